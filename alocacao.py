@@ -0,0 +1,791 @@
+"""
+Módulo de alocação de quartos.
+A disponibilidade é conferida por tipo de quarto (ocupacao.py); aqui cada
+reserva recebe os quartos concretos em que ficará. Os quartos são numerados
+a partir de 1, na ordem de TIPOS_QUARTOS (com a configuração padrão:
+standard 1 a 10, premium 11 a 15, luxo 16 a 18).
+
+Cada quarto guarda seus períodos ocupados como uma lista ordenada de
+limites [check-in, check-out, check-in, check-out, ...] (ordinais de
+data), com os códigos das reservas em uma lista paralela: saber se o quarto
+está livre em um período e qual lacuna livre o contém é uma busca binária.
+Uma nova reserva vai para o quarto cuja lacuna livre melhor se ajusta ao
+período (best fit), o que preserva as lacunas longas para estadias longas.
+
+Se a reserva não couber em nenhuma lacuna, embora haja quartos do tipo
+livres em cada noite (a disponibilidade já foi conferida), as reservas
+futuras do tipo são redistribuídas em ordem de check-in; essa ordem usa o
+menor número de quartos possível, de modo que a redistribuição sempre
+encontra lugar quando a disponibilidade foi respeitada. Estadias em
+andamento não mudam de quarto.
+
+A cada gravação, só as atribuições alteradas (a da nova reserva e as das
+reservas trocadas de quarto) são anexadas ao journal de quartos
+(data/alocacao.journal), sob a mesma trava; o journal é incorporado ao
+mapa data/alocacao.json quando o journal de reservas é compactado. Os
+demais processos aplicam essas alterações ao sincronizar, de modo que
+todos mostram os mesmos quartos. Ao montar a alocação, as atribuições
+salvas ainda válidas são mantidas e as reservas sem quarto são alocadas em
+ordem de check-in.
+
+Relatório de fragmentação pela linha de comando:
+    python alocacao.py [--dias N] [--reorganizar]
+"""
+
+import argparse
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date
+from heapq import merge
+from itertools import islice, repeat
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS, HORIZONTE_CALENDARIO, REORGANIZAR_QUARTOS
+from arquivo import carregar_alocacao, anexar_alocacao
+from calculo import estadia_concluida
+from metricas import instrumentar
+
+# Limite de uma lacuna sem reserva posterior (ou anterior): maior que
+# qualquer ordinal de data, de modo que as lacunas limitadas dos dois lados
+# sejam preferidas
+INFINITO = date.max.toordinal() + 1
+
+
+def numerar_quartos(quantidades=None):
+    """
+    Numera os quartos de cada tipo, em sequência, na ordem de TIPOS_QUARTOS.
+    
+    Args:
+        quantidades (dict, optional): Quartos por tipo; padrão
+            QUARTOS_QUANTIDADE
+            
+    Returns:
+        dict: {tipo_quarto: range(números dos quartos)}
+    """
+    quantidades = QUARTOS_QUANTIDADE if quantidades is None else quantidades
+    numeracao = {}
+    proximo = 1
+    
+    for tipo in TIPOS_QUARTOS:
+        quantidade = quantidades.get(tipo, 0)
+        numeracao[tipo] = range(proximo, proximo + quantidade)
+        proximo += quantidade
+    
+    return numeracao
+
+
+def quarto_livre(limites, inicio, fim):
+    """
+    Indica se um quarto está livre em todas as noites de [início, fim).
+    
+    Args:
+        limites (list): Limites dos períodos ocupados do quarto
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        
+    Returns:
+        bool: True se o quarto está livre no período
+    """
+    posicao = bisect_right(limites, inicio)
+    return posicao % 2 == 0 and (posicao == len(limites) or limites[posicao] >= fim)
+
+
+def escolher_quarto(quartos, inicio, fim, tambem_livre=None):
+    """
+    Escolhe o quarto cuja lacuna livre melhor se ajusta a [início, fim):
+    a que deixa menos noites livres antes e depois do período.
+    
+    Args:
+        quartos (list): Limites dos períodos ocupados de cada quarto do tipo
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        tambem_livre (list, optional): Outra ocupação dos mesmos quartos em
+            que o quarto também precisa estar livre
+            
+    Returns:
+        int: Posição do quarto no tipo ou None se nenhum estiver livre
+    """
+    melhor = None
+    menor_sobra = INFINITO * 2
+    
+    for indice, limites in enumerate(quartos):
+        posicao = bisect_right(limites, inicio)
+        if posicao % 2:
+            continue
+        proximo = limites[posicao] if posicao < len(limites) else INFINITO
+        if proximo < fim:
+            continue
+        if tambem_livre is not None and not quarto_livre(tambem_livre[indice], inicio, fim):
+            continue
+        
+        anterior = limites[posicao - 1] if posicao else 0
+        sobra = (inicio - anterior) + (proximo - fim)
+        if sobra < menor_sobra:
+            melhor = indice
+            menor_sobra = sobra
+            if sobra == 0:
+                break
+    
+    return melhor
+
+
+def ocupar_quarto(alocacao, tipo_quarto, indice, inicio, fim, codigo):
+    """
+    Registra um período ocupado em um quarto (já conferido como livre).
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        tipo_quarto (str): Tipo do quarto
+        indice (int): Posição do quarto no tipo
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        codigo (int): Código da reserva
+    """
+    limites = alocacao['quartos'][tipo_quarto][indice]
+    posicao = bisect_right(limites, inicio)
+    limites[posicao:posicao] = (inicio, fim)
+    alocacao['codigos'][tipo_quarto][indice].insert(posicao // 2, codigo)
+
+
+def desocupar_quarto(alocacao, tipo_quarto, indice, inicio, codigo):
+    """
+    Retira de um quarto o período ocupado por uma reserva.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        tipo_quarto (str): Tipo do quarto
+        indice (int): Posição do quarto no tipo
+        inicio (int): Ordinal do check-in
+        codigo (int): Código da reserva
+    """
+    limites = alocacao['quartos'][tipo_quarto][indice]
+    codigos = alocacao['codigos'][tipo_quarto][indice]
+    
+    # Os check-ins ficam nas posições pares; um check-out no mesmo dia vem
+    # antes do check-in procurado
+    posicao = bisect_left(limites, inicio)
+    posicao += posicao % 2
+    
+    for posicao in range(posicao, len(limites), 2):
+        if limites[posicao] != inicio:
+            break
+        if codigos[posicao // 2] == codigo:
+            del limites[posicao:posicao + 2]
+            del codigos[posicao // 2]
+            break
+
+
+def restaurar_quartos(alocacao, reserva, numeros):
+    """
+    Reocupa os quartos salvos de uma reserva, se ainda forem válidos
+    (quartos do tipo, na quantidade reservada e livres no período).
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        reserva (Reserva): Reserva
+        numeros (tuple): Números dos quartos salvos (None se não houver)
+        
+    Returns:
+        bool: True se os quartos foram reocupados
+    """
+    numeracao = alocacao['numeracao'].get(reserva.tipo_quarto)
+    if (not numeros or numeracao is None or len(numeros) != reserva.quantidade_quartos
+            or len(set(numeros)) != len(numeros) or not all(numero in numeracao for numero in numeros)):
+        return False
+    
+    quartos = alocacao['quartos'][reserva.tipo_quarto]
+    inicio = reserva.checkin.toordinal()
+    fim = reserva.checkout.toordinal()
+    if not all(quarto_livre(quartos[numero - numeracao.start], inicio, fim) for numero in numeros):
+        return False
+    
+    for numero in numeros:
+        ocupar_quarto(alocacao, reserva.tipo_quarto, numero - numeracao.start, inicio, fim, reserva.hash)
+    alocacao['atribuicoes'][reserva.hash] = tuple(sorted(numeros))
+    return True
+
+
+@instrumentar
+def criar_alocacao(reservas=(), salvas=None, quantidades=None):
+    """
+    Monta a alocação de quartos das reservas.
+    
+    A alocação é um dicionário com:
+        - 'numeracao': {tipo_quarto: range(números dos quartos)}
+        - 'quartos': {tipo_quarto: [limites dos períodos ocupados de cada
+          quarto]}
+        - 'codigos': {tipo_quarto: [códigos das reservas de cada quarto]}
+        - 'atribuicoes': {codigo: (números dos quartos)}; () se a reserva
+          ficou sem quarto (livro acima do inventário)
+        - 'realocacoes': reservas que mudaram de quarto em redistribuições
+        - 'alteradas': códigos cujas atribuições mudaram desde a última
+          gravação (ver registrar_alteracoes)
+        
+    Args:
+        reservas (iterable): Reservas do cadastro
+        salvas (dict, optional): Atribuições salvas ({codigo: números})
+        quantidades (dict, optional): Quartos por tipo; padrão
+            QUARTOS_QUANTIDADE
+            
+    Returns:
+        dict: Alocação de quartos
+    """
+    numeracao = numerar_quartos(quantidades)
+    alocacao = {
+        'numeracao': numeracao,
+        'quartos': {tipo: [[] for _ in numeros] for tipo, numeros in numeracao.items()},
+        'codigos': {tipo: [[] for _ in numeros] for tipo, numeros in numeracao.items()},
+        'atribuicoes': {},
+        'realocacoes': 0,
+        'alteradas': set()
+    }
+    salvas = salvas or {}
+    hoje = date.today()
+    pendentes = []
+    
+    for reserva in reservas:
+        # Estadias concluídas não ocupam mais quartos: só guardam os salvos
+        if estadia_concluida(reserva, hoje):
+            if reserva.hash in salvas:
+                alocacao['atribuicoes'][reserva.hash] = salvas[reserva.hash]
+        elif not restaurar_quartos(alocacao, reserva, salvas.get(reserva.hash)):
+            pendentes.append(reserva)
+    
+    pendentes.sort(key=lambda reserva: (reserva.checkin, reserva.hash))
+    for reserva in pendentes:
+        alocar_reserva(alocacao, reserva, reorganizar=False)
+    
+    return alocacao
+
+
+def alocar_reserva(alocacao, reserva, reorganizar=REORGANIZAR_QUARTOS):
+    """
+    Atribui quartos a uma reserva, pelo melhor ajuste. Se não houver
+    lacuna, as reservas futuras do tipo podem ser redistribuídas.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        reserva (Reserva): Reserva incluída no cadastro
+        reorganizar (bool): Redistribui as reservas futuras do tipo se a
+            reserva não couber nas lacunas atuais
+            
+    Returns:
+        tuple: Números dos quartos ou () se a reserva ficou sem quarto
+    """
+    alocacao['alteradas'].add(reserva.hash)
+    quartos = alocacao['quartos'].get(reserva.tipo_quarto)
+    if quartos is None:
+        alocacao['atribuicoes'][reserva.hash] = ()
+        return ()
+    
+    inicio = reserva.checkin.toordinal()
+    fim = reserva.checkout.toordinal()
+    escolhidos = []
+    
+    for _ in range(reserva.quantidade_quartos):
+        indice = escolher_quarto(quartos, inicio, fim)
+        if indice is None and reorganizar:
+            indice = abrir_espaco(alocacao, reserva.tipo_quarto, inicio, fim)
+        if indice is None:
+            break
+        ocupar_quarto(alocacao, reserva.tipo_quarto, indice, inicio, fim, reserva.hash)
+        escolhidos.append(indice)
+    
+    if len(escolhidos) == reserva.quantidade_quartos:
+        primeiro = alocacao['numeracao'][reserva.tipo_quarto].start
+        alocacao['atribuicoes'][reserva.hash] = tuple(sorted(primeiro + indice for indice in escolhidos))
+    else:
+        for indice in escolhidos:
+            desocupar_quarto(alocacao, reserva.tipo_quarto, indice, inicio, reserva.hash)
+        alocacao['atribuicoes'][reserva.hash] = ()
+        if reorganizar:
+            reorganizar_quartos(alocacao, reserva.tipo_quarto, reserva)
+    
+    return alocacao['atribuicoes'][reserva.hash]
+
+
+def alocar_lote(alocacao, reservas, reorganizar=REORGANIZAR_QUARTOS):
+    """
+    Atribui quartos a um lote de reservas em uma única varredura, em ordem
+    de check-in (como na montagem da alocação). Só as reservas que não
+    couberem nas lacunas tentam de novo depois da varredura, abrindo espaço
+    ou redistribuindo as reservas futuras do tipo (ver alocar_reserva).
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        reservas (iterable): Reservas incluídas no cadastro
+        reorganizar (bool): Redistribui as reservas futuras do tipo para as
+            reservas que ficarem sem quarto
+            
+    Returns:
+        int: Reservas do lote que ficaram sem quarto
+    """
+    sem_quarto = []
+    
+    for reserva in sorted(reservas, key=lambda reserva: (reserva.checkin, reserva.hash)):
+        if not alocar_reserva(alocacao, reserva, reorganizar=False):
+            sem_quarto.append(reserva)
+    
+    if reorganizar:
+        sem_quarto = [reserva for reserva in sem_quarto if not alocar_reserva(alocacao, reserva, reorganizar=True)]
+    
+    return len(sem_quarto)
+
+
+def liberar_reserva(alocacao, reserva):
+    """
+    Libera os quartos de uma reserva cancelada.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        reserva (Reserva): Reserva retirada do cadastro
+    """
+    if reserva.hash not in alocacao['atribuicoes']:
+        return
+    
+    numeros = alocacao['atribuicoes'].pop(reserva.hash)
+    alocacao['alteradas'].add(reserva.hash)
+    numeracao = alocacao['numeracao'].get(reserva.tipo_quarto)
+    inicio = reserva.checkin.toordinal()
+    
+    for numero in numeros:
+        if numeracao is not None and numero in numeracao:
+            desocupar_quarto(alocacao, reserva.tipo_quarto, numero - numeracao.start, inicio, reserva.hash)
+
+
+def contar_conflitos(limites, inicio, fim):
+    """
+    Conta os períodos ocupados de um quarto que se sobrepõem a [início, fim).
+    
+    Args:
+        limites (list): Limites dos períodos ocupados do quarto
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        
+    Returns:
+        tuple: (quantidade, posição do primeiro limite, posição após o
+            último limite)
+    """
+    primeira = bisect_right(limites, inicio)
+    primeira -= primeira % 2
+    ultima = bisect_left(limites, fim)
+    ultima += ultima % 2
+    return max(ultima - primeira, 0) // 2, primeira, ultima
+
+
+def escolher_quarto_menos_conflitos(quartos, anteriores, inicio, fim):
+    """
+    Entre os quartos livres em [início, fim), escolhe o que desaloja menos
+    reservas da ocupação anterior (e, no empate, o de melhor ajuste).
+    
+    Args:
+        quartos (list): Ocupação em montagem de cada quarto do tipo
+        anteriores (list): Ocupação anterior de cada quarto do tipo
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        
+    Returns:
+        int: Posição do quarto no tipo ou None se nenhum estiver livre
+    """
+    menor = None
+    candidatos = []
+    
+    for indice, limites in enumerate(quartos):
+        if quarto_livre(limites, inicio, fim):
+            conflitos = contar_conflitos(anteriores[indice], inicio, fim)[0]
+            if menor is None or conflitos < menor:
+                menor = conflitos
+                candidatos = [indice]
+            elif conflitos == menor:
+                candidatos.append(indice)
+    
+    if not candidatos:
+        return None
+    escolhido = escolher_quarto([quartos[indice] for indice in candidatos], inicio, fim)
+    return candidatos[escolhido]
+
+
+def abrir_espaco(alocacao, tipo_quarto, inicio, fim):
+    """
+    Libera [início, fim) em um quarto do tipo, levando as reservas que o
+    ocupam nesse período para lacunas de outros quartos. Os quartos com
+    menos reservas a deslocar são tentados primeiro; estadias em andamento
+    não são deslocadas.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        tipo_quarto (str): Tipo do quarto
+        inicio (int): Ordinal do check-in
+        fim (int): Ordinal do check-out
+        
+    Returns:
+        int: Posição do quarto liberado ou None se nenhum pôde ser liberado
+    """
+    hoje = date.today().toordinal()
+    primeiro = alocacao['numeracao'][tipo_quarto].start
+    quartos = alocacao['quartos'][tipo_quarto]
+    codigos = alocacao['codigos'][tipo_quarto]
+    candidatos = []
+    
+    for indice, limites in enumerate(quartos):
+        conflitos, primeira, ultima = contar_conflitos(limites, inicio, fim)
+        if conflitos and limites[primeira] >= hoje:
+            candidatos.append((conflitos, indice, primeira, ultima))
+    
+    for _, indice, primeira, ultima in sorted(candidatos):
+        limites = quartos[indice]
+        retirados = limites[primeira:ultima]
+        retirados_codigos = codigos[indice][primeira // 2:ultima // 2]
+        deslocadas = list(zip(retirados[::2], retirados[1::2], retirados_codigos))
+        del limites[primeira:ultima]
+        del codigos[indice][primeira // 2:ultima // 2]
+        
+        # O período fica reservado no quarto enquanto as demais procuram lugar
+        ocupar_quarto(alocacao, tipo_quarto, indice, inicio, fim, None)
+        destinos = []
+        for inicio_deslocada, fim_deslocada, codigo in deslocadas:
+            destino = escolher_quarto(quartos, inicio_deslocada, fim_deslocada)
+            if destino is None:
+                break
+            ocupar_quarto(alocacao, tipo_quarto, destino, inicio_deslocada, fim_deslocada, codigo)
+            destinos.append(destino)
+        desocupar_quarto(alocacao, tipo_quarto, indice, inicio, None)
+        
+        if len(destinos) == len(deslocadas):
+            for (_, _, codigo), destino in zip(deslocadas, destinos):
+                numeros = list(alocacao['atribuicoes'][codigo])
+                numeros[numeros.index(primeiro + indice)] = primeiro + destino
+                alocacao['atribuicoes'][codigo] = tuple(sorted(numeros))
+                alocacao['alteradas'].add(codigo)
+            alocacao['realocacoes'] += len(deslocadas)
+            return indice
+        
+        for (inicio_deslocada, _, codigo), destino in zip(deslocadas, destinos):
+            desocupar_quarto(alocacao, tipo_quarto, destino, inicio_deslocada, codigo)
+        limites[primeira:primeira] = retirados
+        codigos[indice][primeira // 2:primeira // 2] = retirados_codigos
+    
+    return None
+
+
+@instrumentar
+def reorganizar_quartos(alocacao, tipo_quarto, nova=None):
+    """
+    Redistribui reservas de um tipo em ordem de check-in, mantendo onde
+    estão as estadias em andamento.
+    
+    Com uma reserva nova que não coube nas lacunas, só as reservas com
+    check-in a partir do dela são redistribuídas: cada uma fica no quarto
+    em que estava, se ele ainda estiver livre, ou vai para o quarto livre
+    de melhor ajuste, e a redistribuição termina assim que nenhuma reserva
+    deslocada alcança as seguintes. Sem reserva nova, todas as reservas
+    futuras são redistribuídas pelo melhor ajuste, para desfragmentar.
+    
+    Em ordem de check-in, qualquer quarto livre no check-in serve: se a
+    disponibilidade por tipo foi respeitada, sempre há lugar. Caso
+    contrário (livro acima do inventário), a alocação não é alterada.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        tipo_quarto (str): Tipo do quarto
+        nova (Reserva, optional): Reserva ainda sem quarto a incluir
+        
+    Returns:
+        int: Reservas que mudaram de quarto ou None se a redistribuição
+            não foi possível
+    """
+    hoje = date.today().toordinal()
+    primeiro = alocacao['numeracao'][tipo_quarto].start
+    quartos = alocacao['quartos'][tipo_quarto]
+    codigos = alocacao['codigos'][tipo_quarto]
+    corte = hoje
+    fronteira = INFINITO
+    novas = []
+    
+    if nova is not None:
+        inicio = nova.checkin.toordinal()
+        fim = nova.checkout.toordinal()
+        corte = max(hoje, inicio)
+        fronteira = fim
+        novas = [(inicio, fim, nova.hash, None)] * nova.quantidade_quartos
+    
+    # Cada quarto fica com os períodos de check-in anterior ao corte; os
+    # demais são percorridos em ordem de check-in, sem ordenar o livro todo
+    novos_quartos = []
+    novos_codigos = []
+    fluxos = [novas]
+    for anterior, (limites, codigos_quarto) in enumerate(zip(quartos, codigos)):
+        posicao = bisect_left(limites, corte)
+        posicao += posicao % 2
+        novos_quartos.append(limites[:posicao])
+        novos_codigos.append(codigos_quarto[:posicao // 2])
+        fluxos.append(zip(
+            islice(limites, posicao, None, 2),
+            islice(limites, posicao + 1, None, 2),
+            islice(codigos_quarto, posicao // 2, None),
+            repeat(anterior)
+        ))
+    
+    alocacao['quartos'][tipo_quarto] = novos_quartos
+    alocacao['codigos'][tipo_quarto] = novos_codigos
+    por_codigo = {}
+    
+    for inicio, fim, codigo, anterior in merge(*fluxos, key=lambda unidade: unidade[:3]):
+        if inicio >= fronteira:
+            break
+        
+        if nova is None:
+            indice = escolher_quarto(novos_quartos, inicio, fim)
+        elif anterior is not None and quarto_livre(novos_quartos[anterior], inicio, fim):
+            indice = anterior
+        elif anterior is not None:
+            # Deslocada: de preferência, para um quarto que também estava
+            # livre, sem desalojar as reservas seguintes
+            indice = escolher_quarto(novos_quartos, inicio, fim, quartos)
+            if indice is None:
+                indice = escolher_quarto(novos_quartos, inicio, fim)
+        else:
+            indice = escolher_quarto_menos_conflitos(novos_quartos, quartos, inicio, fim)
+        if indice is None:
+            alocacao['quartos'][tipo_quarto] = quartos
+            alocacao['codigos'][tipo_quarto] = codigos
+            return None
+        
+        ocupar_quarto(alocacao, tipo_quarto, indice, inicio, fim, codigo)
+        por_codigo.setdefault(codigo, []).append(primeiro + indice)
+        if indice != anterior and nova is not None:
+            fronteira = max(fronteira, fim)
+    
+    # Daqui em diante nenhuma reserva deslocada ocupa noites: as demais
+    # continuam nos mesmos quartos
+    if fronteira < INFINITO:
+        for limites, codigos_quarto, novos_limites, novos_codigos_quarto in zip(
+                quartos, codigos, novos_quartos, novos_codigos):
+            posicao = bisect_left(limites, fronteira)
+            posicao += posicao % 2
+            novos_limites.extend(limites[posicao:])
+            novos_codigos_quarto.extend(codigos_quarto[posicao // 2:])
+    
+    movidas = 0
+    for codigo, numeros in por_codigo.items():
+        numeros = tuple(sorted(numeros))
+        anteriores = alocacao['atribuicoes'].get(codigo)
+        if anteriores not in (numeros, (), None):
+            movidas += 1
+        if anteriores != numeros:
+            alocacao['alteradas'].add(codigo)
+        alocacao['atribuicoes'][codigo] = numeros
+    
+    alocacao['realocacoes'] += movidas
+    return movidas
+
+
+def registrar_alteracoes(alocacao):
+    """
+    Anexa ao journal de quartos as atribuições alteradas desde a última
+    gravação; o custo acompanha as alterações, não o tamanho do livro. Deve
+    ser chamada com a trava dos dados adquirida.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        
+    Returns:
+        bool: True se gravou (ou não havia alterações), False caso contrário
+    """
+    alteradas = alocacao['alteradas']
+    if not alteradas:
+        return True
+    
+    if not anexar_alocacao([(codigo, alocacao['atribuicoes'].get(codigo)) for codigo in alteradas]):
+        return False
+    alteradas.clear()
+    return True
+
+
+def incorporar_atribuicoes(alocacao, reservas_por_codigo, operacoes, entradas):
+    """
+    Aplica à alocação as gravações de outro processo: libera os quartos das
+    reservas canceladas e os das que mudaram de quarto e reocupa os quartos
+    registrados no journal de quartos. Reservas novas sem registro (gravadas
+    por versões anteriores) recebem quartos pelo melhor ajuste.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        reservas_por_codigo (dict): Reservas do cadastro já sincronizado
+        operacoes (list): Operações (operacao, reserva) incorporadas
+        entradas (list): Pares (codigo, números ou None) do journal de
+            quartos, na ordem gravada
+    """
+    hoje = date.today()
+    ultimas = dict(entradas)
+    
+    # Primeiro libera tudo o que mudou, para que as novas posições não
+    # colidam com as antigas
+    for operacao, reserva in operacoes:
+        if operacao == "cancelar":
+            liberar_reserva(alocacao, reserva)
+    for codigo in ultimas:
+        reserva = reservas_por_codigo.get(codigo)
+        if reserva is not None:
+            liberar_reserva(alocacao, reserva)
+    
+    for codigo, numeros in ultimas.items():
+        reserva = reservas_por_codigo.get(codigo)
+        if reserva is None or numeros is None:
+            continue
+        if estadia_concluida(reserva, hoje):
+            alocacao['atribuicoes'][codigo] = numeros
+        elif not restaurar_quartos(alocacao, reserva, numeros):
+            alocar_reserva(alocacao, reserva, reorganizar=False)
+    
+    for operacao, reserva in operacoes:
+        if (operacao == "criar" and reserva.hash in reservas_por_codigo
+                and reserva.hash not in alocacao['atribuicoes']):
+            alocar_reserva(alocacao, reserva, reorganizar=False)
+    
+    # As alterações vieram de outro processo e já estão gravadas
+    alocacao['alteradas'].difference_update(ultimas)
+    alocacao['alteradas'].difference_update(reserva.hash for operacao, reserva in operacoes if operacao == "cancelar")
+
+
+def obter_alocacao(cadastro):
+    """
+    Retorna a alocação de quartos do cadastro, montando-a na primeira
+    consulta a partir das atribuições salvas.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        dict: Alocação de quartos
+    """
+    if cadastro['alocacao'] is None:
+        cadastro['alocacao'] = criar_alocacao(cadastro['reservas'].values(), carregar_alocacao())
+    return cadastro['alocacao']
+
+
+def calcular_fragmentacao(alocacao, data_inicio=None, dias=HORIZONTE_CALENDARIO):
+    """
+    Mede a fragmentação das noites livres de cada tipo em
+    [data_inicio, data_inicio + dias).
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        data_inicio (date, optional): Primeira noite; padrão hoje
+        dias (int): Quantidade de noites consideradas
+        
+    Returns:
+        dict: {tipo_quarto: {'quartos', 'noites_livres', 'lacunas' (trechos
+            livres), 'maior_lacuna', 'noites_isoladas' (lacunas de uma noite
+            entre duas reservas), 'fragmentacao' (fração das noites livres
+            fora da maior lacuna de cada quarto)}}
+    """
+    inicio = (data_inicio or date.today()).toordinal()
+    fim = inicio + dias
+    metricas = {}
+    
+    for tipo, quartos in alocacao['quartos'].items():
+        livres = lacunas = maior = isoladas = fora_da_maior = 0
+        
+        for limites in quartos:
+            anterior = inicio
+            limitada = False
+            posicao = bisect_right(limites, inicio)
+            if posicao % 2:  # Reserva em andamento no início do período
+                anterior = limites[posicao]
+                limitada = True
+                posicao += 1
+            
+            trechos = []
+            for posicao in range(posicao, len(limites), 2):
+                if limites[posicao] >= fim:
+                    break
+                if limites[posicao] > anterior:
+                    trechos.append(limites[posicao] - anterior)
+                    isoladas += limitada and trechos[-1] == 1
+                anterior = max(anterior, limites[posicao + 1])
+                limitada = True
+            if anterior < fim:
+                trechos.append(fim - anterior)
+            
+            if trechos:
+                livres += sum(trechos)
+                lacunas += len(trechos)
+                maior = max(maior, max(trechos))
+                fora_da_maior += sum(trechos) - max(trechos)
+        
+        metricas[tipo] = {
+            'quartos': len(quartos),
+            'noites_livres': livres,
+            'lacunas': lacunas,
+            'maior_lacuna': maior,
+            'noites_isoladas': isoladas,
+            'fragmentacao': round(fora_da_maior / livres, 4) if livres else 0.0
+        }
+    
+    return metricas
+
+
+def formatar_quartos(numeros):
+    """
+    Formata os números dos quartos de uma reserva para exibição.
+    
+    Args:
+        numeros (tuple): Números dos quartos
+        
+    Returns:
+        str: Números separados por vírgula ou "a definir" se não houver
+    """
+    return ", ".join(str(numero) for numero in numeros) or "a definir"
+
+
+def contar_sem_quarto(alocacao):
+    """
+    Conta as reservas que ficaram sem quarto.
+    
+    Args:
+        alocacao (dict): Alocação de quartos
+        
+    Returns:
+        int: Quantidade de reservas sem quarto
+    """
+    return sum(1 for numeros in alocacao['atribuicoes'].values() if not numeros)
+
+
+def executar_relatorio(argumentos=None):
+    """
+    Exibe a fragmentação das noites livres por tipo e, opcionalmente,
+    redistribui as reservas futuras de todos os tipos e salva a alocação.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída
+    """
+    from arquivo import avancar_versao
+    from concorrencia import abrir_cadastro, acesso_exclusivo
+    
+    parser = argparse.ArgumentParser(description="Fragmentação da alocação de quartos.")
+    parser.add_argument("--dias", type=int, default=HORIZONTE_CALENDARIO, help="Noites consideradas a partir de hoje")
+    parser.add_argument("--reorganizar", action="store_true", help="Redistribui as reservas futuras e salva")
+    opcoes = parser.parse_args(argumentos)
+    
+    cadastro = abrir_cadastro()
+    with acesso_exclusivo(cadastro):
+        alocacao = obter_alocacao(cadastro)
+        if opcoes.reorganizar:
+            movidas = sum(reorganizar_quartos(alocacao, tipo) or 0 for tipo in alocacao['quartos'])
+            # O carimbo avança para que os demais processos incorporem as trocas
+            if registrar_alteracoes(alocacao):
+                avancar_versao()
+            print(f"{movidas} reserva(s) mudaram de quarto.")
+    
+    print(f"{'tipo':<10} {'quartos':>7} {'livres':>8} {'lacunas':>8} {'maior':>6} {'isoladas':>9} {'fragm.':>7}")
+    for tipo, metricas in calcular_fragmentacao(alocacao, dias=opcoes.dias).items():
+        print(f"{tipo:<10} {metricas['quartos']:>7} {metricas['noites_livres']:>8} {metricas['lacunas']:>8} "
+              f"{metricas['maior_lacuna']:>6} {metricas['noites_isoladas']:>9} {metricas['fragmentacao']:>7.1%}")
+    print(f"Reservas sem quarto: {contar_sem_quarto(alocacao)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_relatorio())
@@ -0,0 +1,280 @@
+"""
+Módulo do backend de armazenamento em SQLite.
+Guarda as reservas em um banco SQLite (modo WAL) com índices por código,
+nome do responsável e período por tipo de quarto, permitindo que as
+consultas sejam resolvidas pelo banco em vez de varrer a lista em memória.
+"""
+
+import os
+from datetime import date
+from functools import lru_cache
+from config import DIRETORIO_DADOS, ARQUIVO_SQLITE
+from identificador import intervalo_codigos
+from registro import Reserva
+
+COLUNAS = "hash, nome, checkin, checkout, tipo_quarto, quantidade_quartos, valor"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS reservas (
+    id INTEGER PRIMARY KEY,
+    hash INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    checkin TEXT NOT NULL,
+    checkout TEXT NOT NULL,
+    tipo_quarto TEXT NOT NULL,
+    quantidade_quartos INTEGER NOT NULL,
+    valor REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_reservas_hash ON reservas (hash);
+CREATE INDEX IF NOT EXISTS idx_reservas_nome ON reservas (nome);
+CREATE INDEX IF NOT EXISTS idx_reservas_periodo ON reservas (tipo_quarto, checkin, checkout);
+"""
+
+
+def obter_caminho_banco():
+    """
+    Retorna o caminho completo do banco SQLite.
+    
+    Returns:
+        str: Caminho completo do banco
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_SQLITE)
+
+
+def banco_existe():
+    """
+    Indica se o banco SQLite já foi criado.
+    
+    Returns:
+        bool: True se o arquivo do banco existe
+    """
+    return os.path.exists(obter_caminho_banco())
+
+
+@lru_cache(maxsize=None)
+def obter_conexao(caminho=None):
+    """
+    Abre (uma única vez por caminho) a conexão com o banco, ativando o modo
+    WAL e criando a tabela e os índices se necessário.
+    
+    Args:
+        caminho (str, optional): Caminho do banco; padrão em config.py
+        
+    Returns:
+        sqlite3.Connection: Conexão com o banco
+    """
+    # O sqlite3 é importado só quando o banco é usado, para não pesar na
+    # inicialização dos demais backends
+    import sqlite3
+    
+    caminho = caminho or obter_caminho_banco()
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    
+    conexao = sqlite3.connect(caminho)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+
+def formatar_data(data):
+    """
+    Formata uma data para o banco no formato gravado desde a primeira
+    versão (datetime.isoformat, à meia-noite), para que as comparações de
+    texto do índice de período continuem corretas em bancos existentes.
+    
+    Args:
+        data (date): Data
+        
+    Returns:
+        str: Data no formato aaaa-mm-ddT00:00:00
+    """
+    return f"{data.isoformat()}T00:00:00"
+
+
+@lru_cache(maxsize=4096)
+def converter_data_banco(texto):
+    """
+    Converte uma data lida do banco. O cache faz as reservas de um mesmo
+    dia compartilharem o objeto date.
+    
+    Args:
+        texto (str): Data no formato aaaa-mm-dd (com ou sem hora)
+        
+    Returns:
+        date: Data
+    """
+    return date.fromisoformat(texto[:10])
+
+
+def converter_para_linha(reserva):
+    """
+    Converte uma reserva no formato de linha da tabela.
+    
+    Args:
+        reserva (Reserva): Reserva
+        
+    Returns:
+        tuple: Valores na ordem de COLUNAS
+    """
+    return (
+        reserva.hash,
+        reserva.nome,
+        formatar_data(reserva.checkin),
+        formatar_data(reserva.checkout),
+        reserva.tipo_quarto,
+        reserva.quantidade_quartos,
+        reserva.valor
+    )
+
+
+def converter_para_reserva(linha):
+    """
+    Converte uma linha da tabela no registro de reserva.
+    
+    Args:
+        linha (tuple): Valores na ordem de COLUNAS
+        
+    Returns:
+        Reserva: Reserva
+    """
+    codigo, nome, checkin, checkout, tipo_quarto, quantidade_quartos, valor = linha
+    return Reserva(
+        codigo,
+        nome,
+        converter_data_banco(checkin),
+        converter_data_banco(checkout),
+        tipo_quarto,
+        quantidade_quartos,
+        valor
+    )
+
+
+def consultar(sql, parametros=()):
+    """
+    Executa uma consulta de reservas e converte as linhas retornadas.
+    
+    Args:
+        sql (str): Consulta SELECT sobre COLUNAS
+        parametros (tuple): Parâmetros da consulta
+        
+    Returns:
+        list: Lista de reservas
+    """
+    cursor = obter_conexao().execute(sql, parametros)
+    return [converter_para_reserva(linha) for linha in cursor]
+
+
+def carregar_reservas_sqlite():
+    """
+    Carrega todas as reservas do banco, na ordem em que foram criadas.
+    
+    Returns:
+        list: Lista de reservas
+    """
+    return consultar(f"SELECT {COLUNAS} FROM reservas ORDER BY id")
+
+
+def salvar_reservas_sqlite(reservas):
+    """
+    Substitui todo o conteúdo do banco pela lista informada, em uma única
+    transação.
+    
+    Args:
+        reservas (list): Lista de reservas
+    """
+    conexao = obter_conexao()
+    with conexao:
+        conexao.execute("DELETE FROM reservas")
+        conexao.executemany(
+            f"INSERT INTO reservas ({COLUNAS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            map(converter_para_linha, reservas)
+        )
+
+
+def gravar_operacoes_sqlite(operacoes):
+    """
+    Insere as reservas criadas e remove as canceladas em uma única
+    transação.
+    
+    Args:
+        operacoes (list): Operações (operacao, reserva), com operacao
+            "criar" ou "cancelar"
+    """
+    conexao = obter_conexao()
+    with conexao:
+        for operacao, reserva in operacoes:
+            if operacao == "criar":
+                conexao.execute(
+                    f"INSERT INTO reservas ({COLUNAS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    converter_para_linha(reserva)
+                )
+            else:
+                conexao.execute("DELETE FROM reservas WHERE hash = ?", (reserva.hash,))
+
+
+def buscar_por_codigo_sqlite(codigo_hash):
+    """
+    Busca uma reserva pelo código usando o índice de hash.
+    
+    Args:
+        codigo_hash (int): Código da reserva
+        
+    Returns:
+        Reserva: Reserva encontrada ou None
+    """
+    reservas = consultar(f"SELECT {COLUNAS} FROM reservas WHERE hash = ?", (codigo_hash,))
+    return reservas[0] if reservas else None
+
+
+def buscar_por_criacao_sqlite(inicio, fim):
+    """
+    Busca as reservas criadas no intervalo [inicio, fim), varrendo a faixa
+    de códigos correspondente no índice de hash (ver identificador.py).
+    Reservas com códigos antigos (gerados por hash) não são incluídas.
+    
+    Args:
+        inicio (datetime): Início do intervalo
+        fim (datetime): Fim do intervalo (exclusivo)
+        
+    Returns:
+        list: Reservas criadas no intervalo, em ordem de criação
+    """
+    menor, maior = intervalo_codigos(inicio, fim)
+    return consultar(
+        f"SELECT {COLUNAS} FROM reservas WHERE hash BETWEEN ? AND ? ORDER BY hash",
+        (menor, maior)
+    )
+
+
+def buscar_por_nome_sqlite(nome):
+    """
+    Busca as reservas de um responsável usando o índice de nome.
+    
+    Args:
+        nome (str): Nome do responsável
+        
+    Returns:
+        list: Reservas encontradas
+    """
+    return consultar(f"SELECT {COLUNAS} FROM reservas WHERE nome = ? ORDER BY id", (nome,))
+
+
+def buscar_sobrepostas_sqlite(tipo_quarto, data_checkin, data_checkout):
+    """
+    Busca as reservas de um tipo de quarto que se sobrepõem ao período,
+    usando o índice (tipo_quarto, checkin, checkout).
+    
+    Args:
+        tipo_quarto (str): Tipo do quarto
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
+        
+    Returns:
+        list: Reservas sobrepostas ao período
+    """
+    return consultar(
+        f"SELECT {COLUNAS} FROM reservas "
+        "WHERE tipo_quarto = ? AND checkin < ? AND checkout > ?",
+        (tipo_quarto, formatar_data(data_checkout), formatar_data(data_checkin))
+    )
@@ -0,0 +1,377 @@
+"""
+Módulo do arquivo morto de estadias concluídas.
+Reservas concluídas (check-out hoje ou antes; ver calculo.estadia_concluida)
+não podem mais ser canceladas nem afetam a disponibilidade, mas continuavam
+no arquivo de reservas carregado e regravado por inteiro. Ao carregar as
+reservas, elas passam para segmentos mensais em data/arquivo (um por mês
+de check-in, no formato binário de formato_binario.py, comprimido com
+gzip), e o armazenamento principal fica só com as reservas atuais e
+futuras: o custo de abrir e salvar passa a depender do livro à frente, não
+do histórico inteiro.
+
+Cada segmento é gravado em um arquivo temporário e renomeado, e a mesclagem
+com um segmento existente descarta códigos repetidos: se a gravação for
+interrompida antes de o armazenamento principal ser regravado, as mesmas
+estadias são arquivadas de novo no próximo carregamento, sem duplicatas.
+
+As estatísticas de cada segmento ficam em data/arquivo/resumo.json, de modo
+que incluir o histórico nas estatísticas gerais não exige descomprimir os
+segmentos.
+
+Listagem dos segmentos pela linha de comando:
+    python arquivamento.py
+"""
+
+import gzip
+import os
+import struct
+import zlib
+from datetime import date, timedelta
+from config import (
+    DIRETORIO_DADOS,
+    DIRETORIO_ARQUIVO,
+    ARQUIVO_RESUMO_ARQUIVO,
+    ARQUIVAR_ESTADIAS,
+    COMPRIMIR_ARQUIVO
+)
+from arquivo import (
+    travar_dados,
+    usando_sqlite,
+    registrar_operacoes,
+    compactar_journal,
+    gravar_atomicamente,
+    gravar_json,
+    ler_json,
+    codificar_estatisticas,
+    decodificar_estatisticas,
+    ERROS_JSON
+)
+from formato_binario import codificar_binario, abrir_binario, interpretar_binario, fechar_binario, ler_reservas
+from calculo import calcular_estatisticas, combinar_estatisticas, estadia_concluida
+from metricas import instrumentar
+
+EXTENSOES_SEGMENTO = (".bin.gz", ".bin")
+
+
+def obter_diretorio_arquivo():
+    """
+    Retorna o diretório dos segmentos do arquivo morto.
+    
+    Returns:
+        str: Caminho do diretório
+    """
+    return os.path.join(DIRETORIO_DADOS, DIRETORIO_ARQUIVO)
+
+
+def obter_caminho_segmento(ano, mes):
+    """
+    Retorna o caminho do segmento de um mês. Um segmento já gravado é
+    mantido na forma em que está (comprimido ou não), mesmo que
+    COMPRIMIR_ARQUIVO tenha mudado.
+    
+    Args:
+        ano (int): Ano do check-in
+        mes (int): Mês do check-in
+        
+    Returns:
+        str: Caminho do segmento
+    """
+    base = os.path.join(obter_diretorio_arquivo(), f"{ano:04d}-{mes:02d}")
+    
+    for extensao in EXTENSOES_SEGMENTO:
+        if os.path.exists(base + extensao):
+            return base + extensao
+    
+    return base + (".bin.gz" if COMPRIMIR_ARQUIVO else ".bin")
+
+
+def listar_segmentos():
+    """
+    Lista os segmentos do arquivo morto em ordem cronológica.
+    
+    Returns:
+        list: Caminhos dos segmentos
+    """
+    diretorio = obter_diretorio_arquivo()
+    if not os.path.isdir(diretorio):
+        return []
+    
+    return [
+        os.path.join(diretorio, nome) for nome in sorted(os.listdir(diretorio))
+        if nome.endswith(EXTENSOES_SEGMENTO)
+    ]
+
+
+def abrir_segmento(caminho):
+    """
+    Abre um segmento como um livro de formato_binario.abrir_binario: os
+    comprimidos são descomprimidos em memória e os demais, mapeados com
+    mmap. Também abre o próprio arquivo de reservas (.bin).
+    
+    Args:
+        caminho (str): Caminho do segmento
+        
+    Returns:
+        dict: Livro aberto (feche com formato_binario.fechar_binario)
+        
+    Raises:
+        ValueError: Se o segmento estiver corrompido
+    """
+    if not caminho.endswith(".gz"):
+        return abrir_binario(caminho)
+    
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    try:
+        return interpretar_binario(gzip.decompress(conteudo))
+    except (EOFError, zlib.error, gzip.BadGzipFile) as erro:
+        raise ValueError(f"Segmento {os.path.basename(caminho)} corrompido: {erro}")
+
+
+def ler_segmento(caminho):
+    """
+    Lê todas as reservas de um segmento.
+    
+    Args:
+        caminho (str): Caminho do segmento
+        
+    Returns:
+        list: Reservas (Reserva)
+        
+    Raises:
+        ValueError: Se o segmento estiver corrompido
+    """
+    livro = abrir_segmento(caminho)
+    try:
+        return ler_reservas(livro)
+    finally:
+        fechar_binario(livro)
+
+
+def gravar_segmento(caminho, reservas):
+    """
+    Grava (ou substitui) um segmento do arquivo morto.
+    
+    Args:
+        caminho (str): Caminho do segmento
+        reservas (list): Reservas do segmento
+    """
+    conteudo = b"".join(codificar_binario(reservas))
+    if caminho.endswith(".gz"):
+        conteudo = gzip.compress(conteudo, compresslevel=6)
+    gravar_atomicamente(caminho, conteudo)
+
+
+def carregar_resumo():
+    """
+    Carrega as estatísticas por segmento.
+    
+    Returns:
+        dict: {nome do segmento: {'tamanho': bytes do segmento,
+            'estatisticas': estatísticas}}; vazio se não existir
+    """
+    caminho = os.path.join(obter_diretorio_arquivo(), ARQUIVO_RESUMO_ARQUIVO)
+    if not os.path.exists(caminho):
+        return {}
+    
+    try:
+        return {
+            segmento: {'tamanho': item['tamanho'], 'estatisticas': decodificar_estatisticas(item['estatisticas'])}
+            for segmento, item in ler_json(caminho).items()
+        }
+    except ERROS_JSON as erro:
+        print(f"Erro ao carregar o resumo do arquivo morto: {erro}")
+        return {}
+
+
+def salvar_resumo(resumo):
+    """
+    Salva as estatísticas por segmento.
+    
+    Args:
+        resumo (dict): Resumo no formato de carregar_resumo
+    """
+    caminho = os.path.join(obter_diretorio_arquivo(), ARQUIVO_RESUMO_ARQUIVO)
+    
+    try:
+        gravar_json(caminho, {
+            segmento: {'tamanho': item['tamanho'], 'estatisticas': codificar_estatisticas(item['estatisticas'])}
+            for segmento, item in resumo.items()
+        })
+    except (TypeError, ValueError, IOError) as erro:
+        print(f"Erro ao salvar o resumo do arquivo morto: {erro}")
+
+
+def resumir_segmento(resumo, caminho, reservas=None):
+    """
+    Registra no resumo as estatísticas de um segmento, lendo-o se as
+    reservas não forem informadas.
+    
+    Args:
+        resumo (dict): Resumo no formato de carregar_resumo
+        caminho (str): Caminho do segmento
+        reservas (list, optional): Reservas do segmento
+    """
+    if reservas is None:
+        reservas = ler_segmento(caminho)
+    
+    resumo[os.path.basename(caminho)] = {
+        'tamanho': os.path.getsize(caminho),
+        'estatisticas': calcular_estatisticas(reservas)
+    }
+
+
+def gravar_segmentos(reservas):
+    """
+    Acrescenta reservas aos segmentos mensais do arquivo morto, mesclando
+    com o que já estiver arquivado (códigos repetidos são substituídos).
+    
+    Args:
+        reservas (list): Reservas a arquivar
+        
+    Returns:
+        bool: True se todas foram arquivadas, False caso contrário
+    """
+    por_mes = {}
+    for reserva in reservas:
+        por_mes.setdefault((reserva.checkin.year, reserva.checkin.month), []).append(reserva)
+    
+    resumo = carregar_resumo()
+    
+    try:
+        os.makedirs(obter_diretorio_arquivo(), exist_ok=True)
+        for (ano, mes), novas in sorted(por_mes.items()):
+            caminho = obter_caminho_segmento(ano, mes)
+            segmento = {}
+            if os.path.exists(caminho):
+                segmento = {reserva.hash: reserva for reserva in ler_segmento(caminho)}
+            segmento.update((reserva.hash, reserva) for reserva in novas)
+            
+            gravar_segmento(caminho, list(segmento.values()))
+            resumir_segmento(resumo, caminho, list(segmento.values()))
+    except (ValueError, struct.error, OSError) as erro:
+        print(f"Erro ao arquivar estadias concluídas: {erro}")
+        return False
+    finally:
+        salvar_resumo(resumo)
+    
+    return True
+
+
+@instrumentar
+def arquivar_estadias(reservas):
+    """
+    Move as estadias concluídas (check-out hoje ou antes; ver
+    calculo.estadia_concluida) para o arquivo morto e regrava o
+    armazenamento principal apenas com as reservas atuais e futuras. Deve
+    ser chamada com a trava dos dados adquirida, logo após carregar as
+    reservas.
+    
+    Args:
+        reservas (list): Reservas carregadas do armazenamento principal
+        
+    Returns:
+        list: Reservas que permanecem no armazenamento principal
+    """
+    if not ARQUIVAR_ESTADIAS:
+        return reservas
+    
+    hoje = date.today()
+    concluidas = [reserva for reserva in reservas if estadia_concluida(reserva, hoje)]
+    if not concluidas or not gravar_segmentos(concluidas):
+        return reservas
+    
+    atuais = [reserva for reserva in reservas if not estadia_concluida(reserva, hoje)]
+    if usando_sqlite():
+        gravado = registrar_operacoes(atuais, [("cancelar", reserva) for reserva in concluidas])
+    else:
+        gravado = compactar_journal(atuais)
+    
+    if not gravado:
+        return reservas
+    
+    print(f"{len(concluidas)} estadia(s) concluída(s) arquivada(s).")
+    return atuais
+
+
+def ler_arquivo_morto(de=None, ate=None):
+    """
+    Lê as estadias arquivadas, segmento por segmento, em ordem cronológica.
+    Segmentos corrompidos são informados e ignorados.
+    
+    Com um período, são pulados os segmentos que não podem ter estadias
+    nele: os de meses posteriores a 'ate' e aqueles cuja estadia mais longa
+    (registrada no resumo) termina antes de 'de'. Estadias fora do período
+    podem ser retornadas.
+    
+    Args:
+        de (date, optional): Início do período de interesse
+        ate (date, optional): Fim do período de interesse
+        
+    Yields:
+        Reserva: Reserva arquivada
+    """
+    resumo = carregar_resumo() if de is not None else {}
+    
+    for caminho in listar_segmentos():
+        nome = os.path.basename(caminho)
+        if ate is not None and nome[:7] > f"{ate.year:04d}-{ate.month:02d}":
+            break
+        
+        entrada = resumo.get(nome)
+        if entrada and entrada['estatisticas'] and entrada['tamanho'] == os.path.getsize(caminho):
+            ano, mes = int(nome[:4]), int(nome[5:7])
+            fim_do_mes = date(ano + mes // 12, mes % 12 + 1, 1)
+            if fim_do_mes + timedelta(days=entrada['estatisticas']['dias_mais_longa'] - 1) <= de:
+                continue
+        
+        try:
+            yield from ler_segmento(caminho)
+        except (ValueError, struct.error, OSError) as erro:
+            print(f"Erro ao ler o segmento {os.path.basename(caminho)}: {erro}")
+
+
+@instrumentar
+def estatisticas_do_arquivo():
+    """
+    Retorna as estatísticas de todas as estadias arquivadas, a partir do
+    resumo por segmento. Só são lidos os segmentos ausentes do resumo ou
+    alterados desde que foram resumidos.
+    
+    Returns:
+        dict: Estatísticas no formato de calcular_estatisticas ou None se o
+            arquivo morto estiver vazio
+    """
+    with travar_dados():
+        resumo = carregar_resumo()
+        alterado = False
+        parciais = []
+        
+        for caminho in listar_segmentos():
+            entrada = resumo.get(os.path.basename(caminho))
+            if entrada is None or entrada['tamanho'] != os.path.getsize(caminho):
+                try:
+                    resumir_segmento(resumo, caminho)
+                except (ValueError, struct.error, OSError) as erro:
+                    print(f"Erro ao ler o segmento {os.path.basename(caminho)}: {erro}")
+                    continue
+                entrada = resumo[os.path.basename(caminho)]
+                alterado = True
+            parciais.append(entrada['estatisticas'])
+        
+        if alterado:
+            salvar_resumo(resumo)
+    
+    return combinar_estatisticas(parciais)
+
+
+if __name__ == "__main__":
+    resumo = carregar_resumo()
+    segmentos = listar_segmentos()
+    
+    for caminho in segmentos:
+        estatisticas = resumo.get(os.path.basename(caminho), {}).get('estatisticas')
+        quantidade = estatisticas['quantidade_reservas'] if estatisticas else "?"
+        print(f"{os.path.basename(caminho):<16} {quantidade:>10} reserva(s) {os.path.getsize(caminho):>12} bytes")
+    
+    print(f"{len(segmentos)} segmento(s) em {obter_diretorio_arquivo()}")
@@ -1,11 +1,90 @@
 """
 Módulo responsável pela persistência de dados.
-Gerencia carregamento e salvamento de reservas em arquivo.
+Gerencia carregamento e salvamento de reservas em arquivo, delegando ao
+backend configurado em config.py (pickle, binário ou SQLite).
+
+As alterações podem ser gravadas em um journal (registro de operações só de
+acréscimo): cada criação ou cancelamento vira um registro anexado ao final do
+arquivo, e a compactação incorpora o journal ao arquivo de reservas.
+
+Vários processos (terminais, serviço, importação) podem compartilhar o mesmo
+diretório de dados: toda gravação é feita sob uma trava exclusiva
+(fcntl.flock em reservas.lock) e incrementa o carimbo de versão em
+reservas.versao, que os demais processos usam para saber se precisam
+incorporar alterações (ver concorrencia.py).
+
+O arquivo de reservas (pickle ou binário) nunca é sobrescrito no lugar: a
+nova versão é gravada em um temporário, recebe fsync e é renomeada sobre o
+arquivo, e as GERACOES_RESERVAS versões anteriores são mantidas como
+reservas.bin.1, .2, ... Ao final do conteúdo fica um RODAPE com o CRC32 e o
+tamanho do conteúdo (leitores antigos ignoram bytes depois do pickle e do
+formato binário). Ao carregar, o CRC é conferido em uma passada e, se o
+arquivo estiver corrompido, a geração íntegra mais recente é usada e
+restaurada; sem nenhuma geração íntegra, o carregamento é interrompido em
+vez de devolver um livro vazio.
 """
 
+import json
 import os
 import pickle
-from config import DIRETORIO_DADOS, ARQUIVO_RESERVAS
+import shutil
+import struct
+import zlib
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from config import (
+    DIRETORIO_DADOS,
+    ARQUIVO_RESERVAS,
+    ARQUIVO_JOURNAL,
+    ARQUIVO_BINARIO,
+    ARQUIVO_JOURNAL_BINARIO,
+    ARQUIVO_ESTATISTICAS,
+    ARQUIVO_RESUMO_ESTATISTICAS,
+    ARQUIVO_ALOCACAO,
+    ARQUIVO_JOURNAL_ALOCACAO,
+    ARQUIVO_TRAVA,
+    ARQUIVO_VERSAO,
+    USAR_JOURNAL,
+    BACKEND_ARMAZENAMENTO,
+    GERACOES_RESERVAS
+)
+from armazenamento_sqlite import (
+    banco_existe,
+    carregar_reservas_sqlite,
+    salvar_reservas_sqlite,
+    gravar_operacoes_sqlite,
+    buscar_sobrepostas_sqlite
+)
+from formato_binario import (
+    codificar_binario,
+    abrir_binario,
+    ler_reservas,
+    codificar_operacao,
+    ler_operacoes
+)
+from metricas import instrumentar, registrar_medida
+from registro import Reserva, como_registro, valores
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+# Quantas travas aninhadas o processo atual mantém (a trava é reentrante)
+NIVEL_TRAVA = {'nivel': 0}
+
+# Rodapé do arquivo de reservas: assinatura, CRC32 e tamanho do conteúdo
+RODAPE = struct.Struct("<4sIQ")
+ASSINATURA_RODAPE = b"HFLC"
+# Bytes conferidos por vez no cálculo do CRC
+TAMANHO_BLOCO_CRC = 1 << 20
+
+# Erros de um pickle truncado ou corrompido
+ERROS_PICKLE = (pickle.PickleError, EOFError, ValueError, TypeError, AttributeError, ImportError, IndexError, KeyError)
+
+# Erros de um arquivo JSON auxiliar ilegível ou com estrutura inesperada
+ERROS_JSON = (OSError, ValueError, TypeError, AttributeError, IndexError, KeyError)
 
 
 def obter_caminho_arquivo():
@@ -18,6 +97,49 @@ def obter_caminho_arquivo():
     return os.path.join(DIRETORIO_DADOS, ARQUIVO_RESERVAS)
 
 
+def obter_caminho_binario():
+    """
+    Retorna o caminho completo do arquivo de reservas no formato binário.
+    
+    Returns:
+        str: Caminho completo do arquivo binário
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_BINARIO)
+
+
+def obter_caminho_journal():
+    """
+    Retorna o caminho completo do journal de operações do backend em uso
+    (o backend binário tem um journal próprio, em formato binário).
+    
+    Returns:
+        str: Caminho completo do journal
+    """
+    if usando_binario():
+        return os.path.join(DIRETORIO_DADOS, ARQUIVO_JOURNAL_BINARIO)
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_JOURNAL)
+
+
+def obter_caminho_trava():
+    """
+    Retorna o caminho completo do arquivo de trava entre processos.
+    
+    Returns:
+        str: Caminho completo do arquivo de trava
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_TRAVA)
+
+
+def obter_caminho_versao():
+    """
+    Retorna o caminho completo do carimbo de versão dos dados.
+    
+    Returns:
+        str: Caminho completo do carimbo de versão
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_VERSAO)
+
+
 def garantir_diretorio_existe():
     """
     Garante que o diretório de dados existe, criando-o se necessário.
@@ -26,46 +148,1236 @@ def garantir_diretorio_existe():
         os.makedirs(DIRETORIO_DADOS)
 
 
+def usando_sqlite():
+    """
+    Indica se o backend configurado é o SQLite.
+    
+    Returns:
+        bool: True se BACKEND_ARMAZENAMENTO é "sqlite"
+    """
+    return BACKEND_ARMAZENAMENTO == "sqlite"
+
+
+def usando_binario():
+    """
+    Indica se o backend configurado é o formato binário.
+    
+    Returns:
+        bool: True se BACKEND_ARMAZENAMENTO é "binario"
+    """
+    return BACKEND_ARMAZENAMENTO == "binario"
+
+
+def usando_journal():
+    """
+    Indica se as alterações são gravadas no journal (backends pickle e
+    binario com USAR_JOURNAL ativo).
+    
+    Returns:
+        bool: True se o journal está em uso
+    """
+    return USAR_JOURNAL and not usando_sqlite()
+
+
+def gravar_atomicamente(caminho, conteudo, geracoes=0):
+    """
+    Grava um arquivo por inteiro em um temporário e o renomeia sobre o
+    destino, para que leitores nunca vejam o arquivo pela metade. O
+    diretório também recebe fsync, para que a renomeação sobreviva a uma
+    queda de energia.
+    
+    Args:
+        caminho (str): Arquivo de destino
+        conteudo (bytes | list): Conteúdo completo ou as suas partes, em
+            ordem
+        geracoes (int): Versões anteriores mantidas (ver
+            rotacionar_geracoes)
+    """
+    temporario = caminho + ".tmp"
+    partes = [conteudo] if isinstance(conteudo, (bytes, bytearray)) else conteudo
+    
+    with open(temporario, "wb") as arquivo:
+        arquivo.writelines(partes)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    
+    if geracoes:
+        rotacionar_geracoes(caminho, geracoes)
+    os.replace(temporario, caminho)
+    sincronizar_diretorio(os.path.dirname(caminho))
+
+
+def sincronizar_diretorio(diretorio):
+    """
+    Aplica fsync ao diretório, gravando as renomeações feitas nele. Sem
+    efeito onde diretórios não podem ser abertos (Windows).
+    
+    Args:
+        diretorio (str): Diretório
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    
+    try:
+        descritor = os.open(diretorio or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
+
+
+def obter_caminho_geracao(caminho, geracao):
+    """
+    Retorna o caminho de uma geração anterior de um arquivo.
+    
+    Args:
+        caminho (str): Arquivo atual
+        geracao (int): 1 para a versão anterior, 2 para a seguinte, ...
+        
+    Returns:
+        str: Caminho da geração
+    """
+    return f"{caminho}.{geracao}"
+
+
+def rotacionar_geracoes(caminho, geracoes):
+    """
+    Desloca as gerações anteriores de um arquivo (a mais antiga é
+    descartada) e guarda a versão atual como geração 1. A versão atual é
+    guardada com um link, para que o arquivo nunca deixe de existir até ser
+    substituído.
+    
+    Args:
+        caminho (str): Arquivo atual
+        geracoes (int): Gerações mantidas
+    """
+    for geracao in range(geracoes - 1, 0, -1):
+        anterior = obter_caminho_geracao(caminho, geracao)
+        if os.path.exists(anterior):
+            os.replace(anterior, obter_caminho_geracao(caminho, geracao + 1))
+    
+    if not os.path.exists(caminho):
+        return
+    
+    primeira = obter_caminho_geracao(caminho, 1)
+    if os.path.exists(primeira):
+        os.remove(primeira)
+    try:
+        os.link(caminho, primeira)
+    except OSError:
+        shutil.copyfile(caminho, primeira)
+
+
+def calcular_crc(conteudo):
+    """
+    Calcula o CRC32 de um conteúdo em memória ou mapeado, em blocos.
+    
+    Args:
+        conteudo (bytes | mmap | memoryview): Conteúdo
+        
+    Returns:
+        int: CRC32
+    """
+    crc = 0
+    with memoryview(conteudo) as visao:
+        for inicio in range(0, len(visao), TAMANHO_BLOCO_CRC):
+            crc = zlib.crc32(visao[inicio:inicio + TAMANHO_BLOCO_CRC], crc)
+    return crc
+
+
+def montar_rodape(partes):
+    """
+    Monta o rodapé do arquivo de reservas para as partes do conteúdo.
+    
+    Args:
+        partes (list): Partes do conteúdo (bytes), na ordem de gravação
+        
+    Returns:
+        bytes: Rodapé (RODAPE)
+    """
+    crc = 0
+    tamanho = 0
+    for parte in partes:
+        crc = zlib.crc32(parte, crc)
+        tamanho += len(parte)
+    return RODAPE.pack(ASSINATURA_RODAPE, crc, tamanho)
+
+
+def conferir_rodape(conteudo):
+    """
+    Confere o CRC do conteúdo contra o rodapé.
+    
+    Args:
+        conteudo (bytes | mmap): Arquivo completo, com o rodapé
+        
+    Returns:
+        bool: True se o CRC confere, False se não confere ou None se o
+            arquivo não tem rodapé (gravado por versões anteriores)
+    """
+    tamanho = len(conteudo) - RODAPE.size
+    if tamanho < 0:
+        return None
+    
+    assinatura, crc, tamanho_gravado = RODAPE.unpack_from(conteudo, tamanho)
+    if assinatura != ASSINATURA_RODAPE or tamanho_gravado != tamanho:
+        return None
+    
+    with memoryview(conteudo) as visao, visao[:tamanho] as dados:
+        return calcular_crc(dados) == crc
+
+
+def existe_alguma_geracao(caminho):
+    """
+    Indica se o arquivo ou alguma das suas gerações anteriores existe.
+    
+    Args:
+        caminho (str): Arquivo atual
+        
+    Returns:
+        bool: True se existir
+    """
+    return os.path.exists(caminho) or any(
+        os.path.exists(obter_caminho_geracao(caminho, geracao)) for geracao in range(1, GERACOES_RESERVAS + 1)
+    )
+
+
+def restaurar_geracao(origem, caminho):
+    """
+    Copia uma geração íntegra sobre o arquivo atual, com gravação atômica.
+    As gerações não são rotacionadas.
+    
+    Args:
+        origem (str): Geração íntegra
+        caminho (str): Arquivo atual
+    """
+    temporario = caminho + ".tmp"
+    shutil.copyfile(origem, temporario)
+    with open(temporario, "rb") as arquivo:
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    sincronizar_diretorio(os.path.dirname(caminho))
+
+
+def carregar_geracoes(caminho, ler, restaurar=True):
+    """
+    Carrega o arquivo de reservas ou, se ele estiver ausente ou corrompido,
+    a geração íntegra mais recente. O arquivo corrompido é mantido como
+    <arquivo>.corrompido e, com 'restaurar', a geração usada é copiada de
+    volta como arquivo atual.
+    
+    Args:
+        caminho (str): Arquivo de reservas
+        ler (callable): Lê e confere um arquivo; retorna a lista de reservas
+        restaurar (bool): Restaura o arquivo atual a partir da geração usada
+        
+    Returns:
+        list: Reservas ou None se não houver arquivo nem gerações
+        
+    Raises:
+        SystemExit: Se há arquivos, mas nenhum íntegro
+    """
+    candidatos = [caminho] + [obter_caminho_geracao(caminho, geracao) for geracao in range(1, GERACOES_RESERVAS + 1)]
+    existentes = [candidato for candidato in candidatos if os.path.exists(candidato)]
+    if not existentes:
+        return None
+    
+    for candidato in existentes:
+        try:
+            reservas = ler(candidato)
+        except ERROS_PICKLE + (OSError, struct.error) as erro:
+            print(f"Erro ao carregar {os.path.basename(candidato)}: {erro}")
+            continue
+        
+        if candidato != caminho:
+            print(f"Reservas recuperadas de {os.path.basename(candidato)}; as operações gravadas depois "
+                  f"dessa geração e já compactadas podem ter sido perdidas.")
+            if restaurar:
+                if os.path.exists(caminho):
+                    os.replace(caminho, caminho + ".corrompido")
+                restaurar_geracao(candidato, caminho)
+        return reservas
+    
+    raise SystemExit(f"Erro! Nenhuma cópia íntegra de {os.path.basename(caminho)} em {os.path.dirname(caminho)}; "
+                     f"os arquivos foram mantidos como estão.")
+
+
+@lru_cache(maxsize=None)
+def abrir_arquivo_trava(pid):
+    """
+    Abre (uma única vez por processo) o arquivo usado pela trava. O pid faz
+    parte da chave do cache porque processos filhos criados com fork
+    herdariam o mesmo arquivo aberto e, com ele, a mesma trava.
+    
+    Args:
+        pid (int): Identificador do processo atual
+        
+    Returns:
+        file: Arquivo de trava aberto
+    """
+    garantir_diretorio_existe()
+    return open(obter_caminho_trava(), "a")
+
+
+@contextmanager
+def travar_dados():
+    """
+    Mantém a trava exclusiva dos dados entre processos durante o bloco.
+    A trava é reentrante no mesmo processo: só o bloco mais externo a
+    adquire e a libera. Sem fcntl (Windows), não há trava entre processos.
+    """
+    travar = fcntl is not None and NIVEL_TRAVA['nivel'] == 0
+    if travar:
+        fcntl.flock(abrir_arquivo_trava(os.getpid()), fcntl.LOCK_EX)
+    NIVEL_TRAVA['nivel'] += 1
+    
+    try:
+        yield
+    finally:
+        NIVEL_TRAVA['nivel'] -= 1
+        if travar:
+            fcntl.flock(abrir_arquivo_trava(os.getpid()), fcntl.LOCK_UN)
+
+
+def ler_versao():
+    """
+    Lê o carimbo de versão dos dados.
+    
+    Returns:
+        dict: {'versao': gravações realizadas, 'compactacoes': compactações
+            do journal}; zeros se o carimbo não existir
+    """
+    try:
+        with open(obter_caminho_versao()) as arquivo:
+            versao, compactacoes = map(int, arquivo.read().split())
+        return {'versao': versao, 'compactacoes': compactacoes}
+    except (IOError, ValueError):
+        return {'versao': 0, 'compactacoes': 0}
+
+
+def avancar_versao(compactou=False):
+    """
+    Incrementa o carimbo de versão após uma gravação. Deve ser chamada com
+    a trava dos dados adquirida. O carimbo é substituído atomicamente: um
+    carimbo truncado seria lido como versão zero e faria os demais
+    processos recarregarem tudo ou, pior, deixarem de ver uma gravação.
+    
+    Args:
+        compactou (bool): True se o journal foi compactado (as posições
+            lidas do journal deixam de valer)
+    """
+    carimbo = ler_versao()
+    carimbo['versao'] += 1
+    carimbo['compactacoes'] += compactou
+    
+    try:
+        gravar_atomicamente(obter_caminho_versao(), f"{carimbo['versao']} {carimbo['compactacoes']}\n".encode("ascii"))
+    except IOError as erro:
+        print(f"Erro ao gravar a versão dos dados: {erro}")
+
+
+@instrumentar
 def carregar_reservas():
     """
-    Carrega as reservas do arquivo pickle.
+    Carrega as reservas do backend configurado.
+    No primeiro uso do SQLite ou do formato binário, as reservas de um
+    reservas.pkl existente são migradas automaticamente.
+    
+    Returns:
+        list: Lista de reservas (Reserva)
+    """
+    with travar_dados():
+        if usando_sqlite():
+            if not banco_existe() and os.path.exists(obter_caminho_arquivo()):
+                migrar_pickle_para_sqlite()
+            return carregar_reservas_sqlite()
+        if usando_binario():
+            if not existe_alguma_geracao(obter_caminho_binario()) and existe_alguma_geracao(obter_caminho_arquivo()):
+                if not migrar_pickle_para_binario():
+                    raise SystemExit("Erro! As reservas não puderam ser convertidas para o formato binário; "
+                                     "o arquivo pickle foi mantido como está.")
+            return carregar_reservas_binario()
+        return carregar_reservas_pickle()
+
+
+@instrumentar
+def carregar_reservas_pickle():
+    """
+    Carrega as reservas do arquivo pickle (ou da geração íntegra mais
+    recente; ver carregar_geracoes).
     Se o arquivo não existir, cria um novo e retorna lista vazia.
+    Operações pendentes no journal são reaplicadas e, em seguida,
+    compactadas no arquivo de reservas.
     
     Returns:
-        list: Lista de dicionários contendo as reservas
+        list: Lista de reservas (Reserva)
     """
-    caminho = obter_caminho_arquivo()
+    reservas = carregar_geracoes(obter_caminho_arquivo(), ler_arquivo_pickle)
     
-    if os.path.exists(caminho):
-        try:
-            with open(caminho, "rb") as arquivo:
-                return pickle.load(arquivo)
-        except (pickle.PickleError, EOFError) as erro:
-            print(f"Erro ao carregar reservas: {erro}")
-            return []
-    else:
+    if reservas is None:
+        garantir_diretorio_existe()
+        salvar_reservas_pickle([])
+        reservas = []
+    
+    return incorporar_journal(reservas)
+
+
+def ler_arquivo_pickle(caminho):
+    """
+    Lê um arquivo pickle de reservas, conferindo o CRC do rodapé.
+    
+    Args:
+        caminho (str): Arquivo ou geração
+        
+    Returns:
+        list: Lista de reservas (Reserva)
+        
+    Raises:
+        ValueError: Se o CRC não conferir
+    """
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    
+    if conferir_rodape(conteudo) is False:
+        raise ValueError("o CRC do conteúdo não confere")
+    
+    # O pickle ignora o rodapé; arquivos de versões anteriores guardam
+    # dicionários
+    reservas = [como_registro(reserva) for reserva in pickle.loads(conteudo)]
+    registrar_medida("arquivo_reservas_bytes", len(conteudo))
+    return reservas
+
+
+@instrumentar
+def carregar_reservas_binario():
+    """
+    Carrega as reservas do arquivo binário (ver formato_binario.py) ou da
+    geração íntegra mais recente (ver carregar_geracoes).
+    Se o arquivo não existir, cria um novo e retorna lista vazia.
+    Operações pendentes no journal são reaplicadas e, em seguida,
+    compactadas no arquivo de reservas.
+    
+    Returns:
+        list: Lista de reservas (Reserva)
+    """
+    reservas = carregar_geracoes(obter_caminho_binario(), ler_arquivo_binario)
+    
+    if reservas is None:
         garantir_diretorio_existe()
-        salvar_reservas([])
-        return []
+        salvar_reservas_binario([])
+        reservas = []
+    
+    return incorporar_journal(reservas)
+
+
+def ler_arquivo_binario(caminho):
+    """
+    Lê um arquivo binário de reservas, conferindo o CRC do rodapé sobre o
+    arquivo mapeado.
+    
+    Args:
+        caminho (str): Arquivo ou geração
+        
+    Returns:
+        list: Lista de reservas (Reserva)
+        
+    Raises:
+        ValueError: Se o arquivo estiver incompleto ou o CRC não conferir
+    """
+    livro = abrir_binario(caminho)
+    try:
+        if conferir_rodape(livro['mapa']) is False:
+            raise ValueError("o CRC do conteúdo não confere")
+        reservas = ler_reservas(livro)
+        registrar_medida("arquivo_reservas_bytes", len(livro['mapa']))
+    finally:
+        livro['mapa'].close()
+    return reservas
 
 
+def incorporar_journal(reservas):
+    """
+    Reaplica as operações pendentes no journal sobre as reservas recém
+    carregadas do arquivo e as compacta nele.
+    
+    Args:
+        reservas (list): Reservas lidas do arquivo
+        
+    Returns:
+        list: Lista de reservas atualizada
+    """
+    # Compacta também um journal só com registro incompleto, para que novos
+    # registros não sejam anexados depois dele
+    operacoes = list(ler_journal())
+    if operacoes or tamanho_journal():
+        reservas = aplicar_operacoes(reservas, operacoes)
+        compactar_journal(reservas)
+    
+    return reservas
+
+
+@instrumentar
 def salvar_reservas(reservas):
     """
-    Salva a lista de reservas no arquivo pickle.
+    Salva a lista completa de reservas no backend configurado.
+    
+    Args:
+        reservas (list): Lista de reservas (Reserva)
+        
+    Returns:
+        bool: True se salvou com sucesso, False caso contrário
+    """
+    with travar_dados():
+        if usando_sqlite():
+            import sqlite3
+            try:
+                salvar_reservas_sqlite(reservas)
+            except sqlite3.Error as erro:
+                print(f"Erro ao salvar reservas: {erro}")
+                return False
+        elif not salvar_arquivo_reservas(reservas):
+            return False
+        avancar_versao(compactou=True)
+        return True
+
+
+@instrumentar
+def salvar_reservas_pickle(reservas):
+    """
+    Salva a lista de reservas no arquivo pickle, com gravação atômica,
+    rodapé de CRC e rotação das gerações.
     
     Args:
-        reservas (list): Lista de dicionários contendo as reservas
+        reservas (list): Lista de reservas (Reserva)
         
     Returns:
         bool: True se salvou com sucesso, False caso contrário
     """
     garantir_diretorio_existe()
-    caminho = obter_caminho_arquivo()
     
     try:
-        with open(caminho, "wb") as arquivo:
-            pickle.dump(reservas, arquivo)
+        partes = [pickle.dumps(list(reservas))]
+        partes.append(montar_rodape(partes))
+        gravar_atomicamente(obter_caminho_arquivo(), partes, GERACOES_RESERVAS)
+        registrar_medida("arquivo_reservas_bytes", len(partes[0]) + RODAPE.size)
         return True
     except (pickle.PickleError, IOError) as erro:
         print(f"Erro ao salvar reservas: {erro}")
         return False
+
+
+@instrumentar
+def salvar_reservas_binario(reservas):
+    """
+    Salva a lista de reservas no arquivo binário, com gravação atômica,
+    rodapé de CRC e rotação das gerações.
+    
+    Args:
+        reservas (iterable): Reservas (Reserva)
+        
+    Returns:
+        bool: True se salvou com sucesso, False caso contrário
+    """
+    garantir_diretorio_existe()
+    
+    try:
+        partes = codificar_binario(reservas)
+        partes.append(montar_rodape(partes))
+        gravar_atomicamente(obter_caminho_binario(), partes, GERACOES_RESERVAS)
+        registrar_medida("arquivo_reservas_bytes", sum(len(parte) for parte in partes))
+        return True
+    except (struct.error, IOError) as erro:
+        print(f"Erro ao salvar reservas: {erro}")
+        return False
+
+
+def salvar_arquivo_reservas(reservas):
+    """
+    Salva a lista de reservas no arquivo do backend em uso (pickle ou
+    binário).
+    
+    Args:
+        reservas (iterable): Reservas (Reserva)
+        
+    Returns:
+        bool: True se salvou com sucesso, False caso contrário
+    """
+    if usando_binario():
+        return salvar_reservas_binario(reservas)
+    return salvar_reservas_pickle(reservas)
+
+
+def registrar_operacao(reservas, operacao, reserva):
+    """
+    Persiste uma alteração já aplicada à lista de reservas.
+    
+    Args:
+        reservas (list): Lista de reservas já atualizada
+        operacao (str): "criar" ou "cancelar"
+        reserva (Reserva): Reserva criada ou cancelada
+        
+    Returns:
+        bool: True se persistiu com sucesso, False caso contrário
+    """
+    return registrar_operacoes(reservas, [(operacao, reserva)])
+
+
+@instrumentar
+def registrar_operacoes(reservas, operacoes):
+    """
+    Persiste um lote de alterações já aplicadas à lista de reservas com uma
+    única gravação.
+    No SQLite, as linhas são inseridas ou removidas em uma transação; no
+    pickle ou binário com o journal ativo, as operações são anexadas ao
+    journal com um único fsync; caso contrário, a lista inteira é regravada. A gravação é
+    feita sob a trava dos dados e avança o carimbo de versão.
+    
+    Args:
+        reservas (list): Lista de reservas já atualizada
+        operacoes (list): Operações (operacao, reserva), com operacao
+            "criar" ou "cancelar"
+            
+    Returns:
+        bool: True se persistiu com sucesso, False caso contrário
+    """
+    with travar_dados():
+        if usando_sqlite():
+            import sqlite3
+            try:
+                gravar_operacoes_sqlite(operacoes)
+                gravado = True
+            except sqlite3.Error as erro:
+                print(f"Erro ao gravar no banco: {erro}")
+                gravado = False
+        elif USAR_JOURNAL:
+            gravado = anexar_ao_journal(operacoes)
+        else:
+            gravado = salvar_arquivo_reservas(reservas)
+        
+        if gravado:
+            avancar_versao()
+        return gravado
+
+
+@instrumentar
+def anexar_ao_journal(operacoes):
+    """
+    Anexa operações ao journal, com uma única escrita seguida de fsync.
+    Os registros são entradas binárias no backend binário e objetos pickle
+    no backend pickle.
+    
+    Args:
+        operacoes (list): Operações (operacao, reserva), com operacao
+            "criar" ou "cancelar"
+            
+    Returns:
+        bool: True se gravou com sucesso, False caso contrário
+    """
+    garantir_diretorio_existe()
+    
+    try:
+        if usando_binario():
+            registros = b"".join(codificar_operacao(operacao, reserva) for operacao, reserva in operacoes)
+        else:
+            registros = b"".join(pickle.dumps(operacao) for operacao in operacoes)
+        with open(obter_caminho_journal(), "ab") as journal:
+            journal.write(registros)
+            journal.flush()
+            os.fsync(journal.fileno())
+            registrar_medida("journal_bytes", journal.tell())
+        return True
+    except (pickle.PickleError, struct.error, IOError) as erro:
+        print(f"Erro ao gravar no journal: {erro}")
+        return False
+
+
+def ler_journal():
+    """
+    Lê as operações gravadas no journal, na ordem em que ocorreram.
+    Um registro final incompleto (gravação interrompida) é descartado.
+    
+    Yields:
+        tuple: (operacao, reserva)
+    """
+    caminho = obter_caminho_journal()
+    if not os.path.exists(caminho):
+        return
+    
+    with open(caminho, "rb") as journal:
+        posicao = 0
+        for operacao, reserva, posicao in ler_registros_journal(journal):
+            yield operacao, reserva
+        
+        if posicao < os.fstat(journal.fileno()).st_size:
+            print("Registro incompleto no journal descartado.")
+
+
+def ler_registros_journal(journal):
+    """
+    Lê os registros de um journal aberto, a partir da posição atual, no
+    formato do backend em uso.
+    
+    Args:
+        journal (file): Journal aberto em modo binário
+        
+    Yields:
+        tuple: (operacao, reserva, posicao) — posicao é o fim do registro
+    """
+    if usando_binario():
+        yield from ler_operacoes(journal)
+    else:
+        yield from ler_registros_pickle(journal)
+
+
+def ler_registros_pickle(journal):
+    """
+    Lê os registros de um journal em pickle a partir da posição atual,
+    parando no fim do arquivo ou em um registro incompleto.
+    
+    Args:
+        journal (file): Journal aberto em modo binário
+        
+    Yields:
+        tuple: (operacao, reserva, posicao) — posicao é o fim do registro
+    """
+    while True:
+        try:
+            operacao, reserva = pickle.load(journal)
+        except (EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            return
+        yield operacao, como_registro(reserva), journal.tell()
+
+
+def ler_journal_desde(posicao):
+    """
+    Lê as operações anexadas ao journal a partir de uma posição, para
+    incorporar alterações de outros processos sem reler o arquivo inteiro.
+    
+    Args:
+        posicao (int): Posição (em bytes) até onde o journal já foi lido
+        
+    Returns:
+        tuple: (operacoes, posicao) — operações lidas e a posição logo
+            após o último registro completo
+    """
+    operacoes = []
+    caminho = obter_caminho_journal()
+    if not os.path.exists(caminho):
+        return operacoes, 0
+    
+    with open(caminho, "rb") as journal:
+        journal.seek(posicao)
+        for operacao, reserva, posicao in ler_registros_journal(journal):
+            operacoes.append((operacao, reserva))
+    
+    return operacoes, posicao
+
+
+def tamanho_journal():
+    """
+    Retorna o tamanho atual do journal, em bytes.
+    
+    Returns:
+        int: Tamanho do journal (0 se não existir)
+    """
+    try:
+        return os.path.getsize(obter_caminho_journal())
+    except OSError:
+        return 0
+
+
+def aplicar_operacoes(reservas, operacoes):
+    """
+    Reaplica operações do journal sobre a lista de reservas.
+    A aplicação é idempotente: repetir uma operação já incorporada ao
+    arquivo de reservas não altera o resultado.
+    
+    Args:
+        reservas (list): Reservas do último arquivo salvo
+        operacoes (iterable): Operações (operacao, reserva) do journal
+        
+    Returns:
+        list: Lista de reservas atualizada
+    """
+    reservas_por_codigo = {reserva.hash: reserva for reserva in reservas}
+    
+    for operacao, reserva in operacoes:
+        if operacao == "criar":
+            reservas_por_codigo[reserva.hash] = reserva
+        elif operacao == "cancelar":
+            reservas_por_codigo.pop(reserva.hash, None)
+    
+    return list(reservas_por_codigo.values())
+
+
+@instrumentar
+def compactar_journal(reservas):
+    """
+    Incorpora o journal ao arquivo de reservas: grava a lista completa e
+    esvazia o journal; o journal de quartos é compactado junto (ver
+    compactar_alocacao). No SQLite só há o journal de quartos a compactar.
+    Com vários processos, a lista deve estar sincronizada sob a trava dos
+    dados (ver concorrencia.encerrar_cadastro).
+    
+    Args:
+        reservas (list): Lista completa e atualizada de reservas
+        
+    Returns:
+        bool: True se compactou com sucesso, False caso contrário
+    """
+    with travar_dados():
+        if usando_sqlite():
+            return compactar_alocacao(reservas)
+        
+        if not salvar_arquivo_reservas(reservas):
+            return False
+        compactar_alocacao(reservas)
+        
+        try:
+            with open(obter_caminho_journal(), "wb"):
+                pass
+        except IOError as erro:
+            print(f"Erro ao compactar o journal: {erro}")
+            return False
+        
+        avancar_versao(compactou=True)
+        return True
+
+
+def migrar_pickle_para_sqlite():
+    """
+    Copia as reservas do arquivo pickle (incluindo o journal pendente) para
+    o banco SQLite.
+    
+    Returns:
+        int: Quantidade de reservas migradas
+    """
+    reservas = carregar_reservas_pickle()
+    salvar_reservas_sqlite(reservas)
+    return len(reservas)
+
+
+def migrar_pickle_para_binario():
+    """
+    Converte o arquivo pickle (incluindo o journal em pickle pendente) para
+    o formato binário. Os arquivos pickle são mantidos como estão.
+    
+    Returns:
+        bool: True se converteu com sucesso, False caso contrário
+    """
+    reservas = carregar_geracoes(obter_caminho_arquivo(), ler_arquivo_pickle, restaurar=False)
+    if reservas is None:
+        print("Erro ao converter reservas para o formato binário: arquivo pickle não encontrado.")
+        return False
+    
+    caminho_journal = os.path.join(DIRETORIO_DADOS, ARQUIVO_JOURNAL)
+    if os.path.exists(caminho_journal):
+        with open(caminho_journal, "rb") as journal:
+            operacoes = [(operacao, reserva) for operacao, reserva, _ in ler_registros_pickle(journal)]
+        reservas = aplicar_operacoes(reservas, operacoes)
+    
+    return salvar_reservas_binario(reservas)
+
+
+def buscar_reservas_sobrepostas(reservas, tipo_quarto, data_checkin, data_checkout):
+    """
+    Busca as reservas de um tipo de quarto que se sobrepõem ao período, no
+    banco (SQLite) ou na lista em memória.
+    
+    Args:
+        reservas (list): Lista de reservas em memória
+        tipo_quarto (str): Tipo do quarto
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
+        
+    Returns:
+        list: Reservas sobrepostas ao período
+    """
+    if usando_sqlite():
+        return buscar_sobrepostas_sqlite(tipo_quarto, data_checkin, data_checkout)
+    return [
+        reserva for reserva in reservas
+        if reserva.tipo_quarto == tipo_quarto
+        and data_checkin < reserva.checkout and data_checkout > reserva.checkin
+    ]
+
+
+def gravar_json(caminho, conteudo):
+    """
+    Grava um arquivo auxiliar (resumos, estatísticas, alocação) em JSON, de
+    forma atômica e com o rodapé de CRC do arquivo de reservas.
+    
+    Args:
+        caminho (str): Arquivo de destino
+        conteudo: Valor serializável em JSON
+    """
+    dados = json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    gravar_atomicamente(caminho, [dados, montar_rodape([dados])])
+
+
+def ler_json(caminho):
+    """
+    Lê um arquivo auxiliar gravado por gravar_json, conferindo o CRC.
+    
+    Args:
+        caminho (str): Arquivo
+        
+    Returns:
+        Valor lido
+        
+    Raises:
+        OSError: Se o arquivo não puder ser lido
+        ValueError: Se o CRC não conferir ou o JSON for inválido
+    """
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    
+    if not conferir_rodape(conteudo):
+        raise ValueError("rodapé ausente ou CRC não confere")
+    return json.loads(conteudo[:-RODAPE.size].decode("utf-8"))
+
+
+def codificar_reserva(reserva):
+    """
+    Converte uma reserva para JSON (lista dos campos, com as datas no
+    formato ISO).
+    
+    Args:
+        reserva (Reserva): Reserva ou None
+        
+    Returns:
+        list: Campos na ordem de registro.CAMPOS, ou None
+    """
+    if reserva is None:
+        return None
+    campos = list(valores(reserva))
+    campos[2] = reserva.checkin.isoformat()
+    campos[3] = reserva.checkout.isoformat()
+    return campos
+
+
+def decodificar_reserva(campos):
+    """
+    Reconstrói uma reserva convertida por codificar_reserva.
+    
+    Args:
+        campos (list): Campos da reserva ou None
+        
+    Returns:
+        Reserva: Reserva ou None
+    """
+    if campos is None:
+        return None
+    codigo, nome, checkin, checkout, tipo_quarto, quantidade_quartos, valor = campos
+    return Reserva(codigo, nome, date.fromisoformat(checkin), date.fromisoformat(checkout),
+                   tipo_quarto, quantidade_quartos, valor)
+
+
+def codificar_estatisticas(estatisticas):
+    """
+    Converte as estatísticas gerais (ver calculo.calcular_estatisticas)
+    para JSON.
+    
+    Args:
+        estatisticas (dict): Estatísticas ou None
+        
+    Returns:
+        dict: Estatísticas com as reservas convertidas, ou None
+    """
+    if estatisticas is None:
+        return None
+    return dict(
+        estatisticas,
+        reserva_mais_cara=codificar_reserva(estatisticas['reserva_mais_cara']),
+        reserva_mais_longa=codificar_reserva(estatisticas['reserva_mais_longa'])
+    )
+
+
+def decodificar_estatisticas(estatisticas):
+    """
+    Reconstrói as estatísticas convertidas por codificar_estatisticas.
+    
+    Args:
+        estatisticas (dict): Estatísticas lidas ou None
+        
+    Returns:
+        dict: Estatísticas ou None
+    """
+    if estatisticas is None:
+        return None
+    return dict(
+        estatisticas,
+        reserva_mais_cara=decodificar_reserva(estatisticas['reserva_mais_cara']),
+        reserva_mais_longa=decodificar_reserva(estatisticas['reserva_mais_longa'])
+    )
+
+
+def obter_caminho_estatisticas():
+    """
+    Retorna o caminho completo do arquivo do acumulador de estatísticas.
+    
+    Returns:
+        str: Caminho completo do arquivo
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_ESTATISTICAS)
+
+
+def carregar_estatisticas():
+    """
+    Carrega o acumulador de estatísticas salvo junto com os dados. Os
+    códigos voltam a ser chaves inteiras e as entradas dos heaps, tuplas.
+    
+    Returns:
+        dict: Acumulador salvo ou None se não existir ou estiver ilegível
+    """
+    caminho = obter_caminho_estatisticas()
+    
+    if not os.path.exists(caminho):
+        return None
+    
+    try:
+        acumulador = ler_json(caminho)
+        acumulador['heap_valor'] = [tuple(entrada) for entrada in acumulador['heap_valor']]
+        acumulador['heap_dias'] = [tuple(entrada) for entrada in acumulador['heap_dias']]
+        acumulador['sequencias'] = dict(acumulador['sequencias'])
+        return acumulador
+    except ERROS_JSON as erro:
+        print(f"Erro ao carregar estatísticas: {erro}")
+        return None
+
+
+def salvar_estatisticas(acumulador):
+    """
+    Salva o acumulador de estatísticas junto com os dados.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        
+    Returns:
+        bool: True se salvou com sucesso, False caso contrário
+    """
+    garantir_diretorio_existe()
+    
+    try:
+        # Os códigos são inteiros: o mapa de sequências vai como pares
+        gravar_json(obter_caminho_estatisticas(), dict(acumulador, sequencias=list(acumulador['sequencias'].items())))
+        return True
+    except (TypeError, ValueError, IOError) as erro:
+        print(f"Erro ao salvar estatísticas: {erro}")
+        return False
+
+
+def obter_caminho_resumo_estatisticas():
+    """
+    Retorna o caminho completo do resumo das estatísticas.
+    
+    Returns:
+        str: Caminho completo do arquivo
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_RESUMO_ESTATISTICAS)
+
+
+def carregar_resumo_estatisticas():
+    """
+    Carrega o resumo das estatísticas, se ele foi gravado para a versão
+    atual dos dados (o carimbo avança a cada gravação). Deve ser chamada
+    com a trava dos dados adquirida.
+    
+    Returns:
+        dict: Resumo ({'reservas': estatisticas, 'com_arquivo':
+            estatisticas}) ou None se não existir ou estiver desatualizado
+    """
+    try:
+        resumo = ler_json(obter_caminho_resumo_estatisticas())
+        if resumo.get('versao') != ler_versao():
+            return None
+        return {
+            'reservas': decodificar_estatisticas(resumo['reservas']),
+            'com_arquivo': decodificar_estatisticas(resumo['com_arquivo']),
+            'versao': resumo['versao']
+        }
+    except ERROS_JSON:
+        return None
+
+
+def salvar_resumo_estatisticas(resumo):
+    """
+    Salva o resumo das estatísticas com o carimbo da versão atual dos
+    dados. Deve ser chamada com a trava dos dados adquirida e com o resumo
+    calculado sobre essa versão.
+    
+    Args:
+        resumo (dict): Resumo ({'reservas': estatisticas, 'com_arquivo':
+            estatisticas})
+        
+    Returns:
+        bool: True se salvou com sucesso, False caso contrário
+    """
+    garantir_diretorio_existe()
+    
+    try:
+        gravar_json(obter_caminho_resumo_estatisticas(), {
+            'reservas': codificar_estatisticas(resumo['reservas']),
+            'com_arquivo': codificar_estatisticas(resumo['com_arquivo']),
+            'versao': ler_versao()
+        })
+        return True
+    except (TypeError, ValueError, IOError) as erro:
+        print(f"Erro ao salvar o resumo das estatísticas: {erro}")
+        return False
+
+
+def obter_caminho_alocacao():
+    """
+    Retorna o caminho completo do mapa de quartos atribuídos.
+    
+    Returns:
+        str: Caminho completo do arquivo
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_ALOCACAO)
+
+
+def obter_caminho_journal_alocacao():
+    """
+    Retorna o caminho completo do journal de quartos atribuídos.
+    
+    Returns:
+        str: Caminho completo do arquivo
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_JOURNAL_ALOCACAO)
+
+
+def ler_journal_alocacao(posicao=0):
+    """
+    Lê as atribuições anexadas ao journal de quartos a partir de uma
+    posição. Cada gravação é uma linha JSON com os pares [codigo, números]
+    alterados (números nulos para reservas que liberaram os quartos); uma
+    linha final incompleta (gravação interrompida) é ignorada.
+    
+    Args:
+        posicao (int): Posição (em bytes) até onde o journal já foi lido
+        
+    Returns:
+        tuple: (entradas, posicao) — pares (codigo, números ou None), na
+            ordem gravada, e a posição logo após a última linha completa
+    """
+    entradas = []
+    caminho = obter_caminho_journal_alocacao()
+    if not os.path.exists(caminho):
+        return entradas, 0
+    
+    with open(caminho, "rb") as journal:
+        journal.seek(posicao)
+        for linha in journal:
+            if not linha.endswith(b"\n"):
+                break
+            try:
+                pares = json.loads(linha)
+                entradas.extend((codigo, None if numeros is None else tuple(numeros)) for codigo, numeros in pares)
+            except ERROS_JSON:
+                break
+            posicao += len(linha)
+    
+    return entradas, posicao
+
+
+def tamanho_journal_alocacao():
+    """
+    Retorna o tamanho atual do journal de quartos, em bytes.
+    
+    Returns:
+        int: Tamanho do journal (0 se não existir)
+    """
+    try:
+        return os.path.getsize(obter_caminho_journal_alocacao())
+    except OSError:
+        return 0
+
+
+def anexar_alocacao(entradas):
+    """
+    Anexa ao journal de quartos as atribuições alteradas por uma gravação,
+    em uma única linha seguida de fsync. Deve ser chamada com a trava dos
+    dados adquirida.
+    
+    Args:
+        entradas (list): Pares (codigo, números ou None)
+        
+    Returns:
+        bool: True se gravou com sucesso, False caso contrário
+    """
+    garantir_diretorio_existe()
+    
+    try:
+        linha = json.dumps([[codigo, numeros] for codigo, numeros in entradas], separators=(",", ":"))
+        with open(obter_caminho_journal_alocacao(), "ab") as journal:
+            journal.write(linha.encode("utf-8") + b"\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        return True
+    except (TypeError, ValueError, IOError) as erro:
+        print(f"Erro ao gravar a alocação de quartos: {erro}")
+        return False
+
+
+def carregar_alocacao():
+    """
+    Carrega os quartos atribuídos às reservas (ver alocacao.py): o último
+    mapa compactado com as alterações do journal de quartos aplicadas.
+    
+    Returns:
+        dict: {codigo: (números dos quartos)} ou None se não houver mapa
+            nem journal
+    """
+    caminho = obter_caminho_alocacao()
+    atribuicoes = None
+    
+    if os.path.exists(caminho):
+        try:
+            atribuicoes = {codigo: tuple(numeros) for codigo, numeros in ler_json(caminho)}
+        except ERROS_JSON as erro:
+            print(f"Erro ao carregar a alocação de quartos: {erro}")
+    
+    entradas, _ = ler_journal_alocacao()
+    if entradas:
+        atribuicoes = atribuicoes or {}
+        for codigo, numeros in entradas:
+            if numeros is None:
+                atribuicoes.pop(codigo, None)
+            else:
+                atribuicoes[codigo] = numeros
+    
+    return atribuicoes
+
+
+def compactar_alocacao(reservas):
+    """
+    Incorpora o journal de quartos ao mapa compactado, mantendo só as
+    reservas informadas, e esvazia o journal. Deve ser chamada com a trava
+    dos dados adquirida, junto com a compactação do journal de reservas
+    (as posições lidas do journal de quartos deixam de valer).
+    
+    Args:
+        reservas (iterable): Reservas atuais
+        
+    Returns:
+        bool: True se compactou com sucesso, False caso contrário
+    """
+    if not os.path.exists(obter_caminho_journal_alocacao()):
+        return True
+    
+    atribuicoes = carregar_alocacao() or {}
+    codigos = {reserva.hash for reserva in reservas}
+    
+    try:
+        gravar_json(obter_caminho_alocacao(), [
+            [codigo, numeros] for codigo, numeros in atribuicoes.items() if codigo in codigos
+        ])
+        os.remove(obter_caminho_journal_alocacao())
+        return True
+    except (TypeError, ValueError, IOError) as erro:
+        print(f"Erro ao compactar a alocação de quartos: {erro}")
+        return False
@@ -0,0 +1,96 @@
+"""
+Benchmark da alocação de quartos.
+Mede a vazão da atribuição de quartos (melhor ajuste, com redistribuição
+quando a reserva não cabe nas lacunas), a montagem a partir das atribuições
+salvas e a fragmentação resultante, para o inventário de config.py
+multiplicado por 1, 10 e 100. As reservas respeitam a disponibilidade por
+tipo, como no sistema.
+
+Uso:
+    python benchmarks/benchmark_alocacao.py [escala ...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS
+from ocupacao import criar_indice_ocupacao, registrar_ocupacao, pico_ocupacao
+from registro import Reserva
+from alocacao import criar_alocacao, alocar_reserva, calcular_fragmentacao
+
+ESCALAS_PADRAO = (1, 10, 100)
+HORIZONTE_DIAS = 365
+# Pedidos por quarto do inventário: o bastante para lotar o hotel
+PEDIDOS_POR_QUARTO = 60
+
+
+def gerar_reservas(quantidades, semente=42):
+    """
+    Gera pedidos aleatórios e aceita os que cabem no inventário por tipo.
+    
+    Args:
+        quantidades (dict): Quartos por tipo
+        semente (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Reservas aceitas, na ordem dos pedidos
+    """
+    gerador = random.Random(semente)
+    hoje = date.today()
+    ocupacao = criar_indice_ocupacao()
+    reservas = []
+    
+    for numero in range(sum(quantidades.values()) * PEDIDOS_POR_QUARTO):
+        checkin = hoje + timedelta(days=gerador.randrange(HORIZONTE_DIAS))
+        checkout = checkin + timedelta(days=gerador.randint(1, 7))
+        tipo = gerador.choice(TIPOS_QUARTOS)
+        reserva = Reserva(numero, f"Hospede {numero}", checkin, checkout, tipo, gerador.randint(1, 2), 0.0)
+        
+        if pico_ocupacao(ocupacao, tipo, checkin, checkout) + reserva.quantidade_quartos <= quantidades[tipo]:
+            registrar_ocupacao(ocupacao, reserva)
+            reservas.append(reserva)
+    
+    return reservas
+
+
+def executar_benchmark(escalas):
+    """
+    Executa o benchmark para cada escala do inventário.
+    """
+    print(f"{'quartos':>8} | {'reservas':>9} | {'alocações/s':>12} | {'realocadas':>10} | "
+          f"{'montagem salva (s)':>18} | {'fragmentação':>12}")
+    print("-" * 86)
+    
+    for escala in escalas:
+        quantidades = {tipo: QUARTOS_QUANTIDADE[tipo] * escala for tipo in TIPOS_QUARTOS}
+        reservas = gerar_reservas(quantidades)
+        
+        alocacao = criar_alocacao(quantidades=quantidades)
+        inicio = time.perf_counter()
+        for reserva in reservas:
+            alocar_reserva(alocacao, reserva)
+        por_segundo = len(reservas) / (time.perf_counter() - inicio)
+        
+        sem_quarto = sum(1 for numeros in alocacao['atribuicoes'].values() if not numeros)
+        assert sem_quarto == 0, f"{sem_quarto} reserva(s) sem quarto"
+        
+        inicio = time.perf_counter()
+        criar_alocacao(reservas, alocacao['atribuicoes'], quantidades)
+        tempo_montagem = time.perf_counter() - inicio
+        
+        metricas = calcular_fragmentacao(alocacao, dias=HORIZONTE_DIAS).values()
+        livres = sum(tipo['noites_livres'] for tipo in metricas)
+        fragmentacao = sum(tipo['fragmentacao'] * tipo['noites_livres'] for tipo in metricas) / livres if livres else 0.0
+        
+        print(f"{sum(quantidades.values()):>8} | {len(reservas):>9} | {por_segundo:>12,.0f} | "
+              f"{alocacao['realocacoes']:>10} | {tempo_montagem:>18.3f} | {fragmentacao:>12.1%}")
+
+
+if __name__ == "__main__":
+    escalas = [int(argumento) for argumento in sys.argv[1:]] or ESCALAS_PADRAO
+    executar_benchmark(escalas)
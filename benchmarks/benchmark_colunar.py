@@ -0,0 +1,63 @@
+"""
+Benchmark da representação colunar.
+Compara calcular_estatisticas e a ocupação diária de um ano sobre a lista
+de dicionários com as versões vetorizadas de colunar.py.
+
+Uso:
+    python benchmarks/benchmark_colunar.py [tamanho ...]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TIPOS_QUARTOS
+from calculo import calcular_estatisticas
+from ocupacao import criar_indice_ocupacao
+from colunar import converter_para_colunas, calcular_estatisticas_colunar, calcular_ocupacao_diaria
+from benchmark_disponibilidade import gerar_reservas, DATA_BASE
+
+TAMANHOS_PADRAO = (100_000, 1_000_000)
+
+
+def cronometrar(funcao):
+    """
+    Executa a função e retorna o tempo gasto, em segundos.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def executar_benchmark(tamanhos):
+    """
+    Executa o benchmark para cada tamanho de livro informado.
+    """
+    fim = DATA_BASE + timedelta(days=365)
+    print(f"{'reservas':>10} | {'conversão (s)':>13} | {'estat. dict (s)':>15} | {'estat. col (s)':>14} | "
+          f"{'ocup. dict (s)':>14} | {'ocup. col (s)':>13}")
+    print("-" * 96)
+    
+    for tamanho in tamanhos:
+        reservas = gerar_reservas(tamanho)
+        colunas = {}
+        
+        tempo_conversao = cronometrar(lambda: colunas.update(converter_para_colunas(reservas)))
+        tempo_estat_dict = cronometrar(lambda: calcular_estatisticas(reservas))
+        tempo_estat_col = cronometrar(lambda: calcular_estatisticas_colunar(colunas))
+        tempo_ocup_dict = cronometrar(lambda: criar_indice_ocupacao(reservas))
+        tempo_ocup_col = cronometrar(
+            lambda: [calcular_ocupacao_diaria(colunas, tipo, DATA_BASE, fim) for tipo in TIPOS_QUARTOS]
+        )
+        
+        print(f"{tamanho:>10} | {tempo_conversao:>13.2f} | {tempo_estat_dict:>15.3f} | {tempo_estat_col:>14.3f} | "
+              f"{tempo_ocup_dict:>14.3f} | {tempo_ocup_col:>13.3f}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar_benchmark(tamanhos)
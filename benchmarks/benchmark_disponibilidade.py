@@ -0,0 +1,127 @@
+"""
+Benchmark da verificação de disponibilidade.
+Compara a varredura completa da lista de reservas (algoritmo original) com a
+consulta ao índice de ocupação diária para livros de 10 mil, 100 mil e
+1 milhão de reservas.
+
+Uso:
+    python benchmarks/benchmark_disponibilidade.py [tamanho ...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS
+from calculo import verificar_disponibilidade
+from ocupacao import criar_indice_ocupacao
+from registro import Reserva
+
+TAMANHOS_PADRAO = (10_000, 100_000, 1_000_000)
+CONSULTAS = 20
+DATA_BASE = date(2025, 1, 1)
+HORIZONTE_DIAS = 730
+
+
+def gerar_reservas(quantidade, semente=42):
+    """
+    Gera um livro sintético de reservas.
+    
+    Args:
+        quantidade (int): Número de reservas a gerar
+        semente (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Lista de reservas sintéticas
+    """
+    gerador = random.Random(semente)
+    reservas = []
+    
+    for numero in range(quantidade):
+        checkin = DATA_BASE + timedelta(days=gerador.randrange(HORIZONTE_DIAS))
+        checkout = checkin + timedelta(days=gerador.randint(1, 7))
+        reservas.append(Reserva(
+            numero,
+            f"Hospede {numero}",
+            checkin,
+            checkout,
+            gerador.choice(TIPOS_QUARTOS),
+            gerador.randint(1, 2),
+            0.0
+        ))
+    
+    return reservas
+
+
+def verificar_disponibilidade_varredura(reservas, tipo_quarto, data_checkin, data_checkout, quantidade_solicitada):
+    """
+    Algoritmo original: soma todas as reservas sobrepostas ao período.
+    """
+    quartos_ocupados = 0
+    
+    for reserva in reservas:
+        if reserva['tipo_quarto'] == tipo_quarto:
+            if data_checkin < reserva['checkout'] and data_checkout > reserva['checkin']:
+                quartos_ocupados += reserva['quantidade_quartos']
+    
+    return QUARTOS_QUANTIDADE[tipo_quarto] - quartos_ocupados >= quantidade_solicitada
+
+
+def gerar_consultas(quantidade, semente=7):
+    """
+    Gera os períodos consultados em cada rodada do benchmark.
+    """
+    gerador = random.Random(semente)
+    consultas = []
+    
+    for _ in range(quantidade):
+        checkin = DATA_BASE + timedelta(days=gerador.randrange(HORIZONTE_DIAS))
+        consultas.append((gerador.choice(TIPOS_QUARTOS), checkin, checkin + timedelta(days=3), 1))
+    
+    return consultas
+
+
+def medir(funcao, consultas):
+    """
+    Retorna o tempo médio, em milissegundos, de cada chamada da função.
+    """
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        funcao(*consulta)
+    return (time.perf_counter() - inicio) * 1000 / len(consultas)
+
+
+def executar_benchmark(tamanhos):
+    """
+    Executa o benchmark para cada tamanho de livro informado.
+    """
+    consultas = gerar_consultas(CONSULTAS)
+    print(f"{'reservas':>10} | {'varredura (ms)':>15} | {'índice (ms)':>12} | {'montagem índice (s)':>20}")
+    print("-" * 66)
+    
+    for tamanho in tamanhos:
+        reservas = gerar_reservas(tamanho)
+        
+        inicio = time.perf_counter()
+        indice = criar_indice_ocupacao(reservas)
+        tempo_montagem = time.perf_counter() - inicio
+        
+        tempo_varredura = medir(
+            lambda *consulta: verificar_disponibilidade_varredura(reservas, *consulta),
+            consultas
+        )
+        tempo_indice = medir(
+            lambda *consulta: verificar_disponibilidade(reservas, *consulta, indice_ocupacao=indice),
+            consultas
+        )
+        
+        print(f"{tamanho:>10} | {tempo_varredura:>15.3f} | {tempo_indice:>12.4f} | {tempo_montagem:>20.2f}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar_benchmark(tamanhos)
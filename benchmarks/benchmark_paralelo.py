@@ -0,0 +1,99 @@
+"""
+Benchmark de escalabilidade das tarefas paralelas (paralelo.py).
+Grava um livro sintético no formato binário e executa estatísticas,
+conferência de integridade e conferência de preços com 1, 2, 4 e 8
+processos, conferindo que os resultados não dependem da quantidade de
+processos. O resultado é um JSON com o tempo e a aceleração de cada
+execução.
+
+Uso:
+    python benchmarks/benchmark_paralelo.py [--reservas N] [--workers 1 2 4 8] [--saida arquivo.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formato_binario import salvar_binario
+from paralelo import TAREFAS, executar_tarefas
+from benchmark_disponibilidade import gerar_reservas
+
+
+def resumir(resultados):
+    """
+    Extrai dos resultados os valores que devem coincidir entre execuções.
+    As somas em ponto flutuante são arredondadas, pois dependem da ordem em
+    que as fatias são somadas.
+    """
+    estatisticas = resultados['estatisticas']
+    precos = resultados['precos']
+    return (
+        estatisticas['quantidade_reservas'],
+        round(estatisticas['soma_total_valores'], 2),
+        estatisticas['reserva_mais_cara'],
+        estatisticas['reserva_mais_longa'],
+        estatisticas['quartos_reservados'],
+        resultados['integridade'],
+        precos['divergentes'],
+        round(precos['valor_recalculado'], 2)
+    )
+
+
+def executar_benchmark(quantidade, lista_workers):
+    """
+    Executa as tarefas com cada quantidade de processos informada.
+    
+    Args:
+        quantidade (int): Reservas no livro sintético
+        lista_workers (list): Quantidades de processos a medir
+        
+    Returns:
+        dict: Resultado do benchmark
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        instantaneo = os.path.join(diretorio, "reservas.bin")
+        salvar_binario(instantaneo, gerar_reservas(quantidade))
+        
+        medicoes = []
+        referencia = None
+        for workers in lista_workers:
+            inicio = time.perf_counter()
+            resultados = executar_tarefas(TAREFAS, instantaneo, workers=workers)
+            tempo = time.perf_counter() - inicio
+            
+            if referencia is None:
+                referencia = (tempo, resumir(resultados))
+            elif resumir(resultados) != referencia[1]:
+                raise AssertionError(f"Resultados divergentes com {workers} processo(s).")
+            
+            medicoes.append({
+                'workers': workers,
+                'segundos': tempo,
+                'aceleracao': referencia[0] / tempo
+            })
+            print(f"{workers:>3} processo(s): {tempo:8.3f} s  aceleração {referencia[0] / tempo:5.2f}x")
+    
+    return {'reservas': quantidade, 'nucleos': os.cpu_count(), 'medicoes': medicoes}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a escalabilidade das tarefas paralelas.")
+    parser.add_argument("--reservas", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--saida", help="Grava o resultado em JSON neste arquivo")
+    opcoes = parser.parse_args()
+    
+    resultado = executar_benchmark(opcoes.reservas, opcoes.workers)
+    texto = json.dumps(resultado, indent=2)
+    
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as saida:
+            saida.write(texto + "\n")
+    else:
+        print(texto)
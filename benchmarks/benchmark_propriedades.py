@@ -0,0 +1,96 @@
+"""
+Benchmark da rede de propriedades (propriedades.py).
+Cria redes de 1, 8 e 32 propriedades, cada uma com o próprio livro de
+reservas, e mede a busca de hóspede em uma única propriedade e na rede
+inteira. A consulta a uma propriedade só abre o shard dela, e o seu tempo
+não deve crescer com o tamanho da rede; a consulta à rede é distribuída
+entre os processos.
+
+Uso:
+    python benchmarks/benchmark_propriedades.py [--reservas N] [--redes 1 8 32] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import QUARTOS_QUANTIDADE, QUARTOS_VALOR
+from propriedades import criar_propriedade, executar_nas_propriedades, buscar_na_propriedade, buscar_hospede
+
+REPETICOES = 5
+
+
+def popular_propriedade(quantidade):
+    """
+    Grava um livro sintético nos dados da propriedade do processo.
+    
+    Args:
+        quantidade (int): Reservas no livro
+        
+    Returns:
+        bool: True se gravou com sucesso
+    """
+    from arquivo import salvar_reservas
+    from benchmark_disponibilidade import gerar_reservas
+    
+    return salvar_reservas(gerar_reservas(quantidade))
+
+
+def executar_benchmark(quantidade, redes, workers):
+    """
+    Mede as buscas para cada tamanho de rede, em um diretório temporário.
+    
+    Args:
+        quantidade (int): Reservas por propriedade
+        redes (list): Quantidades de propriedades, em ordem crescente
+        workers (int): Processos simultâneos na consulta à rede
+    """
+    nome = f"Hospede {quantidade - 1}"
+    diretorio_original = os.getcwd()
+    
+    print(f"{'propriedades':>12} | {'uma propriedade (ms)':>20} | {'rede inteira (s)':>16} | {'encontradas':>11}")
+    print("-" * 70)
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            criadas = []
+            for tamanho in redes:
+                novas = [f"hotel-{numero:03d}" for numero in range(len(criadas), tamanho - 1)]
+                for propriedade in novas:
+                    criar_propriedade(propriedade, propriedade, QUARTOS_QUANTIDADE, QUARTOS_VALOR)
+                _, erros = executar_nas_propriedades(popular_propriedade, (quantidade,), novas, workers)
+                if not criadas:
+                    _, outros = executar_nas_propriedades(popular_propriedade, (quantidade,), None, 1)
+                    erros.update(outros)
+                if erros:
+                    raise RuntimeError(f"Falha ao gravar as propriedades: {erros}")
+                criadas += novas
+                
+                inicio = time.perf_counter()
+                for _ in range(REPETICOES):
+                    executar_nas_propriedades(buscar_na_propriedade, (nome,), criadas[-1:] or None, 1)
+                tempo_uma = (time.perf_counter() - inicio) * 1000 / REPETICOES
+                
+                inicio = time.perf_counter()
+                encontradas, erros = buscar_hospede(nome, workers=workers)
+                tempo_rede = time.perf_counter() - inicio
+                assert not erros and len(encontradas) == tamanho, erros
+                
+                print(f"{tamanho:>12} | {tempo_uma:>20.1f} | {tempo_rede:>16.2f} | {len(encontradas):>11}")
+        finally:
+            os.chdir(diretorio_original)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da rede de propriedades.")
+    parser.add_argument("--reservas", type=int, default=20_000, help="Reservas por propriedade")
+    parser.add_argument("--redes", type=int, nargs="+", default=[1, 8, 32], help="Quantidades de propriedades")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processos simultâneos")
+    opcoes = parser.parse_args()
+    executar_benchmark(opcoes.reservas, sorted(opcoes.redes), opcoes.workers)
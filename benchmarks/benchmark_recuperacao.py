@@ -0,0 +1,116 @@
+"""
+Benchmark da gravação segura e da recuperação do arquivo de reservas.
+Para livros de 100 mil e 1 milhão de reservas, no formato binário e em
+pickle, mede a gravação (temporário, fsync, renomeação e rotação das
+gerações), a conferência do CRC, o carregamento conferido e a recuperação
+depois de corromper um byte do arquivo atual (descarte do arquivo,
+carregamento e restauração da geração anterior).
+
+Uso:
+    python benchmarks/benchmark_recuperacao.py [tamanho ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DIRETORIO_DADOS
+from arquivo import (
+    salvar_reservas_binario,
+    salvar_reservas_pickle,
+    carregar_geracoes,
+    ler_arquivo_binario,
+    ler_arquivo_pickle,
+    conferir_rodape
+)
+from benchmark_disponibilidade import gerar_reservas
+
+TAMANHOS_PADRAO = (100_000, 1_000_000)
+
+FORMATOS = {
+    'binario': ("reservas.bin", salvar_reservas_binario, ler_arquivo_binario),
+    'pickle': ("reservas.pkl", salvar_reservas_pickle, ler_arquivo_pickle)
+}
+
+
+def cronometrar(funcao):
+    """
+    Executa a função e retorna o tempo gasto, em segundos, e o resultado.
+    """
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def corromper(caminho):
+    """
+    Inverte um byte no meio do arquivo.
+    """
+    with open(caminho, "r+b") as destino:
+        destino.seek(os.path.getsize(caminho) // 2)
+        byte = destino.read(1)
+        destino.seek(-1, os.SEEK_CUR)
+        destino.write(bytes([byte[0] ^ 0xFF]))
+
+
+def executar_benchmark(tamanhos):
+    """
+    Executa o benchmark para cada tamanho de livro informado.
+    """
+    print(f"{'reservas':>10} | {'formato':>8} | {'gravação (s)':>12} | {'CRC (s)':>8} | "
+          f"{'carga (s)':>9} | {'recuperação (s)':>15}")
+    print("-" * 80)
+    
+    diretorio_original = os.getcwd()
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        # DIRETORIO_DADOS é relativo: os arquivos ficam no temporário
+        os.chdir(diretorio)
+        try:
+            medir_tamanhos(tamanhos)
+        finally:
+            os.chdir(diretorio_original)
+
+
+def medir_tamanhos(tamanhos):
+    """
+    Mede cada formato para cada tamanho de livro, no diretório atual.
+    """
+    for tamanho in tamanhos:
+        reservas = gerar_reservas(tamanho)
+        
+        for formato, (nome, salvar, ler) in FORMATOS.items():
+            caminho = os.path.join(DIRETORIO_DADOS, nome)
+            # Duas gravações: a primeira vira a geração 1
+            salvar(reservas[:-1])
+            tempo_gravacao, _ = cronometrar(lambda: salvar(reservas))
+            
+            with open(caminho, "rb") as origem:
+                conteudo = origem.read()
+            tempo_crc, integro = cronometrar(lambda: conferir_rodape(conteudo))
+            assert integro
+            del conteudo
+            
+            tempo_carga, carregadas = cronometrar(lambda: carregar_geracoes(caminho, ler))
+            assert len(carregadas) == tamanho
+            del carregadas
+            
+            corromper(caminho)
+            with redirect_stdout(StringIO()):
+                tempo_recuperacao, recuperadas = cronometrar(lambda: carregar_geracoes(caminho, ler))
+            assert len(recuperadas) == tamanho - 1
+            del recuperadas
+            
+            print(f"{tamanho:>10} | {formato:>8} | {tempo_gravacao:>12.3f} | {tempo_crc:>8.3f} | "
+                  f"{tempo_carga:>9.3f} | {tempo_recuperacao:>15.3f}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar_benchmark(tamanhos)
@@ -0,0 +1,91 @@
+"""
+Benchmark do arquivo de reservas: pickle x formato binário.
+Mede a gravação, o tamanho do arquivo, a abertura (mmap), a leitura de uma
+única reserva, a decodificação completa e a leitura colunar, além da
+montagem do cadastro em memória a partir das reservas carregadas.
+
+Uso:
+    python benchmarks/benchmark_snapshot.py [tamanho ...]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cadastro import criar_cadastro
+from formato_binario import salvar_binario, abrir_binario, ler_reserva, ler_reservas, ler_colunas, importar_numpy
+from benchmark_disponibilidade import gerar_reservas
+
+TAMANHOS_PADRAO = (100_000, 1_000_000)
+
+
+def cronometrar(funcao):
+    """
+    Executa a função e retorna o tempo gasto, em segundos, e o resultado.
+    """
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def gravar_pickle(caminho, reservas):
+    """
+    Grava as reservas em pickle, como salvar_reservas_pickle.
+    """
+    with open(caminho, "wb") as arquivo:
+        pickle.dump(reservas, arquivo)
+
+
+def ler_pickle(caminho):
+    """
+    Lê as reservas de um arquivo pickle.
+    """
+    with open(caminho, "rb") as arquivo:
+        return pickle.load(arquivo)
+
+
+def executar_benchmark(tamanhos):
+    """
+    Executa o benchmark para cada tamanho de livro informado.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_pickle = os.path.join(diretorio, "reservas.pkl")
+        caminho_binario = os.path.join(diretorio, "reservas.bin")
+        
+        for tamanho in tamanhos:
+            reservas = gerar_reservas(tamanho)
+            
+            tempo_gravar_pickle, _ = cronometrar(lambda: gravar_pickle(caminho_pickle, reservas))
+            tempo_gravar_binario, _ = cronometrar(lambda: salvar_binario(caminho_binario, reservas))
+            tempo_ler_pickle, _ = cronometrar(lambda: ler_pickle(caminho_pickle))
+            
+            tempo_abrir, livro = cronometrar(lambda: abrir_binario(caminho_binario))
+            tempo_uma, _ = cronometrar(lambda: ler_reserva(livro, tamanho // 2))
+            tempo_decodificar, carregadas = cronometrar(lambda: ler_reservas(livro))
+            tempo_colunas = None
+            if importar_numpy() is not None:
+                tempo_colunas, _ = cronometrar(lambda: ler_colunas(livro, incluir_nomes=False))
+            tempo_cadastro, _ = cronometrar(lambda: criar_cadastro(carregadas))
+            livro['mapa'].close()
+            
+            print(f"\n{tamanho} reservas")
+            print(f"  {'':<36} {'pickle':>10} {'binário':>10}")
+            print(f"  {'tamanho do arquivo (MB)':<36} {os.path.getsize(caminho_pickle) / 1e6:>10.1f} "
+                  f"{os.path.getsize(caminho_binario) / 1e6:>10.1f}")
+            print(f"  {'gravação (s)':<36} {tempo_gravar_pickle:>10.3f} {tempo_gravar_binario:>10.3f}")
+            print(f"  {'leitura completa (s)':<36} {tempo_ler_pickle:>10.3f} {tempo_decodificar:>10.3f}")
+            print(f"  {'abertura, mmap (ms)':<36} {'-':>10} {tempo_abrir * 1000:>10.3f}")
+            print(f"  {'uma reserva sob demanda (ms)':<36} {'-':>10} {tempo_uma * 1000:>10.3f}")
+            if tempo_colunas is not None:
+                print(f"  {'colunas numéricas (ms)':<36} {'-':>10} {tempo_colunas * 1000:>10.3f}")
+            print(f"  montagem do cadastro, em qualquer formato (s): {tempo_cadastro:.3f}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar_benchmark(tamanhos)
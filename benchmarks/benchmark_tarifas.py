@@ -0,0 +1,141 @@
+"""
+Benchmark da tarifação por data.
+Compara a cotação noite a noite (cada diária calculada pelas regras) com a
+cotação pela tabela pré-calculada de tarifas.py, e mede a montagem da
+tabela, a atualização depois de uma reserva e a alteração de regras, para
+livros de 10 mil e 100 mil reservas.
+
+Uso:
+    python benchmarks/benchmark_tarifas.py [tamanho ...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TIPOS_QUARTOS, HORIZONTE_TARIFAS
+from ocupacao import criar_indice_ocupacao, registrar_ocupacao
+from registro import Reserva
+from tarifas import calcular_diaria, criar_tabela_tarifas, cotar_estadia, atualizar_tarifas, alterar_regras
+
+TAMANHOS_PADRAO = (10_000, 100_000)
+COTACOES = 20_000
+RODADAS_ATUALIZACAO = 200
+
+
+def gerar_reservas(quantidade, semente=42):
+    """
+    Gera um livro sintético de reservas dentro do horizonte das tarifas.
+    
+    Args:
+        quantidade (int): Número de reservas a gerar
+        semente (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Lista de reservas sintéticas
+    """
+    gerador = random.Random(semente)
+    hoje = date.today()
+    reservas = []
+    
+    for numero in range(quantidade):
+        checkin = hoje + timedelta(days=gerador.randrange(HORIZONTE_TARIFAS - 7))
+        checkout = checkin + timedelta(days=gerador.randint(1, 7))
+        reservas.append(Reserva(
+            numero,
+            f"Hospede {numero}",
+            checkin,
+            checkout,
+            gerador.choice(TIPOS_QUARTOS),
+            gerador.randint(1, 2),
+            0.0
+        ))
+    
+    return reservas
+
+
+def gerar_cotacoes(quantidade, semente=7):
+    """
+    Gera as estadias cotadas em cada rodada do benchmark.
+    """
+    gerador = random.Random(semente)
+    hoje = date.today()
+    cotacoes = []
+    
+    for _ in range(quantidade):
+        checkin = hoje + timedelta(days=gerador.randrange(HORIZONTE_TARIFAS - 14))
+        checkout = checkin + timedelta(days=gerador.randint(1, 14))
+        cotacoes.append((gerador.choice(TIPOS_QUARTOS), checkin, checkout, gerador.randint(1, 2)))
+    
+    return cotacoes
+
+
+def cotar_noite_a_noite(tabela, tipo_quarto, data_checkin, data_checkout, quantidade_quartos):
+    """
+    Cota a estadia calculando cada diária pelas regras, sem a tabela.
+    """
+    ocupados = tabela['ocupacao'].get(tipo_quarto, {})
+    total = sum(
+        calcular_diaria(tabela['regras'], tipo_quarto, dia, ocupados.get(dia, 0))
+        for dia in range(data_checkin.toordinal(), data_checkout.toordinal())
+    )
+    return round(total * quantidade_quartos, 2)
+
+
+def medir(funcao, chamadas):
+    """
+    Retorna a quantidade de chamadas da função por segundo.
+    """
+    inicio = time.perf_counter()
+    for argumentos in chamadas:
+        funcao(*argumentos)
+    return len(chamadas) / (time.perf_counter() - inicio)
+
+
+def executar_benchmark(tamanhos):
+    """
+    Executa o benchmark para cada tamanho de livro informado.
+    """
+    cotacoes = gerar_cotacoes(COTACOES)
+    print(f"{'reservas':>10} | {'noite a noite (/s)':>18} | {'tabela (/s)':>12} | {'montagem (s)':>12} | "
+          f"{'reserva (ms)':>12} | {'regra (ms)':>10}")
+    print("-" * 92)
+    
+    for tamanho in tamanhos:
+        reservas = gerar_reservas(tamanho)
+        ocupacao = criar_indice_ocupacao(reservas)
+        
+        inicio = time.perf_counter()
+        tabela = criar_tabela_tarifas(ocupacao)
+        tempo_montagem = time.perf_counter() - inicio
+        
+        for cotacao in cotacoes[:100]:
+            assert abs(cotar_estadia(tabela, *cotacao) - cotar_noite_a_noite(tabela, *cotacao)) < 0.01
+        
+        por_segundo_noites = medir(lambda *cotacao: cotar_noite_a_noite(tabela, *cotacao), cotacoes[:COTACOES // 10])
+        por_segundo_tabela = medir(lambda *cotacao: cotar_estadia(tabela, *cotacao), cotacoes)
+        
+        # Novas reservas: o índice de ocupação e as noites afetadas
+        novas = gerar_reservas(RODADAS_ATUALIZACAO, semente=99)
+        inicio = time.perf_counter()
+        for reserva in novas:
+            registrar_ocupacao(ocupacao, reserva)
+            atualizar_tarifas(tabela, reserva)
+        tempo_reserva = (time.perf_counter() - inicio) * 1000 / len(novas)
+        
+        # Alteração de regra que afeta só as noites de fim de semana
+        inicio = time.perf_counter()
+        alterar_regras(tabela, fator_fim_de_semana=tabela['regras']['fator_fim_de_semana'] + 0.05)
+        tempo_regra = (time.perf_counter() - inicio) * 1000
+        
+        print(f"{tamanho:>10} | {por_segundo_noites:>18,.0f} | {por_segundo_tabela:>12,.0f} | "
+              f"{tempo_montagem:>12.3f} | {tempo_reserva:>12.3f} | {tempo_regra:>10.2f}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or TAMANHOS_PADRAO
+    executar_benchmark(tamanhos)
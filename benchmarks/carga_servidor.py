@@ -0,0 +1,175 @@
+"""
+Gerador de carga para o serviço HTTP (servidor.py).
+Abre várias conexões keep-alive simultâneas que alternam criações de
+reservas, consultas por código e listagens, e informa a vazão
+(requisições/s) e os percentis de latência. Ao final, confere que nenhum
+tipo de quarto ficou acima do inventário em nenhuma noite.
+
+Uso:
+    python benchmarks/carga_servidor.py [--host HOST] [--porta PORTA]
+        [--clientes N] [--requisicoes N]
+
+O servidor deve estar em execução (python servidor.py).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SERVIDOR_HOST, SERVIDOR_PORTA, TIPOS_QUARTOS, QUARTOS_QUANTIDADE
+from utils import converter_data
+from ocupacao import criar_indice_ocupacao
+from registro import como_registro
+
+DATA_BASE = converter_data("01/01/2030")
+
+
+async def enviar(leitor, escritor, metodo, alvo, corpo=None):
+    """
+    Envia uma requisição na conexão aberta e lê a resposta.
+    
+    Returns:
+        tuple: (status, corpo decodificado)
+    """
+    conteudo = json.dumps(corpo).encode("utf-8") if corpo is not None else b""
+    escritor.write(
+        f"{metodo} {alvo} HTTP/1.1\r\nHost: carga\r\nContent-Length: {len(conteudo)}\r\n\r\n".encode("latin-1")
+        + conteudo
+    )
+    await escritor.drain()
+    
+    status = int((await leitor.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        if nome.lower() == "content-length":
+            tamanho = int(valor)
+    return status, json.loads(await leitor.readexactly(tamanho))
+
+
+def gerar_dados(gerador):
+    """
+    Gera os dados de uma reserva aleatória em 2030.
+    """
+    checkin = DATA_BASE + timedelta(days=gerador.randrange(300))
+    checkout = checkin + timedelta(days=gerador.randint(1, 7))
+    return {
+        'nome': f"Carga {gerador.randrange(10_000)}",
+        'checkin': checkin.strftime("%d/%m/%Y"),
+        'checkout': checkout.strftime("%d/%m/%Y"),
+        'tipo_quarto': gerador.choice(TIPOS_QUARTOS),
+        'quantidade_quartos': gerador.randint(1, 3)
+    }
+
+
+async def executar_cliente(host, porta, requisicoes, semente, latencias, contagem):
+    """
+    Executa um cliente: 1/3 criações, 1/3 consultas de reservas criadas e
+    1/3 listagens paginadas.
+    """
+    gerador = random.Random(semente)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    criadas = []
+    
+    for numero in range(requisicoes):
+        inicio = time.perf_counter()
+        if numero % 3 == 0 or not criadas:
+            status, corpo = await enviar(leitor, escritor, "POST", "/reservas", gerar_dados(gerador))
+            if status == 201:
+                criadas.append(corpo['hash'])
+        elif numero % 3 == 1:
+            status, _ = await enviar(leitor, escritor, "GET", f"/reservas/{gerador.choice(criadas)}")
+        else:
+            status, _ = await enviar(leitor, escritor, "GET", f"/reservas?pagina={gerador.randint(1, 5)}&ordenar=checkin")
+        latencias.append(time.perf_counter() - inicio)
+        contagem[status] = contagem.get(status, 0) + 1
+    
+    escritor.close()
+
+
+async def conferir_inventario(host, porta):
+    """
+    Lê todas as reservas pelo serviço e retorna as noites em que algum tipo
+    de quarto excede o inventário.
+    """
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    reservas = []
+    pagina = 1
+    
+    while True:
+        _, corpo = await enviar(leitor, escritor, "GET", f"/reservas?pagina={pagina}&tamanho=1000")
+        if not corpo['reservas']:
+            break
+        reservas.extend(corpo['reservas'])
+        pagina += 1
+    escritor.close()
+    
+    reservas = [
+        como_registro(dict(
+            reserva,
+            checkin=converter_data(reserva['checkin']),
+            checkout=converter_data(reserva['checkout']),
+            quantidade_quartos=int(reserva['quantidade_quartos'])
+        ))
+        for reserva in reservas
+    ]
+    indice = criar_indice_ocupacao(reservas)
+    return [
+        (tipo, dia) for tipo, dias in indice.items()
+        for dia, ocupados in dias.items() if ocupados > QUARTOS_QUANTIDADE[tipo]
+    ]
+
+
+def percentil(valores, fracao):
+    """
+    Retorna o percentil de uma lista já ordenada.
+    """
+    return valores[min(int(len(valores) * fracao), len(valores) - 1)]
+
+
+async def executar_carga(host, porta, clientes, requisicoes):
+    """
+    Dispara os clientes simultâneos e imprime o resumo.
+    """
+    latencias = []
+    contagem = {}
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        executar_cliente(host, porta, requisicoes, semente, latencias, contagem)
+        for semente in range(clientes)
+    ))
+    duracao = time.perf_counter() - inicio
+    
+    latencias.sort()
+    print(f"{len(latencias)} requisições em {duracao:.2f}s: {len(latencias) / duracao:,.0f} req/s")
+    print(
+        f"latência p50 {percentil(latencias, 0.50) * 1000:.2f} ms | "
+        f"p95 {percentil(latencias, 0.95) * 1000:.2f} ms | "
+        f"p99 {percentil(latencias, 0.99) * 1000:.2f} ms"
+    )
+    print("respostas por status:", dict(sorted(contagem.items())))
+    
+    excedidas = await conferir_inventario(host, porta)
+    print("overbooking:", f"{len(excedidas)} noites acima do inventário" if excedidas else "nenhum")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de reservas.")
+    parser.add_argument("--host", default=SERVIDOR_HOST)
+    parser.add_argument("--porta", type=int, default=SERVIDOR_PORTA)
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    opcoes = parser.parse_args()
+    
+    asyncio.run(executar_carga(opcoes.host, opcoes.porta, opcoes.clientes, opcoes.requisicoes))
@@ -0,0 +1,406 @@
+"""
+Suíte de benchmarks das operações do sistema.
+Gera um livro sintético de reservas (tamanho e proporção de tipos de quarto
+configuráveis, por padrão proporcional a QUARTOS_QUANTIDADE) e mede
+verificar_disponibilidade, criar_reserva, cancelar_reserva,
+consultar_reserva_por_nome, calcular_estatisticas, carregar_reservas,
+salvar_reservas e a importação em lote de um CSV (importar_reservas, em
+tempo por linha), com a entrada do teclado simulada e a saída do terminal
+descartada. A persistência é medida em um diretório temporário.
+
+Os resultados são emitidos em JSON; com --comparar, cada operação é
+conferida contra um resultado anterior e o código de saída é 1 se alguma
+ficar mais lenta que o limite percentual configurado. A comparação usa o
+melhor tempo entre as repetições, menos sujeito a ruído que a mediana
+(criar e cancelar incluem o fsync do journal). Independentemente da
+comparação, o código de saída também é 1 se a melhor rodada da importação
+ficar abaixo da meta de linhas por segundo (--meta-importacao).
+
+Uso:
+    python benchmarks/suite_desempenho.py [--reservas N] [--mix standard=10,premium=5,luxo=3]
+        [--repeticoes N] [--saida atual.json] [--comparar base.json] [--limite 20]
+        [--meta-importacao 50000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+DIRETORIO_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRETORIO_PROJETO)
+
+from config import QUARTOS_QUANTIDADE
+from calculo import verificar_disponibilidade, calcular_estatisticas
+from arquivo import carregar_reservas, salvar_reservas
+from concorrencia import abrir_cadastro, acesso_exclusivo
+from cadastro import listar_reservas
+from registro import Reserva
+from reserva import criar_reserva, cancelar_reserva
+from importacao import importar_reservas, ler_registros
+import interface
+
+DATA_BASE = date(2030, 1, 1)
+HORIZONTE_DIAS = 730
+# Percentual de lentidão tolerado antes de acusar regressão
+LIMITE_REGRESSAO_PADRAO = 20.0
+# Linhas por segundo abaixo das quais a importação em lote falha a suíte
+META_IMPORTACAO_PADRAO = 50_000.0
+# CSV da importação, gerado no diretório temporário da suíte
+ARQUIVO_IMPORTACAO = "importacao.csv"
+CHAMADAS_POR_RODADA = {
+    'verificar_disponibilidade': 20000,
+    'criar_reserva': 200,
+    'cancelar_reserva': 200,
+    'consultar_reserva_por_nome': 500,
+    'calcular_estatisticas': 3,
+    'carregar_reservas': 3,
+    'salvar_reservas': 3,
+    # Linhas do CSV importado a cada rodada
+    'importar_reservas': 50_000
+}
+
+
+def interpretar_mix(texto):
+    """
+    Converte "standard=10,premium=5" em pesos por tipo de quarto.
+    """
+    if not texto:
+        return dict(QUARTOS_QUANTIDADE)
+    
+    mix = {}
+    for parte in texto.split(","):
+        tipo, _, peso = parte.partition("=")
+        if tipo.strip() not in QUARTOS_QUANTIDADE:
+            raise ValueError(f"Tipo de quarto desconhecido no mix: {tipo}")
+        mix[tipo.strip()] = float(peso)
+    return mix
+
+
+def gerar_livro(quantidade, mix, semente=42):
+    """
+    Gera um livro sintético de reservas, com os tipos de quarto sorteados
+    na proporção do mix.
+    
+    Args:
+        quantidade (int): Número de reservas
+        mix (dict): Peso de cada tipo de quarto
+        semente (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Reservas sintéticas
+    """
+    gerador = random.Random(semente)
+    tipos = list(mix)
+    pesos = [mix[tipo] for tipo in tipos]
+    sobrenomes = ("Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Gonçalves")
+    reservas = []
+    
+    for numero in range(quantidade):
+        checkin = DATA_BASE + timedelta(days=gerador.randrange(HORIZONTE_DIAS))
+        checkout = checkin + timedelta(days=gerador.randint(1, 7))
+        reservas.append(Reserva(
+            numero + 1,
+            f"Hóspede{numero} {gerador.choice(sobrenomes)}",
+            checkin,
+            checkout,
+            gerador.choices(tipos, pesos)[0],
+            gerador.randint(1, 2),
+            float(gerador.randrange(100, 5000))
+        ))
+    
+    return reservas
+
+
+def gerar_importacao(caminho, quantidade, mix, semente=7):
+    """
+    Grava um CSV de importação com reservas de 1 quarto e 1 a 5 noites,
+    posteriores ao livro e espalhadas o suficiente para que quase todas
+    sejam aceitas: é o caso em que cotação, atribuição de quartos e índice
+    de nomes pesam na importação.
+    
+    Args:
+        caminho (str): Arquivo CSV a gravar
+        quantidade (int): Número de linhas
+        mix (dict): Peso de cada tipo de quarto
+        semente (int): Semente do gerador aleatório
+    """
+    gerador = random.Random(semente)
+    tipos = list(mix)
+    pesos = [mix[tipo] for tipo in tipos]
+    inicio = DATA_BASE + timedelta(days=HORIZONTE_DIAS * 2)
+    
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        arquivo.write("nome,checkin,checkout,tipo_quarto,quantidade_quartos\n")
+        for numero in range(quantidade):
+            checkin = inicio + timedelta(days=gerador.randrange(max(quantidade // 4, 1)))
+            checkout = checkin + timedelta(days=gerador.randint(1, 5))
+            arquivo.write(
+                f"Importada{numero} Silva,{checkin:%d/%m/%Y},{checkout:%d/%m/%Y},"
+                f"{gerador.choices(tipos, pesos)[0]},1\n"
+            )
+
+
+@contextlib.contextmanager
+def terminal_simulado(respostas):
+    """
+    Substitui input() pelas respostas informadas, descarta a saída e evita
+    a limpeza do terminal.
+    """
+    entradas = iter(respostas)
+    with mock.patch("builtins.input", lambda mensagem="": next(entradas)), \
+            mock.patch.object(interface, "limpar_terminal", lambda: None), \
+            contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def cronometrar(funcao, chamadas):
+    """
+    Executa a função o número de vezes indicado e retorna o tempo médio por
+    chamada, em milissegundos.
+    """
+    inicio = time.perf_counter()
+    for indice in range(chamadas):
+        funcao(indice)
+    return (time.perf_counter() - inicio) * 1000 / chamadas
+
+
+def medir_operacoes(livro, mix, rodada):
+    """
+    Mede uma rodada de cada operação sobre um diretório de dados novo.
+    
+    Returns:
+        dict: Tempo médio por chamada (ms) de cada operação
+    """
+    tempos = {}
+    gerador = random.Random(rodada)
+    tipos = list(mix)
+    
+    salvar_reservas(livro)
+    cadastro = abrir_cadastro()
+    reservas = listar_reservas(cadastro)
+    
+    consultas = [
+        (gerador.choice(tipos), DATA_BASE + timedelta(days=dia), DATA_BASE + timedelta(days=dia + 3), 1)
+        for dia in (gerador.randrange(HORIZONTE_DIAS) for _ in range(CHAMADAS_POR_RODADA['verificar_disponibilidade']))
+    ]
+    tempos['verificar_disponibilidade'] = cronometrar(
+        lambda indice: verificar_disponibilidade(reservas, *consultas[indice], cadastro['ocupacao']),
+        len(consultas)
+    )
+    
+    # Reservas criadas após o horizonte do livro, uma por noite, para que
+    # todas sejam aceitas
+    quantidade = CHAMADAS_POR_RODADA['criar_reserva']
+    respostas = []
+    for indice in range(quantidade):
+        checkin = DATA_BASE + timedelta(days=HORIZONTE_DIAS + 10 + indice)
+        respostas += [
+            f"Benchmark {indice}",
+            checkin.strftime("%d/%m/%Y"),
+            (checkin + timedelta(days=1)).strftime("%d/%m/%Y"),
+            tipos[indice % len(tipos)],
+            "1"
+        ]
+    with terminal_simulado(respostas):
+        tempos['criar_reserva'] = cronometrar(lambda indice: criar_reserva(cadastro), quantidade)
+    
+    criadas = [codigo for codigo, reserva in cadastro['reservas'].items() if reserva.nome.startswith("Benchmark")]
+    with terminal_simulado([str(codigo) for codigo in criadas]):
+        tempos['cancelar_reserva'] = cronometrar(lambda indice: cancelar_reserva(cadastro), len(criadas))
+    
+    nomes = [gerador.choice(livro)['nome'] for _ in range(CHAMADAS_POR_RODADA['consultar_reserva_por_nome'])]
+    with terminal_simulado(nomes):
+        tempos['consultar_reserva_por_nome'] = cronometrar(
+            lambda indice: interface.consultar_reserva_por_nome(cadastro),
+            len(nomes)
+        )
+    
+    tempos['calcular_estatisticas'] = cronometrar(
+        lambda indice: calcular_estatisticas(reservas),
+        CHAMADAS_POR_RODADA['calcular_estatisticas']
+    )
+    tempos['carregar_reservas'] = cronometrar(
+        lambda indice: carregar_reservas(),
+        CHAMADAS_POR_RODADA['carregar_reservas']
+    )
+    tempos['salvar_reservas'] = cronometrar(
+        lambda indice: salvar_reservas(livro),
+        CHAMADAS_POR_RODADA['salvar_reservas']
+    )
+    
+    # Importação sobre o livro recém-salvo, com o CSV gerado uma vez por
+    # suíte; o tempo inclui a leitura do arquivo e a gravação do lote
+    salvar_reservas(livro)
+    cadastro = abrir_cadastro()
+    linhas = CHAMADAS_POR_RODADA['importar_reservas']
+    inicio = time.perf_counter()
+    with acesso_exclusivo(cadastro):
+        importar_reservas(cadastro, ler_registros(ARQUIVO_IMPORTACAO))
+    tempos['importar_reservas'] = (time.perf_counter() - inicio) * 1000 / linhas
+    
+    return tempos
+
+
+def obter_commit():
+    """
+    Retorna o commit atual do repositório, se disponível.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=DIRETORIO_PROJETO, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_suite(quantidade, mix, repeticoes):
+    """
+    Executa a suíte em um diretório temporário e monta o resultado.
+    
+    Returns:
+        dict: {'meta': {...}, 'resultados': {operacao: {...}}}
+    """
+    livro = gerar_livro(quantidade, mix)
+    rodadas = []
+    diretorio_original = os.getcwd()
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            gerar_importacao(ARQUIVO_IMPORTACAO, CHAMADAS_POR_RODADA['importar_reservas'], mix)
+            for rodada in range(repeticoes):
+                rodadas.append(medir_operacoes(livro, mix, rodada))
+        finally:
+            os.chdir(diretorio_original)
+    
+    resultados = {}
+    for operacao in rodadas[0]:
+        tempos = [rodada[operacao] for rodada in rodadas]
+        resultados[operacao] = {
+            'mediana_ms': statistics.median(tempos),
+            'minimo_ms': min(tempos),
+            'maximo_ms': max(tempos)
+        }
+    
+    return {
+        'meta': {
+            'reservas': quantidade,
+            'mix': mix,
+            'repeticoes': repeticoes,
+            'commit': obter_commit(),
+            'python': platform.python_version(),
+            'data': datetime.now().isoformat(timespec="seconds")
+        },
+        'resultados': resultados
+    }
+
+
+def comparar_resultados(atual, base, limite):
+    """
+    Compara o melhor tempo de cada operação com um resultado anterior.
+    
+    Args:
+        atual (dict): Resultado desta execução
+        base (dict): Resultado de referência
+        limite (float): Percentual de lentidão tolerado
+        
+    Returns:
+        list: Operações que regrediram, como (operacao, base_ms, atual_ms, variacao)
+    """
+    regressoes = []
+    
+    for operacao, medida in atual['resultados'].items():
+        referencia = base['resultados'].get(operacao)
+        if not referencia or referencia['minimo_ms'] <= 0:
+            continue
+        
+        variacao = (medida['minimo_ms'] / referencia['minimo_ms'] - 1) * 100
+        print(f"{operacao:>28}: {referencia['minimo_ms']:10.4f} -> {medida['minimo_ms']:10.4f} ms ({variacao:+.1f}%)")
+        if variacao > limite:
+            regressoes.append((operacao, referencia['minimo_ms'], medida['minimo_ms'], variacao))
+    
+    return regressoes
+
+
+def conferir_meta_importacao(resultado, meta):
+    """
+    Confere a melhor rodada da importação contra a meta de linhas por
+    segundo.
+    
+    Args:
+        resultado (dict): Resultado desta execução
+        meta (float): Linhas por segundo exigidas
+        
+    Returns:
+        bool: True se a importação atingiu a meta
+    """
+    melhor_ms = resultado['resultados']['importar_reservas']['minimo_ms']
+    linhas_por_segundo = 1000 / melhor_ms if melhor_ms > 0 else float("inf")
+    atingiu = linhas_por_segundo >= meta
+    
+    situacao = "ok" if atingiu else "ABAIXO DA META"
+    print(f"{'importar_reservas':>28}: {linhas_por_segundo:,.0f} linhas/s (meta {meta:,.0f}) {situacao}")
+    return atingiu
+
+
+def executar(argumentos=None):
+    """
+    Ponto de entrada pela linha de comando.
+    
+    Returns:
+        int: Código de saída (0 sem regressões, 1 com regressões ou com a
+            importação abaixo da meta)
+    """
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do sistema de reservas.")
+    parser.add_argument("--reservas", type=int, default=10_000, help="Tamanho do livro sintético")
+    parser.add_argument("--mix", help="Pesos por tipo, ex.: standard=10,premium=5,luxo=3 (padrão: QUARTOS_QUANTIDADE)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Rodadas de cada operação")
+    parser.add_argument("--saida", help="Grava o resultado JSON neste arquivo (padrão: saída padrão)")
+    parser.add_argument("--comparar", help="Resultado JSON de referência")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO_PADRAO, help="Lentidão tolerada, em %%")
+    parser.add_argument("--meta-importacao", type=float, default=META_IMPORTACAO_PADRAO,
+                        help="Linhas por segundo mínimas da importação em lote")
+    opcoes = parser.parse_args(argumentos)
+    
+    resultado = executar_suite(opcoes.reservas, interpretar_mix(opcoes.mix), opcoes.repeticoes)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+    
+    codigo_saida = 0
+    if not conferir_meta_importacao(resultado, opcoes.meta_importacao):
+        codigo_saida = 1
+    
+    if opcoes.comparar:
+        with open(opcoes.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        
+        regressoes = comparar_resultados(resultado, base, opcoes.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} operação(ões) mais lenta(s) que o limite de {opcoes.limite:.0f}%:")
+            for operacao, _, _, variacao in regressoes:
+                print(f"  {operacao}: {variacao:+.1f}%")
+            return 1
+        print(f"\nNenhuma regressão acima de {opcoes.limite:.0f}%.")
+    
+    return codigo_saida
+
+
+if __name__ == "__main__":
+    sys.exit(executar())
@@ -0,0 +1,258 @@
+"""
+Módulo do cadastro de reservas em memória.
+Mantém as reservas indexadas pelo código, preservando a ordem de inserção,
+junto com os índices derivados (ocupação diária e nomes), o acumulador de
+estatísticas, a tabela de tarifas e a alocação de quartos, de modo que busca, inclusão e remoção por código custem O(1).
+"""
+
+from ocupacao import criar_indice_ocupacao, registrar_ocupacao, remover_ocupacao
+from indice_nomes import criar_indice_nomes, indexar_nome, indexar_nomes, desindexar_nome, buscar_nome
+from estatisticas import (
+    criar_acumulador,
+    registrar_no_acumulador,
+    remover_do_acumulador,
+    obter_estatisticas,
+    acumulador_corresponde,
+    verificar_acumulador
+)
+from calculo import combinar_estatisticas
+from relatorios import invalidar_relatorios
+from tarifas import criar_tabela_tarifas, atualizar_tarifas, atualizar_tarifas_lote
+from alocacao import criar_alocacao, alocar_reserva, alocar_lote, liberar_reserva
+from arquivamento import estatisticas_do_arquivo
+from config import VERIFICAR_ESTATISTICAS
+
+
+def criar_cadastro(reservas=(), acumulador=None):
+    """
+    Cria o cadastro a partir de uma coleção de reservas.
+    
+    O cadastro é um dicionário com:
+        - 'reservas': {codigo: reserva}, na ordem de inserção
+        - 'ocupacao': índice de ocupação diária (ver ocupacao.py)
+        - 'nomes': índice de busca por nome (ver indice_nomes.py)
+        - 'estatisticas': acumulador de estatísticas (ver estatisticas.py)
+        - 'relatorios': séries mensais já calculadas (ver relatorios.py)
+        - 'tarifas': diárias pré-calculadas (ver tarifas.py), montadas na
+          primeira cotação
+        - 'alocacao': quartos atribuídos às reservas (ver alocacao.py),
+          montada na primeira reserva ou consulta
+        
+    Args:
+        reservas (iterable): Reservas carregadas do armazenamento
+        acumulador (dict, optional): Acumulador salvo anteriormente; só é
+            aproveitado se corresponder às reservas carregadas
+        
+    Returns:
+        dict: Cadastro de reservas
+    """
+    # Os índices são montados de uma vez a partir das reservas, o que é
+    # bem mais rápido que incluí-las uma a uma em livros grandes
+    por_codigo = {reserva.hash: reserva for reserva in reservas}
+    cadastro = {
+        'reservas': por_codigo,
+        'ocupacao': criar_indice_ocupacao(por_codigo.values()),
+        'nomes': criar_indice_nomes(por_codigo.values()),
+        'estatisticas': None,
+        'relatorios': {},
+        'tarifas': None,
+        'alocacao': None
+    }
+    
+    if acumulador is None or not acumulador_corresponde(acumulador, cadastro['reservas']):
+        acumulador = criar_acumulador(cadastro['reservas'].values())
+    cadastro['estatisticas'] = acumulador
+    
+    return cadastro
+
+
+def adicionar_reserva(cadastro, reserva):
+    """
+    Inclui uma reserva no cadastro e nos índices.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        reserva (Reserva): Reserva a incluir
+    """
+    cadastro['reservas'][reserva.hash] = reserva
+    registrar_ocupacao(cadastro['ocupacao'], reserva)
+    indexar_nome(cadastro['nomes'], reserva.hash, reserva.nome)
+    invalidar_relatorios(cadastro['relatorios'], reserva)
+    atualizar_tarifas(cadastro['tarifas'], reserva)
+    
+    if cadastro['alocacao'] is not None:
+        alocar_reserva(cadastro['alocacao'], reserva)
+    if cadastro['estatisticas'] is not None:
+        registrar_no_acumulador(cadastro['estatisticas'], reserva)
+
+
+def adicionar_lote(cadastro, reservas):
+    """
+    Conclui a inclusão de um lote de reservas cujas noites já foram
+    registradas no índice de ocupação (a importação as registra linha a
+    linha, para conferir a disponibilidade das linhas seguintes). Os
+    índices de nomes, a tabela de tarifas e a alocação de quartos são
+    atualizados uma única vez para o lote todo.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        reservas (list): Reservas do lote
+    """
+    for reserva in reservas:
+        cadastro['reservas'][reserva.hash] = reserva
+        invalidar_relatorios(cadastro['relatorios'], reserva)
+        if cadastro['estatisticas'] is not None:
+            registrar_no_acumulador(cadastro['estatisticas'], reserva)
+    
+    indexar_nomes(cadastro['nomes'], reservas)
+    atualizar_tarifas_lote(cadastro['tarifas'], reservas)
+    if cadastro['alocacao'] is not None:
+        alocar_lote(cadastro['alocacao'], reservas)
+
+
+def remover_reserva(cadastro, codigo_hash):
+    """
+    Remove uma reserva do cadastro e dos índices.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        codigo_hash (int): Código da reserva
+        
+    Returns:
+        Reserva: Reserva removida ou None se o código não existir
+    """
+    reserva = cadastro['reservas'].pop(codigo_hash, None)
+    
+    if reserva is not None:
+        remover_ocupacao(cadastro['ocupacao'], reserva)
+        desindexar_nome(cadastro['nomes'], codigo_hash, reserva.nome)
+        invalidar_relatorios(cadastro['relatorios'], reserva)
+        atualizar_tarifas(cadastro['tarifas'], reserva)
+        if cadastro['alocacao'] is not None:
+            liberar_reserva(cadastro['alocacao'], reserva)
+        remover_do_acumulador(cadastro['estatisticas'], reserva)
+    
+    return reserva
+
+
+def buscar_reserva(cadastro, codigo_hash):
+    """
+    Busca uma reserva pelo código.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        codigo_hash (int): Código da reserva
+        
+    Returns:
+        Reserva: Reserva encontrada ou None
+    """
+    return cadastro['reservas'].get(codigo_hash)
+
+
+def listar_reservas(cadastro):
+    """
+    Retorna uma visão das reservas na ordem de inserção, sem copiá-las.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        dict_values: Reservas do cadastro
+    """
+    return cadastro['reservas'].values()
+
+
+def buscar_reservas_por_nome(cadastro, consulta):
+    """
+    Busca reservas pelo nome do responsável, ignorando acentos e
+    maiúsculas e aceitando partes do nome (ver indice_nomes.buscar_nome).
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        consulta (str): Nome ou parte do nome
+        
+    Returns:
+        list: Reservas encontradas, ordenadas por data de check-in
+    """
+    reservas = cadastro['reservas']
+    encontradas = [reservas[codigo] for codigo in buscar_nome(cadastro['nomes'], consulta)]
+    encontradas.sort(key=lambda reserva: reserva.checkin)
+    return encontradas
+
+
+def obter_estatisticas_cadastro(cadastro, incluir_arquivo=False):
+    """
+    Retorna as estatísticas gerais a partir do acumulador do cadastro.
+    Com VERIFICAR_ESTATISTICAS ativo, o acumulador é conferido contra o
+    recálculo completo e reconstruído se houver divergência.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        incluir_arquivo (bool): Inclui as estadias do arquivo morto
+        
+    Returns:
+        dict: Dicionário com as estatísticas ou None se não houver reservas
+    """
+    if VERIFICAR_ESTATISTICAS and not verificar_acumulador(cadastro['estatisticas'], cadastro['reservas']):
+        print("Aviso: estatísticas acumuladas divergentes; recalculando.")
+        cadastro['estatisticas'] = criar_acumulador(cadastro['reservas'].values())
+    
+    estatisticas = obter_estatisticas(cadastro['estatisticas'], cadastro['reservas'])
+    if incluir_arquivo:
+        return combinar_estatisticas([estatisticas_do_arquivo(), estatisticas])
+    return estatisticas
+
+
+def desfazer_operacoes(cadastro, operacoes):
+    """
+    Desfaz, em ordem inversa, operações já aplicadas ao cadastro (usado
+    quando a gravação de um lote falha).
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        operacoes (list): Operações (operacao, reserva) aplicadas
+    """
+    for operacao, reserva in reversed(operacoes):
+        if operacao == "criar":
+            remover_reserva(cadastro, reserva.hash)
+        else:
+            adicionar_reserva(cadastro, reserva)
+
+
+def reaplicar_operacoes(cadastro, operacoes):
+    """
+    Incorpora ao cadastro operações gravadas por outro processo. A
+    aplicação é idempotente: operações já refletidas no cadastro são
+    ignoradas.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        operacoes (iterable): Operações (operacao, reserva)
+    """
+    for operacao, reserva in operacoes:
+        if operacao == "criar":
+            if reserva.hash not in cadastro['reservas']:
+                adicionar_reserva(cadastro, reserva)
+        elif operacao == "cancelar":
+            remover_reserva(cadastro, reserva.hash)
+
+
+def substituir_reservas(cadastro, reservas):
+    """
+    Substitui todo o conteúdo do cadastro, reconstruindo os índices, sem
+    trocar o dicionário usado pelo restante do sistema. Uma tabela de
+    tarifas já montada é refeita com as mesmas regras, e uma alocação de
+    quartos, mantendo os quartos já atribuídos.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        reservas (iterable): Nova coleção de reservas
+    """
+    tabela = cadastro.get('tarifas')
+    alocacao = cadastro.get('alocacao')
+    cadastro.update(criar_cadastro(reservas))
+    
+    if tabela is not None:
+        cadastro['tarifas'] = criar_tabela_tarifas(cadastro['ocupacao'], regras=tabela['regras'])
+    if alocacao is not None:
+        cadastro['alocacao'] = criar_alocacao(cadastro['reservas'].values(), alocacao['atribuicoes'])
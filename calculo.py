@@ -3,7 +3,11 @@ Módulo de cálculos e validações.
 Contém funções para cálculo de valores, estatísticas e validação de reservas.
 """
 
-from config import QUARTOS_QUANTIDADE, QUARTOS_VALOR
+from datetime import date
+from config import QUARTOS_QUANTIDADE, QUARTOS_VALOR, TIPOS_QUARTOS, HORIZONTE_CALENDARIO
+from ocupacao import criar_indice_ocupacao, pico_ocupacao
+from arquivo import buscar_reservas_sobrepostas
+from metricas import instrumentar
 
 
 def calcular_valor_reserva(tipo_quarto, quantidade_quartos, dias_estadia):
@@ -28,8 +32,8 @@ def calcular_dias_estadia(data_checkin, data_checkout):
     Calcula o número de dias entre check-in e check-out.
     
     Args:
-        data_checkin (datetime): Data de check-in
-        data_checkout (datetime): Data de check-out
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
         
     Returns:
         int: Número de dias de estadia
@@ -37,33 +41,89 @@ def calcular_dias_estadia(data_checkin, data_checkout):
     return (data_checkout - data_checkin).days
 
 
-def verificar_disponibilidade(reservas, tipo_quarto, data_checkin, data_checkout, quantidade_solicitada):
+def estadia_concluida(reserva, hoje=None):
+    """
+    Indica se a estadia de uma reserva já terminou. A estadia termina na
+    manhã do check-out: nesse dia ela já está concluída, não pode ser
+    cancelada, não ocupa quartos e vai para o arquivo morto.
+    
+    Args:
+        reserva (Reserva): Reserva
+        hoje (date, optional): Data de referência; padrão hoje
+        
+    Returns:
+        bool: True se o check-out é hoje ou já passou
+    """
+    return reserva.checkout <= (hoje or date.today())
+
+
+@instrumentar
+def validar_dados_reserva(dados):
+    """
+    Valida os dados de uma nova reserva com as mesmas regras da coleta
+    interativa. Estadias acima de HORIZONTE_CALENDARIO noites são recusadas,
+    como na cotação, pois a tarifa e a ocupação percorrem cada noite.
+    
+    Args:
+        dados (dict): Dados com nome, checkin, checkout, tipo_quarto e
+            quantidade_quartos
+            
+    Returns:
+        str: Motivo da rejeição ou None se os dados são válidos
+    """
+    if not dados['nome']:
+        return "O nome não pode estar vazio."
+    
+    dias = calcular_dias_estadia(dados['checkin'], dados['checkout'])
+    if dias <= 0:
+        return "A data de check-out deve ser posterior à data de check-in."
+    if dias > HORIZONTE_CALENDARIO:
+        return f"A estadia deve ter no máximo {HORIZONTE_CALENDARIO} noites."
+    
+    if dados['tipo_quarto'] not in TIPOS_QUARTOS:
+        return f"Tipo de quarto inválido: {dados['tipo_quarto']!r}."
+    
+    if dados['quantidade_quartos'] < 1:
+        return "A quantidade de quartos deve ser maior ou igual a 1."
+    
+    return None
+
+
+@instrumentar
+def verificar_disponibilidade(reservas, tipo_quarto, data_checkin, data_checkout, quantidade_solicitada,
+                              indice_ocupacao=None):
     """
     Verifica se há quartos disponíveis para o período solicitado.
     
+    A disponibilidade é determinada pelo pico de ocupação noite a noite, de
+    modo que reservas que não se sobrepõem entre si não somam quartos.
+    
     Args:
         reservas (list): Lista de reservas existentes
         tipo_quarto (str): Tipo do quarto desejado
-        data_checkin (datetime): Data de check-in
-        data_checkout (datetime): Data de check-out
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
         quantidade_solicitada (int): Quantidade de quartos solicitados
+        indice_ocupacao (dict, optional): Índice de ocupação diária já mantido
+            pelo sistema; se omitido, é montado apenas com as reservas do
+            período, filtradas pelo backend de armazenamento
         
     Returns:
         bool: True se há disponibilidade, False caso contrário
     """
-    quartos_ocupados = 0
-    
-    for reserva in reservas:
-        if reserva['tipo_quarto'] == tipo_quarto:
-            # Verifica se há sobreposição de datas
-            if data_checkin < reserva['checkout'] and data_checkout > reserva['checkin']:
-                quartos_ocupados += reserva['quantidade_quartos']
+    if indice_ocupacao is None:
+        reservas_sobrepostas = buscar_reservas_sobrepostas(
+            reservas, tipo_quarto, data_checkin, data_checkout
+        )
+        indice_ocupacao = criar_indice_ocupacao(reservas_sobrepostas)
     
+    quartos_ocupados = pico_ocupacao(indice_ocupacao, tipo_quarto, data_checkin, data_checkout)
     quartos_disponiveis = QUARTOS_QUANTIDADE[tipo_quarto] - quartos_ocupados
     
     return quartos_disponiveis >= quantidade_solicitada
 
 
+@instrumentar
 def calcular_estatisticas(reservas):
     """
     Calcula estatísticas gerais sobre as reservas.
@@ -78,37 +138,33 @@ def calcular_estatisticas(reservas):
         return None
     
     quantidade_reservas = len(reservas)
-    reserva_mais_cara = reservas[0]
-    reserva_mais_longa = reservas[0]
+    reserva_mais_cara = next(iter(reservas))
+    reserva_mais_longa = reserva_mais_cara
     dias_mais_longa = calcular_dias_estadia(
-        reserva_mais_longa['checkin'],
-        reserva_mais_longa['checkout']
+        reserva_mais_longa.checkin,
+        reserva_mais_longa.checkout
     )
     
-    quartos_reservados = {
-        "standard": 0,
-        "premium": 0,
-        "luxo": 0
-    }
+    quartos_reservados = {tipo: 0 for tipo in TIPOS_QUARTOS}
     
     soma_total_valores = 0.0
     
     for reserva in reservas:
         # Atualiza reserva mais cara
-        if reserva["valor"] > reserva_mais_cara["valor"]:
+        if reserva.valor > reserva_mais_cara.valor:
             reserva_mais_cara = reserva
         
         # Atualiza reserva mais longa
-        dias_reserva = calcular_dias_estadia(reserva['checkin'], reserva['checkout'])
+        dias_reserva = calcular_dias_estadia(reserva.checkin, reserva.checkout)
         if dias_reserva > dias_mais_longa:
             reserva_mais_longa = reserva
             dias_mais_longa = dias_reserva
         
         # Conta quartos reservados por tipo
-        quartos_reservados[reserva["tipo_quarto"]] += reserva["quantidade_quartos"]
+        quartos_reservados[reserva.tipo_quarto] = quartos_reservados.get(reserva.tipo_quarto, 0) + reserva.quantidade_quartos
         
         # Soma valores
-        soma_total_valores += reserva["valor"]
+        soma_total_valores += reserva.valor
     
     return {
         'quantidade_reservas': quantidade_reservas,
@@ -118,3 +174,44 @@ def calcular_estatisticas(reservas):
         'dias_mais_longa': dias_mais_longa,
         'quartos_reservados': quartos_reservados
     }
+
+
+def combinar_estatisticas(parciais):
+    """
+    Combina estatísticas calculadas sobre grupos disjuntos de reservas (por
+    exemplo, os segmentos do arquivo morto e as reservas atuais). Em caso de
+    empate, vence o grupo que vem primeiro, como em calcular_estatisticas.
+    
+    Args:
+        parciais (iterable): Estatísticas no formato de calcular_estatisticas
+            (None para grupos sem reservas)
+            
+    Returns:
+        dict: Estatísticas combinadas ou None se não houver reservas
+    """
+    combinadas = None
+    
+    for parcial in parciais:
+        if parcial is None:
+            continue
+        
+        if combinadas is None:
+            combinadas = dict(parcial)
+            combinadas['quartos_reservados'] = dict(parcial['quartos_reservados'])
+            continue
+        
+        combinadas['quantidade_reservas'] += parcial['quantidade_reservas']
+        combinadas['soma_total_valores'] += parcial['soma_total_valores']
+        
+        if parcial['reserva_mais_cara'].valor > combinadas['reserva_mais_cara'].valor:
+            combinadas['reserva_mais_cara'] = parcial['reserva_mais_cara']
+        
+        if parcial['dias_mais_longa'] > combinadas['dias_mais_longa']:
+            combinadas['reserva_mais_longa'] = parcial['reserva_mais_longa']
+            combinadas['dias_mais_longa'] = parcial['dias_mais_longa']
+        
+        quartos = combinadas['quartos_reservados']
+        for tipo, quantidade in parcial['quartos_reservados'].items():
+            quartos[tipo] = quartos.get(tipo, 0) + quantidade
+    
+    return combinadas
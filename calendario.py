@@ -0,0 +1,195 @@
+"""
+Módulo do calendário de disponibilidade e das sugestões de alternativas.
+O calendário informa, para cada tipo de quarto, quantos quartos estão
+livres em cada noite de um período. É obtido do índice de ocupação diária
+ou, sem ele, de uma única varredura sobre as reservas (um vetor de
+diferenças por tipo), em vez de uma verificação de disponibilidade por dia.
+
+Quando uma reserva não pode ser feita, as sugestões procuram, no mesmo
+calendário, os períodos mais próximos com a mesma duração que comportam a
+quantidade pedida (mínimo em janela deslizante) e os outros tipos de
+quarto livres nas datas pedidas.
+"""
+
+from collections import deque
+from datetime import date, timedelta
+from itertools import accumulate, repeat
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS, HORIZONTE_SUGESTOES, MAXIMO_SUGESTOES
+from metricas import instrumentar
+
+
+def ocupacao_por_varredura(reservas, data_inicio, data_fim):
+    """
+    Calcula os quartos ocupados de cada tipo em cada noite de [início, fim)
+    com uma única passagem pelas reservas: cada reserva soma sua quantidade
+    na noite de entrada e a subtrai na de saída, e a soma acumulada dá a
+    ocupação de cada noite.
+    
+    Args:
+        reservas (iterable): Reservas
+        data_inicio (date): Primeira noite do período
+        data_fim (date): Dia seguinte à última noite do período
+        
+    Returns:
+        dict: {tipo_quarto: [quartos ocupados por noite]}
+    """
+    inicio = data_inicio.toordinal()
+    fim = data_fim.toordinal()
+    noites = max(fim - inicio, 0)
+    variacoes = {tipo: [0] * (noites + 1) for tipo in TIPOS_QUARTOS}
+    
+    for reserva in reservas:
+        entrada = max(reserva.checkin.toordinal(), inicio)
+        saida = min(reserva.checkout.toordinal(), fim)
+        if entrada < saida:
+            variacao = variacoes.setdefault(reserva.tipo_quarto, [0] * (noites + 1))
+            variacao[entrada - inicio] += reserva.quantidade_quartos
+            variacao[saida - inicio] -= reserva.quantidade_quartos
+    
+    return {tipo: list(accumulate(variacao[:-1])) for tipo, variacao in variacoes.items()}
+
+
+def ocupacao_do_indice(indice, data_inicio, data_fim):
+    """
+    Lê os quartos ocupados de cada tipo em cada noite de [início, fim) no
+    índice de ocupação diária.
+    
+    Args:
+        indice (dict): Índice de ocupação (ver ocupacao.py)
+        data_inicio (date): Primeira noite do período
+        data_fim (date): Dia seguinte à última noite do período
+        
+    Returns:
+        dict: {tipo_quarto: [quartos ocupados por noite]}
+    """
+    noites = range(data_inicio.toordinal(), data_fim.toordinal())
+    return {
+        tipo: list(map(indice.get(tipo, {}).get, noites, repeat(0)))
+        for tipo in TIPOS_QUARTOS
+    }
+
+
+@instrumentar
+def calcular_calendario(reservas, data_inicio, data_fim, indice_ocupacao=None):
+    """
+    Calcula o calendário de disponibilidade: quartos livres de cada tipo em
+    cada noite de [início, fim).
+    
+    Args:
+        reservas (iterable): Reservas existentes (usadas sem o índice)
+        data_inicio (date): Primeira noite do período
+        data_fim (date): Dia seguinte à última noite do período
+        indice_ocupacao (dict, optional): Índice de ocupação diária já
+            mantido pelo sistema; se omitido, as reservas são varridas
+            
+    Returns:
+        dict: {tipo_quarto: [quartos livres por noite]}
+    """
+    if indice_ocupacao is None:
+        ocupacao = ocupacao_por_varredura(reservas, data_inicio, data_fim)
+    else:
+        ocupacao = ocupacao_do_indice(indice_ocupacao, data_inicio, data_fim)
+    
+    return {
+        tipo: [QUARTOS_QUANTIDADE[tipo] - ocupados for ocupados in ocupados_por_noite]
+        for tipo, ocupados_por_noite in ocupacao.items()
+        if tipo in QUARTOS_QUANTIDADE
+    }
+
+
+def minimos_em_janela(valores, largura):
+    """
+    Calcula o mínimo de cada janela de largura fixa (janela deslizante com
+    fila monotônica, em tempo linear).
+    
+    Args:
+        valores (list): Sequência de valores
+        largura (int): Tamanho da janela (>= 1)
+        
+    Returns:
+        list: Mínimo da janela que começa em cada posição
+    """
+    minimos = []
+    fila = deque()
+    
+    for posicao, valor in enumerate(valores):
+        while fila and valores[fila[-1]] >= valor:
+            fila.pop()
+        fila.append(posicao)
+        if fila[0] <= posicao - largura:
+            fila.popleft()
+        if posicao >= largura - 1:
+            minimos.append(valores[fila[0]])
+    
+    return minimos
+
+
+def periodos_proximos(livres, largura, quantidade, posicao_desejada, limite):
+    """
+    Encontra as janelas de noites consecutivas que comportam a quantidade,
+    começando pelas mais próximas da posição desejada (empates favorecem a
+    data mais cedo).
+    
+    Args:
+        livres (list): Quartos livres por noite
+        largura (int): Quantidade de noites da estadia
+        quantidade (int): Quantidade de quartos
+        posicao_desejada (int): Posição do check-in pedido no calendário
+        limite (int): Quantidade máxima de janelas
+        
+    Returns:
+        list: Posições de início das janelas encontradas
+    """
+    cabem = [
+        posicao for posicao, minimo in enumerate(minimos_em_janela(livres, largura))
+        if minimo >= quantidade and posicao != posicao_desejada
+    ]
+    cabem.sort(key=lambda posicao: (abs(posicao - posicao_desejada), posicao))
+    return cabem[:limite]
+
+
+@instrumentar
+def sugerir_alternativas(reservas, dados, indice_ocupacao=None, horizonte=HORIZONTE_SUGESTOES,
+                         limite=MAXIMO_SUGESTOES):
+    """
+    Sugere alternativas para uma reserva sem disponibilidade: os períodos
+    mais próximos, com a mesma duração e o mesmo tipo de quarto, que
+    comportam a quantidade pedida, os outros tipos de quarto livres nas
+    datas pedidas e a maior quantidade disponível no período pedido.
+    Os períodos sugeridos não começam antes de hoje.
+    
+    Args:
+        reservas (iterable): Reservas existentes (usadas sem o índice)
+        dados (dict): Dados com checkin, checkout, tipo_quarto e
+            quantidade_quartos
+        indice_ocupacao (dict, optional): Índice de ocupação diária
+        horizonte (int): Dias procurados antes e depois do check-in pedido
+        limite (int): Quantidade máxima de períodos sugeridos
+        
+    Returns:
+        dict: {'periodos': [(checkin, checkout)], 'tipos': [tipo_quarto],
+            'maximo_disponivel': int}
+    """
+    noites = (dados['checkout'] - dados['checkin']).days
+    inicio = max(dados['checkin'] - timedelta(days=horizonte), date.today())
+    fim = max(dados['checkin'], inicio) + timedelta(days=horizonte + noites)
+    calendario = calcular_calendario(reservas, inicio, fim, indice_ocupacao)
+    
+    posicao_desejada = (dados['checkin'] - inicio).days
+    livres = calendario[dados['tipo_quarto']]
+    periodos = [
+        (inicio + timedelta(days=posicao), inicio + timedelta(days=posicao + noites))
+        for posicao in periodos_proximos(livres, noites, dados['quantidade_quartos'], posicao_desejada, limite)
+    ]
+    
+    tipos = []
+    maximo_disponivel = 0
+    if posicao_desejada >= 0:
+        periodo_pedido = slice(posicao_desejada, posicao_desejada + noites)
+        tipos = [
+            tipo for tipo, livres_tipo in calendario.items()
+            if tipo != dados['tipo_quarto'] and min(livres_tipo[periodo_pedido]) >= dados['quantidade_quartos']
+        ]
+        maximo_disponivel = max(min(livres[periodo_pedido]), 0)
+    
+    return {'periodos': periodos, 'tipos': tipos, 'maximo_disponivel': maximo_disponivel}
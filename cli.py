@@ -0,0 +1,381 @@
+"""
+Linha de comando não interativa, para scripts e automações.
+Cada subcomando importa só os módulos de que precisa e lê só os dados que
+usa: as estatísticas vêm do resumo gravado para a versão atual dos dados
+(concorrencia.resumir_estatisticas); a busca e o cancelamento consultam o
+índice em disco do livro binário (indice_busca.py) ou o índice de código
+do SQLite; só a criação de reservas, que confere a disponibilidade,
+carrega o cadastro inteiro. As reservas são escritas em JSON, uma por
+linha.
+
+Uso:
+    python cli.py [--propriedade ID] reservar --nome NOME --checkin DATA --checkout DATA
+                                              --tipo TIPO [--quartos N]
+    python cli.py cancelar CODIGO
+    python cli.py buscar NOME | --codigo CODIGO
+    python cli.py estatisticas [--com-arquivo | --sem-arquivo]
+    python cli.py exportar [opções de listagem.py]
+
+Com --propriedade, o comando opera sobre os dados de uma propriedade da
+rede (propriedades.py), como a variável de ambiente HOTEL_PROPRIEDADE. Os
+subcomandos também aceitam os nomes em inglês (book, cancel, find,
+stats, export). Códigos de saída: 0 sucesso; 1 reserva recusada, não
+encontrada ou erro de gravação; 2 argumentos inválidos.
+"""
+
+import argparse
+import sys
+
+
+def imprimir_json(dados):
+    """
+    Escreve um documento JSON em uma linha da saída padrão.
+    
+    Args:
+        dados (dict): Documento a escrever
+    """
+    import json
+    
+    print(json.dumps(dados, ensure_ascii=False))
+
+
+def imprimir_erro(mensagem):
+    """
+    Escreve uma mensagem de erro na saída de erros.
+    
+    Args:
+        mensagem (str): Mensagem de erro
+    """
+    print(f"Erro! {mensagem}", file=sys.stderr)
+
+
+def converter_reserva(reserva):
+    """
+    Converte uma reserva para JSON, nos campos da exportação.
+    
+    Args:
+        reserva (Reserva): Reserva
+        
+    Returns:
+        dict: Registro da reserva
+    """
+    from listagem import converter_para_exportacao
+    
+    return converter_para_exportacao(reserva)
+
+
+def carregar_cadastro():
+    """
+    Abre o cadastro completo, com as mensagens do carregamento (arquivo
+    morto, journal) na saída de erros, para que a saída padrão traga só o
+    JSON.
+    
+    Returns:
+        dict: Cadastro de reservas
+    """
+    from contextlib import redirect_stdout
+    from concorrencia import abrir_cadastro
+    
+    with redirect_stdout(sys.stderr):
+        return abrir_cadastro()
+
+
+def buscar_reservas(nome=None, codigo_hash=None):
+    """
+    Busca reservas pelo nome ou pelo código sem montar o cadastro: pelo
+    índice em disco no backend binário e pelo índice de código no SQLite.
+    Nos demais casos (pickle, nome no SQLite) as reservas são carregadas e
+    indexadas em memória.
+    
+    Args:
+        nome (str, optional): Nome ou parte do nome
+        codigo_hash (int, optional): Código da reserva (tem precedência)
+        
+    Returns:
+        list: Reservas encontradas, ordenadas por data de check-in
+    """
+    import os
+    from arquivo import usando_sqlite, usando_binario, obter_caminho_binario
+    
+    if usando_binario() and os.path.exists(obter_caminho_binario()):
+        from indice_busca import buscar_no_livro
+        return buscar_no_livro(nome, codigo_hash)
+    
+    if usando_sqlite() and codigo_hash is not None:
+        from armazenamento_sqlite import banco_existe, buscar_por_codigo_sqlite
+        if banco_existe():
+            reserva = buscar_por_codigo_sqlite(codigo_hash)
+            return [] if reserva is None else [reserva]
+    
+    from contextlib import redirect_stdout
+    from arquivo import carregar_reservas
+    with redirect_stdout(sys.stderr):
+        reservas = carregar_reservas()
+    
+    if codigo_hash is not None:
+        return [reserva for reserva in reservas if reserva.hash == codigo_hash]
+    
+    from indice_nomes import criar_indice_nomes, buscar_nome
+    por_codigo = {reserva.hash: reserva for reserva in reservas}
+    encontradas = [por_codigo[codigo] for codigo in buscar_nome(criar_indice_nomes(reservas), nome)]
+    encontradas.sort(key=lambda reserva: reserva.checkin)
+    return encontradas
+
+
+def comando_reservar(opcoes):
+    """
+    Cria uma reserva, conferindo a disponibilidade contra o cadastro.
+    
+    Args:
+        opcoes (argparse.Namespace): Argumentos do subcomando
+        
+    Returns:
+        int: Código de saída
+    """
+    from importacao import converter_registro
+    from concorrencia import acesso_exclusivo, gravar_operacoes
+    from reserva import aplicar_reserva, ERRO_GRAVACAO
+    
+    dados, erro = converter_registro({
+        'nome': opcoes.nome,
+        'checkin': opcoes.checkin,
+        'checkout': opcoes.checkout,
+        'tipo_quarto': opcoes.tipo,
+        'quantidade_quartos': opcoes.quartos
+    })
+    
+    if erro is None:
+        cadastro = carregar_cadastro()
+        with acesso_exclusivo(cadastro):
+            reserva, erro = aplicar_reserva(cadastro, dados)
+            if erro is None and not gravar_operacoes(cadastro, [("criar", reserva)]):
+                erro = ERRO_GRAVACAO
+    
+    if erro:
+        imprimir_erro(erro)
+        return 1
+    
+    registro = converter_reserva(reserva)
+    registro['quartos'] = list(cadastro['alocacao']['atribuicoes'].get(reserva.hash, ()))
+    imprimir_json(registro)
+    return 0
+
+
+def comando_cancelar(opcoes):
+    """
+    Cancela uma reserva pelo código. Com o journal no backend binário, ou
+    no SQLite, a reserva é localizada pelo índice e o cancelamento é
+    gravado sem carregar as demais reservas.
+    
+    Args:
+        opcoes (argparse.Namespace): Argumentos do subcomando
+        
+    Returns:
+        int: Código de saída
+    """
+    import os
+    from arquivo import (
+        travar_dados,
+        usando_sqlite,
+        usando_binario,
+        usando_journal,
+        obter_caminho_binario,
+        registrar_operacoes
+    )
+    from armazenamento_sqlite import banco_existe
+    from calculo import estadia_concluida
+    from reserva import ERRO_NAO_ENCONTRADA, ERRO_CONCLUIDA, ERRO_GRAVACAO
+    
+    if (usando_sqlite() and banco_existe()) or (
+            usando_binario() and usando_journal() and os.path.exists(obter_caminho_binario())):
+        with travar_dados():
+            encontradas = buscar_reservas(codigo_hash=opcoes.codigo)
+            reserva = encontradas[0] if encontradas else None
+            
+            if reserva is None:
+                erro = ERRO_NAO_ENCONTRADA
+            elif estadia_concluida(reserva):
+                erro = ERRO_CONCLUIDA
+            elif not registrar_operacoes([], [("cancelar", reserva)]):
+                erro = ERRO_GRAVACAO
+            else:
+                erro = None
+    else:
+        from concorrencia import acesso_exclusivo, gravar_operacoes
+        from reserva import aplicar_cancelamento
+        
+        cadastro = carregar_cadastro()
+        with acesso_exclusivo(cadastro):
+            reserva, erro = aplicar_cancelamento(cadastro, opcoes.codigo)
+            if erro is None and not gravar_operacoes(cadastro, [("cancelar", reserva)]):
+                erro = ERRO_GRAVACAO
+    
+    if erro:
+        imprimir_erro(erro)
+        return 1
+    
+    imprimir_json(converter_reserva(reserva))
+    return 0
+
+
+def comando_buscar(opcoes):
+    """
+    Busca reservas pelo nome (ou parte dele) ou pelo código.
+    
+    Args:
+        opcoes (argparse.Namespace): Argumentos do subcomando
+        
+    Returns:
+        int: Código de saída (1 se nenhuma reserva foi encontrada)
+    """
+    reservas = buscar_reservas(opcoes.nome, opcoes.codigo)
+    
+    for reserva in reservas:
+        imprimir_json(converter_reserva(reserva))
+    
+    return 0 if reservas else 1
+
+
+def obter_estatisticas(incluir_arquivo=None):
+    """
+    Obtém as estatísticas gerais. O resumo gravado para a versão atual dos
+    dados é usado sem carregar as reservas; se estiver desatualizado, o
+    cadastro é carregado e o resumo regravado.
+    
+    Args:
+        incluir_arquivo (bool, optional): Inclui as estadias do arquivo
+            morto; padrão ESTATISTICAS_INCLUEM_ARQUIVO
+            
+    Returns:
+        dict: Estatísticas no formato de calculo.calcular_estatisticas ou
+            None se não houver reservas
+    """
+    from arquivo import travar_dados, carregar_resumo_estatisticas
+    
+    with travar_dados():
+        resumo = carregar_resumo_estatisticas()
+    
+    if resumo is None:
+        from concorrencia import acesso_exclusivo, resumir_estatisticas
+        
+        cadastro = carregar_cadastro()
+        with acesso_exclusivo(cadastro):
+            resumo = resumir_estatisticas(cadastro)
+    
+    if incluir_arquivo is None:
+        from config import ESTATISTICAS_INCLUEM_ARQUIVO
+        incluir_arquivo = ESTATISTICAS_INCLUEM_ARQUIVO
+    
+    return resumo['com_arquivo' if incluir_arquivo else 'reservas']
+
+
+def comando_estatisticas(opcoes):
+    """
+    Exibe as estatísticas gerais (ver obter_estatisticas).
+    
+    Args:
+        opcoes (argparse.Namespace): Argumentos do subcomando
+        
+    Returns:
+        int: Código de saída
+    """
+    estatisticas = obter_estatisticas(opcoes.arquivo)
+    if estatisticas is None:
+        imprimir_json({'quantidade_reservas': 0})
+        return 0
+    
+    estatisticas = dict(estatisticas)
+    estatisticas['reserva_mais_cara'] = converter_reserva(estatisticas['reserva_mais_cara'])
+    estatisticas['reserva_mais_longa'] = converter_reserva(estatisticas['reserva_mais_longa'])
+    imprimir_json(estatisticas)
+    return 0
+
+
+def comando_exportar(opcoes):
+    """
+    Exporta as reservas para CSV ou JSONL (ver listagem.executar_exportacao).
+    
+    Args:
+        opcoes (argparse.Namespace): Argumentos do subcomando
+        
+    Returns:
+        int: Código de saída
+    """
+    from listagem import executar_exportacao
+    
+    return executar_exportacao(opcoes.restantes)
+
+
+def criar_parser():
+    """
+    Monta o parser da linha de comando com os subcomandos.
+    
+    Returns:
+        argparse.ArgumentParser: Parser configurado
+    """
+    parser = argparse.ArgumentParser(description="Operações do sistema de reservas para scripts.")
+    parser.add_argument("--propriedade", help="Propriedade da rede (padrão: HOTEL_PROPRIEDADE ou a principal)")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    
+    reservar = subcomandos.add_parser("reservar", aliases=["book"], help="Cria uma reserva")
+    reservar.add_argument("--nome", required=True, help="Nome do responsável")
+    reservar.add_argument("--checkin", required=True, help="Data de check-in (dd/mm/aaaa)")
+    reservar.add_argument("--checkout", required=True, help="Data de check-out (dd/mm/aaaa)")
+    reservar.add_argument("--tipo", required=True, help="Tipo de quarto")
+    reservar.add_argument("--quartos", default="1", help="Quantidade de quartos (padrão: 1)")
+    reservar.set_defaults(executar=comando_reservar)
+    
+    cancelar = subcomandos.add_parser("cancelar", aliases=["cancel"], help="Cancela uma reserva")
+    cancelar.add_argument("codigo", type=int, help="Código da reserva")
+    cancelar.set_defaults(executar=comando_cancelar)
+    
+    buscar = subcomandos.add_parser("buscar", aliases=["find"], help="Busca reservas por nome ou código")
+    criterio = buscar.add_mutually_exclusive_group(required=True)
+    criterio.add_argument("nome", nargs="?", help="Nome ou parte do nome do responsável")
+    criterio.add_argument("--codigo", type=int, help="Código da reserva")
+    buscar.set_defaults(executar=comando_buscar)
+    
+    estatisticas = subcomandos.add_parser("estatisticas", aliases=["stats"], help="Exibe as estatísticas gerais")
+    arquivo = estatisticas.add_mutually_exclusive_group()
+    arquivo.add_argument("--com-arquivo", dest="arquivo", action="store_true", default=None,
+                         help="Inclui as estadias do arquivo morto")
+    arquivo.add_argument("--sem-arquivo", dest="arquivo", action="store_false",
+                         help="Considera só as reservas atuais")
+    estatisticas.set_defaults(executar=comando_estatisticas)
+    
+    # As opções da exportação são repassadas a listagem.py sem interpretação
+    exportar = subcomandos.add_parser("exportar", aliases=["export"], add_help=False,
+                                      help="Exporta reservas para CSV ou JSONL")
+    exportar.set_defaults(executar=comando_exportar)
+    
+    return parser
+
+
+def executar_linha_de_comando(argumentos=None):
+    """
+    Ponto de entrada da linha de comando.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída
+    """
+    parser = criar_parser()
+    opcoes, restantes = parser.parse_known_args(argumentos)
+    
+    if restantes and opcoes.executar is not comando_exportar:
+        parser.error(f"argumentos não reconhecidos: {' '.join(restantes)}")
+    opcoes.restantes = restantes
+    
+    # Os módulos do sistema ainda não foram importados: config lê a
+    # propriedade da variável de ambiente ao ser importado
+    if opcoes.propriedade:
+        import os
+        os.environ["HOTEL_PROPRIEDADE"] = opcoes.propriedade
+    
+    return opcoes.executar(opcoes)
+
+
+if __name__ == "__main__":
+    sys.exit(executar_linha_de_comando())
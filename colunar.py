@@ -0,0 +1,201 @@
+"""
+Módulo da representação colunar das reservas (opcional, requer NumPy).
+Converte a lista de reservas em arrays por campo (datas como ordinais de
+dia, tipo de quarto categórico, quantidades int16 e valores float64) e
+oferece versões vetorizadas das estatísticas e da verificação de
+disponibilidade, para relatórios sobre milhões de reservas históricas.
+"""
+
+from datetime import date
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS
+from registro import Reserva
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def garantir_numpy():
+    """
+    Garante que o NumPy está instalado.
+    
+    Raises:
+        ImportError: Se o NumPy não estiver disponível
+    """
+    if np is None:
+        raise ImportError("A representação colunar requer o NumPy (pip install numpy).")
+
+
+def converter_para_colunas(reservas):
+    """
+    Converte uma coleção de reservas para o formato colunar.
+    
+    O resultado é um dicionário com os arrays 'hash' (int64), 'nome'
+    (object), 'checkin' e 'checkout' (int64, ordinais de dia),
+    'tipo_quarto' (uint8, posição em 'categorias'), 'quantidade_quartos'
+    (int16) e 'valor' (float64).
+    
+    Args:
+        reservas (iterable): Reservas (Reserva)
+        
+    Returns:
+        dict: Reservas em colunas
+    """
+    garantir_numpy()
+    reservas = list(reservas)
+    quantidade = len(reservas)
+    codigos_tipo = {tipo: posicao for posicao, tipo in enumerate(TIPOS_QUARTOS)}
+    
+    return {
+        'categorias': TIPOS_QUARTOS,
+        'hash': np.fromiter((reserva.hash for reserva in reservas), np.int64, quantidade),
+        'nome': np.array([reserva.nome for reserva in reservas], dtype=object),
+        'checkin': np.fromiter((reserva.checkin.toordinal() for reserva in reservas), np.int64, quantidade),
+        'checkout': np.fromiter((reserva.checkout.toordinal() for reserva in reservas), np.int64, quantidade),
+        'tipo_quarto': np.fromiter((codigos_tipo[reserva.tipo_quarto] for reserva in reservas), np.uint8, quantidade),
+        'quantidade_quartos': np.fromiter((reserva.quantidade_quartos for reserva in reservas), np.int16, quantidade),
+        'valor': np.fromiter((reserva.valor for reserva in reservas), np.float64, quantidade)
+    }
+
+
+def reserva_da_linha(colunas, linha):
+    """
+    Reconstrói a reserva de uma linha.
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        linha (int): Posição da reserva
+        
+    Returns:
+        Reserva: Reserva
+    """
+    return Reserva(
+        int(colunas['hash'][linha]),
+        colunas['nome'][linha],
+        date.fromordinal(int(colunas['checkin'][linha])),
+        date.fromordinal(int(colunas['checkout'][linha])),
+        colunas['categorias'][colunas['tipo_quarto'][linha]],
+        int(colunas['quantidade_quartos'][linha]),
+        float(colunas['valor'][linha])
+    )
+
+
+def converter_para_reservas(colunas):
+    """
+    Converte as colunas de volta para a lista de reservas.
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        
+    Returns:
+        list: Lista de reservas
+    """
+    return [reserva_da_linha(colunas, linha) for linha in range(len(colunas['hash']))]
+
+
+def calcular_estatisticas_colunar(colunas):
+    """
+    Versão vetorizada de calculo.calcular_estatisticas, com o mesmo formato
+    de retorno (em empates, vence a primeira reserva, como no original).
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        
+    Returns:
+        dict: Dicionário com as estatísticas ou None se não houver reservas
+    """
+    quantidade = len(colunas['hash'])
+    if not quantidade:
+        return None
+    
+    dias = colunas['checkout'] - colunas['checkin']
+    linha_mais_cara = int(np.argmax(colunas['valor']))
+    linha_mais_longa = int(np.argmax(dias))
+    
+    quartos_por_tipo = np.bincount(
+        colunas['tipo_quarto'],
+        weights=colunas['quantidade_quartos'],
+        minlength=len(colunas['categorias'])
+    )
+    
+    return {
+        'quantidade_reservas': quantidade,
+        'soma_total_valores': float(colunas['valor'].sum()),
+        'reserva_mais_cara': reserva_da_linha(colunas, linha_mais_cara),
+        'reserva_mais_longa': reserva_da_linha(colunas, linha_mais_longa),
+        'dias_mais_longa': int(dias[linha_mais_longa]),
+        'quartos_reservados': {
+            tipo: int(quartos) for tipo, quartos in zip(colunas['categorias'], quartos_por_tipo)
+        }
+    }
+
+
+def calcular_ocupacao_diaria(colunas, tipo_quarto, data_inicio, data_fim):
+    """
+    Calcula os quartos ocupados de um tipo em cada noite de [início, fim),
+    com um vetor de diferenças acumulado (sem laço por reserva).
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        tipo_quarto (str): Tipo do quarto
+        data_inicio (date): Primeira noite do período
+        data_fim (date): Dia seguinte à última noite do período
+        
+    Returns:
+        numpy.ndarray: Quartos ocupados por noite (int64)
+    """
+    inicio = data_inicio.toordinal()
+    noites = data_fim.toordinal() - inicio
+    if noites <= 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    selecao = (
+        (colunas['tipo_quarto'] == colunas['categorias'].index(tipo_quarto))
+        & (colunas['checkin'] < inicio + noites)
+        & (colunas['checkout'] > inicio)
+    )
+    entradas = np.clip(colunas['checkin'][selecao] - inicio, 0, noites)
+    saidas = np.clip(colunas['checkout'][selecao] - inicio, 0, noites)
+    quartos = colunas['quantidade_quartos'][selecao].astype(np.int64)
+    
+    diferencas = np.bincount(entradas, weights=quartos, minlength=noites + 1)
+    diferencas -= np.bincount(saidas, weights=quartos, minlength=noites + 1)
+    return np.cumsum(diferencas[:noites]).astype(np.int64)
+
+
+def verificar_disponibilidade_colunar(colunas, tipo_quarto, data_checkin, data_checkout, quantidade_solicitada):
+    """
+    Versão vetorizada de calculo.verificar_disponibilidade.
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        tipo_quarto (str): Tipo do quarto desejado
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
+        quantidade_solicitada (int): Quantidade de quartos solicitados
+        
+    Returns:
+        bool: True se há disponibilidade, False caso contrário
+    """
+    ocupacao = calcular_ocupacao_diaria(colunas, tipo_quarto, data_checkin, data_checkout)
+    pico = int(ocupacao.max()) if len(ocupacao) else 0
+    return QUARTOS_QUANTIDADE[tipo_quarto] - pico >= quantidade_solicitada
+
+
+def calcular_receita_por_tipo(colunas):
+    """
+    Soma o valor das reservas por tipo de quarto.
+    
+    Args:
+        colunas (dict): Reservas em colunas
+        
+    Returns:
+        dict: Receita total por tipo de quarto
+    """
+    receitas = np.bincount(
+        colunas['tipo_quarto'],
+        weights=colunas['valor'],
+        minlength=len(colunas['categorias'])
+    )
+    return {tipo: float(receita) for tipo, receita in zip(colunas['categorias'], receitas)}
@@ -0,0 +1,226 @@
+"""
+Módulo de concorrência entre processos.
+Permite que várias instâncias do sistema (terminais, serviço HTTP,
+importação) compartilhem o mesmo diretório de dados sem perder gravações.
+
+Cada processo mantém seu cadastro em memória e guarda, em
+cadastro['sincronizacao'], o carimbo de versão (ver arquivo.ler_versao) e as
+posições do journal de reservas e do journal de quartos (ver alocacao.py)
+que já incorporou. As alterações seguem um controle
+otimista: os dados da reserva são coletados sem trava; na hora de gravar, o
+processo adquire a trava, compara o carimbo e, se outro processo gravou
+nesse meio-tempo, incorpora apenas o final do journal (ou recarrega tudo,
+após uma compactação) antes de reconferir a disponibilidade e gravar. A
+trava fica retida só durante essa conferência e a gravação.
+"""
+
+from contextlib import contextmanager
+from arquivo import (
+    travar_dados,
+    ler_versao,
+    ler_journal_desde,
+    tamanho_journal,
+    ler_journal_alocacao,
+    tamanho_journal_alocacao,
+    usando_journal,
+    carregar_reservas,
+    carregar_estatisticas,
+    salvar_estatisticas,
+    salvar_resumo_estatisticas,
+    registrar_operacoes,
+    compactar_journal
+)
+from arquivamento import arquivar_estadias
+from alocacao import registrar_alteracoes, incorporar_atribuicoes
+from cadastro import (
+    criar_cadastro,
+    listar_reservas,
+    reaplicar_operacoes,
+    substituir_reservas,
+    desfazer_operacoes,
+    obter_estatisticas_cadastro
+)
+from metricas import instrumentar
+
+
+def marcar_sincronizacao(cadastro):
+    """
+    Registra no cadastro que ele reflete a versão atual dos dados. Deve ser
+    chamada com a trava dos dados adquirida.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+    """
+    carimbo = ler_versao()
+    carimbo['posicao'] = tamanho_journal()
+    carimbo['posicao_alocacao'] = tamanho_journal_alocacao()
+    cadastro['sincronizacao'] = carimbo
+
+
+def invalidar_sincronizacao(cadastro):
+    """
+    Força a recarga completa do cadastro na próxima sincronização. Após uma
+    falha no meio de uma conferência ou gravação, o cadastro em memória
+    pode não corresponder aos dados gravados.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+    """
+    cadastro['sincronizacao']['compactacoes'] = None
+
+
+def abrir_cadastro():
+    """
+    Carrega as reservas e o acumulador de estatísticas e monta o cadastro
+    sincronizado com a versão atual dos dados. As estadias concluídas são
+    movidas antes para o arquivo morto (ver arquivamento.py).
+    
+    Returns:
+        dict: Cadastro de reservas
+    """
+    with travar_dados():
+        cadastro = criar_cadastro(arquivar_estadias(carregar_reservas()), carregar_estatisticas())
+        marcar_sincronizacao(cadastro)
+    return cadastro
+
+
+@instrumentar
+def sincronizar_cadastro(cadastro):
+    """
+    Incorpora ao cadastro as gravações feitas por outros processos desde a
+    última sincronização. Com o journal, lê apenas os registros novos; após
+    uma compactação (ou nos demais backends), recarrega todas as reservas.
+    Uma alocação de quartos já montada recebe os quartos escolhidos pelo
+    processo que gravou, lidos do journal de quartos (ver gravar_operacoes);
+    após uma recarga completa, ela é remontada na próxima consulta. Deve ser
+    chamada com a trava dos dados adquirida.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        bool: True se havia alterações a incorporar
+    """
+    local = cadastro['sincronizacao']
+    atual = ler_versao()
+    
+    if local['versao'] == atual['versao'] and local['compactacoes'] == atual['compactacoes']:
+        return False
+    
+    # Os quartos das novas reservas foram escolhidos por quem as gravou:
+    # a alocação não participa da reaplicação
+    alocacao = cadastro['alocacao']
+    cadastro['alocacao'] = None
+    
+    if usando_journal() and local['compactacoes'] == atual['compactacoes']:
+        operacoes, posicao = ler_journal_desde(local['posicao'])
+        if posicao == tamanho_journal():
+            reaplicar_operacoes(cadastro, operacoes)
+            entradas, atual['posicao_alocacao'] = ler_journal_alocacao(local['posicao_alocacao'])
+            if alocacao is not None:
+                incorporar_atribuicoes(alocacao, cadastro['reservas'], operacoes, entradas)
+                cadastro['alocacao'] = alocacao
+            atual['posicao'] = posicao
+            cadastro['sincronizacao'] = atual
+            return True
+    
+    # Journal compactado ou com registro incompleto: recarrega tudo
+    substituir_reservas(cadastro, arquivar_estadias(carregar_reservas()))
+    marcar_sincronizacao(cadastro)
+    return True
+
+
+@contextmanager
+def acesso_exclusivo(cadastro):
+    """
+    Adquire a trava dos dados e sincroniza o cadastro; dentro do bloco, o
+    cadastro reflete o estado mais recente e nenhum outro processo grava.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+    """
+    with travar_dados():
+        sincronizar_cadastro(cadastro)
+        yield cadastro
+
+
+def atualizar_cadastro(cadastro):
+    """
+    Sincroniza o cadastro antes de uma consulta, para exibir também as
+    reservas feitas em outros terminais.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        bool: True se havia alterações a incorporar
+    """
+    with travar_dados():
+        return sincronizar_cadastro(cadastro)
+
+
+@instrumentar
+def gravar_operacoes(cadastro, operacoes):
+    """
+    Persiste operações já aplicadas ao cadastro dentro de acesso_exclusivo.
+    As atribuições de quartos alteradas (se a alocação foi montada) são
+    anexadas antes ao journal de quartos, para que os demais processos
+    vejam os mesmos quartos; um registro de quartos sem a operação
+    correspondente é inofensivo. Se a gravação falhar, as operações são
+    desfeitas no cadastro.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        operacoes (list): Operações (operacao, reserva) aplicadas
+        
+    Returns:
+        bool: True se persistiu com sucesso, False caso contrário
+    """
+    if cadastro['alocacao'] is not None:
+        registrar_alteracoes(cadastro['alocacao'])
+    
+    if not registrar_operacoes(listar_reservas(cadastro), operacoes):
+        desfazer_operacoes(cadastro, operacoes)
+        return False
+    
+    marcar_sincronizacao(cadastro)
+    return True
+
+
+def resumir_estatisticas(cadastro):
+    """
+    Calcula e salva o resumo das estatísticas do cadastro, que permite
+    consultá-las sem carregar as reservas enquanto não houver novas
+    gravações (ver cli.py). Deve ser chamada com a trava dos dados
+    adquirida e o cadastro sincronizado.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        dict: Resumo ({'reservas': estatisticas, 'com_arquivo':
+            estatisticas})
+    """
+    resumo = {
+        'reservas': obter_estatisticas_cadastro(cadastro),
+        'com_arquivo': obter_estatisticas_cadastro(cadastro, incluir_arquivo=True)
+    }
+    salvar_resumo_estatisticas(resumo)
+    return resumo
+
+
+def encerrar_cadastro(cadastro):
+    """
+    Compacta os journals de reservas e de quartos e salva o acumulador e o
+    resumo das estatísticas ao encerrar, depois de incorporar as gravações
+    dos demais processos e de registrar os quartos atribuídos só em memória.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+    """
+    with acesso_exclusivo(cadastro):
+        if cadastro['alocacao'] is not None:
+            registrar_alteracoes(cadastro['alocacao'])
+        compactar_journal(listar_reservas(cadastro))
+        salvar_estatisticas(cadastro['estatisticas'])
+        resumir_estatisticas(cadastro)
@@ -3,6 +3,9 @@ Módulo de configuração centralizada do sistema de reservas.
 Contém constantes e configurações globais.
 """
 
+import json
+import os
+
 # Configurações de quartos
 QUARTOS_QUANTIDADE = {
     "standard": 10,
@@ -18,6 +21,129 @@ QUARTOS_VALOR = {
 
 TIPOS_QUARTOS = ("standard", "premium", "luxo")
 
+# Tarifação por data (tarifas.py): a diária de cada noite é a de
+# QUARTOS_VALOR multiplicada pelo fator da temporada, pelo acréscimo de fim
+# de semana e pelo acréscimo de ocupação do tipo de quarto naquela noite.
+# Temporadas: (início (mês, dia), fim (mês, dia), fator), com as duas datas
+# incluídas; a temporada pode atravessar o ano. Se houver mais de uma, vale
+# o maior fator.
+TEMPORADAS = (
+    ((12, 20), (1, 6), 1.30),
+    ((7, 1), (7, 31), 1.15)
+)
+# Noites de fim de semana (dia da semana em que a noite começa: 0 = segunda)
+# e fator do acréscimo
+NOITES_FIM_DE_SEMANA = (4, 5)
+FATOR_FIM_DE_SEMANA = 1.10
+# Faixas de ocupação: (ocupação mínima da noite, fator); vale a maior faixa
+# atingida pelos quartos já reservados do tipo
+FAIXAS_OCUPACAO = (
+    (0.70, 1.10),
+    (0.90, 1.25)
+)
+# Dias, a partir de hoje, com as diárias pré-calculadas; estadias além do
+# horizonte são cotadas noite a noite
+HORIZONTE_TARIFAS = 730
+
+# Quantidade de reservas exibidas por página na listagem
+TAMANHO_PAGINA = 10
+
 # Configurações de arquivo
 DIRETORIO_DADOS = "data"
 ARQUIVO_RESERVAS = "reservas.pkl"
+ARQUIVO_JOURNAL = "reservas.journal"
+ARQUIVO_BINARIO = "reservas.bin"
+ARQUIVO_JOURNAL_BINARIO = "reservas.bin.journal"
+ARQUIVO_SQLITE = "reservas.db"
+ARQUIVO_ESTATISTICAS = "estatisticas.json"
+ARQUIVO_RESUMO_ESTATISTICAS = "estatisticas.resumo.json"
+ARQUIVO_INDICE_BUSCA = "reservas.bin.indice"
+ARQUIVO_ALOCACAO = "alocacao.json"
+ARQUIVO_JOURNAL_ALOCACAO = "alocacao.journal"
+ARQUIVO_TRAVA = "reservas.lock"
+ARQUIVO_VERSAO = "reservas.versao"
+
+# Gravação do arquivo de reservas (pickle e binário): cada gravação vai para
+# um temporário, recebe fsync e substitui o arquivo com uma renomeação
+# atômica; um rodapé com o CRC32 do conteúdo é conferido ao carregar. As
+# GERACOES_RESERVAS gravações anteriores são mantidas (reservas.bin.1 é a
+# mais recente) e, se o arquivo estiver corrompido, o carregamento usa a
+# geração íntegra mais recente
+GERACOES_RESERVAS = 3
+
+# Backend de armazenamento: "pickle", "binario" ou "sqlite". O binário
+# (formato_binario.py) é aberto com mmap e não executa código ao carregar;
+# um reservas.pkl existente é convertido automaticamente no primeiro uso.
+BACKEND_ARMAZENAMENTO = "binario"
+
+# Grava cada criação/cancelamento como um registro no journal em vez de
+# reescrever o arquivo de reservas inteiro a cada alteração (backends pickle
+# e binario)
+USAR_JOURNAL = True
+
+# Confere as estatísticas acumuladas contra um recálculo completo sempre que
+# forem exibidas (mais lento; útil para diagnosticar divergências)
+VERIFICAR_ESTATISTICAS = False
+
+# Serviço HTTP (servidor.py)
+SERVIDOR_HOST = "127.0.0.1"
+SERVIDOR_PORTA = 8080
+# Máximo de operações de escrita gravadas juntas pelo escritor do serviço
+TAMANHO_LOTE_ESCRITA = 256
+
+# Instrumentação de desempenho (metricas.py): contagem de chamadas e
+# histogramas de latência das funções principais. Desativada, não há custo.
+COLETAR_METRICAS = False
+ARQUIVO_METRICAS = "metricas.prom"
+
+# Sugestões quando não há disponibilidade (calendario.py): dias procurados
+# antes e depois do check-in pedido e quantidade de períodos sugeridos
+HORIZONTE_SUGESTOES = 365
+MAXIMO_SUGESTOES = 3
+# Maior período aceito pelo calendário de disponibilidade do serviço HTTP e
+# maior estadia aceita numa reserva
+HORIZONTE_CALENDARIO = 730
+
+# Alocação de quartos (alocacao.py): os quartos são numerados a partir de 1,
+# na ordem de TIPOS_QUARTOS. Se uma nova reserva não couber em nenhuma
+# lacuna dos quartos do tipo, as reservas futuras do tipo são redistribuídas
+# (as estadias em andamento não mudam de quarto)
+REORGANIZAR_QUARTOS = True
+
+# Arquivo morto (arquivamento.py): ao carregar, as estadias com check-out já
+# passado saem do armazenamento principal para segmentos mensais (pelo mês
+# do check-in) em data/arquivo, comprimidos com gzip
+ARQUIVAR_ESTADIAS = True
+DIRETORIO_ARQUIVO = "arquivo"
+ARQUIVO_RESUMO_ARQUIVO = "resumo.json"
+COMPRIMIR_ARQUIVO = True
+# Inclui as estadias arquivadas nas estatísticas gerais (menu e /estatisticas)
+ESTATISTICAS_INCLUEM_ARQUIVO = True
+
+# Propriedades da rede (propriedades.py). Cada processo atende uma única
+# propriedade, escolhida pela variável de ambiente HOTEL_PROPRIEDADE (ou
+# pela opção --propriedade de cli.py). A PROPRIEDADE_PADRAO usa o inventário
+# acima e os dados direto em data/; as demais têm um diretório próprio em
+# data/propriedades/<id>/ (com o mesmo conteúdo de data/), cujo
+# inventario.json substitui QUARTOS_QUANTIDADE, QUARTOS_VALOR e
+# TIPOS_QUARTOS. Uma propriedade nunca lê nem trava os dados de outra.
+VARIAVEL_PROPRIEDADE = "HOTEL_PROPRIEDADE"
+PROPRIEDADE_PADRAO = "flor-de-lotus"
+NOME_PROPRIEDADE = "Hotel Flor de Lótus"
+DIRETORIO_PROPRIEDADES = os.path.join(DIRETORIO_DADOS, "propriedades")
+ARQUIVO_INVENTARIO = "inventario.json"
+PROPRIEDADE = os.environ.get(VARIAVEL_PROPRIEDADE) or PROPRIEDADE_PADRAO
+
+if PROPRIEDADE != PROPRIEDADE_PADRAO:
+    if os.path.basename(PROPRIEDADE) != PROPRIEDADE or PROPRIEDADE.startswith("."):
+        raise SystemExit(f"Erro! Propriedade inválida: {PROPRIEDADE}")
+    DIRETORIO_DADOS = os.path.join(DIRETORIO_PROPRIEDADES, PROPRIEDADE)
+    try:
+        with open(os.path.join(DIRETORIO_DADOS, ARQUIVO_INVENTARIO), encoding="utf-8") as _arquivo:
+            _inventario = json.load(_arquivo)
+        QUARTOS_QUANTIDADE = {tipo: int(quantidade) for tipo, quantidade in _inventario['quartos'].items()}
+        QUARTOS_VALOR = {tipo: float(_inventario['valores'][tipo]) for tipo in QUARTOS_QUANTIDADE}
+        NOME_PROPRIEDADE = str(_inventario.get('nome') or PROPRIEDADE)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as _erro:
+        raise SystemExit(f"Erro! Inventário da propriedade '{PROPRIEDADE}' inválido ou ausente: {_erro}")
+    TIPOS_QUARTOS = tuple(QUARTOS_QUANTIDADE)
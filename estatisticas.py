@@ -0,0 +1,181 @@
+"""
+Módulo do acumulador de estatísticas.
+Mantém as estatísticas gerais atualizadas a cada reserva criada ou
+cancelada, evitando percorrer todas as reservas a cada consulta. A reserva
+mais cara e a mais longa são acompanhadas por heaps com remoção preguiçosa:
+entradas de reservas canceladas só são descartadas quando chegam ao topo.
+"""
+
+import heapq
+import math
+from config import TIPOS_QUARTOS
+from calculo import calcular_dias_estadia, calcular_estatisticas
+
+
+def criar_acumulador(reservas=()):
+    """
+    Cria o acumulador de estatísticas a partir de uma coleção de reservas.
+    
+    O acumulador é um dicionário com os totais, a contagem de quartos por
+    tipo, os heaps 'heap_valor' e 'heap_dias' com entradas
+    (-chave, sequencia, codigo) e o mapa 'sequencias' {codigo: sequencia}
+    das reservas ativas. A sequência preserva a ordem de inserção, de modo
+    que, em caso de empate, vence a reserva mais antiga.
+    
+    Args:
+        reservas (iterable): Reservas existentes
+        
+    Returns:
+        dict: Acumulador de estatísticas
+    """
+    acumulador = {
+        'quantidade_reservas': 0,
+        'soma_total_valores': 0.0,
+        'quartos_reservados': {tipo: 0 for tipo in TIPOS_QUARTOS},
+        'heap_valor': [],
+        'heap_dias': [],
+        'sequencias': {},
+        'proxima_sequencia': 0
+    }
+    
+    for reserva in reservas:
+        registrar_no_acumulador(acumulador, reserva)
+    
+    return acumulador
+
+
+def registrar_no_acumulador(acumulador, reserva):
+    """
+    Soma uma reserva criada às estatísticas.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        reserva (Reserva): Reserva criada
+    """
+    sequencia = acumulador['proxima_sequencia']
+    acumulador['proxima_sequencia'] = sequencia + 1
+    acumulador['sequencias'][reserva.hash] = sequencia
+    
+    acumulador['quantidade_reservas'] += 1
+    acumulador['soma_total_valores'] += reserva.valor
+    quartos = acumulador['quartos_reservados']
+    quartos[reserva.tipo_quarto] = quartos.get(reserva.tipo_quarto, 0) + reserva.quantidade_quartos
+    
+    dias = calcular_dias_estadia(reserva.checkin, reserva.checkout)
+    heapq.heappush(acumulador['heap_valor'], (-reserva.valor, sequencia, reserva.hash))
+    heapq.heappush(acumulador['heap_dias'], (-dias, sequencia, reserva.hash))
+
+
+def remover_do_acumulador(acumulador, reserva):
+    """
+    Retira uma reserva cancelada das estatísticas. As entradas dos heaps
+    permanecem até chegarem ao topo ou até a próxima reconstrução.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        reserva (Reserva): Reserva cancelada
+    """
+    if acumulador['sequencias'].pop(reserva.hash, None) is None:
+        return
+    
+    acumulador['quantidade_reservas'] -= 1
+    acumulador['soma_total_valores'] -= reserva.valor
+    acumulador['quartos_reservados'][reserva.tipo_quarto] -= reserva.quantidade_quartos
+    
+    # Reconstrói os heaps quando as entradas removidas passam a ser maioria
+    ativos = len(acumulador['sequencias'])
+    for chave in ('heap_valor', 'heap_dias'):
+        heap = acumulador[chave]
+        if len(heap) > 2 * ativos + 64:
+            heap[:] = [entrada for entrada in heap if acumulador['sequencias'].get(entrada[2]) == entrada[1]]
+            heapq.heapify(heap)
+
+
+def topo_valido(acumulador, chave):
+    """
+    Descarta as entradas de reservas canceladas no topo de um heap e
+    retorna a entrada válida do topo.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        chave (str): 'heap_valor' ou 'heap_dias'
+        
+    Returns:
+        tuple: Entrada (-chave, sequencia, codigo) ou None se vazio
+    """
+    heap = acumulador[chave]
+    sequencias = acumulador['sequencias']
+    
+    while heap and sequencias.get(heap[0][2]) != heap[0][1]:
+        heapq.heappop(heap)
+    
+    return heap[0] if heap else None
+
+
+def obter_estatisticas(acumulador, reservas_por_codigo):
+    """
+    Monta as estatísticas gerais a partir do acumulador, no mesmo formato
+    de calculo.calcular_estatisticas.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        reservas_por_codigo (dict): Reservas ativas indexadas pelo código
+        
+    Returns:
+        dict: Dicionário com as estatísticas ou None se não houver reservas
+    """
+    if not acumulador['quantidade_reservas']:
+        return None
+    
+    mais_cara = topo_valido(acumulador, 'heap_valor')
+    mais_longa = topo_valido(acumulador, 'heap_dias')
+    
+    return {
+        'quantidade_reservas': acumulador['quantidade_reservas'],
+        'soma_total_valores': acumulador['soma_total_valores'],
+        'reserva_mais_cara': reservas_por_codigo[mais_cara[2]],
+        'reserva_mais_longa': reservas_por_codigo[mais_longa[2]],
+        'dias_mais_longa': -mais_longa[0],
+        'quartos_reservados': dict(acumulador['quartos_reservados'])
+    }
+
+
+def acumulador_corresponde(acumulador, reservas_por_codigo):
+    """
+    Indica se um acumulador (por exemplo, carregado do disco) descreve
+    exatamente as reservas informadas.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        reservas_por_codigo (dict): Reservas ativas indexadas pelo código
+        
+    Returns:
+        bool: True se os códigos acompanhados são os mesmos
+    """
+    return acumulador['sequencias'].keys() == reservas_por_codigo.keys()
+
+
+def verificar_acumulador(acumulador, reservas_por_codigo):
+    """
+    Confere o acumulador contra o recálculo completo das estatísticas.
+    
+    Args:
+        acumulador (dict): Acumulador de estatísticas
+        reservas_por_codigo (dict): Reservas ativas indexadas pelo código
+        
+    Returns:
+        bool: True se o acumulador está consistente
+    """
+    esperadas = calcular_estatisticas(reservas_por_codigo.values())
+    obtidas = obter_estatisticas(acumulador, reservas_por_codigo)
+    
+    if esperadas is None or obtidas is None:
+        return esperadas is None and obtidas is None
+    
+    return (
+        obtidas['quantidade_reservas'] == esperadas['quantidade_reservas']
+        and math.isclose(obtidas['soma_total_valores'], esperadas['soma_total_valores'], abs_tol=0.005)
+        and obtidas['reserva_mais_cara']['valor'] == esperadas['reserva_mais_cara']['valor']
+        and obtidas['dias_mais_longa'] == esperadas['dias_mais_longa']
+        and obtidas['quartos_reservados'] == esperadas['quartos_reservados']
+    )
@@ -0,0 +1,117 @@
+"""
+Módulo de geração de códigos de reserva.
+Os códigos são inteiros de 63 bits ordenados pelo instante de criação, no
+formato:
+
+    | 41 bits: milissegundos desde EPOCA_CODIGOS | 10 bits: nó | 12 bits: sequência |
+
+O nó é derivado do pid, para que processos diferentes gerem códigos
+distintos no mesmo milissegundo, e a sequência distingue os códigos de um
+mesmo processo. Os códigos são crescentes dentro do processo (mesmo se o
+relógio voltar), cabem em um INTEGER do SQLite e em um int64 do NumPy e
+podem ser decodificados em O(1).
+
+Códigos antigos (gerados por hash) continuam válidos para consulta e
+cancelamento; apenas não carregam o instante de criação.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+# Início da contagem dos milissegundos (41 bits cobrem cerca de 69 anos)
+EPOCA_CODIGOS = datetime(2024, 1, 1)
+EPOCA_MS = int(EPOCA_CODIGOS.timestamp() * 1000)
+
+BITS_NO = 10
+BITS_SEQUENCIA = 12
+MASCARA_NO = (1 << BITS_NO) - 1
+MASCARA_SEQUENCIA = (1 << BITS_SEQUENCIA) - 1
+DESLOCAMENTO_TEMPO = BITS_NO + BITS_SEQUENCIA
+
+# Último milissegundo e sequência usados neste processo
+ESTADO_GERADOR = {'pid': None, 'no': 0, 'ultimo_ms': 0, 'sequencia': 0}
+
+
+def gerar_codigo(em_uso=()):
+    """
+    Gera um novo código de reserva, crescente em relação aos anteriores do
+    mesmo processo.
+    
+    Se a sequência do milissegundo se esgotar, o código avança para o
+    milissegundo seguinte em vez de aguardar o relógio.
+    
+    Args:
+        em_uso (container, optional): Códigos já existentes (por exemplo,
+            o índice do cadastro); um código em uso nunca é devolvido
+            
+    Returns:
+        int: Código positivo de até 63 bits
+    """
+    estado = ESTADO_GERADOR
+    pid = os.getpid()
+    if estado['pid'] != pid:
+        # Processo novo (ou filho criado com fork): recalcula o nó
+        estado['pid'] = pid
+        estado['no'] = pid & MASCARA_NO
+    
+    while True:
+        agora = int(time.time() * 1000) - EPOCA_MS
+        
+        if agora > estado['ultimo_ms']:
+            estado['ultimo_ms'] = agora
+            estado['sequencia'] = 0
+        else:
+            estado['sequencia'] = (estado['sequencia'] + 1) & MASCARA_SEQUENCIA
+            if estado['sequencia'] == 0:
+                estado['ultimo_ms'] += 1
+        
+        codigo = (
+            (estado['ultimo_ms'] << DESLOCAMENTO_TEMPO)
+            | (estado['no'] << BITS_SEQUENCIA)
+            | estado['sequencia']
+        )
+        if codigo not in em_uso:
+            return codigo
+
+
+def decodificar_codigo(codigo):
+    """
+    Extrai o instante de criação, o nó e a sequência de um código.
+    
+    Args:
+        codigo (int): Código da reserva
+        
+    Returns:
+        dict: {'criado_em': datetime, 'no': int, 'sequencia': int}, ou None
+            para códigos que apontam para um instante no futuro — o caso da
+            grande maioria dos códigos antigos (gerados por hash); os demais
+            códigos antigos decodificam para instantes sem significado
+    """
+    milissegundos = codigo >> DESLOCAMENTO_TEMPO
+    if codigo < 0 or milissegundos > int(time.time() * 1000) - EPOCA_MS + 60_000:
+        return None
+    
+    return {
+        'criado_em': EPOCA_CODIGOS + timedelta(milliseconds=milissegundos),
+        'no': (codigo >> BITS_SEQUENCIA) & MASCARA_NO,
+        'sequencia': codigo & MASCARA_SEQUENCIA
+    }
+
+
+def intervalo_codigos(inicio, fim):
+    """
+    Retorna a faixa de códigos criados no intervalo [inicio, fim), para
+    varreduras por instante de criação (por exemplo, "hash BETWEEN ? AND ?"
+    no SQLite).
+    
+    Args:
+        inicio (datetime): Início do intervalo
+        fim (datetime): Fim do intervalo (exclusivo)
+        
+    Returns:
+        tuple: (menor_codigo, maior_codigo), ambos inclusivos
+    """
+    ms_inicio = max(int((inicio - EPOCA_CODIGOS).total_seconds() * 1000), 0)
+    ms_fim = max(int((fim - EPOCA_CODIGOS).total_seconds() * 1000), 0)
+    return ms_inicio << DESLOCAMENTO_TEMPO, (ms_fim << DESLOCAMENTO_TEMPO) - 1
@@ -0,0 +1,266 @@
+"""
+Módulo de importação de reservas em lote.
+Lê arquivos CSV ou JSONL (exportações de OTAs, reservas de grupos etc.)
+registro a registro, valida cada linha com as mesmas regras da coleta
+interativa, confere a disponibilidade do lote contra o índice de ocupação
+diária e grava todas as reservas aceitas com uma única operação de
+persistência. A cotação, a atribuição de quartos e o índice de nomes são
+feitos uma única vez para o lote aceito, não linha a linha.
+
+Uso:
+    python importacao.py reservas.csv [--rejeitadas rejeitadas.csv]
+
+Colunas (CSV com cabeçalho) ou chaves (JSONL):
+    nome, checkin, checkout, tipo_quarto, quantidade_quartos
+com datas no formato dd/mm/aaaa.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from utils import formatar_nome, converter_data
+from calculo import validar_dados_reserva, verificar_disponibilidade
+from cadastro import adicionar_lote
+from ocupacao import registrar_ocupacao
+from concorrencia import abrir_cadastro, acesso_exclusivo, gravar_operacoes
+from identificador import gerar_codigo
+from tarifas import obter_tabela_tarifas, cotar_lote
+from alocacao import obter_alocacao
+from registro import Reserva
+from reserva import ERRO_INDISPONIVEL
+
+CAMPOS = ("nome", "checkin", "checkout", "tipo_quarto", "quantidade_quartos")
+
+
+def ler_registros(caminho):
+    """
+    Lê os registros de um arquivo CSV ou JSONL sem carregá-lo inteiro.
+    O formato é definido pela extensão (.jsonl/.json ou CSV nos demais).
+    
+    Args:
+        caminho (str): Caminho do arquivo
+        
+    Yields:
+        tuple: (numero_linha, registro) com registro como dicionário, ou
+            (numero_linha, None) para linhas JSONL ilegíveis
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        if extensao in (".jsonl", ".json"):
+            for numero_linha, linha in enumerate(arquivo, start=1):
+                if not linha.strip():
+                    continue
+                try:
+                    yield numero_linha, json.loads(linha)
+                except json.JSONDecodeError:
+                    yield numero_linha, None
+        else:
+            # A linha 1 é o cabeçalho
+            for numero_linha, registro in enumerate(csv.DictReader(arquivo), start=2):
+                yield numero_linha, registro
+
+
+def converter_quantidade(valor):
+    """
+    Converte a quantidade de quartos de um registro, aceitando apenas
+    inteiros ou texto com um inteiro (números fracionários não são
+    truncados).
+    
+    Args:
+        valor: Quantidade lida do arquivo
+        
+    Returns:
+        int: Quantidade de quartos
+        
+    Raises:
+        ValueError: Se o texto não for um número inteiro
+        TypeError: Se o valor não for inteiro nem texto
+    """
+    if isinstance(valor, str):
+        return int(valor)
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return valor
+    raise TypeError(f"Quantidade de quartos inválida: {valor!r}")
+
+
+def converter_registro(registro):
+    """
+    Converte um registro lido do arquivo nos dados de uma reserva. As
+    regras de negócio são validadas depois, em importar_reservas.
+    
+    Args:
+        registro (dict): Registro com os CAMPOS em texto; qualquer outro
+            valor (linha JSONL ilegível ou que não seja um objeto) é
+            rejeitado
+            
+    Returns:
+        tuple: (dados, motivo) — dados válidos e None, ou None e o motivo
+            da rejeição
+    """
+    if not isinstance(registro, dict):
+        return None, "Linha ilegível."
+    
+    faltando = [campo for campo in CAMPOS if registro.get(campo) in (None, "")]
+    if faltando:
+        return None, f"Campos ausentes: {', '.join(faltando)}."
+    
+    try:
+        dados = {
+            'nome': formatar_nome(str(registro['nome'])),
+            'checkin': converter_data(str(registro['checkin'])),
+            'checkout': converter_data(str(registro['checkout'])),
+            'tipo_quarto': str(registro['tipo_quarto']).strip().lower(),
+            'quantidade_quartos': converter_quantidade(registro['quantidade_quartos'])
+        }
+    except (ValueError, TypeError):
+        return None, "Datas devem estar no formato dd/mm/aaaa e a quantidade deve ser um número inteiro."
+    
+    return dados, None
+
+
+def importar_reservas(cadastro, registros):
+    """
+    Importa um lote de registros para o cadastro.
+    
+    Os registros são validados com as regras da coleta interativa e o lote
+    válido é cotado de uma só vez (tarifas.cotar_lote), com a ocupação
+    anterior ao lote: o valor de uma linha não depende das linhas que a
+    precedem no arquivo. Em seguida, cada registro é conferido contra o
+    índice de ocupação, que já inclui as reservas aceitas anteriormente
+    no mesmo lote, e as aceitas recebem quartos e entram nos índices de
+    uma só vez (cadastro.adicionar_lote). Ao final, todas as reservas
+    aceitas são gravadas com uma única operação de persistência; se ela
+    falhar, o lote inteiro é desfeito. Deve ser chamada dentro de
+    concorrencia.acesso_exclusivo.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        registros (iterable): Pares (numero_linha, registro)
+        
+    Returns:
+        dict: Resultado com 'aceitas' (list), 'rejeitadas' (list de
+            (numero_linha, motivo)) e 'gravado' (bool)
+    """
+    validos = []
+    rejeitadas = []
+    
+    for numero_linha, registro in registros:
+        dados, motivo = converter_registro(registro)
+        if dados is not None:
+            motivo = validar_dados_reserva(dados)
+        
+        if motivo:
+            rejeitadas.append((numero_linha, motivo))
+        else:
+            validos.append((numero_linha, dados))
+    
+    valores = cotar_lote(obter_tabela_tarifas(cadastro), [
+        (dados['tipo_quarto'], dados['checkin'], dados['checkout'], dados['quantidade_quartos'])
+        for _, dados in validos
+    ])
+    
+    aceitas = []
+    ocupacao = cadastro['ocupacao']
+    
+    for (numero_linha, dados), valor in zip(validos, valores):
+        disponivel = verificar_disponibilidade(
+            (),
+            dados['tipo_quarto'],
+            dados['checkin'],
+            dados['checkout'],
+            dados['quantidade_quartos'],
+            ocupacao
+        )
+        if not disponivel:
+            rejeitadas.append((numero_linha, ERRO_INDISPONIVEL))
+            continue
+        
+        reserva = Reserva(
+            gerar_codigo(cadastro['reservas']),
+            dados['nome'],
+            dados['checkin'],
+            dados['checkout'],
+            dados['tipo_quarto'],
+            dados['quantidade_quartos'],
+            valor
+        )
+        registrar_ocupacao(ocupacao, reserva)
+        aceitas.append(reserva)
+    
+    # Rejeições na ordem das linhas do arquivo
+    rejeitadas.sort()
+    obter_alocacao(cadastro)
+    adicionar_lote(cadastro, aceitas)
+    
+    gravado = True
+    if aceitas:
+        gravado = gravar_operacoes(cadastro, [("criar", reserva) for reserva in aceitas])
+    
+    return {'aceitas': aceitas, 'rejeitadas': rejeitadas, 'gravado': gravado}
+
+
+def salvar_rejeitadas(caminho, rejeitadas):
+    """
+    Grava as linhas rejeitadas e seus motivos em um arquivo CSV.
+    
+    Args:
+        caminho (str): Caminho do arquivo de saída
+        rejeitadas (list): Pares (numero_linha, motivo)
+    """
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(("linha", "motivo"))
+        escritor.writerows(rejeitadas)
+
+
+def executar_importacao(argumentos=None):
+    """
+    Ponto de entrada da importação pela linha de comando.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída (0 sucesso, 1 falha na gravação)
+    """
+    parser = argparse.ArgumentParser(description="Importa reservas em lote de arquivos CSV ou JSONL.")
+    parser.add_argument("arquivo", help="Arquivo .csv ou .jsonl com as reservas")
+    parser.add_argument("--rejeitadas", help="Grava as linhas rejeitadas e os motivos neste CSV")
+    opcoes = parser.parse_args(argumentos)
+    
+    cadastro = abrir_cadastro()
+    
+    inicio = time.perf_counter()
+    with acesso_exclusivo(cadastro):
+        resultado = importar_reservas(cadastro, ler_registros(opcoes.arquivo))
+    duracao = time.perf_counter() - inicio
+    
+    if not resultado['gravado']:
+        print("Erro ao gravar as reservas importadas. Nenhuma reserva foi importada.")
+        return 1
+    
+    total = len(resultado['aceitas']) + len(resultado['rejeitadas'])
+    print(f"Registros lidos: {total}")
+    print(f"Reservas importadas: {len(resultado['aceitas'])}")
+    print(f"Registros rejeitados: {len(resultado['rejeitadas'])}")
+    if duracao > 0:
+        print(f"Tempo: {duracao:.2f} s ({total / duracao:,.0f} registros/s)")
+    
+    if opcoes.rejeitadas:
+        salvar_rejeitadas(opcoes.rejeitadas, resultado['rejeitadas'])
+        print(f"Rejeições gravadas em {opcoes.rejeitadas}")
+    else:
+        for numero_linha, motivo in resultado['rejeitadas'][:20]:
+            print(f"  Linha {numero_linha}: {motivo}")
+        if len(resultado['rejeitadas']) > 20:
+            print("  ... use --rejeitadas para gravar a lista completa")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_importacao())
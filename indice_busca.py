@@ -0,0 +1,351 @@
+"""
+Módulo do índice de busca em disco do livro binário.
+Guarda, ao lado de reservas.bin, os códigos das reservas em ordem e as
+palavras normalizadas dos nomes (como em indice_nomes.py) com as posições
+das reservas que as contêm. O índice é aberto com mmap e consultado por
+busca binária: localizar reservas pelo código ou pelo nome lê só algumas
+páginas do índice e decodifica só as reservas encontradas, sem carregar o
+livro inteiro.
+
+Estrutura do arquivo (inteiros little-endian):
+
+    cabeçalho    CABECALHO: assinatura, versão, identificação do livro
+                 indexado (tamanho, modificação e inode), quantidades de
+                 códigos, palavras e ocorrências e tamanho do texto
+    códigos      um CODIGO (código, posição da reserva no livro) por
+                 reserva, em ordem crescente de código
+    palavras     uma PALAVRA (posição e tamanho do texto, primeira
+                 ocorrência e quantidade de ocorrências) por palavra, em
+                 ordem alfabética
+    ocorrências  posições das reservas (uint32), agrupadas por palavra
+    texto        palavras em UTF-8, concatenadas
+
+O índice vale para uma versão do livro: quando reservas.bin é regravado
+(compactação do journal), ele é reconstruído na busca seguinte. As
+operações ainda no journal são aplicadas sobre o resultado.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from config import DIRETORIO_DADOS, ARQUIVO_INDICE_BUSCA
+from arquivo import travar_dados, obter_caminho_binario, ler_journal, gravar_atomicamente
+from formato_binario import REGISTRO, abrir_binario, fechar_binario, ler_reserva, ler_nomes
+from indice_nomes import normalizar_texto, extrair_palavras, criar_indice_nomes, buscar_nome
+
+ASSINATURA = b"HFLI"
+VERSAO_FORMATO = 1
+
+CABECALHO = struct.Struct("<4sHHQqQQQQQ")
+CODIGO = struct.Struct("<qI4x")
+PALAVRA = struct.Struct("<IIII")
+OCORRENCIA = "I"
+
+
+def obter_caminho_indice_busca():
+    """
+    Retorna o caminho completo do índice de busca.
+    
+    Returns:
+        str: Caminho completo do arquivo
+    """
+    return os.path.join(DIRETORIO_DADOS, ARQUIVO_INDICE_BUSCA)
+
+
+def identificar_livro(caminho):
+    """
+    Identifica a versão gravada de um livro binário: regravar o arquivo
+    muda o tamanho, a data de modificação ou o inode.
+    
+    Args:
+        caminho (str): Arquivo de reservas
+        
+    Returns:
+        tuple: (tamanho, modificação em ns, inode)
+    """
+    situacao = os.stat(caminho)
+    return situacao.st_size, situacao.st_mtime_ns, situacao.st_ino
+
+
+def criar_indice_busca(livro, identificacao):
+    """
+    Monta e grava o índice de busca de um livro aberto.
+    
+    Args:
+        livro (dict): Livro aberto por abrir_binario
+        identificacao (tuple): Identificação do livro (identificar_livro)
+    """
+    inicio = livro['inicio_registros']
+    registros = memoryview(livro['mapa'])[inicio:inicio + livro['quantidade'] * REGISTRO.size]
+    try:
+        codigos = sorted(
+            (registro[0], posicao) for posicao, registro in enumerate(REGISTRO.iter_unpack(registros))
+        )
+    finally:
+        registros.release()
+    
+    palavras = {}
+    for posicao, nome in enumerate(ler_nomes(livro)):
+        for palavra in extrair_palavras(nome):
+            posicoes = palavras.get(palavra)
+            if posicoes is None:
+                posicoes = palavras[palavra] = array(OCORRENCIA)
+            posicoes.append(posicao)
+    
+    tabela_codigos = bytearray()
+    for codigo, posicao in codigos:
+        tabela_codigos += CODIGO.pack(codigo, posicao)
+    
+    # A ordem dos bytes em UTF-8 é a mesma dos textos, o que permite a
+    # busca binária comparando bytes direto do arquivo mapeado
+    tabela_palavras = bytearray()
+    ocorrencias = array(OCORRENCIA)
+    texto = bytearray()
+    for palavra in sorted(palavras):
+        codificada = palavra.encode("utf-8")
+        tabela_palavras += PALAVRA.pack(len(texto), len(codificada), len(ocorrencias), len(palavras[palavra]))
+        ocorrencias.extend(palavras[palavra])
+        texto += codificada
+    if sys.byteorder == "big":
+        ocorrencias.byteswap()
+    
+    gravar_atomicamente(obter_caminho_indice_busca(), b"".join((
+        CABECALHO.pack(
+            ASSINATURA, VERSAO_FORMATO, 0, *identificacao,
+            len(codigos), len(palavras), len(ocorrencias), len(texto)
+        ),
+        tabela_codigos,
+        tabela_palavras,
+        ocorrencias.tobytes(),
+        texto
+    )))
+
+
+def abrir_indice_busca(identificacao):
+    """
+    Abre o índice de busca com mmap, se ele corresponder à versão atual do
+    livro.
+    
+    Args:
+        identificacao (tuple): Identificação do livro (identificar_livro)
+        
+    Returns:
+        dict: Índice aberto ou None se não existir, estiver incompleto ou
+            for de outra versão do livro
+    """
+    try:
+        with open(obter_caminho_indice_busca(), "rb") as arquivo:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # Inexistente ou vazio
+        return None
+    
+    if len(mapa) >= CABECALHO.size:
+        (assinatura, versao, _, tamanho, modificacao, inode, quantidade_codigos,
+         quantidade_palavras, quantidade_ocorrencias, tamanho_texto) = CABECALHO.unpack_from(mapa)
+        
+        inicio_palavras = CABECALHO.size + quantidade_codigos * CODIGO.size
+        inicio_ocorrencias = inicio_palavras + quantidade_palavras * PALAVRA.size
+        inicio_texto = inicio_ocorrencias + quantidade_ocorrencias * array(OCORRENCIA).itemsize
+        
+        if (assinatura == ASSINATURA and versao == VERSAO_FORMATO
+                and (tamanho, modificacao, inode) == identificacao
+                and inicio_texto + tamanho_texto == len(mapa)):
+            return {
+                'mapa': mapa,
+                'quantidade_codigos': quantidade_codigos,
+                'quantidade_palavras': quantidade_palavras,
+                'inicio_palavras': inicio_palavras,
+                'inicio_ocorrencias': inicio_ocorrencias,
+                'inicio_texto': inicio_texto
+            }
+    
+    mapa.close()
+    return None
+
+
+def buscar_codigo_indice(indice, codigo_hash):
+    """
+    Localiza uma reserva pelo código, por busca binária.
+    
+    Args:
+        indice (dict): Índice aberto por abrir_indice_busca
+        codigo_hash (int): Código da reserva
+        
+    Returns:
+        int: Posição da reserva no livro ou None se não existir
+    """
+    mapa = indice['mapa']
+    inicio = 0
+    fim = indice['quantidade_codigos']
+    
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        codigo, posicao = CODIGO.unpack_from(mapa, CABECALHO.size + meio * CODIGO.size)
+        if codigo < codigo_hash:
+            inicio = meio + 1
+        elif codigo > codigo_hash:
+            fim = meio
+        else:
+            return posicao
+    
+    return None
+
+
+def ler_palavra(indice, ordem):
+    """
+    Lê uma entrada da tabela de palavras.
+    
+    Args:
+        indice (dict): Índice aberto por abrir_indice_busca
+        ordem (int): Posição da palavra na ordem alfabética
+        
+    Returns:
+        tuple: (palavra em UTF-8, primeira ocorrência, quantidade)
+    """
+    posicao, tamanho, primeira, quantidade = PALAVRA.unpack_from(
+        indice['mapa'], indice['inicio_palavras'] + ordem * PALAVRA.size
+    )
+    inicio = indice['inicio_texto'] + posicao
+    return indice['mapa'][inicio:inicio + tamanho], primeira, quantidade
+
+
+def ler_ocorrencias(indice, primeira, quantidade):
+    """
+    Lê as posições das reservas que contêm uma palavra.
+    
+    Args:
+        indice (dict): Índice aberto por abrir_indice_busca
+        primeira (int): Primeira ocorrência da palavra
+        quantidade (int): Quantidade de ocorrências
+        
+    Returns:
+        array: Posições das reservas no livro
+    """
+    ocorrencias = array(OCORRENCIA)
+    inicio = indice['inicio_ocorrencias'] + primeira * ocorrencias.itemsize
+    ocorrencias.frombytes(indice['mapa'][inicio:inicio + quantidade * ocorrencias.itemsize])
+    if sys.byteorder == "big":
+        ocorrencias.byteswap()
+    return ocorrencias
+
+
+def buscar_prefixo_indice(indice, prefixo):
+    """
+    Retorna as posições das reservas com alguma palavra iniciada pelo
+    prefixo (ver indice_nomes.buscar_prefixo).
+    
+    Args:
+        indice (dict): Índice aberto por abrir_indice_busca
+        prefixo (str): Prefixo já normalizado
+        
+    Returns:
+        set: Posições das reservas no livro
+    """
+    alvo = prefixo.encode("utf-8")
+    inicio = 0
+    fim = indice['quantidade_palavras']
+    
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if ler_palavra(indice, meio)[0] < alvo:
+            inicio = meio + 1
+        else:
+            fim = meio
+    
+    posicoes = set()
+    while inicio < indice['quantidade_palavras']:
+        palavra, primeira, quantidade = ler_palavra(indice, inicio)
+        if not palavra.startswith(alvo):
+            break
+        posicoes.update(ler_ocorrencias(indice, primeira, quantidade))
+        inicio += 1
+    
+    return posicoes
+
+
+def buscar_nome_indice(indice, consulta):
+    """
+    Busca reservas cujo nome contenha todas as palavras da consulta, com as
+    mesmas regras de indice_nomes.buscar_nome.
+    
+    Args:
+        indice (dict): Índice aberto por abrir_indice_busca
+        consulta (str): Nome ou parte do nome
+        
+    Returns:
+        set: Posições das reservas no livro
+    """
+    prefixos = normalizar_texto(consulta).split()
+    if not prefixos:
+        return set()
+    
+    prefixos.sort(key=len, reverse=True)
+    posicoes = buscar_prefixo_indice(indice, prefixos[0])
+    
+    for prefixo in prefixos[1:]:
+        if not posicoes:
+            break
+        posicoes &= buscar_prefixo_indice(indice, prefixo)
+    
+    return posicoes
+
+
+def buscar_no_livro(nome=None, codigo_hash=None):
+    """
+    Busca reservas do livro binário pelo nome ou pelo código usando o
+    índice de busca (reconstruído antes, se estiver desatualizado) e aplica
+    as operações pendentes no journal. Requer que reservas.bin exista.
+    
+    Args:
+        nome (str, optional): Nome ou parte do nome
+        codigo_hash (int, optional): Código da reserva (tem precedência)
+        
+    Returns:
+        list: Reservas encontradas, ordenadas por data de check-in
+    """
+    with travar_dados():
+        caminho = obter_caminho_binario()
+        identificacao = identificar_livro(caminho)
+        livro = abrir_binario(caminho)
+        
+        try:
+            indice = abrir_indice_busca(identificacao)
+            if indice is None:
+                criar_indice_busca(livro, identificacao)
+                indice = abrir_indice_busca(identificacao)
+            
+            try:
+                if codigo_hash is not None:
+                    posicao = buscar_codigo_indice(indice, codigo_hash)
+                    posicoes = () if posicao is None else (posicao,)
+                else:
+                    posicoes = sorted(buscar_nome_indice(indice, nome))
+            finally:
+                indice['mapa'].close()
+            
+            encontradas = {}
+            for posicao in posicoes:
+                reserva = ler_reserva(livro, posicao)
+                encontradas[reserva.hash] = reserva
+        finally:
+            fechar_binario(livro)
+        
+        operacoes = list(ler_journal())
+    
+    # Operações do journal, na ordem: reservas criadas que atendem à busca
+    # entram no resultado; as canceladas (ou substituídas) saem
+    criadas = [reserva for operacao, reserva in operacoes if operacao == "criar"]
+    if codigo_hash is not None:
+        correspondentes = {reserva.hash for reserva in criadas if reserva.hash == codigo_hash}
+    else:
+        correspondentes = buscar_nome(criar_indice_nomes(criadas), nome)
+    
+    for operacao, reserva in operacoes:
+        if operacao == "criar" and reserva.hash in correspondentes:
+            encontradas[reserva.hash] = reserva
+        else:
+            encontradas.pop(reserva.hash, None)
+    
+    return sorted(encontradas.values(), key=lambda reserva: reserva.checkin)
@@ -0,0 +1,208 @@
+"""
+Módulo do índice de busca por nome do responsável.
+Mantém um índice invertido de palavras normalizadas (sem acentos e sem
+diferenciar maiúsculas) para códigos de reserva, com as palavras também
+em uma lista ordenada para buscas por prefixo.
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+
+def normalizar_texto(texto):
+    """
+    Remove acentos e diferenças de maiúsculas/minúsculas de um texto.
+    
+    Args:
+        texto (str): Texto original
+        
+    Returns:
+        str: Texto normalizado (ex.: "João" -> "joao")
+    """
+    if texto.isascii():
+        return texto.casefold()
+    
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return sem_acentos.casefold()
+
+
+@lru_cache(maxsize=65536)
+def normalizar_palavra(palavra):
+    """
+    Normaliza uma palavra de nome, com cache: nomes e sobrenomes se repetem
+    muito, e a remoção de acentos é a parte mais cara da indexação.
+    
+    Args:
+        palavra (str): Palavra sem espaços
+        
+    Returns:
+        tuple: Palavras resultantes (a normalização pode separar a palavra)
+    """
+    return tuple(normalizar_texto(palavra).split())
+
+
+def extrair_palavras(nome):
+    """
+    Divide um nome em palavras normalizadas.
+    
+    Args:
+        nome (str): Nome do responsável
+        
+    Returns:
+        set: Palavras normalizadas do nome
+    """
+    palavras = set()
+    for palavra in nome.split():
+        palavras.update(normalizar_palavra(palavra))
+    return palavras
+
+
+def criar_indice_nomes(reservas=()):
+    """
+    Cria o índice de nomes a partir de uma coleção de reservas.
+    
+    O índice é um dicionário com:
+        - 'palavras': {palavra: set(codigos)}
+        - 'ordenadas': lista ordenada das palavras indexadas
+        
+    As palavras são ordenadas uma única vez ao final, em vez de inseridas
+    uma a uma na lista ordenada (o que seria quadrático em livros grandes).
+    
+    Args:
+        reservas (iterable): Reservas que devem compor o índice
+        
+    Returns:
+        dict: Índice de nomes
+    """
+    palavras = {}
+    
+    for reserva in reservas:
+        for palavra in extrair_palavras(reserva.nome):
+            codigos = palavras.get(palavra)
+            if codigos is None:
+                codigos = palavras[palavra] = set()
+            codigos.add(reserva.hash)
+    
+    return {'palavras': palavras, 'ordenadas': sorted(palavras)}
+
+
+def indexar_nome(indice, codigo_hash, nome):
+    """
+    Associa as palavras de um nome ao código da reserva.
+    
+    Args:
+        indice (dict): Índice de nomes
+        codigo_hash (int): Código da reserva
+        nome (str): Nome do responsável
+    """
+    palavras = indice['palavras']
+    
+    for palavra in extrair_palavras(nome):
+        codigos = palavras.get(palavra)
+        if codigos is None:
+            codigos = palavras[palavra] = set()
+            insort(indice['ordenadas'], palavra)
+        codigos.add(codigo_hash)
+
+
+def indexar_nomes(indice, reservas):
+    """
+    Indexa os nomes de um lote de reservas. As palavras novas são
+    acrescentadas à lista ordenada e ela é reordenada uma única vez, em vez
+    de cada palavra ser inserida na sua posição.
+    
+    Args:
+        indice (dict): Índice de nomes
+        reservas (iterable): Reservas do lote
+    """
+    palavras = indice['palavras']
+    novas = []
+    
+    for reserva in reservas:
+        for palavra in extrair_palavras(reserva.nome):
+            codigos = palavras.get(palavra)
+            if codigos is None:
+                codigos = palavras[palavra] = set()
+                novas.append(palavra)
+            codigos.add(reserva.hash)
+    
+    if novas:
+        indice['ordenadas'].extend(novas)
+        indice['ordenadas'].sort()
+
+
+def desindexar_nome(indice, codigo_hash, nome):
+    """
+    Remove a associação entre as palavras de um nome e o código da reserva.
+    Palavras que deixam de ter reservas saem do índice.
+    
+    Args:
+        indice (dict): Índice de nomes
+        codigo_hash (int): Código da reserva
+        nome (str): Nome do responsável
+    """
+    palavras = indice['palavras']
+    ordenadas = indice['ordenadas']
+    
+    for palavra in extrair_palavras(nome):
+        codigos = palavras.get(palavra)
+        if codigos is None:
+            continue
+        codigos.discard(codigo_hash)
+        if not codigos:
+            del palavras[palavra]
+            del ordenadas[bisect_left(ordenadas, palavra)]
+
+
+def buscar_prefixo(indice, prefixo):
+    """
+    Retorna os códigos das reservas com alguma palavra iniciada pelo prefixo.
+    
+    Args:
+        indice (dict): Índice de nomes
+        prefixo (str): Prefixo já normalizado
+        
+    Returns:
+        set: Códigos encontrados
+    """
+    palavras = indice['palavras']
+    ordenadas = indice['ordenadas']
+    codigos = set()
+    
+    posicao = bisect_left(ordenadas, prefixo)
+    while posicao < len(ordenadas) and ordenadas[posicao].startswith(prefixo):
+        codigos |= palavras[ordenadas[posicao]]
+        posicao += 1
+    
+    return codigos
+
+
+def buscar_nome(indice, consulta):
+    """
+    Busca reservas cujo nome contenha todas as palavras da consulta, cada
+    uma como palavra inteira ou início de palavra (ex.: "silv" encontra
+    "Silva"; "ana sou" encontra "Ana Paula Souza").
+    
+    Args:
+        indice (dict): Índice de nomes
+        consulta (str): Nome ou parte do nome digitado
+        
+    Returns:
+        set: Códigos das reservas encontradas
+    """
+    prefixos = normalizar_texto(consulta).split()
+    if not prefixos:
+        return set()
+    
+    # Começa pelo prefixo mais longo, normalmente o mais seletivo
+    prefixos.sort(key=len, reverse=True)
+    codigos = buscar_prefixo(indice, prefixos[0])
+    
+    for prefixo in prefixos[1:]:
+        if not codigos:
+            break
+        codigos &= buscar_prefixo(indice, prefixo)
+    
+    return codigos
@@ -3,10 +3,16 @@ Módulo de interface com o usuário.
 Contém funções para exibição de informações e coleta de dados.
 """
 
-from datetime import datetime
-from config import TIPOS_QUARTOS
-from utils import limpar_terminal, formatar_valor_monetario, validar_entrada_inteira
-from calculo import calcular_estatisticas, calcular_dias_estadia
+import sys
+from datetime import date, timedelta
+from config import TIPOS_QUARTOS, TAMANHO_PAGINA, COLETAR_METRICAS, ESTATISTICAS_INCLUEM_ARQUIVO, HORIZONTE_CALENDARIO, NOME_PROPRIEDADE
+from utils import limpar_terminal, formatar_valor_monetario, formatar_nome, converter_data, validar_entrada_inteira
+from calculo import calcular_dias_estadia
+from cadastro import buscar_reservas_por_nome, obter_estatisticas_cadastro
+from listagem import ORDENACOES, iterar_reservas, paginar, formatar_reserva, formatar_pagina
+from metricas import METRICAS, resumir_metricas, salvar_metricas
+from relatorios import AGRUPAMENTOS, gerar_relatorio, inicio_do_mes, inicio_do_proximo_mes
+from alocacao import obter_alocacao, calcular_fragmentacao, contar_sem_quarto
 
 
 def exibir_menu():
@@ -15,14 +21,15 @@ def exibir_menu():
     """
     menu = f'''
     {'-=' * 30}
-    HOTEL FLOR DE LÓTUS
+    {NOME_PROPRIEDADE.upper()}
     {'-=' * 30}
     1 - Fazer nova reserva
     2 - Consultar reserva por responsável
     3 - Listar reservas existentes
     4 - Cancelar reserva
     5 - Estatísticas gerais
-    6 - Sair
+    6 - Relatórios de ocupação e receita
+    7 - Sair
     {'-=' * 30}
     '''
     print(menu)
@@ -35,19 +42,45 @@ def exibir_reserva(reserva):
     Args:
         reserva (dict): Dicionário contendo os dados da reserva
     """
-    print(f"Código da Reserva: {reserva['hash']}")
-    print(f"Responsável: {reserva['nome']}")
-    print(f"Check-in: {reserva['checkin'].strftime('%d/%m/%Y')}")
-    print(f"Check-out: {reserva['checkout'].strftime('%d/%m/%Y')}")
-    print(f"Tipo de Quarto: {reserva['tipo_quarto'].capitalize()}")
-    print(f"Quantidade de Quartos: {reserva['quantidade_quartos']}")
-    print(f"Valor Total: {formatar_valor_monetario(reserva['valor'])}")
-    print('--' * 30)
+    sys.stdout.write(formatar_reserva(reserva))
+
+
+def coletar_filtros_listagem():
+    """
+    Coleta os filtros e a ordenação opcionais da listagem de reservas.
+    Respostas em branco mantêm todas as reservas, na ordem de cadastro.
+    
+    Returns:
+        dict: Argumentos para listagem.iterar_reservas
+    """
+    filtros = {}
+    
+    tipo_quarto = input(f"Filtrar por tipo de quarto ({', '.join(TIPOS_QUARTOS)}) [todos]: ").strip().lower()
+    if tipo_quarto in TIPOS_QUARTOS:
+        filtros['tipo_quarto'] = tipo_quarto
+    
+    try:
+        data_inicio = input("A partir de (dd/mm/aaaa) [sem limite]: ").strip()
+        data_fim = input("Até (dd/mm/aaaa) [sem limite]: ").strip()
+        if data_inicio:
+            filtros['data_inicio'] = converter_data(data_inicio)
+        if data_fim:
+            filtros['data_fim'] = converter_data(data_fim)
+    except ValueError:
+        print("Data inválida; o filtro de período foi ignorado.")
+        filtros.pop('data_inicio', None)
+    
+    ordenar_por = input(f"Ordenar por ({', '.join(ORDENACOES)}) [cadastro]: ").strip().lower()
+    if ordenar_por in ORDENACOES:
+        filtros['ordenar_por'] = ordenar_por
+    
+    return filtros
 
 
 def exibir_todas_reservas(reservas):
     """
-    Exibe todas as reservas cadastradas.
+    Exibe as reservas cadastradas, página a página, com filtros opcionais.
+    Cada página é escrita no terminal de uma só vez.
     
     Args:
         reservas (list): Lista de reservas
@@ -59,31 +92,40 @@ def exibir_todas_reservas(reservas):
         return
     
     print(f"\n{'='*60}")
-    print(f"TODAS AS RESERVAS ({len(reservas)} encontrada(s))")
+    print(f"TODAS AS RESERVAS ({len(reservas)} cadastrada(s))")
     print(f"{'='*60}\n")
     
-    for reserva in reservas:
-        exibir_reserva(reserva)
+    filtros = coletar_filtros_listagem()
+    exibidas = 0
+    
+    for numero_pagina, pagina in enumerate(paginar(iterar_reservas(reservas, **filtros), TAMANHO_PAGINA), start=1):
+        exibidas += len(pagina)
+        sys.stdout.write(f"\n--- Página {numero_pagina} ---\n" + formatar_pagina(pagina))
+        
+        if len(pagina) == TAMANHO_PAGINA:
+            if input("ENTER para a próxima página ou 'q' para sair: ").strip().lower() == "q":
+                return
+    
+    if not exibidas:
+        print("\nNenhuma reserva encontrada com os filtros informados.")
 
 
-def consultar_reserva_por_nome(reservas):
+def consultar_reserva_por_nome(cadastro):
     """
     Consulta e exibe reservas de um responsável específico.
+    A busca ignora acentos e maiúsculas e aceita nome parcial ou sobrenome.
     
     Args:
-        reservas (list): Lista de reservas
+        cadastro (dict): Cadastro de reservas
     """
     limpar_terminal()
     print(f"\n{'='*60}")
     print("CONSULTAR RESERVA POR RESPONSÁVEL")
     print(f"{'='*60}\n")
     
-    nome_consulta = input("Digite o nome do responsável da reserva: ").strip().capitalize()
+    nome_consulta = input("Digite o nome (ou parte do nome) do responsável da reserva: ").strip()
     
-    reservas_encontradas = [
-        reserva for reserva in reservas 
-        if reserva['nome'] == nome_consulta
-    ]
+    reservas_encontradas = buscar_reservas_por_nome(cadastro, nome_consulta)
     
     if reservas_encontradas:
         print(f"\n{len(reservas_encontradas)} reserva(s) encontrada(s) para {nome_consulta}:\n")
@@ -94,14 +136,14 @@ def consultar_reserva_por_nome(reservas):
         print("Verifique o nome ou consulte a lista completa de reservas.")
 
 
-def exibir_estatisticas_gerais(reservas):
+def exibir_estatisticas_gerais(cadastro):
     """
     Exibe estatísticas gerais sobre as reservas.
     
     Args:
-        reservas (list): Lista de reservas
+        cadastro (dict): Cadastro de reservas
     """
-    estatisticas = calcular_estatisticas(reservas)
+    estatisticas = obter_estatisticas_cadastro(cadastro, ESTATISTICAS_INCLUEM_ARQUIVO)
     
     if not estatisticas:
         print("\nNão há reservas cadastradas para gerar estatísticas.")
@@ -123,12 +165,154 @@ def exibir_estatisticas_gerais(reservas):
     print(f"  Duração: {estatisticas['dias_mais_longa']} dia(s)")
     
     print(f"\nTotal de Quartos Reservados:")
-    print(f"  Standard: {estatisticas['quartos_reservados']['standard']}")
-    print(f"  Premium: {estatisticas['quartos_reservados']['premium']}")
-    print(f"  Luxo: {estatisticas['quartos_reservados']['luxo']}")
+    for tipo, quantidade in estatisticas['quartos_reservados'].items():
+        print(f"  {tipo.capitalize()}: {quantidade}")
+    
+    alocacao = obter_alocacao(cadastro)
+    print(f"\nFragmentação das Noites Livres (próximos {HORIZONTE_CALENDARIO} dias):")
+    for tipo, metricas in calcular_fragmentacao(alocacao).items():
+        print(f"  {tipo.capitalize()}: {metricas['fragmentacao']:.1%} fora da maior lacuna de cada quarto, "
+              f"{metricas['noites_isoladas']} noite(s) isolada(s)")
+    sem_quarto = contar_sem_quarto(alocacao)
+    if sem_quarto:
+        print(f"  Reservas sem quarto atribuído: {sem_quarto}")
     print()
 
 
+def exibir_sugestoes(sugestoes, dados):
+    """
+    Exibe as alternativas para uma reserva sem disponibilidade.
+    
+    Args:
+        sugestoes (dict): Resultado de calendario.sugerir_alternativas
+        dados (dict): Dados da reserva pedida
+    """
+    print("Sugestões:")
+    
+    if sugestoes['periodos']:
+        print(f"  Períodos próximos com {dados['quantidade_quartos']} quarto(s) {dados['tipo_quarto']} livre(s):")
+        for checkin, checkout in sugestoes['periodos']:
+            print(f"    - {checkin.strftime('%d/%m/%Y')} a {checkout.strftime('%d/%m/%Y')}")
+    else:
+        print("  - Não há períodos próximos com a mesma duração disponíveis")
+    
+    if sugestoes['tipos']:
+        print(f"  Outros tipos livres nas mesmas datas: {', '.join(sugestoes['tipos'])}")
+    
+    if 0 < sugestoes['maximo_disponivel'] < dados['quantidade_quartos']:
+        print(f"  Máximo disponível no período pedido: {sugestoes['maximo_disponivel']} quarto(s)")
+
+
+def exibir_metricas():
+    """
+    Exibe as métricas de desempenho coletadas nesta sessão (chamadas e
+    latências p50/p95/p99 por função) e atualiza data/metricas.prom.
+    Sem a coleta ativa (COLETAR_METRICAS), não exibe nada.
+    """
+    if not COLETAR_METRICAS:
+        return
+    
+    print(f"{'='*60}")
+    print("DESEMPENHO (SESSÃO ATUAL)")
+    print(f"{'='*60}\n")
+    
+    resumo = resumir_metricas()
+    if not resumo:
+        print("Nenhuma chamada medida ainda.")
+    else:
+        print(f"{'Função':<36} {'Chamadas':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for linha in resumo:
+            print(
+                f"{linha['nome'][-36:]:<36} {linha['chamadas']:>8} "
+                f"{linha['p50'] * 1000:>9.3f} {linha['p95'] * 1000:>9.3f} {linha['p99'] * 1000:>9.3f}"
+            )
+    
+    for nome, valor in sorted(METRICAS['medidas'].items()):
+        print(f"{nome}: {valor:,.0f}")
+    
+    if salvar_metricas():
+        print("\nMétricas exportadas para data/metricas.prom (formato Prometheus).")
+
+
+def coletar_periodo_relatorio():
+    """
+    Coleta o período (datas inclusivas) e o agrupamento do relatório.
+    Respostas em branco usam o mês atual, agrupado por dia.
+    
+    Returns:
+        tuple: (data_inicio, data_fim, agrupamento), com data_fim no dia
+            seguinte à última noite, ou None se o período for inválido
+    """
+    hoje = date.today()
+    
+    try:
+        data_inicio = input(f"De (dd/mm/aaaa) [{inicio_do_mes(hoje).strftime('%d/%m/%Y')}]: ").strip()
+        data_inicio = converter_data(data_inicio) if data_inicio else inicio_do_mes(hoje)
+        ultima_noite = input(f"Até (dd/mm/aaaa) [{(inicio_do_proximo_mes(data_inicio) - timedelta(days=1)).strftime('%d/%m/%Y')}]: ").strip()
+        data_fim = converter_data(ultima_noite) + timedelta(days=1) if ultima_noite else inicio_do_proximo_mes(data_inicio)
+    except ValueError:
+        print("Data inválida.")
+        return None
+    
+    if data_fim <= data_inicio:
+        print("A data final deve ser igual ou posterior à inicial.")
+        return None
+    
+    agrupamento = input(f"Agrupar por ({', '.join(AGRUPAMENTOS)}) [dia]: ").strip().lower()
+    if agrupamento not in AGRUPAMENTOS:
+        agrupamento = "dia"
+    
+    return data_inicio, data_fim, agrupamento
+
+
+def formatar_linha_relatorio(linha):
+    """
+    Formata uma linha do relatório de ocupação e receita.
+    
+    Args:
+        linha (dict): Linha de relatorios.gerar_relatorio
+        
+    Returns:
+        str: Linha formatada, terminada em quebra de linha
+    """
+    ultima_noite = linha['fim'] - timedelta(days=1)
+    if ultima_noite == linha['inicio']:
+        periodo = linha['inicio'].strftime('%d/%m/%Y')
+    else:
+        periodo = f"{linha['inicio'].strftime('%d/%m')} a {ultima_noite.strftime('%d/%m/%Y')}"
+    ocupacao = f"{linha['ocupacao'] * 100:.1f}%".replace(".", ",")
+    
+    return (
+        f"{periodo:<21} {linha['tipo_quarto']:<9} {ocupacao:>7} "
+        f"{formatar_valor_monetario(linha['adr']):>13} {formatar_valor_monetario(linha['revpar']):>13} "
+        f"{formatar_valor_monetario(linha['receita']):>16}\n"
+    )
+
+
+def exibir_relatorios(cadastro):
+    """
+    Exibe a ocupação, a diária média (ADR) e a receita por quarto
+    disponível (RevPAR) por tipo de quarto, no período e agrupamento
+    escolhidos. Inclui as estadias do arquivo morto.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+    """
+    limpar_terminal()
+    print(f"\n{'='*60}")
+    print("RELATÓRIO DE OCUPAÇÃO E RECEITA")
+    print(f"{'='*60}\n")
+    
+    periodo = coletar_periodo_relatorio()
+    if periodo is None:
+        return
+    
+    linhas = gerar_relatorio(cadastro, *periodo)
+    
+    print(f"\n{'Período':<21} {'Tipo':<9} {'Ocup.':>7} {'ADR':>13} {'RevPAR':>13} {'Receita':>16}")
+    sys.stdout.write("".join(map(formatar_linha_relatorio, linhas)))
+
+
 def coletar_dados_reserva():
     """
     Coleta os dados necessários para criar uma nova reserva.
@@ -143,7 +327,7 @@ def coletar_dados_reserva():
     
     while True:
         # Coleta nome do responsável
-        responsavel = input("Nome do responsável pela reserva: ").strip().capitalize()
+        responsavel = formatar_nome(input("Nome do responsável pela reserva: "))
         if not responsavel:
             print("Erro! O nome não pode estar vazio.")
             continue
@@ -153,8 +337,8 @@ def coletar_dados_reserva():
             data_checkin_str = input("Data de check-in (dd/mm/aaaa): ").strip()
             data_checkout_str = input("Data de check-out (dd/mm/aaaa): ").strip()
             
-            data_checkin = datetime.strptime(data_checkin_str, "%d/%m/%Y")
-            data_checkout = datetime.strptime(data_checkout_str, "%d/%m/%Y")
+            data_checkin = converter_data(data_checkin_str)
+            data_checkout = converter_data(data_checkout_str)
             
             # Valida datas
             dias_estadia = calcular_dias_estadia(data_checkin, data_checkout)
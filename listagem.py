@@ -0,0 +1,205 @@
+"""
+Módulo de listagem e exportação de reservas.
+Oferece geradores para filtrar, ordenar e paginar as reservas sem copiar
+o cadastro inteiro, e a exportação em fluxo para CSV ou JSONL usando o
+mesmo iterador.
+
+Uso (exportação):
+    python listagem.py [--formato csv|jsonl] [--tipo TIPO] [--de DATA]
+                       [--ate DATA] [--ordenar CAMPO] [--saida ARQUIVO]
+"""
+
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+from utils import formatar_valor_monetario, converter_data
+from arquivo import carregar_reservas
+
+ORDENACOES = {
+    'checkin': lambda reserva: reserva.checkin,
+    'checkout': lambda reserva: reserva.checkout,
+    'nome': lambda reserva: reserva.nome.casefold(),
+    'valor': lambda reserva: reserva.valor,
+    'tipo_quarto': lambda reserva: reserva.tipo_quarto
+}
+
+CAMPOS_EXPORTACAO = ("hash", "nome", "checkin", "checkout", "tipo_quarto", "quantidade_quartos", "valor")
+
+
+def iterar_reservas(reservas, data_inicio=None, data_fim=None, tipo_quarto=None, ordenar_por=None,
+                    decrescente=False):
+    """
+    Percorre as reservas aplicando filtros e, opcionalmente, ordenação.
+    Sem ordenação, as reservas são produzidas uma a uma, na ordem de
+    cadastro, sem cópia; com ordenação, apenas as reservas filtradas são
+    reunidas para ordenar.
+    
+    Args:
+        reservas (iterable): Reservas
+        data_inicio (date, optional): Mantém reservas com check-out após
+            esta data
+        data_fim (date, optional): Mantém reservas com check-in antes
+            desta data
+        tipo_quarto (str, optional): Mantém apenas este tipo de quarto
+        ordenar_por (str, optional): Chave de ORDENACOES
+        decrescente (bool): Inverte a ordenação
+        
+    Yields:
+        dict: Reservas selecionadas
+    """
+    selecionadas = (
+        reserva for reserva in reservas
+        if (tipo_quarto is None or reserva.tipo_quarto == tipo_quarto)
+        and (data_inicio is None or reserva.checkout > data_inicio)
+        and (data_fim is None or reserva.checkin < data_fim)
+    )
+    
+    if ordenar_por is None:
+        yield from selecionadas
+    else:
+        yield from sorted(selecionadas, key=ORDENACOES[ordenar_por], reverse=decrescente)
+
+
+def paginar(iteravel, tamanho_pagina):
+    """
+    Agrupa os itens de um iterável em páginas.
+    
+    Args:
+        iteravel (iterable): Itens a paginar
+        tamanho_pagina (int): Quantidade de itens por página
+        
+    Yields:
+        list: Itens de cada página
+    """
+    iterador = iter(iteravel)
+    while True:
+        pagina = list(islice(iterador, tamanho_pagina))
+        if not pagina:
+            return
+        yield pagina
+
+
+def formatar_reserva(reserva):
+    """
+    Formata os detalhes de uma reserva como texto.
+    
+    Args:
+        reserva (Reserva): Reserva
+        
+    Returns:
+        str: Detalhes da reserva, uma informação por linha
+    """
+    return (
+        f"Código da Reserva: {reserva.hash}\n"
+        f"Responsável: {reserva.nome}\n"
+        f"Check-in: {reserva.checkin.strftime('%d/%m/%Y')}\n"
+        f"Check-out: {reserva.checkout.strftime('%d/%m/%Y')}\n"
+        f"Tipo de Quarto: {reserva.tipo_quarto.capitalize()}\n"
+        f"Quantidade de Quartos: {reserva.quantidade_quartos}\n"
+        f"Valor Total: {formatar_valor_monetario(reserva.valor)}\n"
+        f"{'--' * 30}\n"
+    )
+
+
+def formatar_pagina(pagina):
+    """
+    Formata uma página de reservas como um único texto.
+    
+    Args:
+        pagina (list): Reservas da página
+        
+    Returns:
+        str: Texto da página
+    """
+    return "".join(map(formatar_reserva, pagina))
+
+
+def converter_para_exportacao(reserva):
+    """
+    Converte uma reserva em um registro de texto para exportação, com as
+    datas no formato dd/mm/aaaa aceito pela importação.
+    
+    Args:
+        reserva (Reserva): Reserva
+        
+    Returns:
+        dict: Registro com os CAMPOS_EXPORTACAO
+    """
+    registro = {campo: reserva[campo] for campo in CAMPOS_EXPORTACAO}
+    registro['checkin'] = reserva.checkin.strftime('%d/%m/%Y')
+    registro['checkout'] = reserva.checkout.strftime('%d/%m/%Y')
+    return registro
+
+
+def exportar_reservas(reservas, saida, formato="csv"):
+    """
+    Exporta as reservas em fluxo, uma linha por reserva, sem reuni-las em
+    memória.
+    
+    Args:
+        reservas (iterable): Reservas a exportar (ex.: iterar_reservas)
+        saida (file): Arquivo de texto aberto para escrita
+        formato (str): "csv" ou "jsonl"
+        
+    Returns:
+        int: Quantidade de reservas exportadas
+    """
+    quantidade = 0
+    
+    if formato == "jsonl":
+        for reserva in reservas:
+            saida.write(json.dumps(converter_para_exportacao(reserva), ensure_ascii=False) + "\n")
+            quantidade += 1
+    else:
+        escritor = csv.DictWriter(saida, fieldnames=CAMPOS_EXPORTACAO)
+        escritor.writeheader()
+        for reserva in reservas:
+            escritor.writerow(converter_para_exportacao(reserva))
+            quantidade += 1
+    
+    return quantidade
+
+
+def executar_exportacao(argumentos=None):
+    """
+    Ponto de entrada da exportação pela linha de comando.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída
+    """
+    parser = argparse.ArgumentParser(description="Exporta reservas para CSV ou JSONL.")
+    parser.add_argument("--formato", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--tipo", help="Tipo de quarto")
+    parser.add_argument("--de", help="Início do período (dd/mm/aaaa)")
+    parser.add_argument("--ate", help="Fim do período (dd/mm/aaaa)")
+    parser.add_argument("--ordenar", choices=tuple(ORDENACOES), help="Campo de ordenação")
+    parser.add_argument("--decrescente", action="store_true")
+    parser.add_argument("--saida", help="Arquivo de saída (padrão: saída padrão)")
+    opcoes = parser.parse_args(argumentos)
+    
+    reservas = iterar_reservas(
+        carregar_reservas(),
+        data_inicio=converter_data(opcoes.de) if opcoes.de else None,
+        data_fim=converter_data(opcoes.ate) if opcoes.ate else None,
+        tipo_quarto=opcoes.tipo,
+        ordenar_por=opcoes.ordenar,
+        decrescente=opcoes.decrescente
+    )
+    
+    if opcoes.saida:
+        with open(opcoes.saida, "w", newline="", encoding="utf-8") as saida:
+            quantidade = exportar_reservas(reservas, saida, opcoes.formato)
+        print(f"{quantidade} reserva(s) exportada(s) para {opcoes.saida}")
+    else:
+        exportar_reservas(reservas, sys.stdout, opcoes.formato)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_exportacao())
@@ -5,15 +5,20 @@ Hotel Flor de Lótus
 Módulo principal que coordena a execução do sistema.
 """
 
-from arquivo import carregar_reservas
+from cadastro import listar_reservas
+from concorrencia import abrir_cadastro, atualizar_cadastro, encerrar_cadastro
 from interface import (
     exibir_menu,
     exibir_todas_reservas,
     consultar_reserva_por_nome,
-    exibir_estatisticas_gerais
+    exibir_estatisticas_gerais,
+    exibir_relatorios,
+    exibir_metricas
 )
 from reserva import criar_reserva, cancelar_reserva
+from metricas import salvar_metricas
 from utils import validar_entrada_inteira
+from config import NOME_PROPRIEDADE
 
 
 def executar_sistema():
@@ -21,11 +26,11 @@ def executar_sistema():
     Função principal que executa o loop do sistema de reservas.
     """
     # Carrega as reservas existentes
-    reservas = carregar_reservas()
+    cadastro = abrir_cadastro()
     
     print("\n" + "="*60)
     print("BEM-VINDO AO SISTEMA DE RESERVAS")
-    print("HOTEL FLOR DE LÓTUS")
+    print(NOME_PROPRIEDADE.upper())
     print("="*60 + "\n")
     
     
@@ -34,34 +39,45 @@ def executar_sistema():
         opcao = validar_entrada_inteira(
             'Digite o código da opção desejada: ',
             minimo=1,
-            maximo=6
+            maximo=7
         )
         
+        # Incorpora as reservas feitas em outros terminais antes de consultar
+        if opcao in (2, 3, 5, 6):
+            atualizar_cadastro(cadastro)
+        
         if opcao == 1:
-            criar_reserva(reservas)
+            criar_reserva(cadastro)
             
         elif opcao == 2:
-            consultar_reserva_por_nome(reservas)
+            consultar_reserva_por_nome(cadastro)
             
         elif opcao == 3:
-            exibir_todas_reservas(reservas)
+            exibir_todas_reservas(listar_reservas(cadastro))
             
         elif opcao == 4:
-            cancelar_reserva(reservas)
+            cancelar_reserva(cadastro)
             
         elif opcao == 5:
-            exibir_estatisticas_gerais(reservas)
+            exibir_estatisticas_gerais(cadastro)
+            exibir_metricas()
             
         elif opcao == 6:
+            exibir_relatorios(cadastro)
+        
+        elif opcao == 7:
+            encerrar_cadastro(cadastro)
+            salvar_metricas()
+            
             print("\n" + "="*60)
             print("ENCERRANDO O SISTEMA")
-            print("Obrigado por utilizar o Hotel Flor de Lótus!")
+            print(f"Obrigado por utilizar o sistema de reservas de {NOME_PROPRIEDADE}!")
             print("="*60 + "\n")
 
             break
         
         # Pausa para o usuário visualizar a informação
-        if opcao != 6:
+        if opcao != 7:
             input("\nPressione ENTER para continuar...")
 
 
@@ -0,0 +1,207 @@
+"""
+Módulo de métricas de desempenho.
+Instrumentação opcional (COLETAR_METRICAS em config.py) das funções mais
+usadas: conta as chamadas e registra a latência em histogramas de baldes
+logarítmicos, dos quais se estimam os percentis p50/p95/p99. Também guarda
+medidas avulsas, como o tamanho do arquivo de reservas.
+
+Com a coleta desativada, instrumentar() devolve a própria função, sem
+nenhum custo adicional por chamada.
+
+As métricas podem ser exibidas na tela de estatísticas e exportadas no
+formato de texto do Prometheus (data/metricas.prom).
+"""
+
+import os
+import time
+from bisect import bisect_left
+from functools import wraps
+from config import COLETAR_METRICAS, DIRETORIO_DADOS, ARQUIVO_METRICAS
+
+# Limites superiores dos baldes, em segundos: de 1 µs a ~12 s, crescendo
+# por um fator de √2 (erro máximo de ~41% na estimativa de um percentil)
+LIMITES_BALDES = tuple(1e-6 * 2 ** (indice / 2) for indice in range(48))
+
+METRICAS = {'duracoes': {}, 'medidas': {}}
+
+
+def criar_histograma():
+    """
+    Cria um histograma de durações vazio.
+    
+    Returns:
+        dict: {'contagem', 'soma', 'baldes'}, com um balde extra para
+            durações acima do último limite
+    """
+    return {'contagem': 0, 'soma': 0.0, 'baldes': [0] * (len(LIMITES_BALDES) + 1)}
+
+
+def registrar_duracao(nome, segundos):
+    """
+    Registra uma duração no histograma da métrica.
+    
+    Args:
+        nome (str): Nome da métrica (ex.: "calculo.verificar_disponibilidade")
+        segundos (float): Duração medida
+    """
+    histograma = METRICAS['duracoes'].get(nome)
+    if histograma is None:
+        histograma = METRICAS['duracoes'][nome] = criar_histograma()
+    
+    histograma['contagem'] += 1
+    histograma['soma'] += segundos
+    histograma['baldes'][bisect_left(LIMITES_BALDES, segundos)] += 1
+
+
+def registrar_medida(nome, valor):
+    """
+    Registra o valor atual de uma medida avulsa (último valor observado).
+    Sem a coleta ativa, não faz nada.
+    
+    Args:
+        nome (str): Nome da medida (ex.: "arquivo_reservas_bytes")
+        valor (float): Valor observado
+    """
+    if COLETAR_METRICAS:
+        METRICAS['medidas'][nome] = valor
+
+
+def instrumentar(funcao):
+    """
+    Decorador que mede a duração de cada chamada da função. Com a coleta
+    desativada, devolve a função original.
+    
+    Args:
+        funcao (callable): Função a instrumentar
+        
+    Returns:
+        callable: Função instrumentada (ou a própria função)
+    """
+    if not COLETAR_METRICAS:
+        return funcao
+    
+    # O histograma é criado uma única vez, para que cada chamada apenas
+    # some a duração, sem procurar a métrica pelo nome
+    nome = f"{funcao.__module__}.{funcao.__name__}"
+    histograma = METRICAS['duracoes'].setdefault(nome, criar_histograma())
+    baldes = histograma['baldes']
+    relogio = time.perf_counter
+    
+    @wraps(funcao)
+    def instrumentada(*args, **kwargs):
+        inicio = relogio()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            duracao = relogio() - inicio
+            histograma['contagem'] += 1
+            histograma['soma'] += duracao
+            baldes[bisect_left(LIMITES_BALDES, duracao)] += 1
+    
+    return instrumentada
+
+
+def calcular_percentil(histograma, fracao):
+    """
+    Estima um percentil do histograma, interpolando dentro do balde.
+    
+    Args:
+        histograma (dict): Histograma de durações
+        fracao (float): Percentil desejado, entre 0 e 1
+        
+    Returns:
+        float: Duração estimada, em segundos (0 se não houver amostras)
+    """
+    if not histograma['contagem']:
+        return 0.0
+    
+    alvo = fracao * histograma['contagem']
+    acumulado = 0
+    
+    for indice, quantidade in enumerate(histograma['baldes']):
+        if quantidade and acumulado + quantidade >= alvo:
+            inferior = LIMITES_BALDES[indice - 1] if indice else 0.0
+            superior = LIMITES_BALDES[indice] if indice < len(LIMITES_BALDES) else inferior * 2
+            return inferior + (superior - inferior) * (alvo - acumulado) / quantidade
+        acumulado += quantidade
+    
+    return LIMITES_BALDES[-1]
+
+
+def resumir_metricas():
+    """
+    Resume as métricas coletadas para exibição.
+    
+    Returns:
+        list: Dicionários com 'nome', 'chamadas', 'media', 'p50', 'p95' e
+            'p99' (em segundos), ordenados pelo tempo total
+    """
+    resumo = [
+        {
+            'nome': nome,
+            'chamadas': histograma['contagem'],
+            'media': histograma['soma'] / histograma['contagem'],
+            'p50': calcular_percentil(histograma, 0.50),
+            'p95': calcular_percentil(histograma, 0.95),
+            'p99': calcular_percentil(histograma, 0.99),
+            'total': histograma['soma']
+        }
+        for nome, histograma in METRICAS['duracoes'].items()
+        if histograma['contagem']
+    ]
+    resumo.sort(key=lambda linha: linha['total'], reverse=True)
+    return resumo
+
+
+def formatar_prometheus():
+    """
+    Converte as métricas para o formato de texto do Prometheus.
+    
+    Returns:
+        str: Métricas no formato de exposição do Prometheus
+    """
+    linhas = [
+        "# HELP hotel_duracao_segundos Duração das chamadas das funções instrumentadas.",
+        "# TYPE hotel_duracao_segundos histogram"
+    ]
+    
+    for nome, histograma in sorted(METRICAS['duracoes'].items()):
+        acumulado = 0
+        for limite, quantidade in zip(LIMITES_BALDES, histograma['baldes']):
+            acumulado += quantidade
+            linhas.append(f'hotel_duracao_segundos_bucket{{funcao="{nome}",le="{limite:.6g}"}} {acumulado}')
+        linhas.append(f'hotel_duracao_segundos_bucket{{funcao="{nome}",le="+Inf"}} {histograma["contagem"]}')
+        linhas.append(f'hotel_duracao_segundos_sum{{funcao="{nome}"}} {histograma["soma"]:.9f}')
+        linhas.append(f'hotel_duracao_segundos_count{{funcao="{nome}"}} {histograma["contagem"]}')
+    
+    for nome, valor in sorted(METRICAS['medidas'].items()):
+        linhas.append(f"# TYPE hotel_{nome} gauge")
+        linhas.append(f"hotel_{nome} {valor}")
+    
+    return "\n".join(linhas) + "\n"
+
+
+def salvar_metricas():
+    """
+    Grava as métricas no formato do Prometheus em data/metricas.prom
+    (arquivo temporário seguido de renomeação, para que um coletor nunca
+    leia um arquivo pela metade). Sem a coleta ativa, não faz nada.
+    
+    Returns:
+        bool: True se gravou, False caso contrário
+    """
+    if not COLETAR_METRICAS:
+        return False
+    
+    caminho = os.path.join(DIRETORIO_DADOS, ARQUIVO_METRICAS)
+    temporario = caminho + ".tmp"
+    
+    try:
+        os.makedirs(DIRETORIO_DADOS, exist_ok=True)
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(formatar_prometheus())
+        os.replace(temporario, caminho)
+        return True
+    except OSError as erro:
+        print(f"Erro ao salvar as métricas: {erro}")
+        return False
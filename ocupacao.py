@@ -0,0 +1,96 @@
+"""
+Módulo do índice de ocupação diária.
+Mantém, para cada tipo de quarto, a quantidade de quartos ocupados em cada
+noite, permitindo consultar o pico de ocupação de um período sem percorrer
+todas as reservas existentes.
+"""
+
+from itertools import repeat
+from config import TIPOS_QUARTOS
+
+
+def criar_indice_ocupacao(reservas=()):
+    """
+    Cria o índice de ocupação diária a partir de uma coleção de reservas.
+    
+    O índice é um dicionário {tipo_quarto: {dia_ordinal: quartos_ocupados}},
+    onde cada dia corresponde a uma noite (o dia do check-out não é ocupado).
+    
+    Args:
+        reservas (iterable): Reservas que devem compor o índice
+        
+    Returns:
+        dict: Índice de ocupação por tipo de quarto e dia
+    """
+    indice = {tipo: {} for tipo in TIPOS_QUARTOS}
+    
+    for reserva in reservas:
+        registrar_ocupacao(indice, reserva)
+    
+    return indice
+
+
+def ajustar_ocupacao(indice, reserva, variacao):
+    """
+    Soma a variação informada a cada noite ocupada pela reserva.
+    Dias que ficam sem ocupação são removidos para manter o índice enxuto.
+    
+    Args:
+        indice (dict): Índice de ocupação
+        reserva (Reserva): Reserva cujas noites serão ajustadas
+        variacao (int): Quantidade de quartos a somar (negativa para remover)
+    """
+    dias = indice.setdefault(reserva.tipo_quarto, {})
+    inicio = reserva.checkin.toordinal()
+    fim = reserva.checkout.toordinal()
+    
+    for dia in range(inicio, fim):
+        ocupados = dias.get(dia, 0) + variacao
+        if ocupados:
+            dias[dia] = ocupados
+        else:
+            del dias[dia]
+
+
+def registrar_ocupacao(indice, reserva):
+    """
+    Adiciona as noites de uma reserva ao índice de ocupação.
+    
+    Args:
+        indice (dict): Índice de ocupação
+        reserva (Reserva): Reserva criada
+    """
+    ajustar_ocupacao(indice, reserva, reserva.quantidade_quartos)
+
+
+def remover_ocupacao(indice, reserva):
+    """
+    Retira as noites de uma reserva do índice de ocupação.
+    
+    Args:
+        indice (dict): Índice de ocupação
+        reserva (Reserva): Reserva cancelada
+    """
+    ajustar_ocupacao(indice, reserva, -reserva.quantidade_quartos)
+
+
+def pico_ocupacao(indice, tipo_quarto, data_checkin, data_checkout):
+    """
+    Retorna o maior número de quartos ocupados em uma noite do período
+    [check-in, check-out).
+    
+    Args:
+        indice (dict): Índice de ocupação
+        tipo_quarto (str): Tipo do quarto
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
+        
+    Returns:
+        int: Pico de quartos ocupados no período
+    """
+    dias = indice.get(tipo_quarto)
+    if not dias:
+        return 0
+    
+    noites = range(data_checkin.toordinal(), data_checkout.toordinal())
+    return max(map(dias.get, noites, repeat(0)), default=0)
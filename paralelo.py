@@ -0,0 +1,426 @@
+"""
+Módulo de execução paralela das tarefas sobre o livro inteiro.
+Estatísticas, conferência de integridade (nenhuma noite acima do
+inventário) e conferência de preços contra as tarifas de balcão (tarifas.py)
+percorrem todas as reservas em Python puro e ficam limitadas a um núcleo. Aqui elas são
+divididas em fatias, processadas por um ProcessPoolExecutor, e os
+resultados parciais são combinados no processo principal.
+
+As reservas não são enviadas aos processos. Sob a trava dos dados, o
+arquivo de reservas e os segmentos do arquivo morto são copiados para um
+diretório temporário (ou, fora do backend binário, um instantâneo é gravado
+nele); cada fatia é um intervalo de registros do instantâneo, aberto com
+mmap pelo próprio processo, ou um segmento mensal. Só os resultados
+parciais, pequenos, voltam ao processo principal.
+
+Uso pela linha de comando:
+    python paralelo.py [estatisticas|integridade|precos|todas] [--workers N] [--sem-arquivo]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS
+from arquivo import travar_dados, usando_binario, tamanho_journal, obter_caminho_binario, carregar_reservas
+from arquivamento import listar_segmentos, abrir_segmento
+from formato_binario import REGISTRO, salvar_binario, fechar_binario, ler_reserva
+from calculo import combinar_estatisticas
+from tarifas import criar_tabela_tarifas
+from utils import formatar_valor_monetario
+
+TAREFAS = ("estatisticas", "integridade", "precos")
+
+# Fatias do instantâneo por processo: mais fatias que processos equilibram
+# a carga quando algumas terminam antes
+FATIAS_POR_PROCESSO = 4
+
+# Divergências de preço listadas como exemplo no resultado
+LIMITE_EXEMPLOS = 10
+
+
+def estatisticas_da_fatia(livro, primeiro, registros):
+    """
+    Calcula as estatísticas gerais de uma fatia, no formato de
+    calculo.calcular_estatisticas. Só a reserva mais cara e a mais longa
+    são decodificadas.
+    
+    Args:
+        livro (dict): Livro aberto
+        primeiro (int): Posição do primeiro registro da fatia
+        registros (iterator): Registros (REGISTRO) da fatia
+        
+    Returns:
+        dict: Estatísticas ou None se a fatia estiver vazia
+    """
+    tipos = livro['tipos']
+    quartos_reservados = {tipo: 0 for tipo in TIPOS_QUARTOS}
+    quantidade = 0
+    soma = 0.0
+    maior_valor = maior_duracao = None
+    mais_cara = mais_longa = primeiro
+    
+    for indice, (_, valor, checkin, checkout, _, _, quantidade_quartos, tipo) in enumerate(registros, primeiro):
+        quantidade += 1
+        soma += valor
+        nome_tipo = tipos[tipo]
+        quartos_reservados[nome_tipo] = quartos_reservados.get(nome_tipo, 0) + quantidade_quartos
+        
+        if maior_valor is None or valor > maior_valor:
+            maior_valor = valor
+            mais_cara = indice
+        if maior_duracao is None or checkout - checkin > maior_duracao:
+            maior_duracao = checkout - checkin
+            mais_longa = indice
+    
+    if not quantidade:
+        return None
+    
+    return {
+        'quantidade_reservas': quantidade,
+        'soma_total_valores': soma,
+        'reserva_mais_cara': ler_reserva(livro, mais_cara),
+        'reserva_mais_longa': ler_reserva(livro, mais_longa),
+        'dias_mais_longa': maior_duracao,
+        'quartos_reservados': quartos_reservados
+    }
+
+
+def ocupacao_da_fatia(livro, primeiro, registros):
+    """
+    Monta o vetor de diferenças da ocupação de uma fatia: para cada tipo,
+    os quartos que entram no dia do check-in e saem no do check-out.
+    
+    Args:
+        livro (dict): Livro aberto
+        primeiro (int): Posição do primeiro registro da fatia
+        registros (iterator): Registros (REGISTRO) da fatia
+        
+    Returns:
+        dict: {tipo_quarto: {dia_ordinal: variação de quartos ocupados}}
+    """
+    tipos = livro['tipos']
+    diferencas = {}
+    
+    for _, _, checkin, checkout, _, _, quantidade_quartos, tipo in registros:
+        dias = diferencas.get(tipos[tipo])
+        if dias is None:
+            dias = diferencas[tipos[tipo]] = {}
+        dias[checkin] = dias.get(checkin, 0) + quantidade_quartos
+        dias[checkout] = dias.get(checkout, 0) - quantidade_quartos
+    
+    return diferencas
+
+
+def precos_da_fatia(livro, primeiro, registros):
+    """
+    Recalcula o valor de cada reserva da fatia com as tarifas de balcão
+    (temporada e fim de semana, sem acréscimo de ocupação) e confere o valor
+    registrado: ele diverge se ficar abaixo da tarifa de balcão ou acima
+    dela com o maior acréscimo de ocupação.
+    
+    Args:
+        livro (dict): Livro aberto
+        primeiro (int): Posição do primeiro registro da fatia
+        registros (iterator): Registros (REGISTRO) da fatia
+        
+    Returns:
+        dict: Totais registrados e recalculados, quantidade de divergências
+            e até LIMITE_EXEMPLOS exemplos (codigo, registrado, recalculado)
+    """
+    tipos = livro['tipos']
+    resultado = {'conferidas': 0, 'valor_registrado': 0.0, 'valor_recalculado': 0.0, 'divergentes': 0, 'exemplos': []}
+    registros = list(registros)
+    if not registros:
+        return resultado
+    
+    # Uma tabela de balcão cobrindo o período da fatia: cada reserva é
+    # cotada pela diferença de duas somas acumuladas
+    inicio = min(registro[2] for registro in registros)
+    fim = max(registro[3] for registro in registros)
+    tabela = criar_tabela_tarifas(data_inicio=date.fromordinal(inicio), dias=fim - inicio)
+    acrescimo_maximo = max((fator for _, fator in tabela['regras']['faixas_ocupacao']), default=1.0)
+    
+    for codigo, valor, checkin, checkout, _, _, quantidade_quartos, tipo in registros:
+        serie = tabela['tipos'].get(tipos[tipo])
+        recalculado = 0.0
+        if serie is not None:
+            acumuladas = serie['acumuladas']
+            recalculado = round((acumuladas[checkout - inicio] - acumuladas[checkin - inicio]) * quantidade_quartos, 2)
+        resultado['conferidas'] += 1
+        resultado['valor_registrado'] += valor
+        resultado['valor_recalculado'] += recalculado
+        
+        # Tolerância de um centavo por noite e quarto para os arredondamentos
+        tolerancia = 0.005 + 0.01 * (checkout - checkin) * quantidade_quartos
+        if valor < recalculado - 0.005 or valor > recalculado * acrescimo_maximo + tolerancia:
+            resultado['divergentes'] += 1
+            if len(resultado['exemplos']) < LIMITE_EXEMPLOS:
+                resultado['exemplos'].append((codigo, valor, recalculado))
+    
+    return resultado
+
+
+FUNCOES_FATIA = {
+    'estatisticas': estatisticas_da_fatia,
+    'integridade': ocupacao_da_fatia,
+    'precos': precos_da_fatia
+}
+
+
+def processar_fatia(tarefa, fatia):
+    """
+    Executa uma tarefa sobre uma fatia, abrindo o arquivo no próprio
+    processo. Chamada nos processos do ProcessPoolExecutor.
+    
+    Args:
+        tarefa (str): Tarefa (ver TAREFAS)
+        fatia (tuple): (caminho, primeiro, ultimo); ultimo None indica até
+            o fim do arquivo
+            
+    Returns:
+        object: Resultado parcial da tarefa
+    """
+    caminho, primeiro, ultimo = fatia
+    livro = abrir_segmento(caminho)
+    
+    try:
+        if ultimo is None:
+            ultimo = livro['quantidade']
+        inicio = livro['inicio_registros']
+        registros = memoryview(livro['mapa'])[inicio + primeiro * REGISTRO.size:inicio + ultimo * REGISTRO.size]
+        try:
+            return FUNCOES_FATIA[tarefa](livro, primeiro, REGISTRO.iter_unpack(registros))
+        finally:
+            registros.release()
+    finally:
+        fechar_binario(livro)
+
+
+def combinar_ocupacao(parciais):
+    """
+    Soma os vetores de diferenças das fatias e percorre os dias em ordem,
+    procurando noites acima do inventário.
+    
+    Args:
+        parciais (iterable): Resultados de ocupacao_da_fatia
+        
+    Returns:
+        dict: 'noites' (noites com algum quarto ocupado, por tipo) e
+            'excessos' [(tipo, data, ocupados, inventario)]
+    """
+    diferencas = {}
+    for parcial in parciais:
+        for tipo, dias in parcial.items():
+            total = diferencas.setdefault(tipo, {})
+            for dia, variacao in dias.items():
+                total[dia] = total.get(dia, 0) + variacao
+    
+    resultado = {'noites': {}, 'excessos': []}
+    for tipo, dias in diferencas.items():
+        inventario = QUARTOS_QUANTIDADE.get(tipo, 0)
+        ocupados = 0
+        noites = 0
+        dia_anterior = None
+        for dia in sorted(dias):
+            if ocupados:
+                noites += dia - dia_anterior
+            ocupados += dias[dia]
+            dia_anterior = dia
+            if ocupados > inventario:
+                resultado['excessos'].append((tipo, date.fromordinal(dia), ocupados, inventario))
+        resultado['noites'][tipo] = noites
+    
+    return resultado
+
+
+def combinar_precos(parciais):
+    """
+    Soma os resultados de precos_da_fatia.
+    
+    Args:
+        parciais (iterable): Resultados de precos_da_fatia
+        
+    Returns:
+        dict: Resultado no mesmo formato
+    """
+    resultado = {'conferidas': 0, 'valor_registrado': 0.0, 'valor_recalculado': 0.0, 'divergentes': 0, 'exemplos': []}
+    
+    for parcial in parciais:
+        for chave in ('conferidas', 'valor_registrado', 'valor_recalculado', 'divergentes'):
+            resultado[chave] += parcial[chave]
+        resultado['exemplos'].extend(parcial['exemplos'][:LIMITE_EXEMPLOS - len(resultado['exemplos'])])
+    
+    return resultado
+
+
+COMBINACOES = {
+    'estatisticas': combinar_estatisticas,
+    'integridade': combinar_ocupacao,
+    'precos': combinar_precos
+}
+
+
+def dividir_em_fatias(caminho, quantidade, partes):
+    """
+    Divide os registros de um arquivo em intervalos contíguos.
+    
+    Args:
+        caminho (str): Arquivo no formato binário
+        quantidade (int): Quantidade de registros
+        partes (int): Quantidade desejada de fatias
+        
+    Returns:
+        list: Fatias (caminho, primeiro, ultimo)
+    """
+    partes = max(1, min(partes, quantidade))
+    limites = [quantidade * parte // partes for parte in range(partes + 1)]
+    return [(caminho, limites[parte], limites[parte + 1]) for parte in range(partes)]
+
+
+def preparar_instantaneo(diretorio, incluir_arquivo=True):
+    """
+    Copia os dados para um diretório temporário, sob a trava dos dados,
+    para que as tarefas leiam um estado consistente sem bloquear os demais
+    processos. No backend binário com o journal vazio, o arquivo de
+    reservas é copiado como está; caso contrário, as reservas são
+    carregadas e gravadas no formato binário.
+    
+    Args:
+        diretorio (str): Diretório temporário
+        incluir_arquivo (bool): Copia também os segmentos do arquivo morto
+        
+    Returns:
+        tuple: (caminho do instantâneo, lista de segmentos copiados)
+    """
+    instantaneo = os.path.join(diretorio, "reservas.bin")
+    segmentos = []
+    
+    with travar_dados():
+        if usando_binario() and not tamanho_journal() and os.path.exists(obter_caminho_binario()):
+            shutil.copyfile(obter_caminho_binario(), instantaneo)
+        else:
+            salvar_binario(instantaneo, carregar_reservas())
+        
+        if incluir_arquivo:
+            for caminho in listar_segmentos():
+                copia = os.path.join(diretorio, os.path.basename(caminho))
+                shutil.copyfile(caminho, copia)
+                segmentos.append(copia)
+    
+    return instantaneo, segmentos
+
+
+def executar_tarefas(tarefas, instantaneo, segmentos=(), workers=None):
+    """
+    Executa as tarefas sobre o instantâneo e os segmentos, em paralelo.
+    Com um único processo, as fatias são processadas no próprio processo
+    principal.
+    
+    Args:
+        tarefas (iterable): Tarefas (ver TAREFAS)
+        instantaneo (str): Arquivo de reservas no formato binário
+        segmentos (iterable): Segmentos do arquivo morto
+        workers (int, optional): Quantidade de processos (padrão: núcleos
+            da máquina)
+            
+    Returns:
+        dict: {tarefa: resultado combinado}
+    """
+    workers = workers or os.cpu_count() or 1
+    livro = abrir_segmento(instantaneo)
+    quantidade = livro['quantidade']
+    fechar_binario(livro)
+    
+    # Segmentos antigos primeiro, para que empates nas estatísticas sejam
+    # decididos pela reserva mais antiga, como em calcular_estatisticas
+    fatias = [(caminho, 0, None) for caminho in segmentos]
+    fatias += dividir_em_fatias(instantaneo, quantidade, workers * FATIAS_POR_PROCESSO)
+    pares = [(tarefa, fatia) for tarefa in tarefas for fatia in fatias]
+    
+    if workers == 1:
+        parciais = [processar_fatia(tarefa, fatia) for tarefa, fatia in pares]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parciais = list(executor.map(processar_fatia, *zip(*pares)))
+    
+    resultados = {}
+    for posicao, tarefa in enumerate(tarefas):
+        resultados[tarefa] = COMBINACOES[tarefa](parciais[posicao * len(fatias):(posicao + 1) * len(fatias)])
+    
+    return resultados
+
+
+def exibir_resultados(resultados):
+    """
+    Exibe os resultados das tarefas.
+    
+    Args:
+        resultados (dict): Resultado de executar_tarefas
+    """
+    estatisticas = resultados.get('estatisticas', False)
+    if estatisticas:
+        print(f"Reservas: {estatisticas['quantidade_reservas']}")
+        print(f"Valor total: {formatar_valor_monetario(estatisticas['soma_total_valores'])}")
+        print(f"Mais cara: {estatisticas['reserva_mais_cara'].nome} "
+              f"({formatar_valor_monetario(estatisticas['reserva_mais_cara'].valor)})")
+        print(f"Mais longa: {estatisticas['reserva_mais_longa'].nome} ({estatisticas['dias_mais_longa']} dia(s))")
+        print(f"Quartos por tipo: {estatisticas['quartos_reservados']}")
+    elif estatisticas is None:
+        print("Não há reservas.")
+    
+    integridade = resultados.get('integridade')
+    if integridade is not None:
+        print(f"Noites com ocupação, por tipo: {integridade['noites']}")
+        if not integridade['excessos']:
+            print("Integridade: nenhuma noite acima do inventário.")
+        else:
+            print(f"Integridade: {len(integridade['excessos'])} alteração(ões) de ocupação acima do inventário")
+        for tipo, dia, ocupados, inventario in integridade['excessos'][:LIMITE_EXEMPLOS]:
+            print(f"Overbooking: {tipo} em {dia.strftime('%d/%m/%Y')}: {ocupados} de {inventario} quarto(s)")
+    
+    precos = resultados.get('precos')
+    if precos is not None:
+        print(f"Preços conferidos: {precos['conferidas']}, divergentes: {precos['divergentes']}")
+        print(f"Total registrado: {formatar_valor_monetario(precos['valor_registrado'])}; "
+              f"com as tarifas de balcão: {formatar_valor_monetario(precos['valor_recalculado'])}")
+        for codigo, registrado, recalculado in precos['exemplos']:
+            print(f"  {codigo}: {formatar_valor_monetario(registrado)} -> {formatar_valor_monetario(recalculado)}")
+
+
+def executar_linha_de_comando(argumentos=None):
+    """
+    Ponto de entrada das tarefas paralelas pela linha de comando.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída (1 se houver noites acima do inventário)
+    """
+    parser = argparse.ArgumentParser(description="Executa tarefas sobre todas as reservas em paralelo.")
+    parser.add_argument("tarefa", nargs="?", choices=TAREFAS + ("todas",), default="todas")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Quantidade de processos")
+    parser.add_argument("--sem-arquivo", action="store_true", help="Ignora o arquivo morto")
+    opcoes = parser.parse_args(argumentos)
+    
+    tarefas = TAREFAS if opcoes.tarefa == "todas" else (opcoes.tarefa,)
+    inicio = time.perf_counter()
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        instantaneo, segmentos = preparar_instantaneo(diretorio, not opcoes.sem_arquivo)
+        resultados = executar_tarefas(tarefas, instantaneo, segmentos, max(1, opcoes.workers))
+    
+    exibir_resultados(resultados)
+    print(f"Concluído em {time.perf_counter() - inicio:.2f} s com {max(1, opcoes.workers)} processo(s).")
+    
+    integridade = resultados.get('integridade')
+    return 1 if integridade and integridade['excessos'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_linha_de_comando())
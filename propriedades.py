@@ -0,0 +1,472 @@
+"""
+Módulo da rede de propriedades.
+Cada propriedade (hotel) da rede é um shard independente: um diretório de
+dados próprio, data/propriedades/<id>/, com o inventário em
+inventario.json e o mesmo conteúdo de data/ (reservas, journal, trava,
+arquivo morto, índices). A propriedade padrão (PROPRIEDADE_PADRAO) continua
+em data/, com o inventário de config.py.
+
+Um processo atende uma única propriedade, escolhida pela variável de
+ambiente HOTEL_PROPRIEDADE antes de config ser importado. Assim o menu, o
+serviço HTTP e cli.py de uma propriedade nunca abrem nem travam os arquivos
+das outras, e a latência das operações não depende do tamanho da rede.
+
+As consultas da rede inteira (busca de hóspede e estatísticas
+consolidadas) são distribuídas: cada propriedade é consultada por um
+processo próprio, iniciado com a variável de ambiente dela, e os resultados
+parciais são combinados no processo principal.
+
+Uso pela linha de comando:
+    python propriedades.py listar
+    python propriedades.py criar ID --nome NOME --quartos standard=20 luxo=4
+                           --valores standard=120 luxo=300
+    python propriedades.py buscar NOME [--workers N]
+    python propriedades.py estatisticas [--com-arquivo | --sem-arquivo] [--workers N]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from config import (
+    VARIAVEL_PROPRIEDADE,
+    PROPRIEDADE_PADRAO,
+    DIRETORIO_PROPRIEDADES,
+    ARQUIVO_INVENTARIO
+)
+from arquivo import gravar_atomicamente
+
+# Identificador de propriedade: também é o nome do diretório do shard
+FORMATO_IDENTIFICADOR = re.compile(r"[a-z0-9][a-z0-9_-]*")
+
+
+def obter_diretorio_propriedade(propriedade):
+    """
+    Retorna o diretório de dados de uma propriedade.
+    
+    Args:
+        propriedade (str): Identificador da propriedade
+        
+    Returns:
+        str: Caminho do diretório
+    """
+    if propriedade == PROPRIEDADE_PADRAO:
+        return os.path.dirname(DIRETORIO_PROPRIEDADES)
+    return os.path.join(DIRETORIO_PROPRIEDADES, propriedade)
+
+
+def carregar_inventario(propriedade):
+    """
+    Lê o inventário de uma propriedade (exceto a padrão, cujo inventário
+    está em config.py).
+    
+    Args:
+        propriedade (str): Identificador da propriedade
+        
+    Returns:
+        dict: {'nome', 'quartos', 'valores'} ou None se o inventário não
+            existir ou for inválido
+    """
+    caminho = os.path.join(obter_diretorio_propriedade(propriedade), ARQUIVO_INVENTARIO)
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            inventario = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    
+    if (not isinstance(inventario, dict) or not isinstance(inventario.get('quartos'), dict)
+            or not isinstance(inventario.get('valores'), dict)
+            or set(inventario['quartos']) - set(inventario['valores'])):
+        return None
+    return inventario
+
+
+def listar_propriedades():
+    """
+    Lista as propriedades da rede: a padrão e as que têm um inventário
+    válido em DIRETORIO_PROPRIEDADES.
+    
+    Returns:
+        list: Identificadores, com a propriedade padrão primeiro
+    """
+    propriedades = [PROPRIEDADE_PADRAO]
+    if os.path.isdir(DIRETORIO_PROPRIEDADES):
+        for nome in sorted(os.listdir(DIRETORIO_PROPRIEDADES)):
+            if FORMATO_IDENTIFICADOR.fullmatch(nome) and carregar_inventario(nome) is not None:
+                propriedades.append(nome)
+    return propriedades
+
+
+def criar_propriedade(propriedade, nome, quartos, valores):
+    """
+    Cria o shard de uma nova propriedade, com o seu inventário.
+    
+    Args:
+        propriedade (str): Identificador (letras minúsculas, dígitos, - e _)
+        nome (str): Nome do hotel
+        quartos (dict): Quantidade de quartos por tipo, na ordem dos tipos
+        valores (dict): Diária base por tipo
+        
+    Returns:
+        bool: True se a propriedade foi criada
+    """
+    if not FORMATO_IDENTIFICADOR.fullmatch(propriedade or ""):
+        print("Erro! Identificador inválido: use letras minúsculas, dígitos, '-' e '_'.")
+        return False
+    
+    diretorio = obter_diretorio_propriedade(propriedade)
+    if propriedade == PROPRIEDADE_PADRAO or os.path.exists(os.path.join(diretorio, ARQUIVO_INVENTARIO)):
+        print(f"Erro! A propriedade '{propriedade}' já existe.")
+        return False
+    
+    if not quartos or any(quantidade <= 0 for quantidade in quartos.values()):
+        print("Erro! Informe ao menos um tipo de quarto, com quantidade positiva.")
+        return False
+    
+    if set(quartos) != set(valores) or any(valor <= 0 for valor in valores.values()):
+        print("Erro! Informe uma diária positiva para cada tipo de quarto, e só para eles.")
+        return False
+    
+    inventario = {
+        'nome': nome or propriedade,
+        'quartos': dict(quartos),
+        'valores': {tipo: valores[tipo] for tipo in quartos}
+    }
+    
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        gravar_atomicamente(
+            os.path.join(diretorio, ARQUIVO_INVENTARIO),
+            json.dumps(inventario, ensure_ascii=False, indent=2).encode("utf-8")
+        )
+    except OSError as erro:
+        print(f"Erro ao criar a propriedade: {erro}")
+        return False
+    
+    return True
+
+
+@contextmanager
+def definir_propriedade(propriedade):
+    """
+    Define a propriedade na variável de ambiente, para os processos
+    iniciados dentro do bloco, e restaura o valor anterior ao sair.
+    
+    Args:
+        propriedade (str): Identificador da propriedade
+    """
+    anterior = os.environ.get(VARIAVEL_PROPRIEDADE)
+    os.environ[VARIAVEL_PROPRIEDADE] = propriedade
+    try:
+        yield
+    finally:
+        if anterior is None:
+            del os.environ[VARIAVEL_PROPRIEDADE]
+        else:
+            os.environ[VARIAVEL_PROPRIEDADE] = anterior
+
+
+def executar_na_propriedade(conexao, funcao, argumentos):
+    """
+    Executa a consulta no processo da propriedade e envia o resultado ao
+    processo principal.
+    
+    Args:
+        conexao (Connection): Extremidade de envio do pipe
+        funcao (callable): Consulta (função de nível de módulo)
+        argumentos (tuple): Argumentos da consulta
+    """
+    try:
+        resposta = (True, funcao(*argumentos))
+    except BaseException as erro:
+        resposta = (False, f"{type(erro).__name__}: {erro}")
+    conexao.send(resposta)
+    conexao.close()
+
+
+def executar_nas_propriedades(funcao, argumentos=(), propriedades=None, workers=None):
+    """
+    Executa uma consulta em cada propriedade, em paralelo. Cada propriedade
+    tem um processo próprio (iniciado com spawn, para que config seja
+    importado com a propriedade certa), e até 'workers' processos rodam ao
+    mesmo tempo.
+    
+    Args:
+        funcao (callable): Consulta (função de nível de módulo)
+        argumentos (tuple): Argumentos da consulta
+        propriedades (list, optional): Propriedades consultadas; padrão
+            todas (listar_propriedades)
+        workers (int, optional): Processos simultâneos (padrão: núcleos da
+            máquina)
+            
+    Returns:
+        tuple: ({propriedade: resultado}, {propriedade: mensagem de erro})
+    """
+    pendentes = deque(listar_propriedades() if propriedades is None else propriedades)
+    workers = max(1, workers or os.cpu_count() or 1)
+    contexto = get_context("spawn")
+    ativos = {}
+    resultados = {}
+    erros = {}
+    
+    while pendentes or ativos:
+        while pendentes and len(ativos) < workers:
+            propriedade = pendentes.popleft()
+            recepcao, envio = contexto.Pipe(duplex=False)
+            processo = contexto.Process(target=executar_na_propriedade, args=(envio, funcao, argumentos))
+            with definir_propriedade(propriedade):
+                processo.start()
+            envio.close()
+            ativos[recepcao] = (propriedade, processo)
+        
+        for recepcao in wait(list(ativos)):
+            propriedade, processo = ativos.pop(recepcao)
+            try:
+                sucesso, resposta = recepcao.recv()
+            except EOFError:
+                sucesso, resposta = False, "o processo da propriedade terminou sem responder"
+            recepcao.close()
+            processo.join()
+            
+            if sucesso:
+                resultados[propriedade] = resposta
+            else:
+                erros[propriedade] = resposta
+    
+    return resultados, erros
+
+
+def buscar_na_propriedade(nome):
+    """
+    Busca hóspedes pelo nome nos dados da propriedade do processo (ver
+    cli.buscar_reservas).
+    
+    Args:
+        nome (str): Nome ou parte do nome
+        
+    Returns:
+        list: Reservas encontradas, ordenadas por data de check-in
+    """
+    from cli import buscar_reservas
+    
+    return buscar_reservas(nome=nome)
+
+
+def resumir_propriedade(incluir_arquivo=None):
+    """
+    Reúne o inventário e as estatísticas gerais da propriedade do processo
+    (ver cli.obter_estatisticas).
+    
+    Args:
+        incluir_arquivo (bool, optional): Inclui as estadias do arquivo morto
+        
+    Returns:
+        dict: {'nome', 'quartos', 'estatisticas'}
+    """
+    from cli import obter_estatisticas
+    from config import NOME_PROPRIEDADE, QUARTOS_QUANTIDADE
+    
+    return {
+        'nome': NOME_PROPRIEDADE,
+        'quartos': dict(QUARTOS_QUANTIDADE),
+        'estatisticas': obter_estatisticas(incluir_arquivo)
+    }
+
+
+def buscar_hospede(nome, propriedades=None, workers=None):
+    """
+    Busca um hóspede em todas as propriedades da rede.
+    
+    Args:
+        nome (str): Nome ou parte do nome
+        propriedades (list, optional): Propriedades consultadas
+        workers (int, optional): Processos simultâneos
+        
+    Returns:
+        tuple: (lista de (propriedade, reserva) ordenada por check-in,
+            {propriedade: mensagem de erro})
+    """
+    resultados, erros = executar_nas_propriedades(buscar_na_propriedade, (nome,), propriedades, workers)
+    
+    encontradas = heapq.merge(
+        *([(propriedade, reserva) for reserva in reservas] for propriedade, reservas in resultados.items()),
+        key=lambda item: item[1].checkin
+    )
+    return list(encontradas), erros
+
+
+def consolidar_estatisticas(incluir_arquivo=None, propriedades=None, workers=None):
+    """
+    Calcula as estatísticas gerais de cada propriedade e as da rede.
+    
+    Args:
+        incluir_arquivo (bool, optional): Inclui as estadias do arquivo morto
+        propriedades (list, optional): Propriedades consultadas
+        workers (int, optional): Processos simultâneos
+        
+    Returns:
+        tuple: ({'propriedades': {propriedade: resumo}, 'rede': estatísticas
+            combinadas, 'quartos': inventário da rede por tipo},
+            {propriedade: mensagem de erro})
+    """
+    from calculo import combinar_estatisticas
+    
+    resumos, erros = executar_nas_propriedades(resumir_propriedade, (incluir_arquivo,), propriedades, workers)
+    
+    quartos = {}
+    for resumo in resumos.values():
+        for tipo, quantidade in resumo['quartos'].items():
+            quartos[tipo] = quartos.get(tipo, 0) + quantidade
+    
+    return {
+        'propriedades': resumos,
+        'rede': combinar_estatisticas(resumo['estatisticas'] for resumo in resumos.values()),
+        'quartos': quartos
+    }, erros
+
+
+def converter_estatisticas(estatisticas):
+    """
+    Converte estatísticas para JSON, com as reservas no formato da
+    exportação.
+    
+    Args:
+        estatisticas (dict): Estatísticas ou None
+        
+    Returns:
+        dict: Estatísticas serializáveis
+    """
+    from cli import converter_reserva
+    
+    if estatisticas is None:
+        return {'quantidade_reservas': 0}
+    
+    convertidas = dict(estatisticas)
+    convertidas['reserva_mais_cara'] = converter_reserva(estatisticas['reserva_mais_cara'])
+    convertidas['reserva_mais_longa'] = converter_reserva(estatisticas['reserva_mais_longa'])
+    return convertidas
+
+
+def interpretar_pares(pares, conversao):
+    """
+    Converte argumentos no formato tipo=valor em um dicionário.
+    
+    Args:
+        pares (list): Argumentos tipo=valor
+        conversao (callable): Conversão do valor (int ou float)
+        
+    Returns:
+        dict: {tipo: valor}, na ordem informada
+        
+    Raises:
+        ValueError: Se algum argumento não estiver no formato tipo=valor
+    """
+    resultado = {}
+    for par in pares:
+        tipo, separador, valor = par.partition("=")
+        if not separador or not tipo.strip():
+            raise ValueError(f"use tipo=valor: {par}")
+        resultado[tipo.strip().lower()] = conversao(valor)
+    return resultado
+
+
+def exibir_erros(erros):
+    """
+    Informa, na saída de erros, as propriedades que não responderam.
+    
+    Args:
+        erros (dict): {propriedade: mensagem de erro}
+    """
+    for propriedade, mensagem in erros.items():
+        print(f"Erro! Propriedade '{propriedade}': {mensagem}", file=sys.stderr)
+
+
+def executar_linha_de_comando(argumentos=None):
+    """
+    Ponto de entrada da rede de propriedades pela linha de comando.
+    
+    Args:
+        argumentos (list, optional): Argumentos; padrão sys.argv[1:]
+        
+    Returns:
+        int: Código de saída (1 se alguma propriedade falhar ou a criação
+            for recusada)
+    """
+    parser = argparse.ArgumentParser(description="Propriedades da rede e consultas consolidadas.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    
+    subcomandos.add_parser("listar", help="Lista as propriedades")
+    
+    criar = subcomandos.add_parser("criar", help="Cria uma propriedade")
+    criar.add_argument("propriedade", help="Identificador (nome do diretório)")
+    criar.add_argument("--nome", help="Nome do hotel")
+    criar.add_argument("--quartos", nargs="+", required=True, help="Quartos por tipo (tipo=quantidade)")
+    criar.add_argument("--valores", nargs="+", required=True, help="Diária base por tipo (tipo=valor)")
+    
+    buscar = subcomandos.add_parser("buscar", help="Busca um hóspede em todas as propriedades")
+    buscar.add_argument("nome", help="Nome ou parte do nome do responsável")
+    
+    estatisticas = subcomandos.add_parser("estatisticas", help="Estatísticas por propriedade e da rede")
+    arquivo = estatisticas.add_mutually_exclusive_group()
+    arquivo.add_argument("--com-arquivo", dest="arquivo", action="store_true", default=None,
+                         help="Inclui as estadias do arquivo morto")
+    arquivo.add_argument("--sem-arquivo", dest="arquivo", action="store_false",
+                         help="Considera só as reservas atuais")
+    
+    for subparser in (buscar, estatisticas):
+        subparser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processos simultâneos")
+    
+    opcoes = parser.parse_args(argumentos)
+    
+    if opcoes.comando == "listar":
+        for propriedade in listar_propriedades():
+            inventario = carregar_inventario(propriedade) or {}
+            print(f"{propriedade}\t{obter_diretorio_propriedade(propriedade)}\t{inventario.get('nome', 'config.py')}")
+        return 0
+    
+    if opcoes.comando == "criar":
+        try:
+            quartos = interpretar_pares(opcoes.quartos, int)
+            valores = interpretar_pares(opcoes.valores, float)
+        except ValueError as erro:
+            parser.error(str(erro))
+        if not criar_propriedade(opcoes.propriedade, opcoes.nome, quartos, valores):
+            return 1
+        print(f"Propriedade '{opcoes.propriedade}' criada em {obter_diretorio_propriedade(opcoes.propriedade)}.")
+        return 0
+    
+    from cli import converter_reserva, imprimir_json
+    
+    if opcoes.comando == "buscar":
+        encontradas, erros = buscar_hospede(opcoes.nome, workers=opcoes.workers)
+        for propriedade, reserva in encontradas:
+            registro = converter_reserva(reserva)
+            registro['propriedade'] = propriedade
+            imprimir_json(registro)
+    else:
+        consolidadas, erros = consolidar_estatisticas(opcoes.arquivo, workers=opcoes.workers)
+        imprimir_json({
+            'propriedades': {
+                propriedade: {
+                    'nome': resumo['nome'],
+                    'quartos': resumo['quartos'],
+                    'estatisticas': converter_estatisticas(resumo['estatisticas'])
+                }
+                for propriedade, resumo in consolidadas['propriedades'].items()
+            },
+            'rede': converter_estatisticas(consolidadas['rede']),
+            'quartos': consolidadas['quartos']
+        })
+    
+    exibir_erros(erros)
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(executar_linha_de_comando())
@@ -0,0 +1,140 @@
+"""
+Módulo do registro de reserva.
+Cada reserva é um registro imutável com __slots__ (Reserva), com as datas
+como date: ocupa bem menos memória que um dicionário de sete chaves com
+dois datetime, e o acesso por atributo (reserva.valor) é mais rápido que a
+busca por chave nos laços de estatísticas e de disponibilidade.
+
+Durante a transição, o registro continua aceitando o acesso por chave de
+dicionário (reserva['valor']), e reservas antigas gravadas como dicionário
+são convertidas ao serem carregadas (como_registro).
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+CAMPOS = ('hash', 'nome', 'checkin', 'checkout', 'tipo_quarto', 'quantidade_quartos', 'valor')
+
+definir_campo = object.__setattr__
+
+
+class Reserva:
+    """
+    Registro imutável de uma reserva, com os campos de CAMPOS.
+    """
+    __slots__ = CAMPOS
+    
+    def __init__(self, hash, nome, checkin, checkout, tipo_quarto, quantidade_quartos, valor):
+        definir_campo(self, 'hash', hash)
+        definir_campo(self, 'nome', nome)
+        definir_campo(self, 'checkin', checkin)
+        definir_campo(self, 'checkout', checkout)
+        definir_campo(self, 'tipo_quarto', tipo_quarto)
+        definir_campo(self, 'quantidade_quartos', quantidade_quartos)
+        definir_campo(self, 'valor', valor)
+    
+    def __setattr__(self, campo, valor):
+        raise AttributeError("Reserva é imutável")
+    
+    def __delattr__(self, campo):
+        raise AttributeError("Reserva é imutável")
+    
+    def __getitem__(self, chave):
+        """
+        Acesso por chave, como nos dicionários de reserva usados até aqui.
+        """
+        if chave not in CAMPOS:
+            raise KeyError(chave)
+        return getattr(self, chave)
+    
+    def get(self, chave, padrao=None):
+        """
+        Equivalente a dict.get, para o código que ainda trata a reserva
+        como dicionário.
+        """
+        return getattr(self, chave) if chave in CAMPOS else padrao
+    
+    def __eq__(self, outra):
+        if not isinstance(outra, Reserva):
+            return NotImplemented
+        return valores(self) == valores(outra)
+    
+    def __hash__(self):
+        return hash(valores(self))
+    
+    def __repr__(self):
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in CAMPOS)
+        return f"Reserva({campos})"
+    
+    def __reduce__(self):
+        # Sem o estado padrão dos slots, que seria restaurado por __setattr__
+        return Reserva, valores(self)
+
+
+def valores(reserva):
+    """
+    Retorna os campos do registro, na ordem de CAMPOS.
+    
+    Args:
+        reserva (Reserva): Registro da reserva
+        
+    Returns:
+        tuple: Valores dos campos
+    """
+    return (
+        reserva.hash, reserva.nome, reserva.checkin, reserva.checkout,
+        reserva.tipo_quarto, reserva.quantidade_quartos, reserva.valor
+    )
+
+
+@lru_cache(maxsize=4096)
+def converter_para_data(valor):
+    """
+    Converte um datetime (formato das versões anteriores) para date. O
+    cache faz as reservas de um mesmo dia compartilharem o objeto date.
+    
+    Args:
+        valor (date): Data ou data e hora
+        
+    Returns:
+        date: Data sem hora
+    """
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+def como_registro(reserva):
+    """
+    Converte uma reserva no formato de dicionário (arquivos e journals de
+    versões anteriores) para o registro Reserva.
+    
+    Args:
+        reserva (dict): Reserva como dicionário ou registro
+        
+    Returns:
+        Reserva: Registro da reserva
+    """
+    if isinstance(reserva, Reserva):
+        return reserva
+    
+    return Reserva(
+        reserva['hash'],
+        reserva['nome'],
+        converter_para_data(reserva['checkin']),
+        converter_para_data(reserva['checkout']),
+        reserva['tipo_quarto'],
+        reserva['quantidade_quartos'],
+        reserva['valor']
+    )
+
+
+def como_dicionario(reserva):
+    """
+    Converte o registro para dicionário.
+    
+    Args:
+        reserva (Reserva): Registro da reserva
+        
+    Returns:
+        dict: Reserva como dicionário
+    """
+    return dict(zip(CAMPOS, valores(reserva)))
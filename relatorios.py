@@ -0,0 +1,272 @@
+"""
+Módulo de relatórios de receita e ocupação.
+Calcula, por tipo de quarto e por dia, semana ou mês de um período, a taxa
+de ocupação, a diária média (ADR: receita por quarto vendido) e a receita
+por quarto disponível (RevPAR).
+
+Cada reserva é distribuída pelas noites que ocupa com um vetor de diferenças
+(quartos e receita por noite somados no check-in e subtraídos no check-out)
+seguido de uma soma acumulada, em uma única passagem pelas reservas. As
+séries diárias ficam em cache por mês no cadastro (cadastro['relatorios']):
+criar ou cancelar uma reserva invalida só os meses que ela ocupa, e as
+estadias do arquivo morto só são lidas quando o período pedido começa antes
+de hoje.
+"""
+
+from datetime import date, timedelta
+from itertools import accumulate
+from config import QUARTOS_QUANTIDADE, TIPOS_QUARTOS
+from arquivamento import ler_arquivo_morto
+from metricas import instrumentar
+
+AGRUPAMENTOS = ("dia", "semana", "mes")
+
+
+def inicio_do_mes(data):
+    """
+    Retorna o primeiro dia do mês de uma data.
+    
+    Args:
+        data (date): Data qualquer
+        
+    Returns:
+        date: Primeiro dia do mês
+    """
+    return data.replace(day=1)
+
+
+def inicio_do_proximo_mes(data):
+    """
+    Retorna o primeiro dia do mês seguinte ao de uma data.
+    
+    Args:
+        data (date): Data qualquer
+        
+    Returns:
+        date: Primeiro dia do mês seguinte
+    """
+    return (data.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def meses_do_periodo(data_inicio, data_fim):
+    """
+    Lista os meses que têm alguma noite no período [data_inicio, data_fim).
+    
+    Args:
+        data_inicio (date): Primeira noite
+        data_fim (date): Dia seguinte à última noite
+        
+    Returns:
+        list: Primeiro dia de cada mês
+    """
+    meses = []
+    mes = inicio_do_mes(data_inicio)
+    
+    while mes < data_fim:
+        meses.append(mes)
+        mes = inicio_do_proximo_mes(mes)
+    
+    return meses
+
+
+def invalidar_relatorios(cache, reserva):
+    """
+    Descarta do cache as séries dos meses ocupados por uma reserva criada
+    ou cancelada.
+    
+    Args:
+        cache (dict): Cache de séries mensais (cadastro['relatorios'])
+        reserva (Reserva): Reserva alterada
+    """
+    if cache:
+        for mes in meses_do_periodo(reserva.checkin, reserva.checkout):
+            cache.pop(mes, None)
+
+
+def calcular_series(reservas, data_inicio, data_fim):
+    """
+    Distribui as reservas pelas noites do período em uma única passagem.
+    
+    Args:
+        reservas (iterable): Reservas (Reserva)
+        data_inicio (date): Primeira noite
+        data_fim (date): Dia seguinte à última noite
+        
+    Returns:
+        dict: {tipo_quarto: (quartos vendidos por noite, receita por noite)}
+    """
+    inicio = data_inicio.toordinal()
+    fim = data_fim.toordinal()
+    dias = fim - inicio
+    diferencas = {tipo: ([0] * (dias + 1), [0.0] * (dias + 1)) for tipo in TIPOS_QUARTOS}
+    
+    for reserva in reservas:
+        checkin = reserva.checkin.toordinal()
+        checkout = reserva.checkout.toordinal()
+        primeira = max(checkin, inicio)
+        ultima = min(checkout, fim)
+        if primeira >= ultima or reserva.tipo_quarto not in diferencas:
+            continue
+        
+        quartos, receita = diferencas[reserva.tipo_quarto]
+        receita_noite = reserva.valor / (checkout - checkin)
+        quartos[primeira - inicio] += reserva.quantidade_quartos
+        quartos[ultima - inicio] -= reserva.quantidade_quartos
+        receita[primeira - inicio] += receita_noite
+        receita[ultima - inicio] -= receita_noite
+    
+    return {
+        tipo: (list(accumulate(quartos[:dias])), list(accumulate(receita[:dias])))
+        for tipo, (quartos, receita) in diferencas.items()
+    }
+
+
+def preencher_cache(cadastro, meses):
+    """
+    Calcula, em uma única passagem, as séries dos meses que ainda não estão
+    no cache.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        meses (list): Primeiro dia de cada mês necessário
+    """
+    cache = cadastro['relatorios']
+    faltantes = [mes for mes in meses if mes not in cache]
+    if not faltantes:
+        return
+    
+    data_inicio = faltantes[0]
+    data_fim = inicio_do_proximo_mes(faltantes[-1])
+    reservas = list(cadastro['reservas'].values())
+    
+    # Estadias arquivadas terminaram antes de hoje; uma reserva que ainda
+    # esteja no cadastro (arquivamento interrompido) não é contada duas vezes
+    if data_inicio < date.today():
+        reservas.extend(
+            reserva for reserva in ler_arquivo_morto(de=data_inicio, ate=data_fim)
+            if reserva.hash not in cadastro['reservas']
+        )
+    
+    series = calcular_series(reservas, data_inicio, data_fim)
+    
+    for mes in faltantes:
+        posicao = (mes - data_inicio).days
+        tamanho = (inicio_do_proximo_mes(mes) - mes).days
+        cache[mes] = {
+            tipo: (quartos[posicao:posicao + tamanho], receita[posicao:posicao + tamanho])
+            for tipo, (quartos, receita) in series.items()
+        }
+
+
+def dividir_periodo(data_inicio, data_fim, agrupamento):
+    """
+    Divide o período em dias, semanas (de segunda a domingo) ou meses,
+    recortando o primeiro e o último grupo nos limites do período.
+    
+    Args:
+        data_inicio (date): Primeira noite
+        data_fim (date): Dia seguinte à última noite
+        agrupamento (str): "dia", "semana" ou "mes"
+        
+    Returns:
+        list: Grupos (inicio, fim), com fim exclusivo
+    """
+    grupos = []
+    inicio = data_inicio
+    
+    while inicio < data_fim:
+        if agrupamento == "dia":
+            fim = inicio + timedelta(days=1)
+        elif agrupamento == "semana":
+            fim = inicio + timedelta(days=7 - inicio.weekday())
+        else:
+            fim = inicio_do_proximo_mes(inicio)
+        fim = min(fim, data_fim)
+        grupos.append((inicio, fim))
+        inicio = fim
+    
+    return grupos
+
+
+def montar_linha(inicio, fim, tipo_quarto, quartos_disponiveis, quartos_vendidos, receita):
+    """
+    Monta uma linha do relatório com os indicadores derivados.
+    
+    Args:
+        inicio (date): Primeira noite do grupo
+        fim (date): Dia seguinte à última noite do grupo
+        tipo_quarto (str): Tipo do quarto ou "total"
+        quartos_disponiveis (int): Quartos-noite disponíveis
+        quartos_vendidos (int): Quartos-noite vendidos
+        receita (float): Receita das noites do grupo
+        
+    Returns:
+        dict: Linha do relatório
+    """
+    return {
+        'inicio': inicio,
+        'fim': fim,
+        'tipo_quarto': tipo_quarto,
+        'quartos_disponiveis': quartos_disponiveis,
+        'quartos_vendidos': quartos_vendidos,
+        'receita': receita,
+        'ocupacao': quartos_vendidos / quartos_disponiveis if quartos_disponiveis else 0.0,
+        'adr': receita / quartos_vendidos if quartos_vendidos else 0.0,
+        'revpar': receita / quartos_disponiveis if quartos_disponiveis else 0.0
+    }
+
+
+@instrumentar
+def gerar_relatorio(cadastro, data_inicio, data_fim, agrupamento="mes"):
+    """
+    Gera o relatório de receita e ocupação de um período.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        data_inicio (date): Primeira noite
+        data_fim (date): Dia seguinte à última noite
+        agrupamento (str): "dia", "semana" ou "mes"
+        
+    Returns:
+        list: Linhas do relatório (ver montar_linha), uma por tipo de quarto
+            e uma "total" por grupo, em ordem cronológica
+    """
+    meses = meses_do_periodo(data_inicio, data_fim)
+    preencher_cache(cadastro, meses)
+    
+    # Séries do período, recortadas dos meses em cache, já acumuladas para
+    # que a soma de cada grupo seja uma subtração
+    deslocamento = (data_inicio - meses[0]).days if meses else 0
+    dias = (data_fim - data_inicio).days
+    acumulados = {}
+    for tipo in TIPOS_QUARTOS:
+        quartos = [quantidade for mes in meses for quantidade in cadastro['relatorios'][mes][tipo][0]]
+        receita = [valor for mes in meses for valor in cadastro['relatorios'][mes][tipo][1]]
+        acumulados[tipo] = (
+            list(accumulate(quartos[deslocamento:deslocamento + dias], initial=0)),
+            list(accumulate(receita[deslocamento:deslocamento + dias], initial=0.0))
+        )
+    
+    linhas = []
+    for inicio, fim in dividir_periodo(data_inicio, data_fim, agrupamento):
+        primeira = (inicio - data_inicio).days
+        ultima = (fim - data_inicio).days
+        noites = ultima - primeira
+        totais = [0, 0, 0.0]
+        
+        for tipo in TIPOS_QUARTOS:
+            quartos, receita = acumulados[tipo]
+            linha = montar_linha(
+                inicio, fim, tipo,
+                QUARTOS_QUANTIDADE[tipo] * noites,
+                quartos[ultima] - quartos[primeira],
+                receita[ultima] - receita[primeira]
+            )
+            linhas.append(linha)
+            totais[0] += linha['quartos_disponiveis']
+            totais[1] += linha['quartos_vendidos']
+            totais[2] += linha['receita']
+        
+        linhas.append(montar_linha(inicio, fim, "total", *totais))
+    
+    return linhas
@@ -3,31 +3,126 @@ Módulo de gerenciamento de reservas.
 Contém funções para criar, cancelar e gerenciar reservas.
 """
 
-from datetime import datetime
-from calculo import calcular_valor_reserva, calcular_dias_estadia, verificar_disponibilidade
-from interface import coletar_dados_reserva
-from arquivo import salvar_reservas
+from calculo import verificar_disponibilidade, validar_dados_reserva, estadia_concluida
+from interface import coletar_dados_reserva, exibir_sugestoes
+from cadastro import adicionar_reserva, remover_reserva, buscar_reserva, listar_reservas
+from concorrencia import acesso_exclusivo, gravar_operacoes
+from identificador import gerar_codigo
+from calendario import sugerir_alternativas
+from tarifas import obter_tabela_tarifas, cotar_estadia
+from alocacao import obter_alocacao, formatar_quartos
+from metricas import instrumentar
+from registro import Reserva
 
 
-def gerar_hash_reserva(dados_reserva):
+# Motivos de falha das operações sobre o cadastro
+ERRO_INDISPONIVEL = "Não há quartos suficientes disponíveis para o período solicitado."
+ERRO_NAO_ENCONTRADA = "Reserva não encontrada."
+ERRO_CONCLUIDA = "O período da reserva já foi concluído."
+ERRO_GRAVACAO = "Erro ao salvar as alterações."
+
+
+def montar_reserva(dados, codigo, tabela):
+    """
+    Monta a reserva completa (código e valor) a partir dos dados validados.
+    
+    Args:
+        dados (dict): Dados com nome, checkin, checkout, tipo_quarto e
+            quantidade_quartos
+        codigo (int): Código da reserva (ver identificador.gerar_codigo)
+        tabela (dict): Tabela de tarifas (ver tarifas.py)
+        
+    Returns:
+        Reserva: Reserva completa
+    """
+    valor = cotar_estadia(
+        tabela,
+        dados['tipo_quarto'],
+        dados['checkin'],
+        dados['checkout'],
+        dados['quantidade_quartos']
+    )
+    
+    return Reserva(
+        codigo,
+        dados['nome'],
+        dados['checkin'],
+        dados['checkout'],
+        dados['tipo_quarto'],
+        dados['quantidade_quartos'],
+        valor
+    )
+
+
+@instrumentar
+def aplicar_reserva(cadastro, dados):
+    """
+    Valida os dados, confere a disponibilidade e inclui a nova reserva no
+    cadastro, sem interação com o usuário e sem persistir.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas existentes
+        dados (dict): Dados com nome, checkin, checkout, tipo_quarto e
+            quantidade_quartos
+            
+    Returns:
+        tuple: (reserva, None) se incluída, ou (None, motivo) caso contrário
+    """
+    motivo = validar_dados_reserva(dados)
+    if motivo:
+        return None, motivo
+    
+    disponivel = verificar_disponibilidade(
+        listar_reservas(cadastro),
+        dados['tipo_quarto'],
+        dados['checkin'],
+        dados['checkout'],
+        dados['quantidade_quartos'],
+        cadastro['ocupacao']
+    )
+    if not disponivel:
+        return None, ERRO_INDISPONIVEL
+    
+    # Cria a reserva completa, com um código que não esteja em uso e o valor
+    # cotado antes de a reserva ocupar os quartos; ao ser incluída, ela
+    # recebe os quartos (ver alocacao.py)
+    reserva = montar_reserva(dados, gerar_codigo(cadastro['reservas']), obter_tabela_tarifas(cadastro))
+    obter_alocacao(cadastro)
+    adicionar_reserva(cadastro, reserva)
+    return reserva, None
+
+
+@instrumentar
+def aplicar_cancelamento(cadastro, codigo_hash):
     """
-    Gera um código hash único para a reserva.
+    Retira uma reserva do cadastro, sem interação com o usuário e sem
+    persistir. Reservas com período já concluído não podem ser canceladas.
     
     Args:
-        dados_reserva (dict): Dados da reserva
+        cadastro (dict): Cadastro de reservas existentes
+        codigo_hash (int): Código da reserva
         
     Returns:
-        int: Código hash positivo
+        tuple: (reserva, None) se removida, ou (None, motivo) caso contrário
     """
-    return abs(hash(str(dados_reserva)))
+    reserva = buscar_reserva(cadastro, codigo_hash)
+    
+    if reserva is None:
+        return None, ERRO_NAO_ENCONTRADA
+    
+    if estadia_concluida(reserva):
+        return None, ERRO_CONCLUIDA
+    
+    remover_reserva(cadastro, codigo_hash)
+    return reserva, None
 
 
-def criar_reserva(reservas):
+def criar_reserva(cadastro):
     """
     Cria uma nova reserva após coletar dados e validar disponibilidade.
     
     Args:
-        reservas (list): Lista de reservas existentes
+        cadastro (dict): Cadastro de reservas existentes
         
     Returns:
         bool: True se a reserva foi criada com sucesso, False caso contrário
@@ -38,72 +133,48 @@ def criar_reserva(reservas):
         print("\nErro ao coletar dados da reserva.")
         return False
     
-    # Verifica disponibilidade
-    disponivel = verificar_disponibilidade(
-        reservas,
-        dados['tipo_quarto'],
-        dados['checkin'],
-        dados['checkout'],
-        dados['quantidade_quartos']
-    )
+    # Incorpora as reservas feitas em outros terminais, confere a
+    # disponibilidade contra o estado mais recente e grava, sob a trava
+    with acesso_exclusivo(cadastro):
+        reserva, erro = aplicar_reserva(cadastro, dados)
+        if erro is None and not gravar_operacoes(cadastro, [("criar", reserva)]):
+            erro = ERRO_GRAVACAO
     
-    if not disponivel:
+    if erro == ERRO_INDISPONIVEL:
         print("\n" + "="*60)
         print("NÃO FOI POSSÍVEL REALIZAR ESSA RESERVA!")
         print("="*60)
         print("Não há quartos suficientes disponíveis para o período solicitado.")
-        print("Sugestões:")
-        print("  - Escolha outro tipo de quarto")
-        print("  - Reduza a quantidade de quartos")
-        print("  - Altere as datas da reserva")
+        exibir_sugestoes(sugerir_alternativas(listar_reservas(cadastro), dados, cadastro['ocupacao']), dados)
         print("="*60 + "\n")
         return False
     
-    # Calcula valor da reserva
-    dias_estadia = calcular_dias_estadia(dados['checkin'], dados['checkout'])
-    valor = calcular_valor_reserva(
-        dados['tipo_quarto'],
-        dados['quantidade_quartos'],
-        dias_estadia
-    )
-    
-    # Cria a reserva completa
-    reserva = {
-        'hash': gerar_hash_reserva(dados),
-        'nome': dados['nome'],
-        'checkin': dados['checkin'],
-        'checkout': dados['checkout'],
-        'tipo_quarto': dados['tipo_quarto'],
-        'quantidade_quartos': dados['quantidade_quartos'],
-        'valor': valor
-    }
-    
-    # Adiciona à lista e salva
-    reservas.append(reserva)
-    
-    if salvar_reservas(reservas):
-        print("\n" + "="*60)
-        print("RESERVA REALIZADA COM SUCESSO!")
-        print("="*60)
-        print(f"Código da Reserva: {reserva['hash']}")
-        print(f"Responsável: {reserva['nome']}")
-        print(f"Período: {reserva['checkin'].strftime('%d/%m/%Y')} a {reserva['checkout'].strftime('%d/%m/%Y')}")
-        print(f"Valor Total: R$ {valor:.2f}")
-        print("="*60 + "\n")
-        return True
-    else:
-        # Remove da lista se não conseguiu salvar
-        reservas.pop()
+    if erro == ERRO_GRAVACAO:
         print("\nErro ao salvar a reserva. Tente novamente.")
         return False
+    
+    if erro:
+        print(f"\nErro! {erro}")
+        return False
+    
+    print("\n" + "="*60)
+    print("RESERVA REALIZADA COM SUCESSO!")
+    print("="*60)
+    print(f"Código da Reserva: {reserva['hash']}")
+    print(f"Responsável: {reserva['nome']}")
+    print(f"Período: {reserva['checkin'].strftime('%d/%m/%Y')} a {reserva['checkout'].strftime('%d/%m/%Y')}")
+    print(f"Quarto(s): {formatar_quartos(cadastro['alocacao']['atribuicoes'].get(reserva.hash, ()))}")
+    print(f"Valor Total: R$ {reserva['valor']:.2f}")
+    print("="*60 + "\n")
+    return True
 
 
-def cancelar_reserva(reservas):
+def cancelar_reserva(cadastro):
     """
-    Cancela uma reserva existente baseado no código hash.
+    Cancela uma reserva existente baseado no código.
     
     Args:
-        reservas (list): Lista de reservas existentes
+        cadastro (dict): Cadastro de reservas existentes
         
     Returns:
         bool: True se a reserva foi cancelada, False caso contrário
@@ -113,39 +184,38 @@ def cancelar_reserva(reservas):
     print("="*60 + "\n")
     
     try:
-        codigo_hash = int(input("Digite o código (HASH) da reserva: "))
+        codigo_hash = int(input("Digite o código da reserva: "))
     except ValueError:
         print("\nErro! Digite um código válido.")
         return False
     
-    # Busca a reserva
-    for indice, reserva in enumerate(reservas):
-        if reserva['hash'] == codigo_hash:
-            # Verifica se a reserva já passou
-            if reserva['checkout'] < datetime.today():
-                print("\n" + "="*60)
-                print("ESSA RESERVA NÃO PODE SER CANCELADA!")
-                print("="*60)
-                print("O período da reserva já foi concluído.")
-                print("="*60 + "\n")
-                return False
-            
-            # Remove a reserva
-            reservas.pop(indice)
-            
-            if salvar_reservas(reservas):
-                print("\n" + "="*60)
-                print("RESERVA CANCELADA COM SUCESSO!")
-                print("="*60)
-                print(f"Código: {codigo_hash}")
-                print(f"Responsável: {reserva['nome']}")
-                print("="*60 + "\n")
-                return True
-            else:
-                # Restaura a reserva se não conseguiu salvar
-                reservas.insert(indice, reserva)
-                print("\nErro ao salvar as alterações. Tente novamente.")
-                return False
-    
-    print(f"\nReserva com código {codigo_hash} não encontrada.")
-    return False
+    # Busca e remove a reserva, se ainda não concluída, sob a trava e
+    # considerando os cancelamentos feitos em outros terminais
+    with acesso_exclusivo(cadastro):
+        reserva, erro = aplicar_cancelamento(cadastro, codigo_hash)
+        if erro is None and not gravar_operacoes(cadastro, [("cancelar", reserva)]):
+            erro = ERRO_GRAVACAO
+    
+    if erro == ERRO_NAO_ENCONTRADA:
+        print(f"\nReserva com código {codigo_hash} não encontrada.")
+        return False
+    
+    if erro == ERRO_CONCLUIDA:
+        print("\n" + "="*60)
+        print("ESSA RESERVA NÃO PODE SER CANCELADA!")
+        print("="*60)
+        print("O período da reserva já foi concluído.")
+        print("="*60 + "\n")
+        return False
+    
+    if erro == ERRO_GRAVACAO:
+        print("\nErro ao salvar as alterações. Tente novamente.")
+        return False
+    
+    print("\n" + "="*60)
+    print("RESERVA CANCELADA COM SUCESSO!")
+    print("="*60)
+    print(f"Código: {codigo_hash}")
+    print(f"Responsável: {reserva['nome']}")
+    print("="*60 + "\n")
+    return True
@@ -0,0 +1,784 @@
+"""
+Módulo do serviço HTTP/JSON de reservas.
+Expõe as operações do sistema para vários atendentes ao mesmo tempo, com
+asyncio e apenas a biblioteca padrão. Leituras são atendidas diretamente
+pelo cadastro em memória; criações e cancelamentos passam por uma fila
+com um único escritor, que aplica as operações em ordem (sem risco de
+overbooking) e grava cada lote com uma única operação de persistência.
+
+O cadastro só é acessado na thread do cadastro (o executor padrão do loop,
+com uma única thread; ver executar_servidor): a trava dos dados, o fsync e
+a sincronização não bloqueiam o loop, que continua atendendo as conexões,
+e consultas e gravações nunca disputam o cadastro entre si.
+
+Uso:
+    python servidor.py [--host HOST] [--porta PORTA]
+
+Cada serviço atende uma propriedade da rede (HOTEL_PROPRIEDADE=ID; ver
+propriedades.py).
+
+Rotas:
+    POST   /reservas              cria reserva (JSON com nome, checkin,
+                                  checkout, tipo_quarto, quantidade_quartos);
+                                  a resposta traz os quartos atribuídos
+    GET    /reservas/{codigo}     consulta por código, com os quartos
+    DELETE /reservas/{codigo}     cancela
+    GET    /reservas?nome=...     busca por nome
+    GET    /reservas?pagina=&tamanho=&tipo=&de=&ate=&ordenar=
+                                  lista paginada
+    GET    /estatisticas?arquivo=1
+                                  estatísticas gerais (com ou sem o
+                                  arquivo morto)
+    GET    /relatorios?de=&ate=&agrupar=mes
+                                  ocupação, ADR e RevPAR por tipo e período
+    GET    /disponibilidade?de=&ate=
+                                  quartos livres e diárias por tipo e noite
+    GET    /cotacao?tipo=&checkin=&checkout=&quartos=
+                                  valor de uma estadia, com as diárias
+    GET    /alocacao?dias=        fragmentação das noites livres por tipo
+    GET    /metricas              métricas de desempenho (texto do
+                                  Prometheus; requer COLETAR_METRICAS)
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+from urllib.parse import urlsplit, parse_qs
+from config import (
+    SERVIDOR_HOST,
+    SERVIDOR_PORTA,
+    TAMANHO_LOTE_ESCRITA,
+    TAMANHO_PAGINA,
+    COLETAR_METRICAS,
+    HORIZONTE_CALENDARIO,
+    ESTATISTICAS_INCLUEM_ARQUIVO,
+    TIPOS_QUARTOS,
+    NOME_PROPRIEDADE
+)
+from utils import converter_data
+from cadastro import buscar_reserva, buscar_reservas_por_nome, listar_reservas, obter_estatisticas_cadastro
+from concorrencia import (
+    abrir_cadastro,
+    atualizar_cadastro,
+    acesso_exclusivo,
+    gravar_operacoes,
+    invalidar_sincronizacao,
+    encerrar_cadastro
+)
+from reserva import (
+    aplicar_reserva,
+    aplicar_cancelamento,
+    ERRO_INDISPONIVEL,
+    ERRO_NAO_ENCONTRADA,
+    ERRO_CONCLUIDA,
+    ERRO_GRAVACAO
+)
+from importacao import converter_registro
+from calendario import calcular_calendario, sugerir_alternativas
+from relatorios import AGRUPAMENTOS, gerar_relatorio
+from tarifas import obter_tabela_tarifas, listar_diarias, cotar_estadia
+from alocacao import obter_alocacao, calcular_fragmentacao, contar_sem_quarto
+from listagem import ORDENACOES, iterar_reservas, converter_para_exportacao
+from metricas import registrar_duracao, formatar_prometheus, salvar_metricas
+
+STATUS_HTTP = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    500: "Internal Server Error"
+}
+
+ROTAS = ("reservas", "estatisticas", "relatorios", "disponibilidade", "cotacao", "alocacao", "metricas")
+
+STATUS_POR_ERRO = {
+    ERRO_INDISPONIVEL: 409,
+    ERRO_CONCLUIDA: 409,
+    ERRO_NAO_ENCONTRADA: 404,
+    ERRO_GRAVACAO: 500
+}
+
+
+def executar_lote(cadastro, lote):
+    """
+    Aplica em ordem um lote de operações do escritor e grava-o com uma
+    única persistência, sob a trava dos dados e sobre o estado mais recente
+    (ver concorrencia.py). Se a gravação falhar, todas as operações do lote
+    são desfeitas. Roda na thread do cadastro.
+    
+    Um erro inesperado numa operação vale só para ela. Um erro fora das
+    operações (na sincronização ou na gravação) é propagado, e o cadastro
+    é recarregado por completo na próxima sincronização.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        lote (list): Itens (operacao, argumento, futuro)
+        
+    Returns:
+        list: Pares [futuro, resultado], com resultado (reserva, erro) ou a
+            exceção da operação
+    """
+    aplicadas = []
+    resultados = []
+    
+    try:
+        with acesso_exclusivo(cadastro):
+            for operacao, argumento, futuro in lote:
+                try:
+                    if operacao == "criar":
+                        reserva, erro = aplicar_reserva(cadastro, argumento)
+                    else:
+                        reserva, erro = aplicar_cancelamento(cadastro, argumento)
+                except Exception as falha:
+                    resultados.append([futuro, falha])
+                    continue
+                
+                if erro is None:
+                    aplicadas.append((operacao, reserva))
+                resultados.append([futuro, (reserva, erro)])
+            
+            if aplicadas and not gravar_operacoes(cadastro, aplicadas):
+                for resultado in resultados:
+                    if isinstance(resultado[1], tuple) and resultado[1][1] is None:
+                        resultado[1] = (None, ERRO_GRAVACAO)
+    except BaseException:
+        invalidar_sincronizacao(cadastro)
+        raise
+    
+    return resultados
+
+
+async def processar_escritas(cadastro, fila):
+    """
+    Único escritor do cadastro: retira da fila as operações pendentes e
+    executa cada lote na thread do cadastro (executar_lote). Se o lote
+    inteiro falhar (inclusive com SystemExit, como o de
+    arquivo.carregar_geracoes sem geração íntegra), a falha é repassada aos
+    futuros do lote e o escritor segue atendendo a fila.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        fila (asyncio.Queue): Itens (operacao, argumento, futuro)
+    """
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        lote = [await fila.get()]
+        while not fila.empty() and len(lote) < TAMANHO_LOTE_ESCRITA:
+            lote.append(fila.get_nowait())
+        
+        try:
+            resultados = await loop.run_in_executor(None, executar_lote, cadastro, lote)
+        except (Exception, SystemExit) as falha:
+            traceback.print_exc()
+            # Só exceções comuns vão aos futuros: SystemExit num atendimento
+            # encerraria o servidor
+            if not isinstance(falha, Exception):
+                falha = RuntimeError(f"Falha ao gravar o lote: {falha!r}")
+            resultados = [[futuro, falha] for _, _, futuro in lote]
+        
+        for futuro, resultado in resultados:
+            if futuro.done():
+                continue
+            if isinstance(resultado, BaseException):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+
+async def enfileirar_escrita(fila, operacao, argumento):
+    """
+    Envia uma operação ao escritor e aguarda o resultado.
+    
+    Args:
+        fila (asyncio.Queue): Fila do escritor
+        operacao (str): "criar" ou "cancelar"
+        argumento: Dados da reserva ou código a cancelar
+        
+    Returns:
+        tuple: (reserva, erro)
+    """
+    futuro = asyncio.get_running_loop().create_future()
+    await fila.put((operacao, argumento, futuro))
+    return await futuro
+
+
+def resposta_de_erro(erro):
+    """
+    Converte um motivo de falha em resposta HTTP.
+    
+    Args:
+        erro (str): Motivo da falha
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    return STATUS_POR_ERRO.get(erro, 400), {'erro': erro}
+
+
+def listar_pagina(cadastro, parametros):
+    """
+    Monta uma página da listagem a partir dos parâmetros da URL.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        pagina = max(int(parametros.get('pagina', 1)), 1)
+        tamanho = min(max(int(parametros.get('tamanho', TAMANHO_PAGINA)), 1), 1000)
+        data_inicio = converter_data(parametros['de']) if parametros.get('de') else None
+        data_fim = converter_data(parametros['ate']) if parametros.get('ate') else None
+    except ValueError:
+        return 400, {'erro': "Parâmetros de paginação ou de período inválidos."}
+    
+    ordenar_por = parametros.get('ordenar')
+    if ordenar_por is not None and ordenar_por not in ORDENACOES:
+        return 400, {'erro': f"Ordenação inválida; use: {', '.join(ORDENACOES)}."}
+    
+    reservas = iterar_reservas(
+        listar_reservas(cadastro),
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        tipo_quarto=parametros.get('tipo'),
+        ordenar_por=ordenar_por
+    )
+    selecionadas = islice(reservas, (pagina - 1) * tamanho, pagina * tamanho)
+    
+    return 200, {
+        'pagina': pagina,
+        'tamanho': tamanho,
+        'reservas': [converter_para_exportacao(reserva) for reserva in selecionadas]
+    }
+
+
+def montar_estatisticas(cadastro, parametros):
+    """
+    Converte as estatísticas gerais para JSON. O parâmetro 'arquivo' (0 ou
+    1) escolhe se as estadias arquivadas entram no cálculo; o padrão é
+    ESTATISTICAS_INCLUEM_ARQUIVO.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta
+        
+    Returns:
+        dict: Estatísticas ou {'quantidade_reservas': 0} sem reservas
+    """
+    incluir_arquivo = parametros.get('arquivo', str(int(ESTATISTICAS_INCLUEM_ARQUIVO))) not in ("0", "")
+    estatisticas = obter_estatisticas_cadastro(cadastro, incluir_arquivo)
+    if estatisticas is None:
+        return {'quantidade_reservas': 0}
+    
+    estatisticas = dict(estatisticas)
+    estatisticas['reserva_mais_cara'] = converter_para_exportacao(estatisticas['reserva_mais_cara'])
+    estatisticas['reserva_mais_longa'] = converter_para_exportacao(estatisticas['reserva_mais_longa'])
+    return estatisticas
+
+
+def montar_disponibilidade(cadastro, parametros):
+    """
+    Monta o calendário de disponibilidade de um período (padrão: os
+    próximos 30 dias, limitado a HORIZONTE_CALENDARIO dias), com as
+    diárias de cada tipo em cada noite.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta (de, ate)
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        data_inicio = converter_data(parametros['de']) if parametros.get('de') else date.today()
+        data_fim = converter_data(parametros['ate']) if parametros.get('ate') else data_inicio + timedelta(days=30)
+    except ValueError:
+        return 400, {'erro': "Período inválido."}
+    
+    if not 0 < (data_fim - data_inicio).days <= HORIZONTE_CALENDARIO:
+        return 400, {'erro': f"O período deve ter entre 1 e {HORIZONTE_CALENDARIO} noites."}
+    
+    tabela = obter_tabela_tarifas(cadastro)
+    return 200, {
+        'de': data_inicio.strftime('%d/%m/%Y'),
+        'ate': data_fim.strftime('%d/%m/%Y'),
+        'livres': calcular_calendario(listar_reservas(cadastro), data_inicio, data_fim, cadastro['ocupacao']),
+        'diarias': {tipo: listar_diarias(tabela, tipo, data_inicio, data_fim) for tipo in TIPOS_QUARTOS}
+    }
+
+
+def montar_cotacao(cadastro, parametros):
+    """
+    Cota uma estadia com as tarifas atuais, sem reservar.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta (tipo, checkin, checkout e
+            quartos, padrão 1)
+            
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        data_checkin = converter_data(parametros.get('checkin', ""))
+        data_checkout = converter_data(parametros.get('checkout', ""))
+        quantidade_quartos = int(parametros.get('quartos', 1))
+    except ValueError:
+        return 400, {'erro': "Datas devem estar no formato dd/mm/aaaa e a quantidade deve ser um número inteiro."}
+    
+    tipo_quarto = parametros.get('tipo', "").strip().lower()
+    if tipo_quarto not in TIPOS_QUARTOS:
+        return 400, {'erro': f"Tipo de quarto inválido; use: {', '.join(TIPOS_QUARTOS)}."}
+    if not 0 < (data_checkout - data_checkin).days <= HORIZONTE_CALENDARIO:
+        return 400, {'erro': f"A estadia deve ter entre 1 e {HORIZONTE_CALENDARIO} noites."}
+    if quantidade_quartos < 1:
+        return 400, {'erro': "A quantidade de quartos deve ser maior ou igual a 1."}
+    
+    tabela = obter_tabela_tarifas(cadastro)
+    return 200, {
+        'tipo_quarto': tipo_quarto,
+        'checkin': data_checkin.strftime('%d/%m/%Y'),
+        'checkout': data_checkout.strftime('%d/%m/%Y'),
+        'quantidade_quartos': quantidade_quartos,
+        'valor': cotar_estadia(tabela, tipo_quarto, data_checkin, data_checkout, quantidade_quartos),
+        'diarias': listar_diarias(tabela, tipo_quarto, data_checkin, data_checkout)
+    }
+
+
+def converter_com_quartos(cadastro, reserva):
+    """
+    Converte uma reserva para JSON, com os quartos atribuídos.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        reserva (Reserva): Reserva
+        
+    Returns:
+        dict: Registro da reserva com 'quartos' (lista vazia se ainda não
+            houver quarto)
+    """
+    registro = converter_para_exportacao(reserva)
+    registro['quartos'] = list(obter_alocacao(cadastro)['atribuicoes'].get(reserva.hash, ()))
+    return registro
+
+
+def montar_alocacao(cadastro, parametros):
+    """
+    Monta as métricas de fragmentação da alocação de quartos nas próximas
+    noites (parâmetro 'dias', padrão e limite HORIZONTE_CALENDARIO).
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta (dias)
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        dias = int(parametros.get('dias', HORIZONTE_CALENDARIO))
+    except ValueError:
+        return 400, {'erro': "Quantidade de dias inválida."}
+    
+    if not 0 < dias <= HORIZONTE_CALENDARIO:
+        return 400, {'erro': f"A quantidade de dias deve estar entre 1 e {HORIZONTE_CALENDARIO}."}
+    
+    alocacao = obter_alocacao(cadastro)
+    return 200, {
+        'dias': dias,
+        'tipos': calcular_fragmentacao(alocacao, dias=dias),
+        'sem_quarto': contar_sem_quarto(alocacao),
+        'realocacoes': alocacao['realocacoes']
+    }
+
+
+def montar_relatorio(cadastro, parametros):
+    """
+    Monta o relatório de ocupação e receita de um período. As datas 'de' e
+    'ate' são inclusivas (padrão: o mês atual) e 'agrupar' é "dia",
+    "semana" ou "mes" (padrão).
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        parametros (dict): Parâmetros da consulta (de, ate, agrupar)
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        data_inicio = converter_data(parametros['de']) if parametros.get('de') else date.today().replace(day=1)
+        data_fim = converter_data(parametros['ate']) + timedelta(days=1) if parametros.get('ate') else None
+    except ValueError:
+        return 400, {'erro': "Período inválido."}
+    
+    if data_fim is None:
+        data_fim = (data_inicio.replace(day=1) + timedelta(days=32)).replace(day=1)
+    agrupamento = parametros.get('agrupar', "mes")
+    
+    if agrupamento not in AGRUPAMENTOS:
+        return 400, {'erro': f"Agrupamento inválido: use {', '.join(AGRUPAMENTOS)}."}
+    if data_fim <= data_inicio:
+        return 400, {'erro': "A data final deve ser igual ou posterior à inicial."}
+    
+    linhas = gerar_relatorio(cadastro, data_inicio, data_fim, agrupamento)
+    for linha in linhas:
+        linha['inicio'] = linha['inicio'].strftime('%d/%m/%Y')
+        linha['ate'] = (linha.pop('fim') - timedelta(days=1)).strftime('%d/%m/%Y')
+    return 200, {'agrupamento': agrupamento, 'linhas': linhas}
+
+
+def montar_sugestoes(cadastro, dados):
+    """
+    Converte as alternativas para uma reserva sem disponibilidade para JSON.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        dados (dict): Dados da reserva pedida
+        
+    Returns:
+        dict: Períodos (datas dd/mm/aaaa), tipos e máximo disponível
+    """
+    sugestoes = sugerir_alternativas(listar_reservas(cadastro), dados, cadastro['ocupacao'])
+    return {
+        'periodos': [
+            {'checkin': checkin.strftime('%d/%m/%Y'), 'checkout': checkout.strftime('%d/%m/%Y')}
+            for checkin, checkout in sugestoes['periodos']
+        ],
+        'tipos': sugestoes['tipos'],
+        'maximo_disponivel': sugestoes['maximo_disponivel']
+    }
+
+
+async def criar_pela_fila(cadastro, fila, corpo):
+    """
+    Cria uma reserva pelo escritor a partir do corpo JSON de um POST.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        fila (asyncio.Queue): Fila do escritor
+        corpo (bytes): Corpo da requisição
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        registro = json.loads(corpo or b"{}")
+    except ValueError:
+        return 400, {'erro': "Corpo JSON inválido."}
+    dados, motivo = converter_registro(registro if isinstance(registro, dict) else None)
+    if motivo:
+        return 400, {'erro': motivo}
+    
+    reserva, erro = await enfileirar_escrita(fila, "criar", dados)
+    loop = asyncio.get_running_loop()
+    
+    if erro == ERRO_INDISPONIVEL:
+        status, corpo = resposta_de_erro(erro)
+        corpo['sugestoes'] = await loop.run_in_executor(None, montar_sugestoes, cadastro, dados)
+        return status, corpo
+    if erro is not None:
+        return resposta_de_erro(erro)
+    return 201, await loop.run_in_executor(None, converter_com_quartos, cadastro, reserva)
+
+
+async def cancelar_pela_fila(fila, codigo):
+    """
+    Cancela uma reserva pelo escritor.
+    
+    Args:
+        fila (asyncio.Queue): Fila do escritor
+        codigo (str): Código da reserva, como veio na URL
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    try:
+        codigo_hash = int(codigo)
+    except ValueError:
+        return 400, {'erro': "Código inválido."}
+    
+    reserva, erro = await enfileirar_escrita(fila, "cancelar", codigo_hash)
+    return (200, converter_para_exportacao(reserva)) if erro is None else resposta_de_erro(erro)
+
+
+async def tratar_requisicao(cadastro, fila, metodo, alvo, corpo):
+    """
+    Encaminha uma requisição para a operação correspondente: criações e
+    cancelamentos vão para o escritor e as consultas rodam na thread do
+    cadastro (tratar_consulta).
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        fila (asyncio.Queue): Fila do escritor
+        metodo (str): Método HTTP
+        alvo (str): Caminho e consulta da URL
+        corpo (bytes): Corpo da requisição
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    url = urlsplit(alvo)
+    partes = [parte for parte in url.path.split("/") if parte]
+    parametros = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+    
+    if metodo == "POST" and partes == ["reservas"]:
+        return await criar_pela_fila(cadastro, fila, corpo)
+    if metodo == "DELETE" and len(partes) == 2 and partes[0] == "reservas":
+        return await cancelar_pela_fila(fila, partes[1])
+    
+    return await asyncio.get_running_loop().run_in_executor(
+        None, tratar_consulta, cadastro, metodo, partes, parametros
+    )
+
+
+def tratar_consulta(cadastro, metodo, partes, parametros):
+    """
+    Atende as requisições que não gravam (consultas, rotas inexistentes e
+    métodos não permitidos). Roda na thread do cadastro.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        metodo (str): Método HTTP
+        partes (list): Partes não vazias do caminho da URL
+        parametros (dict): Parâmetros da consulta
+        
+    Returns:
+        tuple: (status, corpo)
+    """
+    # Consultas incluem as gravações feitas por outros processos
+    if metodo == "GET":
+        atualizar_cadastro(cadastro)
+    
+    if partes == ["estatisticas"] and metodo == "GET":
+        return 200, montar_estatisticas(cadastro, parametros)
+    
+    if partes == ["relatorios"] and metodo == "GET":
+        return montar_relatorio(cadastro, parametros)
+    
+    if partes == ["disponibilidade"] and metodo == "GET":
+        return montar_disponibilidade(cadastro, parametros)
+    
+    if partes == ["cotacao"] and metodo == "GET":
+        return montar_cotacao(cadastro, parametros)
+    
+    if partes == ["alocacao"] and metodo == "GET":
+        return montar_alocacao(cadastro, parametros)
+    
+    if partes == ["metricas"] and metodo == "GET":
+        if not COLETAR_METRICAS:
+            return 404, {'erro': "Coleta de métricas desativada (COLETAR_METRICAS em config.py)."}
+        return 200, formatar_prometheus()
+    
+    if not partes or partes[0] != "reservas" or len(partes) > 2:
+        return 404, {'erro': "Rota não encontrada."}
+    
+    if len(partes) == 1:
+        if metodo == "GET":
+            if 'nome' in parametros:
+                encontradas = buscar_reservas_por_nome(cadastro, parametros['nome'])
+                return 200, {'reservas': [converter_para_exportacao(reserva) for reserva in encontradas]}
+            return listar_pagina(cadastro, parametros)
+        
+        return 405, {'erro': "Método não permitido."}
+    
+    try:
+        codigo_hash = int(partes[1])
+    except ValueError:
+        return 400, {'erro': "Código inválido."}
+    
+    if metodo == "GET":
+        reserva = buscar_reserva(cadastro, codigo_hash)
+        return (200, converter_com_quartos(cadastro, reserva)) if reserva else resposta_de_erro(ERRO_NAO_ENCONTRADA)
+    
+    return 405, {'erro': "Método não permitido."}
+
+
+async def ler_requisicao(leitor):
+    """
+    Lê uma requisição HTTP/1.1 da conexão.
+    
+    Args:
+        leitor (asyncio.StreamReader): Leitor da conexão
+        
+    Returns:
+        tuple: (metodo, alvo, cabecalhos, corpo) ou None se a conexão
+            foi encerrada
+    """
+    linha = await leitor.readline()
+    if not linha.strip():
+        return None
+    
+    metodo, alvo, _ = linha.decode("latin-1").split(" ", 2)
+    cabecalhos = {}
+    
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    
+    tamanho = int(cabecalhos.get("content-length", 0))
+    corpo = await leitor.readexactly(tamanho) if tamanho else b""
+    return metodo.upper(), alvo, cabecalhos, corpo
+
+
+def nomear_rota(metodo, alvo):
+    """
+    Nome da métrica de latência de uma requisição. Métodos e caminhos
+    desconhecidos são agrupados, para que clientes não criem métricas
+    ilimitadas.
+    
+    Args:
+        metodo (str): Método HTTP
+        alvo (str): Caminho e consulta da URL
+        
+    Returns:
+        str: Nome da métrica (ex.: "servidor.GET /reservas")
+    """
+    try:
+        # Alvos sem caminho ("http://host", "") ficam na raiz ("/")
+        rota = urlsplit(alvo).path.strip("/").partition("/")[0]
+    except ValueError:
+        rota = "outra"
+    if metodo not in ("GET", "POST", "DELETE"):
+        metodo = "outro"
+    if rota and rota not in ROTAS:
+        rota = "outra"
+    return f"servidor.{metodo} /{rota}"
+
+
+def montar_resposta(status, corpo, manter_conexao):
+    """
+    Serializa a resposta HTTP com corpo JSON (ou texto, para as métricas).
+    
+    Args:
+        status (int): Código de status
+        corpo (dict ou str): Corpo da resposta
+        manter_conexao (bool): Mantém a conexão aberta (keep-alive)
+        
+    Returns:
+        bytes: Resposta completa
+    """
+    if isinstance(corpo, str):
+        conteudo = corpo.encode("utf-8")
+        tipo = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        conteudo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        tipo = "application/json; charset=utf-8"
+    
+    cabecalho = (
+        f"HTTP/1.1 {status} {STATUS_HTTP.get(status, '')}\r\n"
+        f"Content-Type: {tipo}\r\n"
+        f"Content-Length: {len(conteudo)}\r\n"
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n"
+    )
+    return cabecalho.encode("latin-1") + conteudo
+
+
+async def atender_conexao(cadastro, fila, leitor, escritor):
+    """
+    Atende as requisições de uma conexão até o cliente encerrá-la.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        fila (asyncio.Queue): Fila do escritor
+        leitor (asyncio.StreamReader): Leitor da conexão
+        escritor (asyncio.StreamWriter): Escritor da conexão
+    """
+    try:
+        while True:
+            try:
+                requisicao = await ler_requisicao(leitor)
+            except (ValueError, asyncio.IncompleteReadError):
+                escritor.write(montar_resposta(400, {'erro': "Requisição malformada."}, False))
+                break
+            
+            if requisicao is None:
+                break
+            
+            metodo, alvo, cabecalhos, corpo = requisicao
+            manter_conexao = cabecalhos.get("connection", "").lower() != "close"
+            inicio = time.perf_counter()
+            try:
+                status, resposta = await tratar_requisicao(cadastro, fila, metodo, alvo, corpo)
+            except Exception:
+                # Um erro inesperado não deve deixar o cliente sem resposta
+                traceback.print_exc()
+                status, resposta = 500, {'erro': "Erro interno do servidor."}
+            if COLETAR_METRICAS:
+                registrar_duracao(nomear_rota(metodo, alvo), time.perf_counter() - inicio)
+            escritor.write(montar_resposta(status, resposta, manter_conexao))
+            await escritor.drain()
+            
+            if not manter_conexao:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def executar_servidor(host=SERVIDOR_HOST, porta=SERVIDOR_PORTA):
+    """
+    Carrega o cadastro, inicia o escritor e atende conexões até ser
+    interrompido; ao encerrar, aguarda o lote em andamento, compacta o
+    journal e salva as estatísticas.
+    
+    O executor padrão do loop passa a ter uma única thread, a thread do
+    cadastro: tudo o que acessa o cadastro roda nele, em ordem.
+    
+    Args:
+        host (str): Endereço de escuta
+        porta (int): Porta de escuta
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cadastro")
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    cadastro = abrir_cadastro()
+    fila = asyncio.Queue()
+    escritor = asyncio.create_task(processar_escritas(cadastro, fila))
+    
+    servidor = await asyncio.start_server(
+        lambda leitor, conexao: atender_conexao(cadastro, fila, leitor, conexao),
+        host,
+        porta
+    )
+    print(f"Servidor de reservas de {NOME_PROPRIEDADE} em http://{host}:{porta} ({len(cadastro['reservas'])} reservas)")
+    
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        escritor.cancel()
+        # Um segundo sinal não deve interromper a compactação do journal
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        executor.shutdown(wait=True)
+        encerrar_cadastro(cadastro)
+        salvar_metricas()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON de reservas.")
+    parser.add_argument("--host", default=SERVIDOR_HOST)
+    parser.add_argument("--porta", type=int, default=SERVIDOR_PORTA)
+    opcoes = parser.parse_args()
+    
+    # SIGTERM (encerramento pelo gerenciador de serviços) equivale ao Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    try:
+        asyncio.run(executar_servidor(opcoes.host, opcoes.porta))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
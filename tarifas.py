@@ -0,0 +1,442 @@
+"""
+Módulo de tarifação por data.
+A diária de cada noite parte do valor base de QUARTOS_VALOR e é ajustada
+pela temporada, pelo acréscimo de fim de semana e pela ocupação do tipo de
+quarto naquela noite (índice de ocupação diária, ver ocupacao.py).
+
+As diárias dos próximos HORIZONTE_TARIFAS dias ficam pré-calculadas em uma
+tabela por tipo de quarto, junto com as somas acumuladas: cotar qualquer
+estadia dentro do horizonte custa uma subtração, independentemente do
+número de noites. Criar ou cancelar uma reserva recalcula só as noites que
+ela ocupa, e alterar uma regra (alterar_regras) recalcula só os dias que a
+regra afeta; em ambos os casos as somas acumuladas são refeitas a partir
+do primeiro dia alterado.
+"""
+
+from datetime import date
+from itertools import accumulate
+from config import (
+    QUARTOS_QUANTIDADE,
+    QUARTOS_VALOR,
+    TEMPORADAS,
+    NOITES_FIM_DE_SEMANA,
+    FATOR_FIM_DE_SEMANA,
+    FAIXAS_OCUPACAO,
+    HORIZONTE_TARIFAS
+)
+from metricas import instrumentar
+
+
+def obter_regras_padrao():
+    """
+    Monta as regras de tarifação configuradas em config.py.
+    
+    Returns:
+        dict: Regras com 'diarias' ({tipo_quarto: diária base}),
+            'temporadas', 'noites_fim_de_semana', 'fator_fim_de_semana' e
+            'faixas_ocupacao'
+    """
+    return {
+        'diarias': dict(QUARTOS_VALOR),
+        'temporadas': tuple(TEMPORADAS),
+        'noites_fim_de_semana': frozenset(NOITES_FIM_DE_SEMANA),
+        'fator_fim_de_semana': FATOR_FIM_DE_SEMANA,
+        'faixas_ocupacao': tuple(FAIXAS_OCUPACAO)
+    }
+
+
+def na_temporada(temporada, data):
+    """
+    Indica se uma data pertence a uma temporada.
+    
+    Args:
+        temporada (tuple): (início (mês, dia), fim (mês, dia), fator)
+        data (date): Data da noite
+        
+    Returns:
+        bool: True se a data está entre o início e o fim, inclusive
+    """
+    inicio, fim, _ = temporada
+    dia = (data.month, data.day)
+    
+    if inicio <= fim:
+        return inicio <= dia <= fim
+    # Temporada que atravessa o ano (ex.: dezembro a janeiro)
+    return dia >= inicio or dia <= fim
+
+
+def calcular_fator_ocupacao(faixas, taxa_ocupacao):
+    """
+    Retorna o fator da maior faixa de ocupação atingida.
+    
+    Args:
+        faixas (tuple): Faixas (ocupação mínima, fator)
+        taxa_ocupacao (float): Fração dos quartos do tipo já ocupados
+        
+    Returns:
+        float: Fator de ocupação (1.0 se nenhuma faixa foi atingida)
+    """
+    return max((fator for minimo, fator in faixas if taxa_ocupacao >= minimo), default=1.0)
+
+
+def calcular_diaria(regras, tipo_quarto, dia, ocupados=0):
+    """
+    Calcula a diária de uma noite pelas regras de tarifação.
+    
+    Args:
+        regras (dict): Regras de tarifação (ver obter_regras_padrao)
+        tipo_quarto (str): Tipo do quarto
+        dia (int): Ordinal da data da noite
+        ocupados (int): Quartos do tipo já ocupados na noite
+        
+    Returns:
+        float: Diária, arredondada em centavos
+    """
+    data = date.fromordinal(dia)
+    fator_temporada = max(
+        (temporada[2] for temporada in regras['temporadas'] if na_temporada(temporada, data)),
+        default=1.0
+    )
+    diaria = regras['diarias'][tipo_quarto] * fator_temporada
+    
+    if data.weekday() in regras['noites_fim_de_semana']:
+        diaria *= regras['fator_fim_de_semana']
+    
+    total = QUARTOS_QUANTIDADE.get(tipo_quarto)
+    if ocupados and total:
+        diaria *= calcular_fator_ocupacao(regras['faixas_ocupacao'], ocupados / total)
+    
+    return round(diaria, 2)
+
+
+@instrumentar
+def criar_tabela_tarifas(ocupacao=None, data_inicio=None, dias=HORIZONTE_TARIFAS, regras=None):
+    """
+    Pré-calcula as diárias de cada tipo de quarto nas noites de
+    [data_inicio, data_inicio + dias).
+    
+    A tabela é um dicionário com:
+        - 'inicio': ordinal da primeira noite
+        - 'dias': quantidade de noites cobertas
+        - 'regras': regras de tarifação em uso
+        - 'ocupacao': índice de ocupação usado nos acréscimos (None para
+          as tarifas de balcão, sem acréscimo de ocupação)
+        - 'tipos': {tipo_quarto: {'diarias': [diária por noite],
+          'acumuladas': [soma das diárias anteriores a cada noite]}}
+          
+    Args:
+        ocupacao (dict, optional): Índice de ocupação diária (ver
+            ocupacao.py), mantido atualizado pelo cadastro
+        data_inicio (date, optional): Primeira noite; padrão hoje
+        dias (int): Quantidade de noites pré-calculadas
+        regras (dict, optional): Regras de tarifação; padrão as de config.py
+        
+    Returns:
+        dict: Tabela de tarifas
+    """
+    inicio = (data_inicio or date.today()).toordinal()
+    regras = regras or obter_regras_padrao()
+    tabela = {
+        'inicio': inicio,
+        'dias': dias,
+        'regras': regras,
+        'ocupacao': ocupacao,
+        'tipos': {}
+    }
+    
+    for tipo in regras['diarias']:
+        ocupados = ocupacao.get(tipo, {}) if ocupacao is not None else {}
+        diarias = [calcular_diaria(regras, tipo, dia, ocupados.get(dia, 0)) for dia in range(inicio, inicio + dias)]
+        tabela['tipos'][tipo] = {
+            'diarias': diarias,
+            'acumuladas': list(accumulate(diarias, initial=0.0))
+        }
+    
+    return tabela
+
+
+def recalcular_noites(tabela, tipo_quarto, posicoes):
+    """
+    Recalcula as diárias de algumas noites de um tipo e refaz as somas
+    acumuladas a partir da primeira delas.
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        tipo_quarto (str): Tipo do quarto
+        posicoes (iterable): Posições das noites na tabela (não vazio)
+    """
+    serie = tabela['tipos'][tipo_quarto]
+    diarias = serie['diarias']
+    ocupados = tabela['ocupacao'].get(tipo_quarto, {}) if tabela['ocupacao'] is not None else {}
+    primeira = tabela['dias']
+    
+    for posicao in posicoes:
+        dia = tabela['inicio'] + posicao
+        diarias[posicao] = calcular_diaria(tabela['regras'], tipo_quarto, dia, ocupados.get(dia, 0))
+        primeira = min(primeira, posicao)
+    
+    acumuladas = serie['acumuladas']
+    acumuladas[primeira:] = accumulate(diarias[primeira:], initial=acumuladas[primeira])
+
+
+def atualizar_tarifas(tabela, reserva):
+    """
+    Recalcula as noites ocupadas por uma reserva criada ou cancelada, cuja
+    ocupação (e, com ela, o acréscimo de ocupação) mudou. Deve ser chamada
+    depois de atualizado o índice de ocupação.
+    
+    Args:
+        tabela (dict): Tabela de tarifas (None se ainda não foi montada)
+        reserva (Reserva): Reserva criada ou cancelada
+    """
+    if tabela is None or tabela['ocupacao'] is None or reserva.tipo_quarto not in tabela['tipos']:
+        return
+    
+    primeira = max(reserva.checkin.toordinal() - tabela['inicio'], 0)
+    ultima = min(reserva.checkout.toordinal() - tabela['inicio'], tabela['dias'])
+    if primeira < ultima:
+        recalcular_noites(tabela, reserva.tipo_quarto, range(primeira, ultima))
+
+
+def atualizar_tarifas_lote(tabela, reservas):
+    """
+    Recalcula, uma única vez por tipo de quarto, as noites ocupadas por um
+    lote de reservas criadas; equivale a atualizar_tarifas para cada uma,
+    mas refaz as somas acumuladas uma vez só. Deve ser chamada depois de
+    atualizado o índice de ocupação.
+    
+    Args:
+        tabela (dict): Tabela de tarifas (None se ainda não foi montada)
+        reservas (iterable): Reservas criadas
+    """
+    if tabela is None or tabela['ocupacao'] is None:
+        return
+    
+    afetadas = {}
+    for reserva in reservas:
+        if reserva.tipo_quarto not in tabela['tipos']:
+            continue
+        primeira = max(reserva.checkin.toordinal() - tabela['inicio'], 0)
+        ultima = min(reserva.checkout.toordinal() - tabela['inicio'], tabela['dias'])
+        if primeira < ultima:
+            afetadas.setdefault(reserva.tipo_quarto, set()).update(range(primeira, ultima))
+    
+    for tipo, posicoes in afetadas.items():
+        recalcular_noites(tabela, tipo, posicoes)
+
+
+def obter_posicoes_afetadas(tabela, antigas, novas):
+    """
+    Determina as noites cuja diária pode mudar com a troca de regras.
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        antigas (dict): Regras em uso
+        novas (dict): Regras novas
+        
+    Returns:
+        dict: {tipo_quarto: set(posições das noites na tabela)}
+    """
+    noites = range(tabela['dias'])
+    datas = [date.fromordinal(tabela['inicio'] + posicao) for posicao in noites]
+    comuns = set()
+    
+    # Temporadas incluídas, removidas ou alteradas: noites cobertas por elas
+    temporadas = set(antigas['temporadas']) ^ set(novas['temporadas'])
+    if temporadas:
+        comuns.update(
+            posicao for posicao in noites
+            if any(na_temporada(temporada, datas[posicao]) for temporada in temporadas)
+        )
+    
+    # Fim de semana: todas as noites de fim de semana se o fator mudou, ou
+    # só os dias da semana incluídos ou retirados
+    if antigas['fator_fim_de_semana'] != novas['fator_fim_de_semana']:
+        dias_semana = antigas['noites_fim_de_semana'] | novas['noites_fim_de_semana']
+    else:
+        dias_semana = antigas['noites_fim_de_semana'] ^ novas['noites_fim_de_semana']
+    if dias_semana:
+        comuns.update(posicao for posicao in noites if datas[posicao].weekday() in dias_semana)
+    
+    afetadas = {}
+    faixas = set(antigas['faixas_ocupacao']) ^ set(novas['faixas_ocupacao'])
+    
+    for tipo in tabela['tipos']:
+        if antigas['diarias'].get(tipo) != novas['diarias'].get(tipo):
+            afetadas[tipo] = set(noites)
+            continue
+        
+        afetadas[tipo] = set(comuns)
+        
+        # Faixas de ocupação alteradas: noites com ocupação a partir da
+        # menor faixa alterada
+        total = QUARTOS_QUANTIDADE.get(tipo)
+        if faixas and total and tabela['ocupacao'] is not None:
+            minimo = min(faixa[0] for faixa in faixas)
+            for dia, ocupados in tabela['ocupacao'].get(tipo, {}).items():
+                posicao = dia - tabela['inicio']
+                if 0 <= posicao < tabela['dias'] and ocupados / total >= minimo:
+                    afetadas[tipo].add(posicao)
+    
+    return afetadas
+
+
+@instrumentar
+def alterar_regras(tabela, **alteracoes):
+    """
+    Altera regras de tarifação e recalcula só as diárias afetadas.
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        **alteracoes: Regras novas, com as chaves de obter_regras_padrao
+            (ex.: fator_fim_de_semana=1.2, diarias={...})
+            
+    Returns:
+        int: Quantidade de diárias recalculadas
+        
+    Raises:
+        ValueError: Se alguma regra não existir
+    """
+    antigas = tabela['regras']
+    desconhecidas = set(alteracoes) - set(antigas)
+    if desconhecidas:
+        raise ValueError(f"Regras de tarifação desconhecidas: {', '.join(sorted(desconhecidas))}")
+    
+    novas = dict(antigas, **alteracoes)
+    novas['diarias'] = dict(novas['diarias'])
+    novas['temporadas'] = tuple(novas['temporadas'])
+    novas['noites_fim_de_semana'] = frozenset(novas['noites_fim_de_semana'])
+    novas['faixas_ocupacao'] = tuple(novas['faixas_ocupacao'])
+    
+    afetadas = obter_posicoes_afetadas(tabela, antigas, novas)
+    tabela['regras'] = novas
+    
+    for tipo, posicoes in afetadas.items():
+        if posicoes:
+            recalcular_noites(tabela, tipo, posicoes)
+    
+    return sum(len(posicoes) for posicoes in afetadas.values())
+
+
+def obter_tabela_tarifas(cadastro):
+    """
+    Retorna a tabela de tarifas do cadastro, montando-a na primeira cotação
+    e remontando-a (com as mesmas regras) quando o dia muda.
+    
+    Args:
+        cadastro (dict): Cadastro de reservas
+        
+    Returns:
+        dict: Tabela de tarifas
+    """
+    tabela = cadastro['tarifas']
+    
+    if tabela is None or tabela['inicio'] != date.today().toordinal():
+        regras = tabela['regras'] if tabela is not None else None
+        tabela = cadastro['tarifas'] = criar_tabela_tarifas(cadastro['ocupacao'], regras=regras)
+    
+    return tabela
+
+
+def listar_diarias(tabela, tipo_quarto, data_checkin, data_checkout):
+    """
+    Lista as diárias de cada noite de [check-in, check-out).
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        tipo_quarto (str): Tipo do quarto
+        data_checkin (date): Primeira noite
+        data_checkout (date): Dia seguinte à última noite
+        
+    Returns:
+        list: Diária de cada noite
+    """
+    primeira = data_checkin.toordinal() - tabela['inicio']
+    ultima = data_checkout.toordinal() - tabela['inicio']
+    
+    if 0 <= primeira and ultima <= tabela['dias']:
+        return tabela['tipos'][tipo_quarto]['diarias'][primeira:ultima]
+    
+    ocupados = tabela['ocupacao'].get(tipo_quarto, {}) if tabela['ocupacao'] is not None else {}
+    return [
+        calcular_diaria(tabela['regras'], tipo_quarto, dia, ocupados.get(dia, 0))
+        for dia in range(data_checkin.toordinal(), data_checkout.toordinal())
+    ]
+
+
+def cotar_estadia(tabela, tipo_quarto, data_checkin, data_checkout, quantidade_quartos=1):
+    """
+    Calcula o valor de uma estadia. Dentro do horizonte da tabela, o custo
+    é constante (diferença de duas somas acumuladas); fora dele, as
+    diárias são calculadas noite a noite.
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        tipo_quarto (str): Tipo do quarto
+        data_checkin (date): Data de check-in
+        data_checkout (date): Data de check-out
+        quantidade_quartos (int): Quantidade de quartos
+        
+    Returns:
+        float: Valor total da estadia
+    """
+    primeira = data_checkin.toordinal() - tabela['inicio']
+    ultima = data_checkout.toordinal() - tabela['inicio']
+    
+    if 0 <= primeira and ultima <= tabela['dias']:
+        acumuladas = tabela['tipos'][tipo_quarto]['acumuladas']
+        total = acumuladas[ultima] - acumuladas[primeira]
+    else:
+        total = sum(listar_diarias(tabela, tipo_quarto, data_checkin, data_checkout))
+    
+    return round(total * quantidade_quartos, 2)
+
+
+def cotar_lote(tabela, pedidos):
+    """
+    Cota um lote de estadias em uma única varredura, todas com a ocupação
+    anterior ao lote (a ordem dos pedidos não altera os valores). Dentro do
+    horizonte da tabela, cada cotação é uma subtração; fora dele, a diária
+    de cada noite de cada tipo é calculada uma única vez para o lote todo.
+    Deve ser chamada antes de o lote ocupar os quartos.
+    
+    Args:
+        tabela (dict): Tabela de tarifas
+        pedidos (iterable): Tuplas (tipo_quarto, data_checkin,
+            data_checkout, quantidade_quartos)
+            
+    Returns:
+        list: Valor total de cada estadia, na ordem dos pedidos
+    """
+    inicio = tabela['inicio']
+    dias = tabela['dias']
+    ocupacao = tabela['ocupacao'] if tabela['ocupacao'] is not None else {}
+    diarias_fora = {}
+    valores = []
+    
+    for tipo_quarto, data_checkin, data_checkout, quantidade_quartos in pedidos:
+        primeira = data_checkin.toordinal()
+        ultima = data_checkout.toordinal()
+        
+        if 0 <= primeira - inicio and ultima - inicio <= dias:
+            acumuladas = tabela['tipos'][tipo_quarto]['acumuladas']
+            total = acumuladas[ultima - inicio] - acumuladas[primeira - inicio]
+        else:
+            calculadas = diarias_fora.get(tipo_quarto)
+            if calculadas is None:
+                calculadas = diarias_fora[tipo_quarto] = {}
+            ocupados = ocupacao.get(tipo_quarto, {})
+            total = 0.0
+            for dia in range(primeira, ultima):
+                diaria = calculadas.get(dia)
+                if diaria is None:
+                    if 0 <= dia - inicio < dias:
+                        diaria = tabela['tipos'][tipo_quarto]['diarias'][dia - inicio]
+                    else:
+                        diaria = calcular_diaria(tabela['regras'], tipo_quarto, dia, ocupados.get(dia, 0))
+                    calculadas[dia] = diaria
+                total += diaria
+        
+        valores.append(round(total * quantidade_quartos, 2))
+    
+    return valores
@@ -0,0 +1,158 @@
+"""
+Testes da atribuição de quartos (alocacao.py): quartos sem sobreposição,
+redistribuição quando as lacunas não comportam a reserva e persistência das
+atribuições no journal de quartos.
+"""
+
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+import arquivo
+from alocacao import criar_alocacao, alocar_reserva, liberar_reserva, obter_alocacao, contar_sem_quarto
+from arquivo import ler_journal_alocacao
+from concorrencia import abrir_cadastro, acesso_exclusivo, gravar_operacoes, atualizar_cadastro, encerrar_cadastro
+from registro import Reserva
+from reserva import aplicar_reserva
+
+QUANTIDADES = {'standard': 4}
+INICIO = date(2030, 3, 1)
+
+
+def sortear_reservas(quantidade, semente):
+    """
+    Sorteia reservas futuras que respeitam a disponibilidade por noite.
+    """
+    sorteio = random.Random(semente)
+    ocupados = Counter()
+    reservas = []
+    
+    for codigo in range(1, quantidade + 1):
+        checkin = INICIO + timedelta(days=sorteio.randrange(60))
+        checkout = checkin + timedelta(days=sorteio.randint(1, 7))
+        quartos = sorteio.randint(1, 2)
+        noites = [checkin + timedelta(days=dia) for dia in range((checkout - checkin).days)]
+        if all(ocupados[noite] + quartos <= QUANTIDADES['standard'] for noite in noites):
+            ocupados.update(dict.fromkeys(noites, quartos))
+            reservas.append(Reserva(codigo, "Hóspede", checkin, checkout, "standard", quartos, 100.0))
+    
+    return reservas
+
+
+def conferir_quartos(alocacao, reservas):
+    periodos = {}
+    for reserva in reservas:
+        numeros = alocacao['atribuicoes'][reserva.hash]
+        assert len(numeros) == reserva.quantidade_quartos
+        for numero in numeros:
+            periodos.setdefault(numero, []).append((reserva.checkin, reserva.checkout))
+    
+    for numero, ocupados in periodos.items():
+        assert numero in alocacao['numeracao']['standard']
+        ocupados.sort()
+        assert all(fim <= inicio for (_, fim), (inicio, _) in zip(ocupados, ocupados[1:])), numero
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_reservas_uma_a_uma_sem_sobreposicao(semente):
+    reservas = sortear_reservas(80, semente)
+    alocacao = criar_alocacao(quantidades=QUANTIDADES)
+    
+    # Em ordem de chegada (não de check-in), com redistribuição
+    for reserva in reservas:
+        alocar_reserva(alocacao, reserva)
+    
+    assert contar_sem_quarto(alocacao) == 0
+    conferir_quartos(alocacao, reservas)
+
+
+def reservas_em_dias(periodos):
+    return [
+        Reserva(codigo, "Hóspede", INICIO + timedelta(days=inicio), INICIO + timedelta(days=fim), "standard", 1, 100.0)
+        for codigo, (inicio, fim) in enumerate(periodos, start=1)
+    ]
+
+
+@pytest.mark.parametrize("reorganizar", [False, True])
+def test_redistribuicao_abre_espaco(reorganizar):
+    # Dois quartos e no máximo duas estadias por noite, mas, pelo melhor
+    # ajuste na ordem de chegada, a última não cabe em nenhuma lacuna
+    reservas = reservas_em_dias([(7, 12), (2, 4), (2, 6), (5, 8)])
+    alocacao = criar_alocacao(quantidades={'standard': 2})
+    
+    for reserva in reservas[:-1]:
+        assert alocar_reserva(alocacao, reserva, reorganizar=False)
+    
+    if not reorganizar:
+        assert alocar_reserva(alocacao, reservas[-1], reorganizar=False) == ()
+        return
+    
+    assert alocar_reserva(alocacao, reservas[-1], reorganizar=True)
+    assert alocacao['realocacoes'] > 0
+    conferir_quartos(alocacao, reservas)
+    
+    liberar_reserva(alocacao, reservas[-1])
+    assert reservas[-1].hash not in alocacao['atribuicoes']
+    assert alocar_reserva(alocacao, reservas[-1], reorganizar=False)
+
+
+def test_atribuicoes_salvas_sao_mantidas():
+    reservas = sortear_reservas(40, 7)
+    alocacao = criar_alocacao(reservas, quantidades=QUANTIDADES)
+    salvas = dict(alocacao['atribuicoes'])
+    
+    # Ordem diferente, mesmas atribuições
+    remontada = criar_alocacao(reversed(reservas), salvas, quantidades=QUANTIDADES)
+    
+    assert remontada['atribuicoes'] == salvas
+
+
+@pytest.fixture
+def dados(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    arquivo.abrir_arquivo_trava.cache_clear()
+    yield
+    arquivo.abrir_arquivo_trava.cache_clear()
+
+
+def reservar(cadastro, dia, quartos=1):
+    dados = {
+        'nome': "Maria Silva",
+        'checkin': date(2030, 12, dia),
+        'checkout': date(2030, 12, dia + 3),
+        'tipo_quarto': "premium",
+        'quantidade_quartos': quartos
+    }
+    with acesso_exclusivo(cadastro):
+        reserva, erro = aplicar_reserva(cadastro, dados)
+        assert erro is None
+        assert gravar_operacoes(cadastro, [("criar", reserva)])
+    return reserva
+
+
+def test_journal_de_quartos_ida_e_volta(dados):
+    cadastro = abrir_cadastro()
+    outro = abrir_cadastro()
+    obter_alocacao(outro)
+    
+    for dia in (1, 2, 3, 5):
+        reservar(cadastro, dia, quartos=2 if dia == 3 else 1)
+    
+    # Cada gravação anexa só a atribuição da nova reserva (não há
+    # redistribuição)
+    entradas, _ = ler_journal_alocacao()
+    assert [codigo for codigo, _ in entradas] == list(cadastro['reservas'])
+    
+    # Outro processo, já com a alocação montada, recebe os mesmos quartos
+    atualizar_cadastro(outro)
+    assert outro['alocacao']['atribuicoes'] == cadastro['alocacao']['atribuicoes']
+    # Um processo novo também
+    assert obter_alocacao(abrir_cadastro())['atribuicoes'] == cadastro['alocacao']['atribuicoes']
+    
+    # E depois da compactação
+    atribuicoes = dict(cadastro['alocacao']['atribuicoes'])
+    encerrar_cadastro(cadastro)
+    assert ler_journal_alocacao() == ([], 0)
+    assert obter_alocacao(abrir_cadastro())['atribuicoes'] == atribuicoes
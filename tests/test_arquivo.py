@@ -0,0 +1,90 @@
+"""
+Testes da gravação atômica do arquivo de reservas: rodapé de CRC, gerações
+anteriores e recuperação de um arquivo corrompido (arquivo.py).
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+import arquivo
+from arquivo import (
+    carregar_reservas,
+    salvar_reservas,
+    obter_caminho_arquivo,
+    obter_caminho_binario,
+    obter_caminho_geracao,
+    gravar_json,
+    ler_json
+)
+from config import GERACOES_RESERVAS
+from registro import Reserva
+
+
+def criar_reserva(codigo):
+    return Reserva(codigo, "Maria Silva", date(2030, 12, 10), date(2030, 12, 12), "standard", 1, 200.0)
+
+
+def corromper(caminho):
+    with open(caminho, "r+b") as arquivo_dados:
+        arquivo_dados.seek(os.path.getsize(caminho) // 2)
+        byte = arquivo_dados.read(1)
+        arquivo_dados.seek(-1, os.SEEK_CUR)
+        arquivo_dados.write(bytes([byte[0] ^ 0xFF]))
+
+
+@pytest.fixture(params=["pickle", "binario"])
+def caminho(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arquivo, "BACKEND_ARMAZENAMENTO", request.param)
+    return obter_caminho_binario() if request.param == "binario" else obter_caminho_arquivo()
+
+
+def codigos(reservas):
+    return sorted(reserva.hash for reserva in reservas)
+
+
+def test_gravacoes_mantem_geracoes(caminho):
+    for quantidade in range(1, GERACOES_RESERVAS + 3):
+        assert salvar_reservas([criar_reserva(codigo) for codigo in range(quantidade)])
+    
+    assert codigos(carregar_reservas()) == list(range(GERACOES_RESERVAS + 2))
+    assert os.path.exists(obter_caminho_geracao(caminho, GERACOES_RESERVAS))
+    assert not os.path.exists(obter_caminho_geracao(caminho, GERACOES_RESERVAS + 1))
+
+
+def test_arquivo_corrompido_usa_geracao_anterior(caminho, capsys):
+    assert salvar_reservas([criar_reserva(1)])
+    assert salvar_reservas([criar_reserva(1), criar_reserva(2)])
+    corromper(caminho)
+    
+    assert codigos(carregar_reservas()) == [1]
+    assert "recuperadas de" in capsys.readouterr().out
+    # A geração usada foi restaurada e o arquivo corrompido, preservado
+    assert os.path.exists(caminho + ".corrompido")
+    assert codigos(carregar_reservas()) == [1]
+    assert "recuperadas de" not in capsys.readouterr().out
+
+
+def test_sem_geracao_integra_interrompe(caminho):
+    assert salvar_reservas([criar_reserva(1)])
+    assert salvar_reservas([criar_reserva(2)])
+    corromper(caminho)
+    corromper(obter_caminho_geracao(caminho, 1))
+    
+    with pytest.raises(SystemExit):
+        carregar_reservas()
+    assert os.path.exists(caminho)
+
+
+def test_json_auxiliar_confere_crc(tmp_path):
+    caminho_json = str(tmp_path / "alocacao.json")
+    conteudo = {'versao': 1, 'atribuicoes': [[1, [3, 4]]], 'nome': "Conceição"}
+    
+    gravar_json(caminho_json, conteudo)
+    assert ler_json(caminho_json) == conteudo
+    
+    corromper(caminho_json)
+    with pytest.raises(ValueError):
+        ler_json(caminho_json)
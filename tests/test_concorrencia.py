@@ -0,0 +1,126 @@
+"""
+Testes do compartilhamento do diretório de dados entre processos: trava
+exclusiva, carimbo de versão e sincronização dos cadastros
+(concorrencia.py).
+"""
+
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+import arquivo
+from arquivo import travar_dados, ler_versao, obter_caminho_trava
+from concorrencia import (
+    abrir_cadastro,
+    acesso_exclusivo,
+    atualizar_cadastro,
+    gravar_operacoes,
+    encerrar_cadastro
+)
+from reserva import aplicar_reserva, aplicar_cancelamento, ERRO_INDISPONIVEL
+
+DADOS = {
+    'nome': "Maria Silva",
+    'checkin': date(2030, 12, 10),
+    'checkout': date(2030, 12, 12),
+    'tipo_quarto': "luxo",
+    'quantidade_quartos': 2
+}
+
+# Tenta adquirir a trava sem esperar; sai com 1 se outro processo a detém
+TENTAR_TRAVA = """
+import fcntl, sys
+with open(sys.argv[1], "a") as trava:
+    try:
+        fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        sys.exit(1)
+"""
+
+
+@pytest.fixture(autouse=True)
+def dados(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # O arquivo de trava é aberto uma vez por processo, no diretório atual
+    arquivo.abrir_arquivo_trava.cache_clear()
+    yield
+    arquivo.abrir_arquivo_trava.cache_clear()
+
+
+def reservar(cadastro, dados=DADOS):
+    with acesso_exclusivo(cadastro):
+        reserva, erro = aplicar_reserva(cadastro, dict(dados))
+        if erro is None:
+            assert gravar_operacoes(cadastro, [("criar", reserva)])
+    return reserva, erro
+
+
+@pytest.mark.skipif(arquivo.fcntl is None, reason="sem trava entre processos")
+def test_trava_exclui_outros_processos():
+    def trava_livre():
+        return subprocess.run([sys.executable, "-c", TENTAR_TRAVA, obter_caminho_trava()]).returncode == 0
+    
+    with travar_dados():
+        # Reentrante no mesmo processo
+        with travar_dados():
+            assert not trava_livre()
+        assert not trava_livre()
+    assert trava_livre()
+
+
+def test_gravacao_avanca_versao():
+    cadastro = abrir_cadastro()
+    antes = ler_versao()
+    
+    reservar(cadastro)
+    
+    assert ler_versao() == {'versao': antes['versao'] + 1, 'compactacoes': antes['compactacoes']}
+    assert cadastro['sincronizacao']['versao'] == antes['versao'] + 1
+    # Sem gravações de outros processos, nada a incorporar
+    assert not atualizar_cadastro(cadastro)
+
+
+def test_outro_cadastro_incorpora_gravacoes():
+    primeiro = abrir_cadastro()
+    segundo = abrir_cadastro()
+    
+    reserva, _ = reservar(primeiro)
+    
+    assert atualizar_cadastro(segundo)
+    assert segundo['reservas'][reserva.hash] == reserva
+    
+    with acesso_exclusivo(segundo):
+        assert aplicar_cancelamento(segundo, reserva.hash)[1] is None
+        assert gravar_operacoes(segundo, [("cancelar", reserva)])
+    
+    assert atualizar_cadastro(primeiro)
+    assert reserva.hash not in primeiro['reservas']
+
+
+def test_disponibilidade_reconferida_sob_a_trava():
+    primeiro = abrir_cadastro()
+    segundo = abrir_cadastro()
+    
+    # Cada cadastro vê os 3 quartos de luxo livres; só um pedido de 2 cabe
+    assert reservar(primeiro)[1] is None
+    reserva, erro = reservar(segundo)
+    
+    assert reserva is None
+    assert erro == ERRO_INDISPONIVEL
+    assert len(segundo['reservas']) == 1
+
+
+def test_recarrega_apos_compactacao():
+    primeiro = abrir_cadastro()
+    segundo = abrir_cadastro()
+    
+    reserva, _ = reservar(primeiro)
+    encerrar_cadastro(primeiro)
+    
+    assert ler_versao()['compactacoes'] == 1
+    assert atualizar_cadastro(segundo)
+    assert set(segundo['reservas']) == {reserva.hash}
+    assert segundo['sincronizacao']['compactacoes'] == 1
+    assert not atualizar_cadastro(segundo)
@@ -0,0 +1,84 @@
+"""
+Testes da geração e decodificação dos códigos de reserva
+(identificador.py).
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import identificador
+from identificador import (
+    gerar_codigo,
+    decodificar_codigo,
+    intervalo_codigos,
+    MASCARA_NO,
+    MASCARA_SEQUENCIA,
+    DESLOCAMENTO_TEMPO
+)
+
+# Instante fixo (2030) para os testes que controlam o relógio
+AGORA = 1_900_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def gerador(monkeypatch):
+    # Estado próprio do gerador em cada teste: um relógio simulado no futuro
+    # não afeta os códigos gerados depois
+    monkeypatch.setattr(identificador, "ESTADO_GERADOR", {'pid': None, 'no': 0, 'ultimo_ms': 0, 'sequencia': 0})
+
+
+def test_codigos_crescentes_e_unicos():
+    codigos = [gerar_codigo() for _ in range(10_000)]
+    
+    assert codigos == sorted(set(codigos))
+    assert all(0 < codigo < 1 << 63 for codigo in codigos)
+
+
+def test_codigo_em_uso_nao_e_devolvido(monkeypatch):
+    monkeypatch.setattr(identificador.time, "time", lambda: AGORA)
+    primeiro = gerar_codigo()
+    
+    # Os dois próximos códigos do mesmo milissegundo já estão em uso
+    codigo = gerar_codigo({primeiro + 1, primeiro + 2})
+    
+    assert codigo == primeiro + 3
+
+
+def test_relogio_voltando_mantem_a_ordem(monkeypatch):
+    monkeypatch.setattr(identificador.time, "time", lambda: AGORA)
+    anterior = gerar_codigo()
+    monkeypatch.setattr(identificador.time, "time", lambda: AGORA - 1)
+    
+    assert gerar_codigo() > anterior
+
+
+def test_sequencia_esgotada_avanca_o_milissegundo(monkeypatch):
+    monkeypatch.setattr(identificador.time, "time", lambda: AGORA)
+    codigos = [gerar_codigo() for _ in range(MASCARA_SEQUENCIA + 2)]
+    
+    assert codigos == sorted(set(codigos))
+    assert codigos[-1] >> DESLOCAMENTO_TEMPO == (codigos[0] >> DESLOCAMENTO_TEMPO) + 1
+
+
+def test_decodificacao():
+    antes = datetime.now() - timedelta(seconds=1)
+    codigo = gerar_codigo()
+    
+    partes = decodificar_codigo(codigo)
+    
+    assert antes <= partes['criado_em'] <= datetime.now()
+    assert partes['no'] == os.getpid() & MASCARA_NO
+    assert partes['sequencia'] == codigo & MASCARA_SEQUENCIA
+    # Códigos no futuro (os antigos, gerados por hash) não são decodificados
+    assert decodificar_codigo(2**62 + 12345) is None
+
+
+def test_intervalo_contem_os_codigos_do_periodo():
+    inicio = datetime.now() - timedelta(seconds=1)
+    codigo = gerar_codigo()
+    menor, maior = intervalo_codigos(inicio, datetime.now() + timedelta(seconds=1))
+    
+    assert menor <= codigo <= maior
+    assert intervalo_codigos(inicio - timedelta(seconds=1), inicio)[1] < codigo
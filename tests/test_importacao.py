@@ -0,0 +1,101 @@
+"""
+Testes da conversão dos registros importados (importacao.converter_registro)
+e da importação de um lote (importacao.importar_reservas).
+"""
+
+from datetime import date
+
+import pytest
+
+from importacao import converter_registro, importar_reservas
+from concorrencia import abrir_cadastro, acesso_exclusivo
+from indice_nomes import criar_indice_nomes
+from alocacao import obter_alocacao
+
+REGISTRO = {
+    'nome': "maria silva",
+    'checkin': "10/12/2030",
+    'checkout': "12/12/2030",
+    'tipo_quarto': "Standard",
+    'quantidade_quartos': "2"
+}
+
+
+def test_registro_valido():
+    dados, motivo = converter_registro(REGISTRO)
+    
+    assert motivo is None
+    assert dados['checkin'] == date(2030, 12, 10)
+    assert dados['checkout'] == date(2030, 12, 12)
+    assert dados['tipo_quarto'] == "standard"
+    assert dados['quantidade_quartos'] == 2
+
+
+@pytest.mark.parametrize("quantidade", [2, " 2 "])
+def test_quantidade_inteira(quantidade):
+    dados, motivo = converter_registro(dict(REGISTRO, quantidade_quartos=quantidade))
+    
+    assert motivo is None
+    assert dados['quantidade_quartos'] == 2
+
+
+@pytest.mark.parametrize("registro", [None, [1, 2], "x", 3, True])
+def test_linha_que_nao_e_objeto(registro):
+    assert converter_registro(registro) == (None, "Linha ilegível.")
+
+
+@pytest.mark.parametrize("quantidade", [{'quartos': 1}, [1], 1.7, 2.0, "1.7", "dois", True])
+def test_quantidade_invalida(quantidade):
+    dados, motivo = converter_registro(dict(REGISTRO, quantidade_quartos=quantidade))
+    
+    assert dados is None
+    assert "número inteiro" in motivo
+
+
+def test_campo_ausente():
+    registro = dict(REGISTRO)
+    del registro['checkout']
+    
+    dados, motivo = converter_registro(registro)
+    
+    assert dados is None
+    assert "checkout" in motivo
+
+
+def importar(registros):
+    cadastro = abrir_cadastro()
+    with acesso_exclusivo(cadastro):
+        resultado = importar_reservas(cadastro, enumerate(registros, start=2))
+    return cadastro, resultado
+
+
+def test_lote_respeita_a_disponibilidade(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registros = [dict(REGISTRO, nome=f"hóspede {numero}", quantidade_quartos="1") for numero in range(12)]
+    registros.insert(3, dict(REGISTRO, checkin="xx"))
+    
+    cadastro, resultado = importar(registros)
+    
+    assert resultado['gravado']
+    assert len(resultado['aceitas']) == 10
+    assert [linha for linha, _ in resultado['rejeitadas']] == [5, 13, 14]
+    # Valores cotados com a ocupação anterior ao lote
+    assert len({reserva.valor for reserva in resultado['aceitas']}) == 1
+    
+    assert cadastro['nomes'] == criar_indice_nomes(cadastro['reservas'].values())
+    quartos = [cadastro['alocacao']['atribuicoes'][reserva.hash] for reserva in resultado['aceitas']]
+    assert sorted(numero for numeros in quartos for numero in numeros) == list(range(1, 11))
+
+
+def test_lote_visivel_em_outro_processo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registros = [
+        dict(REGISTRO, nome=f"grupo {numero}", checkin=f"{dia:02d}/12/2030", checkout=f"{dia + 2:02d}/12/2030")
+        for numero, dia in enumerate(range(1, 25, 3))
+    ]
+    
+    cadastro, resultado = importar(registros)
+    recarregado = abrir_cadastro()
+    
+    assert set(recarregado['reservas']) == {reserva.hash for reserva in resultado['aceitas']}
+    assert obter_alocacao(recarregado)['atribuicoes'] == cadastro['alocacao']['atribuicoes']
@@ -0,0 +1,70 @@
+"""
+Testes do journal de operações (arquivo.registrar_operacoes e a
+reaplicação em arquivo.carregar_reservas), nos backends pickle e binário.
+"""
+
+from datetime import date
+
+import pytest
+
+import arquivo
+from arquivo import (
+    carregar_reservas,
+    registrar_operacoes,
+    obter_caminho_journal,
+    tamanho_journal
+)
+from registro import Reserva
+
+
+def criar_reserva(codigo, nome="Maria Silva"):
+    return Reserva(codigo, nome, date(2030, 12, 10), date(2030, 12, 12), "standard", 1, 200.0)
+
+
+@pytest.fixture(params=["pickle", "binario"])
+def dados(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(arquivo, "BACKEND_ARMAZENAMENTO", request.param)
+    # Cria o arquivo de reservas vazio
+    assert carregar_reservas() == []
+
+
+def test_operacoes_reaplicadas_ao_carregar(dados):
+    primeira, segunda, terceira = criar_reserva(1), criar_reserva(2, "João Souza"), criar_reserva(3)
+    
+    assert registrar_operacoes([], [("criar", primeira), ("criar", segunda)])
+    assert registrar_operacoes([], [("criar", terceira), ("cancelar", primeira)])
+    assert tamanho_journal() > 0
+    
+    reservas = carregar_reservas()
+    
+    assert sorted(reservas, key=lambda reserva: reserva.hash) == [segunda, terceira]
+    # O journal foi compactado no arquivo de reservas
+    assert tamanho_journal() == 0
+    assert sorted(reserva.hash for reserva in carregar_reservas()) == [2, 3]
+
+
+def test_registro_incompleto_descartado(dados, capsys):
+    assert registrar_operacoes([], [("criar", criar_reserva(1))])
+    tamanho = tamanho_journal()
+    assert registrar_operacoes([], [("criar", criar_reserva(2))])
+    
+    # Gravação interrompida no meio do segundo registro
+    with open(obter_caminho_journal(), "r+b") as journal:
+        journal.truncate(tamanho + (tamanho_journal() - tamanho) // 2)
+    
+    assert [reserva.hash for reserva in carregar_reservas()] == [1]
+    assert "Registro incompleto" in capsys.readouterr().out
+    
+    # Novos registros não são anexados depois do registro incompleto
+    assert tamanho_journal() == 0
+    assert registrar_operacoes([], [("criar", criar_reserva(3))])
+    assert sorted(reserva.hash for reserva in carregar_reservas()) == [1, 3]
+
+
+def test_cancelamento_repetido_e_idempotente(dados):
+    reserva = criar_reserva(1)
+    assert registrar_operacoes([], [("criar", reserva), ("cancelar", reserva), ("cancelar", reserva)])
+    
+    assert carregar_reservas() == []
+    assert tamanho_journal() == 0
@@ -0,0 +1,103 @@
+"""
+Testes dos relatórios de receita e ocupação (relatorios.py): indicadores
+por grupo, cache mensal invalidado pelas alterações e estadias do arquivo
+morto.
+"""
+
+from datetime import date
+
+import pytest
+
+import arquivo
+from arquivamento import arquivar_estadias
+from cadastro import criar_cadastro, adicionar_reserva, remover_reserva
+from registro import Reserva
+from relatorios import gerar_relatorio
+
+
+def criar_reserva(codigo, checkin, checkout, quartos=1, valor=200.0, tipo_quarto="standard"):
+    return Reserva(codigo, "Maria Silva", checkin, checkout, tipo_quarto, quartos, valor)
+
+
+def linha(linhas, inicio, tipo_quarto="standard"):
+    return next(linha for linha in linhas if linha['inicio'] == inicio and linha['tipo_quarto'] == tipo_quarto)
+
+
+def test_indicadores_do_mes():
+    cadastro = criar_cadastro([criar_reserva(1, date(2030, 3, 4), date(2030, 3, 6), quartos=2, valor=500.0)])
+    
+    linhas = gerar_relatorio(cadastro, date(2030, 3, 1), date(2030, 4, 1))
+    
+    standard = linha(linhas, date(2030, 3, 1))
+    assert standard['quartos_disponiveis'] == 10 * 31
+    assert standard['quartos_vendidos'] == 4
+    assert standard['receita'] == pytest.approx(500.0)
+    assert standard['adr'] == pytest.approx(125.0)
+    assert standard['ocupacao'] == pytest.approx(4 / 310)
+    assert standard['revpar'] == pytest.approx(500.0 / 310)
+    
+    total = linha(linhas, date(2030, 3, 1), "total")
+    assert total['quartos_disponiveis'] == (10 + 5 + 3) * 31
+    assert total['quartos_vendidos'] == 4
+    assert len(linhas) == 4
+
+
+def test_agrupamentos_somam_o_periodo():
+    # Estadia de 6 noites atravessando a virada do mês
+    cadastro = criar_cadastro([
+        criar_reserva(1, date(2030, 3, 28), date(2030, 4, 3), valor=600.0),
+        criar_reserva(2, date(2030, 4, 10), date(2030, 4, 12), quartos=3, valor=900.0, tipo_quarto="luxo")
+    ])
+    inicio, fim = date(2030, 3, 15), date(2030, 4, 20)
+    
+    for agrupamento in ("dia", "semana", "mes"):
+        totais = [linha for linha in gerar_relatorio(cadastro, inicio, fim, agrupamento) if linha['tipo_quarto'] == "total"]
+        assert totais[0]['inicio'] == inicio and totais[-1]['fim'] == fim
+        assert sum(linha['quartos_vendidos'] for linha in totais) == 6 + 6
+        assert sum(linha['receita'] for linha in totais) == pytest.approx(1500.0)
+    
+    por_mes = gerar_relatorio(cadastro, inicio, fim, "mes")
+    assert linha(por_mes, date(2030, 3, 15))['receita'] == pytest.approx(400.0)
+    assert linha(por_mes, date(2030, 4, 1))['receita'] == pytest.approx(200.0)
+    
+    semanas = [linha for linha in gerar_relatorio(cadastro, inicio, fim, "semana") if linha['tipo_quarto'] == "total"]
+    assert all(linha['inicio'].weekday() == 0 for linha in semanas[1:])
+
+
+def test_alteracoes_invalidam_so_os_meses_ocupados():
+    cadastro = criar_cadastro([criar_reserva(1, date(2030, 3, 4), date(2030, 3, 6))])
+    gerar_relatorio(cadastro, date(2030, 3, 1), date(2030, 5, 1))
+    abril = cadastro['relatorios'][date(2030, 4, 1)]
+    
+    adicionar_reserva(cadastro, criar_reserva(2, date(2030, 3, 10), date(2030, 3, 11), valor=100.0))
+    assert date(2030, 3, 1) not in cadastro['relatorios']
+    assert cadastro['relatorios'][date(2030, 4, 1)] is abril
+    
+    linhas = gerar_relatorio(cadastro, date(2030, 3, 1), date(2030, 5, 1))
+    assert linha(linhas, date(2030, 3, 1))['receita'] == pytest.approx(300.0)
+    
+    remover_reserva(cadastro, 1)
+    linhas = gerar_relatorio(cadastro, date(2030, 3, 1), date(2030, 5, 1))
+    assert linha(linhas, date(2030, 3, 1))['receita'] == pytest.approx(100.0)
+    assert linha(linhas, date(2030, 3, 1))['quartos_vendidos'] == 1
+
+
+@pytest.fixture
+def dados(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    arquivo.abrir_arquivo_trava.cache_clear()
+    yield
+    arquivo.abrir_arquivo_trava.cache_clear()
+
+
+def test_estadias_arquivadas_entram_no_relatorio(dados):
+    concluida = criar_reserva(1, date(2024, 1, 10), date(2024, 1, 13), valor=300.0)
+    futura = criar_reserva(2, date(2030, 1, 10), date(2030, 1, 12))
+    
+    atuais = arquivar_estadias([concluida, futura])
+    cadastro = criar_cadastro(atuais)
+    
+    assert atuais == [futura]
+    standard = linha(gerar_relatorio(cadastro, date(2024, 1, 1), date(2024, 2, 1)), date(2024, 1, 1))
+    assert standard['quartos_vendidos'] == 3
+    assert standard['receita'] == pytest.approx(300.0)
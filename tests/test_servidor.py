@@ -0,0 +1,199 @@
+"""
+Testes do serviço HTTP/JSON (servidor.py): rotas de consulta e de
+gravação, o escritor único e o atendimento pela conexão.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import arquivo
+import servidor
+from concorrencia import abrir_cadastro
+from servidor import processar_escritas, tratar_requisicao, atender_conexao
+
+RESERVA = {
+    'nome': "maria silva",
+    'checkin': "10/12/2030",
+    'checkout': "12/12/2030",
+    'tipo_quarto': "luxo",
+    'quantidade_quartos': 2
+}
+
+
+@pytest.fixture(autouse=True)
+def dados(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    arquivo.abrir_arquivo_trava.cache_clear()
+    yield
+    arquivo.abrir_arquivo_trava.cache_clear()
+
+
+def servir(teste):
+    """
+    Executa teste(cadastro, requisitar) com o escritor e a thread do
+    cadastro, como em executar_servidor.
+    """
+    async def principal():
+        executor = ThreadPoolExecutor(max_workers=1)
+        asyncio.get_running_loop().set_default_executor(executor)
+        cadastro = abrir_cadastro()
+        fila = asyncio.Queue()
+        escritor = asyncio.create_task(processar_escritas(cadastro, fila))
+        
+        async def requisitar(metodo, alvo, corpo=None):
+            conteudo = json.dumps(corpo).encode("utf-8") if corpo is not None else b""
+            return await tratar_requisicao(cadastro, fila, metodo, alvo, conteudo)
+        
+        try:
+            await teste(cadastro, requisitar)
+        finally:
+            escritor.cancel()
+            executor.shutdown(wait=True)
+    
+    asyncio.run(principal())
+
+
+def test_criar_consultar_e_cancelar():
+    async def teste(cadastro, requisitar):
+        status, criada = await requisitar("POST", "/reservas", RESERVA)
+        assert status == 201
+        assert criada['nome'] == "Maria Silva"
+        assert len(criada['quartos']) == 2
+        
+        assert await requisitar("GET", f"/reservas/{criada['hash']}") == (200, criada)
+        status, busca = await requisitar("GET", "/reservas?nome=MARIA")
+        assert [reserva['hash'] for reserva in busca['reservas']] == [criada['hash']]
+        
+        status, cancelada = await requisitar("DELETE", f"/reservas/{criada['hash']}")
+        assert status == 200 and cancelada['hash'] == criada['hash']
+        assert (await requisitar("GET", f"/reservas/{criada['hash']}"))[0] == 404
+        assert (await requisitar("DELETE", f"/reservas/{criada['hash']}"))[0] == 404
+    
+    servir(teste)
+
+
+def test_gravacoes_persistem():
+    criadas = []
+    
+    async def teste(cadastro, requisitar):
+        for _ in range(3):
+            status, corpo = await requisitar("POST", "/reservas", dict(RESERVA, quantidade_quartos=1))
+            assert status == 201
+            criadas.append(corpo['hash'])
+    
+    servir(teste)
+    
+    assert set(abrir_cadastro()['reservas']) == set(criadas)
+
+
+def test_pedidos_simultaneos_sem_overbooking():
+    async def teste(cadastro, requisitar):
+        # Três quartos de luxo: só um dos pedidos de dois quartos cabe
+        respostas = await asyncio.gather(*(requisitar("POST", "/reservas", RESERVA) for _ in range(4)))
+        
+        assert sorted(status for status, _ in respostas) == [201, 409, 409, 409]
+        recusada = next(corpo for status, corpo in respostas if status == 409)
+        assert "sugestoes" in recusada
+        assert len(cadastro['reservas']) == 1
+    
+    servir(teste)
+
+
+@pytest.mark.parametrize("metodo, alvo, corpo, status", [
+    ("POST", "/reservas", dict(RESERVA, checkin="xx"), 400),
+    ("POST", "/reservas", [1, 2], 400),
+    ("GET", "/reservas/abc", None, 400),
+    ("DELETE", "/reservas/abc", None, 400),
+    ("PUT", "/reservas", None, 405),
+    ("PUT", "/reservas/1", None, 405),
+    ("GET", "/inexistente", None, 404),
+    ("GET", "/", None, 404),
+    ("GET", "/cotacao?tipo=suite&checkin=10/12/2030&checkout=12/12/2030", None, 400)
+])
+def test_requisicoes_invalidas(metodo, alvo, corpo, status):
+    async def teste(cadastro, requisitar):
+        resposta_status, resposta = await requisitar(metodo, alvo, corpo)
+        assert resposta_status == status
+        assert 'erro' in resposta
+    
+    servir(teste)
+
+
+def test_consultas():
+    async def teste(cadastro, requisitar):
+        await requisitar("POST", "/reservas", RESERVA)
+        
+        status, cotacao = await requisitar("GET", "/cotacao?tipo=luxo&checkin=10/12/2030&checkout=12/12/2030&quartos=2")
+        assert status == 200 and len(cotacao['diarias']) == 2
+        status, calendario = await requisitar("GET", "/disponibilidade?de=10/12/2030&ate=12/12/2030")
+        assert status == 200 and calendario['livres']
+        status, relatorio = await requisitar("GET", "/relatorios?de=01/12/2030&ate=31/12/2030")
+        assert status == 200
+        assert sum(linha['quartos_vendidos'] for linha in relatorio['linhas'] if linha['tipo_quarto'] == "total") == 4
+        status, estatisticas = await requisitar("GET", "/estatisticas")
+        assert status == 200 and estatisticas['quantidade_reservas'] == 1
+    
+    servir(teste)
+
+
+def test_escritor_sobrevive_a_falha_do_lote(monkeypatch):
+    acesso_exclusivo = servidor.acesso_exclusivo
+    falhas = [SystemExit("Nenhuma cópia íntegra")]
+    
+    def acesso_que_falha(cadastro):
+        if falhas:
+            raise falhas.pop()
+        return acesso_exclusivo(cadastro)
+    
+    monkeypatch.setattr(servidor, "acesso_exclusivo", acesso_que_falha)
+    
+    async def teste(cadastro, requisitar):
+        with pytest.raises(RuntimeError):
+            await requisitar("POST", "/reservas", RESERVA)
+        # O cadastro é recarregado por completo na próxima sincronização
+        assert cadastro['sincronizacao']['compactacoes'] is None
+        
+        status, criada = await requisitar("POST", "/reservas", RESERVA)
+        assert status == 201
+        assert list(cadastro['reservas']) == [criada['hash']]
+    
+    servir(teste)
+
+
+def test_atendimento_pela_conexao():
+    async def teste(cadastro, requisitar):
+        fila = asyncio.Queue()
+        escritor_fila = asyncio.create_task(processar_escritas(cadastro, fila))
+        servico = await asyncio.start_server(
+            lambda leitor, conexao: atender_conexao(cadastro, fila, leitor, conexao), "127.0.0.1", 0
+        )
+        porta = servico.sockets[0].getsockname()[1]
+        
+        async def enviar(requisicao):
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            escritor.write(requisicao)
+            resposta = await leitor.read()
+            escritor.close()
+            cabecalho, _, corpo = resposta.partition(b"\r\n\r\n")
+            return int(cabecalho.split()[1]), json.loads(corpo)
+        
+        try:
+            corpo = json.dumps(RESERVA).encode("utf-8")
+            status, criada = await enviar(
+                b"POST /reservas HTTP/1.1\r\nConnection: close\r\n"
+                b"Content-Length: " + str(len(corpo)).encode() + b"\r\n\r\n" + corpo
+            )
+            assert status == 201
+            
+            alvo = f"/reservas/{criada['hash']}".encode()
+            assert await enviar(b"GET " + alvo + b" HTTP/1.1\r\nConnection: close\r\n\r\n") == (200, criada)
+            assert (await enviar(b"GET /reservas HTTP/1.1\r\nContent-Length: x\r\n\r\n"))[0] == 400
+        finally:
+            servico.close()
+            await servico.wait_closed()
+            escritor_fila.cancel()
+    
+    servir(teste)
@@ -0,0 +1,123 @@
+"""
+Testes da tarifação por data (tarifas.py): regras por noite, cotação pela
+tabela pré-calculada e atualização incremental da tabela.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from ocupacao import criar_indice_ocupacao, registrar_ocupacao, remover_ocupacao
+from registro import Reserva
+from tarifas import (
+    criar_tabela_tarifas,
+    atualizar_tarifas,
+    atualizar_tarifas_lote,
+    alterar_regras,
+    listar_diarias,
+    cotar_estadia,
+    cotar_lote
+)
+
+INICIO = date(2030, 3, 1)
+DIAS = 365
+
+
+def criar_tabela(ocupacao=None):
+    return criar_tabela_tarifas(ocupacao, data_inicio=INICIO, dias=DIAS)
+
+
+def reserva_luxo(codigo, checkin, noites, quartos):
+    return Reserva(codigo, "Maria Silva", checkin, checkin + timedelta(days=noites), "luxo", quartos, 0.0)
+
+
+def test_diarias_por_regra():
+    tabela = criar_tabela()
+    
+    # Segunda-feira comum, sexta-feira (fim de semana), julho e Natal
+    assert listar_diarias(tabela, "standard", date(2030, 3, 4), date(2030, 3, 5)) == [100.0]
+    assert listar_diarias(tabela, "standard", date(2030, 3, 8), date(2030, 3, 9)) == [110.0]
+    assert listar_diarias(tabela, "standard", date(2030, 7, 10), date(2030, 7, 11)) == [115.0]
+    assert listar_diarias(tabela, "standard", date(2030, 12, 24), date(2030, 12, 25)) == [130.0]
+
+
+@pytest.mark.parametrize("checkin, noites", [
+    (date(2030, 3, 4), 7),
+    (date(2030, 12, 20), 20),
+    # Atravessa o fim do horizonte e começa antes dele
+    (INICIO + timedelta(days=DIAS - 3), 10),
+    (INICIO - timedelta(days=2), 5)
+])
+def test_cotacao_soma_as_diarias(checkin, noites):
+    tabela = criar_tabela()
+    checkout = checkin + timedelta(days=noites)
+    
+    diarias = listar_diarias(tabela, "premium", checkin, checkout)
+    
+    assert len(diarias) == noites
+    assert cotar_estadia(tabela, "premium", checkin, checkout, 2) == pytest.approx(round(sum(diarias) * 2, 2))
+
+
+def test_ocupacao_recalcula_so_as_noites_da_reserva():
+    ocupacao = criar_indice_ocupacao()
+    tabela = criar_tabela(ocupacao)
+    reserva = reserva_luxo(1, date(2030, 3, 4), 3, 3)
+    base = cotar_estadia(tabela, "luxo", date(2030, 3, 2), date(2030, 3, 10))
+    
+    registrar_ocupacao(ocupacao, reserva)
+    atualizar_tarifas(tabela, reserva)
+    
+    # Luxo lotado: acréscimo da maior faixa nas três noites
+    assert listar_diarias(tabela, "luxo", date(2030, 3, 4), date(2030, 3, 7)) == [312.5] * 3
+    assert tabela['tipos'] == criar_tabela(ocupacao)['tipos']
+    
+    remover_ocupacao(ocupacao, reserva)
+    atualizar_tarifas(tabela, reserva)
+    
+    assert cotar_estadia(tabela, "luxo", date(2030, 3, 2), date(2030, 3, 10)) == base
+    assert tabela['tipos'] == criar_tabela(ocupacao)['tipos']
+
+
+def test_lote_equivale_a_reservas_uma_a_uma():
+    ocupacao = criar_indice_ocupacao()
+    tabela = criar_tabela(ocupacao)
+    reservas = [reserva_luxo(codigo, INICIO + timedelta(days=codigo * 2), 4, 1) for codigo in range(1, 20)]
+    
+    for reserva in reservas:
+        registrar_ocupacao(ocupacao, reserva)
+    atualizar_tarifas_lote(tabela, reservas)
+    
+    esperada = criar_tabela(ocupacao)
+    for tipo, serie in esperada['tipos'].items():
+        assert tabela['tipos'][tipo]['diarias'] == serie['diarias']
+        assert tabela['tipos'][tipo]['acumuladas'] == pytest.approx(serie['acumuladas'])
+
+
+def test_alteracao_de_regras_recalcula_as_noites_afetadas():
+    ocupacao = criar_indice_ocupacao([reserva_luxo(1, date(2030, 5, 1), 5, 3)])
+    tabela = criar_tabela(ocupacao)
+    
+    recalculadas = alterar_regras(tabela, fator_fim_de_semana=1.2, faixas_ocupacao=((0.9, 1.5),))
+    
+    assert 0 < recalculadas < DIAS * len(tabela['tipos'])
+    esperada = criar_tabela_tarifas(ocupacao, data_inicio=INICIO, dias=DIAS, regras=tabela['regras'])
+    assert tabela['tipos'] == esperada['tipos']
+    
+    with pytest.raises(ValueError):
+        alterar_regras(tabela, fator_feriado=1.5)
+
+
+def test_cotacao_em_lote_usa_a_ocupacao_anterior():
+    ocupacao = criar_indice_ocupacao([reserva_luxo(1, date(2030, 3, 4), 3, 2)])
+    tabela = criar_tabela(ocupacao)
+    pedidos = [
+        ("luxo", date(2030, 3, 3), date(2030, 3, 8), 1),
+        ("standard", date(2030, 7, 1), date(2030, 7, 3), 3),
+        ("luxo", INICIO + timedelta(days=DIAS - 2), INICIO + timedelta(days=DIAS + 4), 1),
+        ("luxo", INICIO + timedelta(days=DIAS + 1), INICIO + timedelta(days=DIAS + 3), 2)
+    ]
+    
+    esperados = [cotar_estadia(tabela, *pedido) for pedido in pedidos]
+    
+    assert cotar_lote(tabela, pedidos) == pytest.approx(esperados)
+    assert cotar_lote(tabela, reversed(pedidos)) == pytest.approx(esperados[::-1])
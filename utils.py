@@ -4,14 +4,28 @@ Contém funções auxiliares usadas em todo o sistema.
 """
 
 import os
+import sys
+from datetime import date
+from functools import lru_cache
+
+# Sequência ANSI que posiciona o cursor no início, apaga a tela e o
+# histórico de rolagem (o mesmo que o comando clear faz)
+LIMPAR_TELA_ANSI = "\033[H\033[2J\033[3J"
 
 
 def limpar_terminal():
     """
     Limpa a tela do terminal de forma compatível com o Sistema Operacional.
+    Em terminais POSIX escreve a sequência ANSI diretamente, sem criar um
+    processo para o comando clear a cada tela. Com a saída redirecionada
+    (scripts, testes), não escreve nada.
     """
+    if not sys.stdout.isatty():
+        return
+    
     if os.name == "posix":
-        os.system("clear")
+        sys.stdout.write(LIMPAR_TELA_ANSI)
+        sys.stdout.flush()
     elif os.name == "nt":
         os.system("cls")
 
@@ -29,6 +43,46 @@ def formatar_valor_monetario(valor):
     return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
 
+def formatar_nome(nome):
+    """
+    Padroniza um nome próprio: remove espaços extras e coloca a inicial de
+    cada palavra em maiúscula.
+    
+    Args:
+        nome (str): Nome digitado
+        
+    Returns:
+        str: Nome formatado (ex.: "joão  da silva" -> "João Da Silva")
+    """
+    return " ".join(palavra.capitalize() for palavra in nome.split())
+
+
+@lru_cache(maxsize=65536)
+def converter_data(texto):
+    """
+    Converte uma data no formato dd/mm/aaaa, sem o custo de strptime.
+    Datas repetidas (comuns em importações) são atendidas por cache.
+    
+    Args:
+        texto (str): Data digitada ou lida de arquivo
+        
+    Returns:
+        date: Data convertida
+        
+    Raises:
+        ValueError: Se o texto não for uma data válida no formato dd/mm/aaaa
+    """
+    partes = texto.strip().split("/")
+    if len(partes) != 3:
+        raise ValueError(f"data inválida: {texto!r}")
+    
+    dia, mes, ano = partes
+    if not (dia.isdigit() and mes.isdigit() and ano.isdigit() and len(ano) == 4):
+        raise ValueError(f"data inválida: {texto!r}")
+    
+    return date(int(ano), int(mes), int(dia))
+
+
 def validar_entrada_inteira(mensagem, minimo=None, maximo=None):
     """
     Solicita e valida uma entrada inteira do usuário.